@@ -0,0 +1,54 @@
+"""Add durable background job queue
+
+Revision ID: add_background_jobs
+Revises: add_user_skill_counts
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_background_jobs'
+down_revision = 'add_user_skill_counts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('background_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('run_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('locked_by', sa.String(), nullable=True),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_background_jobs_user_id', 'background_jobs', ['user_id'], unique=False)
+    # Partial indexes keep the claim and stale-lock scans small as finished jobs pile up
+    op.create_index(
+        'ix_background_jobs_claim', 'background_jobs', ['run_at'], unique=False,
+        postgresql_where=sa.text("status = 'queued'")
+    )
+    op.create_index(
+        'ix_background_jobs_locked_at', 'background_jobs', ['locked_at'], unique=False,
+        postgresql_where=sa.text("status = 'running'")
+    )
+
+
+def downgrade():
+    op.drop_index('ix_background_jobs_locked_at', table_name='background_jobs')
+    op.drop_index('ix_background_jobs_claim', table_name='background_jobs')
+    op.drop_index('ix_background_jobs_user_id', table_name='background_jobs')
+    op.drop_table('background_jobs')
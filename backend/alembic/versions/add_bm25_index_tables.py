@@ -0,0 +1,84 @@
+"""Add BM25 inverted index tables for keyword search
+
+Revision ID: add_bm25_index
+Revises: make_password_nullable
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_bm25_index'
+down_revision = 'make_password_nullable'
+branch_labels = None
+depends_on = None
+
+# Lower-cased word tokens of one resume's searchable text.
+# Must match BM25Index.tokenize and BM25Index.document_text.
+TOKENS_SQL = r"""
+    SELECT m[1] AS term
+    FROM regexp_matches(
+        lower(concat_ws(' ',
+            {r}.raw_text,
+            {r}.summary,
+            (SELECT string_agg(s, ' ') FROM json_array_elements_text(
+                CASE WHEN json_typeof({r}.skills::json) = 'array' THEN {r}.skills::json ELSE '[]'::json END
+            ) AS s),
+            {r}.current_title
+        )),
+        '\w+', 'g'
+    ) AS m
+"""
+
+
+def upgrade():
+    # Per-resume document lengths
+    op.create_table('bm25_documents',
+        sa.Column('resume_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('length', sa.Integer(), nullable=False),
+        sa.Column('indexed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('resume_id')
+    )
+    op.create_index(op.f('ix_bm25_documents_user_id'), 'bm25_documents', ['user_id'], unique=False)
+
+    # Term postings
+    op.create_table('bm25_postings',
+        sa.Column('resume_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('term', sa.String(), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('tf', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('resume_id', 'term')
+    )
+    op.create_index('ix_bm25_postings_user_term', 'bm25_postings', ['user_id', 'term'], unique=False)
+
+    # Backfill existing active resumes, so keyword search does not lose them
+    op.execute(f"""
+        INSERT INTO bm25_documents (resume_id, user_id, length)
+        SELECT r.id, r.user_id, count(t.term)
+        FROM resumes r
+        LEFT JOIN LATERAL ({TOKENS_SQL.format(r='r')}) AS t ON true
+        WHERE r.status = 'active'
+        GROUP BY r.id, r.user_id;
+    """)
+    op.execute(f"""
+        INSERT INTO bm25_postings (resume_id, user_id, term, tf)
+        SELECT r.id, r.user_id, t.term, count(*)
+        FROM resumes r
+        CROSS JOIN LATERAL ({TOKENS_SQL.format(r='r')}) AS t
+        WHERE r.status = 'active'
+        GROUP BY r.id, r.user_id, t.term;
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_bm25_postings_user_term', table_name='bm25_postings')
+    op.drop_table('bm25_postings')
+    op.drop_index(op.f('ix_bm25_documents_user_id'), table_name='bm25_documents')
+    op.drop_table('bm25_documents')
@@ -0,0 +1,35 @@
+"""Add content-addressed cache of AI results
+
+Revision ID: add_content_cache
+Revises: add_background_jobs
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_content_cache'
+down_revision = 'add_background_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('content_cache',
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('version', sa.String(), nullable=False),
+        sa.Column('result', sa.JSON(), nullable=False),
+        sa.Column('cost_usd', sa.Float(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('last_hit_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('content_hash')
+    )
+    op.create_index('ix_content_cache_kind', 'content_cache', ['kind'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_content_cache_kind', table_name='content_cache')
+    op.drop_table('content_cache')
@@ -0,0 +1,31 @@
+"""Add source hash and retention index to the content cache
+
+Revision ID: add_content_cache_retention
+Revises: add_content_cache
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_content_cache_retention'
+down_revision = 'add_content_cache'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('content_cache', sa.Column('source_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_content_cache_source_hash', 'content_cache', ['source_hash'], unique=False)
+    # Eviction scans entries by their last use
+    op.execute("""
+        CREATE INDEX ix_content_cache_last_used
+        ON content_cache ((coalesce(last_hit_at, created_at)))
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_content_cache_last_used', table_name='content_cache')
+    op.drop_index('ix_content_cache_source_hash', table_name='content_cache')
+    op.drop_column('content_cache', 'source_hash')
@@ -0,0 +1,91 @@
+"""Add normalized resume_skills table for indexed skill filtering
+
+Revision ID: add_resume_skills
+Revises: add_bm25_index
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_resume_skills'
+down_revision = 'add_bm25_index'
+branch_labels = None
+depends_on = None
+
+# Lower-cased, trimmed skills of one resume (json or jsonb ``skills`` value).
+# Must match SkillIndex.normalize.
+SKILL_ROWS_SQL = """
+    SELECT lower(btrim(s, E' \\t\\r\\n')) AS skill_norm, min(btrim(s, E' \\t\\r\\n')) AS skill
+    FROM json_array_elements_text(
+        CASE WHEN json_typeof({skills}::json) = 'array' THEN {skills}::json ELSE '[]'::json END
+    ) AS s
+    WHERE btrim(s, E' \\t\\r\\n') <> ''
+    GROUP BY lower(btrim(s, E' \\t\\r\\n'))
+"""
+
+
+def upgrade():
+    op.create_table('resume_skills',
+        sa.Column('resume_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('skill_norm', sa.String(), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('skill', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('resume_id', 'skill_norm')
+    )
+    op.create_index('ix_resume_skills_user_skill', 'resume_skills', ['user_id', 'skill_norm'], unique=False)
+
+    # Trigram index for partial skill matches (LIKE '%term%' and regex)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_resume_skills_skill_norm_trgm
+        ON resume_skills USING GIN (skill_norm gin_trgm_ops);
+    """)
+
+    # Keep resume_skills in sync with every write to resumes.skills
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION sync_resume_skills() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                DELETE FROM resume_skills WHERE resume_id = NEW.id;
+            END IF;
+            INSERT INTO resume_skills (resume_id, user_id, skill_norm, skill)
+            SELECT NEW.id, NEW.user_id, skill_rows.skill_norm, skill_rows.skill
+            FROM ({SKILL_ROWS_SQL.format(skills='NEW.skills')}) AS skill_rows;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER trg_resume_skills_insert
+        AFTER INSERT ON resumes
+        FOR EACH ROW EXECUTE FUNCTION sync_resume_skills();
+
+        CREATE TRIGGER trg_resume_skills_update
+        AFTER UPDATE OF skills, user_id ON resumes
+        FOR EACH ROW
+        WHEN (OLD.skills::text IS DISTINCT FROM NEW.skills::text OR OLD.user_id IS DISTINCT FROM NEW.user_id)
+        EXECUTE FUNCTION sync_resume_skills();
+    """)
+
+    # Backfill existing resumes
+    op.execute(f"""
+        INSERT INTO resume_skills (resume_id, user_id, skill_norm, skill)
+        SELECT r.id, r.user_id, skill_rows.skill_norm, skill_rows.skill
+        FROM resumes r
+        CROSS JOIN LATERAL ({SKILL_ROWS_SQL.format(skills='r.skills')}) AS skill_rows;
+    """)
+
+
+def downgrade():
+    op.execute("""
+        DROP TRIGGER IF EXISTS trg_resume_skills_update ON resumes;
+        DROP TRIGGER IF EXISTS trg_resume_skills_insert ON resumes;
+        DROP FUNCTION IF EXISTS sync_resume_skills();
+        DROP INDEX IF EXISTS ix_resume_skills_skill_norm_trgm;
+    """)
+    op.drop_index('ix_resume_skills_user_skill', table_name='resume_skills')
+    op.drop_table('resume_skills')
@@ -0,0 +1,156 @@
+"""Add incrementally maintained per-user skill counts
+
+Revision ID: add_user_skill_counts
+Revises: add_resume_skills
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_skill_counts'
+down_revision = 'add_resume_skills'
+branch_labels = None
+depends_on = None
+
+# Lower-cased, trimmed skills of one resume, as in add_resume_skills.
+# Must match SkillIndex.normalize.
+SKILL_ROWS_SQL = """
+    SELECT lower(btrim(s, E' \\t\\r\\n')) AS skill_norm, min(btrim(s, E' \\t\\r\\n')) AS skill
+    FROM json_array_elements_text(
+        CASE WHEN json_typeof({skills}::json) = 'array' THEN {skills}::json ELSE '[]'::json END
+    ) AS s
+    WHERE btrim(s, E' \\t\\r\\n') <> ''
+    GROUP BY lower(btrim(s, E' \\t\\r\\n'))
+"""
+
+# Rows are inserted in skill order so concurrent writers lock counters in the same order
+SYNC_FUNCTION_SQL = f"""
+    CREATE OR REPLACE FUNCTION sync_resume_skills() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE'
+           AND OLD.skills::text IS NOT DISTINCT FROM NEW.skills::text
+           AND OLD.user_id IS NOT DISTINCT FROM NEW.user_id THEN
+            -- Only the status changed: move the skills in or out of the counts
+            UPDATE resume_skills SET active = COALESCE(NEW.status = 'active', false)
+            WHERE resume_id = NEW.id;
+            RETURN NULL;
+        END IF;
+        IF TG_OP = 'UPDATE' THEN
+            DELETE FROM resume_skills WHERE resume_id = NEW.id;
+        END IF;
+        INSERT INTO resume_skills (resume_id, user_id, skill_norm, skill, active)
+        SELECT NEW.id, NEW.user_id, skill_rows.skill_norm, skill_rows.skill, COALESCE(NEW.status = 'active', false)
+        FROM ({SKILL_ROWS_SQL.format(skills='NEW.skills')}) AS skill_rows
+        ORDER BY skill_rows.skill_norm;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+# Previous definitions, restored on downgrade
+PREVIOUS_SYNC_FUNCTION_SQL = f"""
+    CREATE OR REPLACE FUNCTION sync_resume_skills() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' THEN
+            DELETE FROM resume_skills WHERE resume_id = NEW.id;
+        END IF;
+        INSERT INTO resume_skills (resume_id, user_id, skill_norm, skill)
+        SELECT NEW.id, NEW.user_id, skill_rows.skill_norm, skill_rows.skill
+        FROM ({SKILL_ROWS_SQL.format(skills='NEW.skills')}) AS skill_rows;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade():
+    op.add_column('resume_skills', sa.Column('active', sa.Boolean(), nullable=False, server_default=sa.true()))
+    op.execute("""
+        UPDATE resume_skills rs SET active = COALESCE(r.status = 'active', false)
+        FROM resumes r
+        WHERE r.id = rs.resume_id;
+    """)
+
+    op.create_table('user_skill_counts',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('skill_norm', sa.String(), nullable=False),
+        sa.Column('skill', sa.String(), nullable=False),
+        sa.Column('resume_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'skill_norm')
+    )
+    op.create_index('ix_user_skill_counts_user_count', 'user_skill_counts', ['user_id', 'resume_count'], unique=False)
+
+    # Count active skill rows as they are inserted, deleted (including by the
+    # cascade from resumes) and activated or deactivated
+    op.execute("""
+        CREATE OR REPLACE FUNCTION count_resume_skills() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.active THEN
+                UPDATE user_skill_counts SET resume_count = resume_count - 1
+                WHERE user_id = OLD.user_id AND skill_norm = OLD.skill_norm;
+                DELETE FROM user_skill_counts
+                WHERE user_id = OLD.user_id AND skill_norm = OLD.skill_norm AND resume_count <= 0;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'INSERT') AND NEW.active THEN
+                INSERT INTO user_skill_counts (user_id, skill_norm, skill, resume_count)
+                VALUES (NEW.user_id, NEW.skill_norm, NEW.skill, 1)
+                ON CONFLICT (user_id, skill_norm) DO UPDATE
+                SET resume_count = user_skill_counts.resume_count + 1,
+                    skill = LEAST(user_skill_counts.skill, EXCLUDED.skill);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER trg_user_skill_counts
+        AFTER INSERT OR DELETE OR UPDATE OF active, user_id, skill_norm ON resume_skills
+        FOR EACH ROW EXECUTE FUNCTION count_resume_skills();
+    """)
+
+    # Status changes now flow into resume_skills.active
+    op.execute(SYNC_FUNCTION_SQL)
+    op.execute("""
+        DROP TRIGGER IF EXISTS trg_resume_skills_update ON resumes;
+
+        CREATE TRIGGER trg_resume_skills_update
+        AFTER UPDATE OF skills, user_id, status ON resumes
+        FOR EACH ROW
+        WHEN (
+            OLD.skills::text IS DISTINCT FROM NEW.skills::text
+            OR OLD.user_id IS DISTINCT FROM NEW.user_id
+            OR COALESCE(OLD.status = 'active', false) IS DISTINCT FROM COALESCE(NEW.status = 'active', false)
+        )
+        EXECUTE FUNCTION sync_resume_skills();
+    """)
+
+    # Backfill from the existing skill rows
+    op.execute("""
+        INSERT INTO user_skill_counts (user_id, skill_norm, skill, resume_count)
+        SELECT user_id, skill_norm, min(skill), count(*)
+        FROM resume_skills
+        WHERE active
+        GROUP BY user_id, skill_norm;
+    """)
+
+
+def downgrade():
+    op.execute(PREVIOUS_SYNC_FUNCTION_SQL)
+    op.execute("""
+        DROP TRIGGER IF EXISTS trg_resume_skills_update ON resumes;
+
+        CREATE TRIGGER trg_resume_skills_update
+        AFTER UPDATE OF skills, user_id ON resumes
+        FOR EACH ROW
+        WHEN (OLD.skills::text IS DISTINCT FROM NEW.skills::text OR OLD.user_id IS DISTINCT FROM NEW.user_id)
+        EXECUTE FUNCTION sync_resume_skills();
+
+        DROP TRIGGER IF EXISTS trg_user_skill_counts ON resume_skills;
+        DROP FUNCTION IF EXISTS count_resume_skills();
+    """)
+    op.drop_index('ix_user_skill_counts_user_count', table_name='user_skill_counts')
+    op.drop_table('user_skill_counts')
+    op.drop_column('resume_skills', 'active')
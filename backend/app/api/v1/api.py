@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, health, resumes, search, users, interviews, interview_pipelines, websocket, linkedin, debug_search, debug_profiles, search_debug, debug_skills, fix_data, debug_duplicates, admin, debug, cleanup, linkedin_fix, outreach, admin_migrate, search_progressive, debug_analytics, simple_oauth, dev_oauth, oauth_frontend, pipelines
+from app.api.v1.endpoints import auth, health, resumes, search, users, interviews, interview_pipelines, websocket, linkedin, debug_search, debug_profiles, search_debug, debug_skills, fix_data, debug_duplicates, admin, debug, cleanup, linkedin_fix, outreach, admin_migrate, search_progressive, debug_analytics, simple_oauth, dev_oauth, oauth_frontend, pipelines, jobs
 # bulk_import temporarily disabled - pandas not in Docker image
 
 api_router = APIRouter()
@@ -12,6 +12,7 @@ api_router.include_router(health.router, prefix="/health", tags=["health"])
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(resumes.router, prefix="/resumes", tags=["resumes"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
 api_router.include_router(search.router, prefix="/search", tags=["search"])
 api_router.include_router(search_progressive.router, prefix="/search", tags=["search-progressive"])
 api_router.include_router(interviews.router, prefix="/interviews", tags=["interviews"])
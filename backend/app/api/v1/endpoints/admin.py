@@ -9,6 +9,7 @@ from pydantic import BaseModel
 
 from app.api import deps
 from app.models.user import User
+from app.services.content_cache import content_cache
 from app.services.reindex_service import reindex_service
 
 logger = logging.getLogger(__name__)
@@ -24,6 +25,7 @@ class ReindexRequest(BaseModel):
 class ReindexAllRequest(BaseModel):
     """Request model for re-indexing all resumes."""
     batch_size: int = 100
+    restart: bool = False  # Ignore any saved checkpoint
 
 
 @router.post("/reindex-resume/{resume_id}", response_model=Dict[str, Any])
@@ -84,7 +86,8 @@ async def reindex_all_resumes(
     background_tasks.add_task(
         reindex_service.reindex_all_resumes,
         db,
-        request.batch_size
+        request.batch_size,
+        request.restart
     )
     
     return {
@@ -98,15 +101,32 @@ async def reindex_all_resumes(
 async def get_reindex_status(
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Dict[str, Any]:
-    """Get current re-indexing status (placeholder for future implementation)."""
+    """Get current re-indexing status from the saved checkpoint."""
+    
+    checkpoint = await reindex_service.get_checkpoint()
+    if not checkpoint:
+        return {
+            "status": "idle",
+            "message": "No active or interrupted re-indexing operations",
+            "checkpoint": None
+        }
     
     return {
-        "status": "idle",
-        "message": "No active re-indexing operations",
-        "last_reindex": None
+        "status": "in_progress_or_interrupted",
+        "message": f"Re-indexed {checkpoint['processed']} resumes so far",
+        "checkpoint": checkpoint
     }
 
 
+@router.get("/content-cache/stats", response_model=Dict[str, Any])
+async def get_content_cache_stats(
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Dict[str, Any]:
+    """Hit rate and estimated OpenAI spend saved by the content cache (superuser only)."""
+    
+    return await content_cache.get_report()
+
+
 @router.post("/cleanup-orphaned-embeddings", response_model=Dict[str, Any])
 async def cleanup_orphaned_embeddings(
     db: AsyncSession = Depends(deps.get_db),
@@ -131,7 +151,7 @@ async def cleanup_orphaned_embeddings(
         # Note: This is a simplified approach. In production, you might want to paginate
         from qdrant_client.models import Filter
         
-        scroll_result = vector_search.client.scroll(
+        scroll_result = await vector_search.client.scroll(
             collection_name=vector_search.collection_name,
             limit=1000,  # Adjust based on your data size
             with_payload=True,
@@ -52,6 +52,36 @@ async def redis_health() -> Dict[str, str]:
     }
 
 
+@router.get("/embedding-cache")
+async def embedding_cache_stats() -> Dict[str, Any]:
+    """Query embedding cache hit/miss counters."""
+    from app.services.embedding_cache import embedding_cache
+    return {
+        **embedding_cache.get_stats(),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
+@router.get("/cache-invalidation")
+async def cache_invalidation_stats() -> Dict[str, Any]:
+    """Tag invalidation counters: keys deleted and time spent."""
+    from app.core.redis import cache_manager
+    return {
+        **cache_manager.get_invalidation_stats(),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
+@router.get("/file-parser")
+async def file_parser_stats() -> Dict[str, Any]:
+    """Text extraction pool: size, queue depth and outcome counters."""
+    from app.services.file_parser import extraction_pool
+    return {
+        **extraction_pool.get_stats(),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
 @router.get("/qdrant")
 async def qdrant_health() -> Dict[str, str]:
     """Qdrant connectivity check - simplified to avoid type issues."""
@@ -6,7 +6,7 @@ from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func
 
@@ -29,11 +29,16 @@ from app.schemas.interview import (
 from app.services.interview_ai import interview_ai_service
 from app.services.interview_copilot import InterviewCopilotService
 from app.services.interview_pipeline_integration import interview_pipeline_service
+from app.services.upload_stream import (
+    UploadRejectedError, UploadTooLargeError, multipart_file_body, receive_upload
+)
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 copilot_service = InterviewCopilotService()
 
+RECORDING_MAX_SIZE = 500 * 1024 * 1024  # 500MB
+
 
 def make_timezone_naive(dt: datetime) -> datetime:
     """Convert datetime to timezone-naive for consistent comparisons."""
@@ -1414,17 +1419,16 @@ async def get_extended_analytics(
     }
 
 
-@router.post("/sessions/{session_id}/upload-recording")
+@router.post("/sessions/{session_id}/upload-recording", openapi_extra=multipart_file_body())
 async def upload_interview_recording(
     session_id: UUID,
-    file: UploadFile = File(...),
+    request: Request,
     db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user)
 ):
-    """Upload an interview recording for transcription and analysis."""
+    """Upload an interview recording (multipart form field ``file``) for transcription and analysis."""
     
     logger.info(f"Upload recording request for session {session_id} by user {current_user.id}")
-    logger.info(f"File details: name={file.filename}, content_type={file.content_type}")
     
     # Get session
     query = select(InterviewSession).where(
@@ -1440,29 +1444,23 @@ async def upload_interview_recording(
     if not session:
         raise HTTPException(status_code=404, detail="Interview session not found")
     
-    # Validate file type
-    allowed_extensions = ['mp3', 'mp4', 'wav', 'm4a', 'webm', 'ogg', 'mpeg']
-    file_extension = file.filename.split('.')[-1].lower()
+    # Don't hold a database connection while the recording streams in
+    await db.commit()
     
-    if file_extension not in allowed_extensions:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Invalid file type. Allowed types: {', '.join(allowed_extensions)}"
+    # Stream the recording to disk; too large or the wrong type is rejected mid-upload
+    allowed_extensions = ['mp3', 'mp4', 'wav', 'm4a', 'webm', 'ogg', 'mpeg']
+    try:
+        upload = await receive_upload(
+            request,
+            max_size=RECORDING_MAX_SIZE,
+            allowed_extensions=allowed_extensions
         )
+    except UploadTooLargeError:
+        raise HTTPException(status_code=413, detail="File size exceeds 500MB limit")
+    except UploadRejectedError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Save file temporarily and check size
-    import tempfile
-    import os
-    
-    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as tmp_file:
-        content = await file.read()
-        
-        # Check file size after reading (max 500MB)
-        if len(content) > 500 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File size exceeds 500MB limit")
-            
-        tmp_file.write(content)
-        tmp_file_path = tmp_file.name
+    logger.info(f"File details: name={upload.filename}, content_type={upload.content_type}, size={upload.size}")
     
     try:
         # Process the recording
@@ -1472,7 +1470,7 @@ async def upload_interview_recording(
         session.status = InterviewStatus.PROCESSING
         session.recordings = session.recordings or []
         session.recordings.append({
-            "filename": file.filename,
+            "filename": upload.filename,
             "uploaded_at": datetime.utcnow().isoformat(),
             "status": "processing"
         })
@@ -1481,7 +1479,7 @@ async def upload_interview_recording(
         
         # Process transcription in background (for now, doing it synchronously)
         try:
-            transcript_data = await transcription_service.transcribe_with_speakers(tmp_file_path)
+            transcript_data = await transcription_service.transcribe_with_speakers(upload.path)
             
             # Update session with transcript
             session.transcript = transcript_data["transcript_text"]
@@ -1544,9 +1542,6 @@ async def upload_interview_recording(
                 logger.error(f"Auto-analysis failed: {str(analysis_error)}")
                 # Don't fail the upload if analysis fails
             
-            # Clean up temp file
-            os.unlink(tmp_file_path)
-            
             return {
                 "message": "Recording uploaded and processed successfully",
                 "transcript": transcript_data,
@@ -1570,10 +1565,9 @@ async def upload_interview_recording(
             }
         
     except Exception as e:
-        # Clean up temp file on error
-        if os.path.exists(tmp_file_path):
-            os.unlink(tmp_file_path)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        upload.cleanup()
 
 
 @router.post("/sessions/{session_id}/analyze-transcript")
@@ -0,0 +1,52 @@
+"""Background job status endpoints."""
+
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app import models, schemas
+from app.api import deps
+from app.models.background_job import JobStatus
+from app.services.job_queue import job_queue
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[schemas.BackgroundJob])
+async def list_jobs(
+    job_status: Optional[str] = Query(JobStatus.DEAD, alias="status"),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> List[schemas.BackgroundJob]:
+    """List recent jobs with a status; dead-lettered jobs by default."""
+    return await job_queue.list(status=job_status, limit=limit)
+
+
+@router.get("/{job_id}", response_model=schemas.BackgroundJob)
+async def get_job(
+    job_id: UUID,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> schemas.BackgroundJob:
+    """Get the status of a job, e.g. the processing of an uploaded resume."""
+    job = await job_queue.get(job_id)
+    if not job or (job.user_id != current_user.id and not current_user.is_superuser):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+
+@router.post("/{job_id}/retry", response_model=schemas.BackgroundJob)
+async def retry_job(
+    job_id: UUID,
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> schemas.BackgroundJob:
+    """Queue a dead-lettered job again with a fresh set of attempts."""
+    if not await job_queue.requeue(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Only dead-lettered jobs can be retried"
+        )
+    return await job_queue.get(job_id)
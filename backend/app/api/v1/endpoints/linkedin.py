@@ -14,9 +14,12 @@ from app.api import deps
 from app.models.user import User
 from app.models.resume import Resume
 from app.crud import resume as crud_resume
+from app.services.linkedin_bulk_import import build_resume_data, linkedin_bulk_importer, normalize_linkedin_url
 from app.services.linkedin_parser import LinkedInParser
+from app.services.reindex_service import reindex_service
 from app.services.vector_search import vector_search
-from app.services.search_skill_fix import normalize_skill_for_storage
+from app.services.search_cache import search_result_cache
+from app.services.skill_index import skill_index
 
 logger = logging.getLogger(__name__)
 
@@ -65,7 +68,7 @@ async def import_linkedin_profile(
     """Import a LinkedIn profile to the database."""
     
     # Normalize LinkedIn URL (remove query parameters and trailing slash)
-    normalized_url = profile_data.linkedin_url.split('?')[0].rstrip('/')
+    normalized_url = normalize_linkedin_url(profile_data.linkedin_url)
     
     logger.info(f"Import attempt - Original URL: {profile_data.linkedin_url}")
     logger.info(f"Import attempt - Normalized URL: {normalized_url}")
@@ -121,27 +124,7 @@ async def import_linkedin_profile(
         parsed_data = await parser.parse_linkedin_data(profile_data.dict())
         
         # Create new resume
-        resume_data = {
-            "user_id": current_user.id,
-            "first_name": parsed_data.get("first_name", ""),
-            "last_name": parsed_data.get("last_name", ""),
-            "email": profile_data.email or parsed_data.get("email", ""),  # Use email from Chrome extension if provided
-            "phone": profile_data.phone or parsed_data.get("phone", ""),  # Use phone from Chrome extension if provided
-            "location": profile_data.location or "",
-            "summary": profile_data.about or "",
-            "current_title": profile_data.headline or "",
-            "years_experience": profile_data.years_experience or parsed_data.get("years_experience", 0),
-            "skills": [normalize_skill_for_storage(skill) for skill in (profile_data.skills or [])],
-            "keywords": parsed_data.get("keywords", []),
-            "linkedin_url": normalized_url,
-            "linkedin_data": profile_data.dict(),
-            "last_linkedin_sync": datetime.utcnow(),
-            "status": "active",
-            "parse_status": "completed",
-            "parsed_at": datetime.utcnow(),
-            "raw_text": parsed_data.get("raw_text", ""),
-            "parsed_data": parsed_data
-        }
+        resume_data = build_resume_data(profile_data.dict(), parsed_data, current_user.id, normalized_url)
         
         # Debug log the skills being stored
         logger.info(f"Storing skills for {resume_data['first_name']} {resume_data['last_name']}: {resume_data['skills']}")
@@ -150,25 +133,19 @@ async def import_linkedin_profile(
         db.add(resume)
         await db.flush()
         
-        # Generate embedding for vector search - temporarily disabled
-        # TODO: Fix async context issue
-        # if profile_data.about or profile_data.headline:
-        #     search_text = f"{profile_data.headline or ''} {profile_data.about or ''}"
-        #     embedding = await vector_search.index_resume(
-        #         resume_id=str(resume.id),
-        #         text=search_text,
-        #         metadata={
-        #             "user_id": str(current_user.id),  # CRITICAL: Include user_id for security
-        #             "name": f"{parsed_data.get('first_name', '')} {parsed_data.get('last_name', '')}",
-        #             "title": profile_data.headline,
-        #             "location": profile_data.location,
-        #             "skills": [normalize_skill_for_storage(skill) for skill in (profile_data.skills or [])]
-        #         }
-        #     )
-        #     if embedding:
-        #         resume.embedding = embedding
+        # Keyword index in the same transaction, so keyword search sees the profile at once
+        await reindex_service.index_keywords(db, [resume])
         
         await db.commit()
+        await search_result_cache.bump_version(current_user.id)
+        await skill_index.invalidate_popular_skills(current_user.id)
+        
+        # Embedding and vector indexing run in the background
+        try:
+            await reindex_service.enqueue_index_batch([resume.id], user_id=current_user.id)
+        except Exception as e:
+            # The resume is saved; a re-index picks it up
+            logger.error(f"Failed to queue indexing of imported profile {resume.id}: {e}")
         
         # Log import history
         logger.info(f"Successfully imported LinkedIn profile: {profile_data.linkedin_url} for user {current_user.id}")
@@ -234,7 +211,7 @@ async def check_profile_exists(
     """Check if a LinkedIn profile already exists in the database."""
     
     # Normalize the URL to match import logic
-    normalized_url = request.linkedin_url.split('?')[0].rstrip('/')
+    normalized_url = normalize_linkedin_url(request.linkedin_url)
     
     # Check for the current user's resumes only
     query = select(Resume).where(
@@ -270,59 +247,11 @@ async def bulk_import_profiles(
 ) -> Dict[str, Any]:
     """Bulk import multiple LinkedIn profiles."""
     
-    results = {
-        "total": len(request.profiles),
-        "imported": 0,
-        "duplicates": 0,
-        "failed": 0,
-        "details": []
-    }
-    
-    for profile_data in request.profiles:
-        try:
-            result = await import_linkedin_profile(profile_data, db, current_user)
-            
-            if result.is_duplicate:
-                results["duplicates"] += 1
-            else:
-                results["imported"] += 1
-            
-            results["details"].append({
-                "linkedin_url": profile_data.linkedin_url,
-                "success": True,
-                "is_duplicate": result.is_duplicate,
-                "candidate_id": result.candidate_id
-            })
-            
-        except HTTPException as e:
-            # Check if it's a duplicate (409 conflict)
-            if e.status_code == status.HTTP_409_CONFLICT:
-                results["duplicates"] += 1
-                results["details"].append({
-                    "linkedin_url": profile_data.linkedin_url,
-                    "success": False,
-                    "is_duplicate": True,
-                    "error": str(e.detail)
-                })
-                logger.info(f"Duplicate profile: {profile_data.linkedin_url}")
-            else:
-                results["failed"] += 1
-                results["details"].append({
-                    "linkedin_url": profile_data.linkedin_url,
-                    "success": False,
-                    "error": str(e.detail)
-                })
-                logger.error(f"Failed to import {profile_data.linkedin_url}: {e}")
-        except Exception as e:
-            results["failed"] += 1
-            results["details"].append({
-                "linkedin_url": profile_data.linkedin_url,
-                "success": False,
-                "error": str(e)
-            })
-            logger.error(f"Failed to import {profile_data.linkedin_url}: {e}")
-    
-    return results
+    return await linkedin_bulk_importer.import_profiles(
+        db,
+        current_user.id,
+        [profile_data.dict() for profile_data in request.profiles]
+    )
 
 
 @router.post("/sync/{resume_id}")
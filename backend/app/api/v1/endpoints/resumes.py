@@ -1,18 +1,24 @@
 """Resume endpoints."""
 
+import logging
 from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, models, schemas
 from app.api import deps
 from app.core.config import settings
-from app.services.file_parser import FileParser
+from app.services.file_parser import FileParser, FileParserBusyError
 from app.services.resume_processor import resume_processor
+from app.services.upload_stream import (
+    UploadRejectedError, UploadTooLargeError, multipart_file_body, receive_upload
+)
+
+logger = logging.getLogger(__name__)
 
 
 class BulkDeleteRequest(BaseModel):
@@ -28,35 +34,52 @@ class BulkUpdatePositionRequest(BaseModel):
 router = APIRouter()
 
 
-@router.post("/", response_model=schemas.Resume)
+@router.post("/", response_model=schemas.Resume, openapi_extra=multipart_file_body())
 async def upload_resume(
     *,
     db: AsyncSession = Depends(deps.get_db),
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
+    request: Request,
+    response: Response,
     job_position: str | None = None,
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> schemas.Resume:
-    """Upload a new resume."""
-    # Validate file
-    file_content = await file.read()
-    file_size = len(file_content)
+    """Upload a new resume (multipart form field ``file``)."""
+    # Don't hold a database connection while the file streams in
+    await db.commit()
     
-    is_valid, error_msg = FileParser.validate_file(file.filename, file_size)
-    if not is_valid:
+    # Stream the file to disk; too large or the wrong type is rejected mid-upload
+    try:
+        upload = await receive_upload(
+            request,
+            max_size=FileParser.MAX_FILE_SIZE,
+            allowed_extensions=FileParser.ALLOWED_EXTENSIONS
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except UploadRejectedError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=error_msg
+            detail=str(e)
         )
     
     # Extract text from file
     try:
-        text = FileParser.extract_text(file_content, file.filename)
+        text = await FileParser.extract_text_async(upload.path, upload.filename)
+    except FileParserBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    finally:
+        upload.cleanup()
     
     # Parse basic information from text (simple extraction for now)
     # TODO: Implement AI-powered parsing
@@ -67,9 +90,9 @@ async def upload_resume(
         first_name=first_line_parts[0] if len(first_line_parts) > 0 else "Unknown",
         last_name=first_line_parts[1] if len(first_line_parts) > 1 else "Unknown",
         raw_text=text,
-        original_filename=file.filename,
-        file_size=file_size,
-        file_type=file.content_type or "application/octet-stream",
+        original_filename=upload.filename,
+        file_size=upload.size,
+        file_type=upload.content_type or "application/octet-stream",
         job_position=job_position
     )
     
@@ -85,12 +108,15 @@ async def upload_resume(
         db, obj_in=resume_in, user_id=current_user.id
     )
     
-    # Queue background processing (parsing and embedding generation)
+    # Queue processing (parsing and embedding generation) for a job worker;
+    # its progress is at /jobs/{X-Job-Id}
     if settings.OPENAI_API_KEY:
-        background_tasks.add_task(
-            resume_processor.process_resume_background,
-            str(resume.id)
-        )
+        try:
+            job = await resume_processor.enqueue(resume.id, user_id=current_user.id)
+            response.headers["X-Job-Id"] = str(job.id)
+        except Exception as e:
+            # The resume stays in parse_status "pending" and can be re-queued
+            logger.error(f"Failed to queue processing for resume {resume.id}: {e}")
     
     return resume
 
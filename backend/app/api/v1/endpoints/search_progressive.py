@@ -1,5 +1,6 @@
 """Progressive search endpoint with real-time updates."""
 
+import asyncio
 import logging
 import json
 from typing import Optional
@@ -29,6 +30,59 @@ class ProgressiveSearchQuery(BaseModel):
     context: Optional[dict] = None
 
 
+def _analysis_event_data(stage_result: dict) -> dict:
+    """Format the background query analysis event for SSE/WebSocket clients."""
+    return {
+        "event": "analysis",
+        "search_id": stage_result["search_id"],
+        "parsed_query": stage_result["parsed_query"],
+        "suggestions": stage_result["suggestions"],
+        "corrected_query": stage_result.get("corrected_query"),
+        "timing_ms": stage_result["timing_ms"],
+        "stage_timing_ms": stage_result["stage_timing_ms"]
+    }
+
+
+async def _wait_for_disconnect(websocket: WebSocket):
+    """Return once the WebSocket client disconnects, ignoring other messages."""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+async def _until_disconnect(websocket: WebSocket, stream):
+    """
+    Iterate a progressive search stream until it ends or the client leaves.
+    
+    Each stage is awaited alongside a disconnect watcher, so a client that
+    disconnects mid-stage cancels the in-flight search work immediately
+    rather than when the next send fails. Raises WebSocketDisconnect then.
+    """
+    disconnect_task = asyncio.create_task(_wait_for_disconnect(websocket))
+    next_task = None
+    try:
+        while True:
+            next_task = asyncio.ensure_future(stream.__anext__())
+            await asyncio.wait({next_task, disconnect_task}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_task.done():
+                raise WebSocketDisconnect()
+            
+            try:
+                stage_result = next_task.result()
+            except StopAsyncIteration:
+                return
+            next_task = None
+            yield stage_result
+    finally:
+        disconnect_task.cancel()
+        if next_task is not None and not next_task.done():
+            # Cancelling the pending stage unwinds the search and its tasks
+            next_task.cancel()
+            await asyncio.wait({next_task})
+        await stream.aclose()
+
+
 @router.get("/progressive")
 async def search_progressive_sse(
     query: str = Query(..., description="Search query"),
@@ -101,6 +155,7 @@ async def search_progressive_sse(
     
     async def event_generator():
         """Generate SSE events for progressive search."""
+        stream = None
         try:
             # Track search start
             await analytics_service.track_event(
@@ -115,13 +170,19 @@ async def search_progressive_sse(
             )
             
             # Perform progressive search
-            async for stage_result in search_service.search_resumes_progressive(
+            stream = search_service.search_resumes_progressive(
                 db=db,
                 query=query,
                 user_id=current_user.id,
                 limit=limit,
                 filters=None
-            ):
+            )
+            async for stage_result in stream:
+                # AI query analysis arrives as its own event, between stages
+                if stage_result["stage"] == "analysis":
+                    yield f"data: {json.dumps(_analysis_event_data(stage_result))}\n\n"
+                    continue
+                
                 # Format results for SSE
                 event_data = {
                     "stage": stage_result["stage"],
@@ -130,6 +191,10 @@ async def search_progressive_sse(
                     "search_id": stage_result["search_id"],
                     "count": stage_result["count"],
                     "timing_ms": stage_result["timing_ms"],
+                    "stage_timing_ms": stage_result.get("stage_timing_ms"),
+                    "stage_timings_ms": stage_result.get("stage_timings_ms"),
+                    "partial": stage_result.get("partial", False),
+                    "cached": stage_result.get("cached", False),
                     "is_final": stage_result["is_final"],
                     "results": []
                 }
@@ -142,6 +207,10 @@ async def search_progressive_sse(
                 if "suggestions" in stage_result:
                     event_data["suggestions"] = stage_result["suggestions"]
                 
+                # Include hybrid search leg status and timings
+                if "hybrid_search" in stage_result:
+                    event_data["hybrid_search"] = stage_result["hybrid_search"]
+                
                 # Format results
                 for resume_data, score in stage_result["results"]:
                     result_item = {
@@ -196,6 +265,10 @@ async def search_progressive_sse(
         except Exception as e:
             logger.error(f"Error in progressive search: {e}")
             yield f"data: {json.dumps({'event': 'error', 'message': str(e)})}\n\n"
+        finally:
+            # The response is cancelled when the client disconnects; stop the search with it
+            if stream is not None:
+                await stream.aclose()
     
     return StreamingResponse(
         event_generator(),
@@ -274,14 +347,20 @@ async def search_progressive_websocket(
         limit = data.get("limit", 10)
         filters = data.get("filters")
         
-        # Perform progressive search
-        async for stage_result in search_service.search_resumes_progressive(
+        # Perform progressive search, cancelling it if the client disconnects
+        stream = search_service.search_resumes_progressive(
             db=db,
             query=query,
             user_id=current_user.id,
             limit=limit,
             filters=filters
-        ):
+        )
+        async for stage_result in _until_disconnect(websocket, stream):
+            # AI query analysis arrives as its own event, between stages
+            if stage_result["stage"] == "analysis":
+                await websocket.send_json(_analysis_event_data(stage_result))
+                continue
+            
             # Format and send results
             event_data = {
                 "stage": stage_result["stage"],
@@ -290,10 +369,18 @@ async def search_progressive_websocket(
                 "search_id": stage_result["search_id"],
                 "count": stage_result["count"],
                 "timing_ms": stage_result["timing_ms"],
+                "stage_timing_ms": stage_result.get("stage_timing_ms"),
+                "stage_timings_ms": stage_result.get("stage_timings_ms"),
+                "partial": stage_result.get("partial", False),
+                "cached": stage_result.get("cached", False),
                 "is_final": stage_result["is_final"],
                 "results": []
             }
             
+            # Include hybrid search leg status and timings
+            if "hybrid_search" in stage_result:
+                event_data["hybrid_search"] = stage_result["hybrid_search"]
+            
             # Format results
             for resume_data, score in stage_result["results"]:
                 result_item = {
@@ -426,13 +513,14 @@ async def enhance_single_result(
     try:
         # Get the resume data
         from app.models.resume import Resume
+        from app.services.search_card import fetch_search_cards, select_search_cards
         
-        stmt = select(Resume).where(
+        stmt = select_search_cards(
             Resume.id == resume_id,
             Resume.user_id == current_user.id  # Security: ensure user owns the resume
         )
-        result = await db.execute(stmt)
-        resume = result.scalar_one_or_none()
+        cards = await fetch_search_cards(db, stmt)
+        resume = cards[0] if cards else None
         
         if not resume:
             raise HTTPException(
@@ -1,7 +1,8 @@
 """In-memory cache fallback for development when Redis is not available."""
 
 import asyncio
-from typing import Any, Dict, Optional
+import fnmatch
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
 from datetime import datetime, timedelta
 
 
@@ -21,6 +22,10 @@ class InMemoryCache:
             return self._store[key]
         return None
     
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """Get values of several keys."""
+        return [await self.get(key) for key in keys]
+    
     async def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
         """Set key-value with optional expiration in seconds."""
         self._store[key] = value
@@ -32,16 +37,21 @@ class InMemoryCache:
         """Set key-value with expiration."""
         return await self.set(key, value, ex=seconds)
     
-    async def delete(self, key: str) -> int:
-        """Delete key."""
+    async def delete(self, *keys: str) -> int:
+        """Delete keys."""
         deleted = 0
-        if key in self._store:
-            del self._store[key]
-            deleted = 1
-        if key in self._expiry:
-            del self._expiry[key]
+        for key in keys:
+            if key in self._store:
+                del self._store[key]
+                deleted += 1
+            if key in self._expiry:
+                del self._expiry[key]
         return deleted
     
+    async def unlink(self, *keys: str) -> int:
+        """Delete keys (Redis frees them in the background)."""
+        return await self.delete(*keys)
+    
     async def exists(self, key: str) -> int:
         """Check if key exists."""
         self._cleanup_expired()
@@ -77,6 +87,42 @@ class InMemoryCache:
             return -2
         return int(ttl)
     
+    async def sadd(self, key: str, *members: str) -> int:
+        """Add members to a set."""
+        members_set = self._set(key, create=True)
+        added = len(set(members) - members_set)
+        members_set.update(members)
+        return added
+    
+    async def spop(self, key: str, count: Optional[int] = None):
+        """Remove and return random members of a set."""
+        members_set = self._set(key)
+        if count is None:
+            return members_set.pop() if members_set else None
+        popped = [members_set.pop() for _ in range(min(count, len(members_set)))]
+        if not members_set:
+            self._store.pop(key, None)
+        return popped
+    
+    async def scard(self, key: str) -> int:
+        """Number of members in a set."""
+        return len(self._set(key))
+    
+    async def smembers(self, key: str) -> Set[str]:
+        """All members of a set."""
+        return set(self._set(key))
+    
+    async def scan_iter(self, match: Optional[str] = None, count: Optional[int] = None) -> AsyncIterator[str]:
+        """Iterate over keys, optionally matching a glob pattern."""
+        self._cleanup_expired()
+        for key in list(self._store):
+            if match is None or fnmatch.fnmatchcase(key, match):
+                yield key
+    
+    def pipeline(self, transaction: bool = True) -> "InMemoryPipeline":
+        """Queue commands and run them together on ``execute``."""
+        return InMemoryPipeline(self)
+    
     async def ping(self) -> bool:
         """Test connection."""
         return True
@@ -85,6 +131,28 @@ class InMemoryCache:
         """Close connection (no-op for in-memory)."""
         pass
     
+    def _set(self, key: str, create: bool = False) -> Set[str]:
+        """The set stored at a key."""
+        if not self._exists_now(key):
+            if not create:
+                return set()
+            self._store[key] = set()
+            self._expiry.pop(key, None)
+        value = self._store[key]
+        if not isinstance(value, set):
+            raise TypeError(f"WRONGTYPE Operation against a key holding the wrong kind of value: {key}")
+        return value
+    
+    def _exists_now(self, key: str) -> bool:
+        """Whether a key exists and has not expired."""
+        if key not in self._store:
+            return False
+        if key in self._expiry and datetime.now() >= self._expiry[key]:
+            self._store.pop(key, None)
+            del self._expiry[key]
+            return False
+        return True
+    
     def _cleanup_expired(self):
         """Remove expired keys."""
         now = datetime.now()
@@ -95,4 +163,26 @@ class InMemoryCache:
         for key in expired_keys:
             if key in self._store:
                 del self._store[key]
-            del self._expiry[key]
\ No newline at end of file
+            del self._expiry[key]
+
+
+class InMemoryPipeline:
+    """Command queue mimicking a non-transactional Redis pipeline."""
+    
+    def __init__(self, cache: InMemoryCache):
+        self._cache = cache
+        self._commands: List[Any] = []
+    
+    def __getattr__(self, name: str):
+        command = getattr(self._cache, name)
+        
+        def queue(*args, **kwargs):
+            self._commands.append((command, args, kwargs))
+            return self
+        
+        return queue
+    
+    async def execute(self) -> List[Any]:
+        """Run the queued commands in order and return their results."""
+        commands, self._commands = self._commands, []
+        return [await command(*args, **kwargs) for command, args, kwargs in commands]
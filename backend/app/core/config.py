@@ -129,12 +129,79 @@ class Settings(BaseSettings):
     ANTHROPIC_API_KEY: Optional[str] = None
     ANTHROPIC_MODEL: str = "claude-3-sonnet-20240229"
     EMBEDDING_MODEL: str = "text-embedding-ada-002"
+    EMBEDDING_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # In-process query embedding LRU budget
+    EMBEDDING_BATCH_SIZE: int = 128  # Max inputs per embeddings request
+    EMBEDDING_BATCH_MAX_TOKENS: int = 100000  # Estimated token budget per embeddings request
+    EMBEDDING_BATCH_CONCURRENCY: int = 4  # Embeddings requests in flight
+    ENHANCEMENT_CONCURRENCY: int = 8  # Result enhancement completions in flight, across all searches
+    ENHANCEMENT_TIMEOUT: float = 8.0  # Seconds per candidate before the basic enhancement is used
+    ENHANCEMENT_BATCH_SIZE: int = 1  # Candidates per completion; above 1 uses a batched prompt
     ASSEMBLYAI_API_KEY: Optional[str] = None
     
     # Vector Database (Qdrant)
     QDRANT_URL: str = "http://localhost:6333"
     QDRANT_API_KEY: Optional[str] = None
     QDRANT_COLLECTION_NAME: str = "promtitude_resumes"
+    QDRANT_TIMEOUT: int = 30  # Client-level HTTP timeout in seconds
+    QDRANT_REQUEST_TIMEOUT: float = 10.0  # Per-call deadline enforced on the event loop
+    QDRANT_MAX_CONNECTIONS: int = 20  # Upper bound on pooled HTTP connections
+    
+    # Hybrid search
+    HYBRID_SEARCH_CONCURRENT: bool = True  # Run keyword and vector legs concurrently
+    HYBRID_KEYWORD_TIMEOUT: float = 2.0  # Seconds before the BM25 leg is abandoned
+    HYBRID_VECTOR_TIMEOUT: float = 3.0  # Seconds before the vector leg is abandoned
+    
+    # Progressive search
+    PROGRESSIVE_SEARCH_PIPELINED: bool = True  # Start stage 2 and query analysis alongside stage 1
+    # Seconds after the search starts by which each stage must yield (0 disables);
+    # a stage that misses its deadline yields partial results instead
+    PROGRESSIVE_STAGE1_DEADLINE: float = 1.0
+    PROGRESSIVE_STAGE2_DEADLINE: float = 4.0
+    PROGRESSIVE_ANALYSIS_DEADLINE: float = 7.0  # Stage 3 waits this long for the AI analysis
+    PROGRESSIVE_STAGE3_DEADLINE: float = 12.0
+    SEARCH_CACHE_TTL: int = 3600  # Seconds; resume writes invalidate sooner via the corpus version
+    
+    # Popular skills (tag cloud)
+    POPULAR_SKILLS_CACHE_SIZE: int = 50  # Top skills cached per user
+    POPULAR_SKILLS_CACHE_TTL: int = 600  # Seconds; resume writes also drop the cache
+    
+    # Document text extraction, run in worker processes off the event loop
+    FILE_PARSER_WORKERS: int = 2  # Extraction processes per API process
+    FILE_PARSER_MAX_QUEUE: int = 32  # Files waiting for a worker before new ones are turned away
+    FILE_PARSER_CPU_SECONDS: int = 20  # CPU time per file before its extraction is aborted
+    FILE_PARSER_TIMEOUT: float = 60.0  # Seconds per file, including the wait for a worker
+    FILE_PARSER_MAX_PAGES: int = 50  # PDF pages read per file; longer documents are truncated
+    
+    # Background jobs
+    JOB_BROKER: str = "postgres"  # "postgres", or "memory" for tests and single-process development
+    JOB_WORKER_CONCURRENCY: int = 4  # Jobs run at once by one worker process
+    JOB_WORKER_EMBEDDED: bool = True  # Run a worker inside the API process; turn off where `python -m app.worker` runs
+    JOB_POLL_INTERVAL: float = 1.0  # Seconds an idle worker waits before polling again
+    JOB_MAX_ATTEMPTS: int = 5  # Attempts before a job is dead-lettered
+    JOB_RETRY_BASE_DELAY: float = 10.0  # Seconds before the first retry; doubles per attempt
+    JOB_RETRY_MAX_DELAY: float = 900.0
+    JOB_VISIBILITY_TIMEOUT: int = 900  # Seconds before a running job of a lost worker is requeued
+    
+    # Content-addressed cache of AI results (resume parsing, embeddings)
+    CONTENT_CACHE_TTL: int = 86400 * 7  # Seconds in Redis
+    CONTENT_CACHE_RETENTION_DAYS: int = 90  # Postgres drops entries not hit for this many days
+    CONTENT_CACHE_EVICT_INTERVAL: int = 3600  # Seconds between eviction sweeps of one process
+    CONTENT_CACHE_HIT_FLUSH_SIZE: int = 100  # Redis hits counted in memory before they are written to Postgres
+    CONTENT_CACHE_HIT_FLUSH_INTERVAL: float = 60.0  # Seconds before counted hits are written regardless
+    # Estimated OpenAI prices in USD per 1K tokens, for the dollars-saved report
+    OPENAI_CHAT_INPUT_COST_PER_1K: float = 0.0004  # OPENAI_MODEL input
+    OPENAI_CHAT_OUTPUT_COST_PER_1K: float = 0.0016  # OPENAI_MODEL output
+    OPENAI_EMBEDDING_COST_PER_1K: float = 0.0001  # text-embedding-ada-002
+    
+    # Bulk LinkedIn import
+    LINKEDIN_IMPORT_PARSE_CONCURRENCY: int = 5  # Profiles parsed (AI calls) at once per request
+    BULK_IMPORT_MAX_ACTIVE_USERS: int = 8  # Users' import queues processed at once per process
+    BULK_IMPORT_CLAIM_BATCH: int = 10  # Queue items claimed per user at a time
+    BULK_IMPORT_VISIBILITY_TIMEOUT: int = 900  # Seconds before items claimed by a lost worker are pending again
+    
+    # Cache invalidation by tag
+    CACHE_TAG_TTL: int = 86400 * 7  # Seconds; at least the longest TTL of a tagged key
+    CACHE_INVALIDATE_CHUNK_SIZE: int = 500  # Keys popped and deleted per round trip
     
     # Supabase
     SUPABASE_URL: Optional[str] = None
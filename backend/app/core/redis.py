@@ -1,7 +1,8 @@
 """Redis connection and utilities."""
 
 import logging
-from typing import Optional, Any, List
+import time
+from typing import Optional, Any, Dict, Iterable, List
 import hashlib
 import json
 
@@ -14,6 +15,7 @@ logger = logging.getLogger(__name__)
 
 # Global Redis client
 redis_client: Optional[Redis] = None
+binary_redis_client: Optional[Redis] = None
 
 
 async def get_redis_client() -> Optional[Redis]:
@@ -56,13 +58,48 @@ async def get_redis_client() -> Optional[Redis]:
     return redis_client
 
 
+async def get_binary_redis_client() -> Optional[Redis]:
+    """Get Redis client instance that returns raw bytes.
+    
+    The default client decodes responses as UTF-8, which breaks binary
+    payloads such as packed embedding vectors.
+    """
+    global binary_redis_client
+    
+    if binary_redis_client is None:
+        if not settings.REDIS_URL:
+            return None
+            
+        try:
+            binary_redis_client = redis.from_url(
+                settings.REDIS_URL,
+                decode_responses=False,
+                max_connections=10,
+                socket_keepalive=True
+            )
+            await binary_redis_client.ping()
+        except Exception as e:
+            logger.error(f"Failed to connect binary Redis client: {e}")
+            if settings.DEBUG:
+                from app.core.cache_fallback import InMemoryCache
+                binary_redis_client = InMemoryCache()
+            else:
+                binary_redis_client = None
+                return None
+    
+    return binary_redis_client
+
+
 async def close_redis():
     """Close Redis connection."""
-    global redis_client
+    global redis_client, binary_redis_client
     if redis_client:
         await redis_client.close()
         redis_client = None
         logger.info("Redis connection closed")
+    if binary_redis_client:
+        await binary_redis_client.close()
+        binary_redis_client = None
 
 
 class RedisKeys:
@@ -70,9 +107,11 @@ class RedisKeys:
     
     # Search related
     SEARCH_CACHE = "search:{user_id}:{query_hash}"
+    CORPUS_VERSION = "corpus_version:{user_id}"  # Bumped on resume writes
     SEARCH_SESSION = "search_session:{session_id}"
     SEARCH_CONTEXT = "search_context:{user_id}:{session_id}"
     QUERY_ANALYSIS = "query_analysis:{query_hash}"
+    POPULAR_SKILLS = "popular_skills:{user_id}"
     
     # User preferences
     USER_SEARCH_PREFS = "user:search_prefs:{user_id}"
@@ -83,6 +122,15 @@ class RedisKeys:
     EMBEDDING_CACHE = "embedding:{text_hash}"
     QUERY_EMBEDDING = "query_embedding:{query_hash}"
     
+    # Content-addressed AI results
+    CONTENT_CACHE = "content:{content_hash}"
+    
+    # Reindexing
+    REINDEX_CHECKPOINT = "reindex:checkpoint"
+    
+    # Bulk import rate limits: imports per user in one fixed window
+    IMPORT_RATE = "import_rate:{user_id}:{window}:{bucket}"
+    
     # Analytics
     SEARCH_METRICS = "metrics:search:{date}"
     USER_BEHAVIOR = "behavior:{user_id}:{action_type}"
@@ -92,6 +140,13 @@ class RedisKeys:
     EXTENSION_TOKEN = "extension_token:{token}"
     EXTENSION_TOKEN_ATTEMPTS = "extension_token_attempts:{email}"
     
+    # Cache tags: a set of the keys cached under each tag
+    CACHE_TAG = "tag:{tag}"
+    TAG_USER = "user:{user_id}"
+    TAG_RESUME = "resume:{resume_id}"
+    TAG_QUERY = "query:{query_hash}"
+    TAG_CONTENT_SOURCE = "content_source:{source_hash}"  # Content cache entries derived from one document
+    
     @staticmethod
     def hash_text(text: str) -> str:
         """Generate consistent hash for text."""
@@ -105,13 +160,21 @@ class CacheManager:
         self.default_ttl = 3600  # 1 hour
         self.embedding_ttl = 86400 * 7  # 7 days for embeddings
         self.query_ttl = 3600  # 1 hour for query results
+        self.tag_ttl = settings.CACHE_TAG_TTL
+        self.invalidate_chunk_size = settings.CACHE_INVALIDATE_CHUNK_SIZE
+        
+        # Invalidation counters
+        self.invalidations = 0
+        self.keys_invalidated = 0
+        self.invalidation_seconds = 0.0
         
     async def get_or_set(
         self,
         key: str,
         fetch_func,
         ttl: Optional[int] = None,
-        serialize: bool = True
+        serialize: bool = True,
+        tags: Iterable[str] = ()
     ):
         """
         Get value from cache or fetch and set if not exists.
@@ -121,6 +184,7 @@ class CacheManager:
             fetch_func: Async function to fetch data if not in cache
             ttl: Time to live in seconds
             serialize: Whether to JSON serialize the value
+            tags: Tags to register the key under, see ``invalidate_tags``
             
         Returns:
             Cached or fetched value
@@ -143,11 +207,7 @@ class CacheManager:
             
             # Store in cache
             cache_value = json.dumps(value) if serialize else str(value)
-            await redis_client.setex(
-                key,
-                ttl or self.default_ttl,
-                cache_value
-            )
+            await self._store(redis_client, key, cache_value, ttl or self.default_ttl, tags)
             
             return value
             
@@ -156,30 +216,180 @@ class CacheManager:
             # Fallback to fetching without cache
             return await fetch_func()
     
-    async def invalidate_pattern(self, pattern: str):
+    async def get_many(self, keys: Iterable[str], serialize: bool = True) -> Dict[str, Any]:
         """
-        Invalidate all keys matching a pattern.
+        Read several keys with a single MGET.
+        
+        Returns:
+            Values of the keys that were cached; misses are left out
+        """
+        keys = list(dict.fromkeys(keys))
+        redis_client = await get_redis_client()
+        if not redis_client or not keys:
+            return {}
+        
+        try:
+            values = await redis_client.mget(keys)
+        except Exception as e:
+            logger.error(f"Cache error reading {len(keys)} keys: {e}")
+            return {}
+        
+        return {
+            key: json.loads(value) if serialize else value
+            for key, value in zip(keys, values)
+            if value is not None
+        }
+    
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        serialize: bool = True,
+        tags: Iterable[str] = ()
+    ):
+        """Store a value, registering the key under ``tags``."""
+        await self.set_many({key: value}, ttl=ttl, serialize=serialize, tags={key: tags})
+    
+    async def set_many(
+        self,
+        values: Dict[str, Any],
+        ttl: Optional[int] = None,
+        serialize: bool = True,
+        tags: Optional[Dict[str, Iterable[str]]] = None
+    ):
+        """
+        Store several values in one pipelined round trip.
         
         Args:
-            pattern: Redis pattern (e.g., "search:user123:*")
+            values: Values by cache key
+            ttl: Time to live in seconds, shared by all keys
+            serialize: Whether to JSON serialize the values
+            tags: Tags to register each key under, by cache key
         """
         redis_client = await get_redis_client()
-        if not redis_client:
+        if not redis_client or not values:
             return
         
         try:
-            # Find all matching keys
-            keys = []
-            async for key in redis_client.scan_iter(match=pattern):
-                keys.append(key)
+            pipe = redis_client.pipeline(transaction=False)
+            for key, value in values.items():
+                cache_value = json.dumps(value) if serialize else str(value)
+                self._queue_store(pipe, key, cache_value, ttl or self.default_ttl, (tags or {}).get(key, ()))
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Cache error writing {len(values)} keys: {e}")
+    
+    async def get_or_set_many(
+        self,
+        keys: Iterable[str],
+        fetch_many_func,
+        ttl: Optional[int] = None,
+        serialize: bool = True,
+        tags: Optional[Dict[str, Iterable[str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Batch ``get_or_set``: one MGET, one fetch for the misses, one pipeline.
+        
+        Args:
+            keys: Cache keys
+            fetch_many_func: Async function taking the missing keys and
+                returning their values by key; keys it leaves out or maps to
+                None are not cached
+            ttl: Time to live in seconds
+            serialize: Whether to JSON serialize the values
+            tags: Tags to register each key under, by cache key
             
-            # Delete in batches
-            if keys:
-                await redis_client.delete(*keys)
-                logger.info(f"Invalidated {len(keys)} cache keys matching pattern: {pattern}")
-                
+        Returns:
+            Cached and fetched values by key
+        """
+        keys = list(dict.fromkeys(keys))
+        values = await self.get_many(keys, serialize=serialize)
+        missing = [key for key in keys if key not in values]
+        if not missing:
+            logger.debug(f"Cache hit for all {len(keys)} keys")
+            return values
+        
+        logger.debug(f"Cache miss for {len(missing)} of {len(keys)} keys")
+        fetched = {
+            key: value for key, value in (await fetch_many_func(missing) or {}).items()
+            if value is not None
+        }
+        await self.set_many(fetched, ttl=ttl, serialize=serialize, tags=tags)
+        values.update(fetched)
+        return values
+    
+    async def _store(self, redis_client, key: str, value: str, ttl: int, tags: Iterable[str]):
+        """Write a key and add it to its tag sets in one round trip."""
+        tags = set(tags)
+        if not tags:
+            await redis_client.setex(key, ttl, value)
+            return
+        
+        pipe = redis_client.pipeline(transaction=False)
+        self._queue_store(pipe, key, value, ttl, tags)
+        await pipe.execute()
+    
+    def _queue_store(self, pipe, key: str, value: str, ttl: int, tags: Iterable[str]):
+        """Queue the writes for one key and its tag sets on a pipeline."""
+        pipe.setex(key, ttl, value)
+        for tag in set(tags):
+            tag_key = RedisKeys.CACHE_TAG.format(tag=tag)
+            pipe.sadd(tag_key, key)
+            # Tag sets must outlive their members; expired members are harmless
+            pipe.expire(tag_key, max(ttl, self.tag_ttl))
+    
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        Delete every key cached under any of these tags.
+        
+        Members are popped from each tag set in chunks; deleting a chunk and
+        popping the next one share a pipeline, so a tag holding N keys costs
+        about N / ``invalidate_chunk_size`` round trips, independent of the
+        size of the keyspace.
+        
+        Args:
+            tags: Tags such as ``RedisKeys.TAG_USER.format(user_id=...)``
+            
+        Returns:
+            Number of keys deleted
+        """
+        redis_client = await get_redis_client()
+        if not redis_client or not tags:
+            return 0
+        
+        start = time.perf_counter()
+        deleted = 0
+        try:
+            for tag in set(tags):
+                tag_key = RedisKeys.CACHE_TAG.format(tag=tag)
+                members = await redis_client.spop(tag_key, self.invalidate_chunk_size)
+                while members:
+                    pipe = redis_client.pipeline(transaction=False)
+                    pipe.unlink(*members)
+                    pipe.spop(tag_key, self.invalidate_chunk_size)
+                    removed, members = await pipe.execute()
+                    deleted += removed
         except Exception as e:
-            logger.error(f"Error invalidating cache pattern {pattern}: {e}")
+            logger.error(f"Error invalidating cache tags {tags}: {e}")
+        
+        elapsed = time.perf_counter() - start
+        self.invalidations += 1
+        self.keys_invalidated += deleted
+        self.invalidation_seconds += elapsed
+        logger.info(f"Invalidated {deleted} cache keys for tags {tags} in {elapsed * 1000:.1f}ms")
+        return deleted
+    
+    def get_invalidation_stats(self) -> Dict[str, Any]:
+        """Return tag invalidation counters."""
+        return {
+            "invalidations": self.invalidations,
+            "keys_invalidated": self.keys_invalidated,
+            "invalidation_seconds": self.invalidation_seconds,
+            "avg_invalidation_ms": (
+                self.invalidation_seconds * 1000 / self.invalidations if self.invalidations else 0.0
+            )
+        }
     
     async def add_to_list(
         self,
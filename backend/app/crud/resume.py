@@ -8,10 +8,15 @@ from uuid import UUID
 from sqlalchemy import select, update, func, extract, cast, Date
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.redis import RedisKeys, cache_manager
 from app.crud.base import CRUDBase
 from app.models.resume import Resume
 from app.schemas.resume import ResumeCreate, ResumeUpdate
+from app.services.bm25_index import bm25_index
+from app.services.content_cache import content_cache
 from app.services.reindex_service import reindex_service
+from app.services.search_cache import search_result_cache
+from app.services.skill_index import skill_index
 
 logger = logging.getLogger(__name__)
 
@@ -39,8 +44,12 @@ class CRUDResume(CRUDBase[Resume, ResumeCreate, ResumeUpdate]):
             file_type=obj_in.file_type,
         )
         db.add(db_obj)
+        await db.flush()
+        await reindex_service.index_keywords(db, [db_obj])
         await db.commit()
         await db.refresh(db_obj)
+        await search_result_cache.bump_version(user_id)
+        await skill_index.invalidate_popular_skills(user_id)
         return db_obj
     
     async def get_by_user(
@@ -98,6 +107,7 @@ class CRUDResume(CRUDBase[Resume, ResumeCreate, ResumeUpdate]):
         )
         await db.commit()
         await db.refresh(db_obj)
+        await search_result_cache.bump_version(db_obj.user_id)
         
         # Re-index if skills or keywords were updated
         if needs_reindex:
@@ -153,10 +163,17 @@ class CRUDResume(CRUDBase[Resume, ResumeCreate, ResumeUpdate]):
         
         # Perform the update using parent class method
         updated_resume = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        await search_result_cache.bump_version(updated_resume.user_id)
+        await skill_index.invalidate_popular_skills(updated_resume.user_id)
+        await cache_manager.invalidate_tags(RedisKeys.TAG_RESUME.format(resume_id=updated_resume.id))
         
         # Re-index in vector search if needed
         if needs_reindex:
             await reindex_service.reindex_resume(db, updated_resume)
+        elif 'raw_text' in update_data:
+            # The text only feeds the keyword index
+            if await reindex_service.index_keywords(db, [updated_resume]):
+                await db.commit()
         
         return updated_resume
     
@@ -176,11 +193,17 @@ class CRUDResume(CRUDBase[Resume, ResumeCreate, ResumeUpdate]):
             logger.error(f"Failed to delete vector embeddings for resume {id}: {e}")
             # Continue with soft delete even if vector deletion fails
         
+        # Drop from the keyword index so it no longer counts towards BM25 statistics
+        await bm25_index.remove_document(db, id)
+        
         # Soft delete by setting status to 'deleted'
         resume.status = 'deleted'
         resume.updated_at = datetime.utcnow()
         await db.commit()
         await db.refresh(resume)
+        await search_result_cache.bump_version(resume.user_id)
+        await skill_index.invalidate_popular_skills(resume.user_id)
+        await cache_manager.invalidate_tags(RedisKeys.TAG_RESUME.format(resume_id=id))
         
         logger.info(f"Soft deleted resume {id} by setting status to 'deleted'")
         return resume
@@ -204,6 +227,15 @@ class CRUDResume(CRUDBase[Resume, ResumeCreate, ResumeUpdate]):
         # Hard delete from database
         await db.delete(resume)
         await db.commit()
+        await search_result_cache.bump_version(resume.user_id)
+        await skill_index.invalidate_popular_skills(resume.user_id)
+        await cache_manager.invalidate_tags(RedisKeys.TAG_RESUME.format(resume_id=id))
+        
+        # Drop the parses and embeddings cached from this resume's text
+        try:
+            await content_cache.purge_source(resume.raw_text)
+        except Exception as e:
+            logger.error(f"Failed to purge cached AI results for resume {id}: {e}")
         
         logger.info(f"Hard deleted resume {id} from database")
         return resume
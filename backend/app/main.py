@@ -27,11 +27,32 @@ async def lifespan(app: FastAPI):
         print("Continuing without Redis - some features may be limited")
         # Don't raise in production - Redis is optional
     
+    # Run background jobs in this process unless a dedicated worker is deployed
+    job_worker = None
+    if settings.JOB_WORKER_EMBEDDED:
+        from app.worker import start_embedded_worker
+        job_worker, job_worker_task = start_embedded_worker()
+        print("Embedded job worker started")
+    
     yield
     
     # Shutdown
+    if job_worker:
+        job_worker.stop()
+        await job_worker_task
+        print("Embedded job worker stopped")
+    
     await close_redis()
     print("Redis connection closed")
+    
+    from app.services.vector_search import vector_search
+    await vector_search.close()
+    
+    from app.services.file_parser import extraction_pool
+    extraction_pool.shutdown()
+    
+    from app.services.content_cache import content_cache
+    await content_cache.flush_hits()
 
 
 # Conditionally enable API documentation
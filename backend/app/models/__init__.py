@@ -8,6 +8,9 @@ from .interview import InterviewSession, InterviewQuestion, InterviewFeedback, I
 from .interview_pipeline import InterviewPipeline, CandidateJourney
 from .outreach import OutreachMessage, OutreachTemplate, MessageStyle, MessageStatus
 from .analytics import AnalyticsEvent, EventType
+from .search_index import BM25Document, BM25Posting, ResumeSkill, UserSkillCount
+from .background_job import BackgroundJob, JobStatus
+from .content_cache import ContentCacheEntry
 from .pipeline import (
     Pipeline, CandidatePipelineState, PipelineActivity, 
     CandidateNote, CandidateEvaluation, CandidateCommunication,
@@ -33,6 +36,13 @@ __all__ = [
     "MessageStatus",
     "AnalyticsEvent",
     "EventType",
+    "BM25Document",
+    "BM25Posting",
+    "ResumeSkill",
+    "UserSkillCount",
+    "BackgroundJob",
+    "JobStatus",
+    "ContentCacheEntry",
     # Pipeline models
     "Pipeline",
     "CandidatePipelineState",
@@ -0,0 +1,58 @@
+"""Background job model for the durable job queue."""
+
+from uuid import uuid4
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, JSON, String, Text, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class JobStatus:
+    """Lifecycle of a background job."""
+    
+    QUEUED = "queued"  # Waiting for run_at, or for a free worker
+    RUNNING = "running"  # Claimed by a worker
+    SUCCEEDED = "succeeded"
+    DEAD = "dead"  # Out of attempts, or failed permanently (dead-letter)
+
+
+class BackgroundJob(Base):
+    """
+    A unit of background work, claimed by workers with FOR UPDATE SKIP LOCKED.
+    
+    See app.services.job_queue for the claim, retry and dead-letter rules.
+    """
+    
+    __tablename__ = "background_jobs"
+    __table_args__ = (
+        # Claim query: next queued jobs that are due
+        Index(
+            "ix_background_jobs_claim", "run_at",
+            postgresql_where=text("status = 'queued'")
+        ),
+        # Recovery of jobs held by crashed workers
+        Index(
+            "ix_background_jobs_locked_at", "locked_at",
+            postgresql_where=text("status = 'running'")
+        ),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    kind = Column(String, nullable=False)  # Handler name, e.g. "resume.process"
+    payload = Column(JSON, nullable=False, default=dict)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True)
+    
+    status = Column(String, nullable=False, default=JobStatus.QUEUED)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())  # Not claimed before
+    
+    locked_by = Column(String, nullable=True)  # Worker id while running
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    result = Column(JSON, nullable=True)
+    
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,35 @@
+"""Content-addressed cache of AI results."""
+
+from sqlalchemy import Column, DateTime, Float, Index, Integer, JSON, String
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class ContentCacheEntry(Base):
+    """
+    The result of an AI call (resume parse, embedding) for one input.
+    
+    Keyed by the SHA-256 of the kind, model/prompt version and normalized
+    input text, so identical uploads and re-synced profiles reuse the result.
+    Entries not hit for ``CONTENT_CACHE_RETENTION_DAYS`` are evicted.
+    See app.services.content_cache.
+    """
+    
+    __tablename__ = "content_cache"
+    __table_args__ = (
+        Index("ix_content_cache_kind", "kind"),
+        Index("ix_content_cache_source_hash", "source_hash"),
+    )
+    
+    content_hash = Column(String(64), primary_key=True)
+    kind = Column(String, nullable=False)  # e.g. "resume_parse", "embedding"
+    version = Column(String, nullable=False)  # Model plus prompt hash
+    result = Column(JSON, nullable=False)
+    source_hash = Column(String(64), nullable=True)  # Document the input came from, to purge with its resume
+    
+    cost_usd = Column(Float, nullable=False, default=0.0)  # Estimated cost of the call this replaces
+    hit_count = Column(Integer, nullable=False, default=0)
+    
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_hit_at = Column(DateTime(timezone=True), nullable=True)
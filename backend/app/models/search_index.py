@@ -0,0 +1,75 @@
+"""Search index models (BM25 inverted index, normalized resume skills, skill counts)."""
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class BM25Document(Base):
+    """Per-resume document statistics for BM25 length normalization."""
+    
+    __tablename__ = "bm25_documents"
+    
+    resume_id = Column(UUID(as_uuid=True), ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    length = Column(Integer, nullable=False)  # Number of tokens in the document
+    indexed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class BM25Posting(Base):
+    """Inverted index posting: how often a term occurs in a resume."""
+    
+    __tablename__ = "bm25_postings"
+    __table_args__ = (
+        # Postings are always read per user and term
+        Index("ix_bm25_postings_user_term", "user_id", "term"),
+    )
+    
+    resume_id = Column(UUID(as_uuid=True), ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    term = Column(String, primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    tf = Column(Integer, nullable=False)  # Term frequency in the resume
+
+
+class ResumeSkill(Base):
+    """
+    One lower-cased skill of a resume, for indexed skill filtering.
+    
+    Rows are maintained by triggers on ``resumes`` (see the add_resume_skills
+    migration) whenever ``skills`` is written, and rebuilt by re-indexing.
+    """
+    
+    __tablename__ = "resume_skills"
+    __table_args__ = (
+        # Exact skill filters and per-user aggregation
+        Index("ix_resume_skills_user_skill", "user_id", "skill_norm"),
+    )
+    
+    resume_id = Column(UUID(as_uuid=True), ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    skill_norm = Column(String, primary_key=True)  # lower(trim(skill))
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    skill = Column(String, nullable=False)  # Skill as written on the resume
+    active = Column(Boolean, nullable=False, default=True)  # Resume is active; counted in user_skill_counts
+
+
+class UserSkillCount(Base):
+    """
+    Number of active resumes per normalized skill, for each user.
+    
+    Maintained incrementally by the ``resume_skills`` triggers (see the
+    add_user_skill_counts migration), so the tag cloud reads the top-k rows
+    instead of aggregating every resume.
+    """
+    
+    __tablename__ = "user_skill_counts"
+    __table_args__ = (
+        # Top-k skills for a user
+        Index("ix_user_skill_counts_user_count", "user_id", "resume_count"),
+    )
+    
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    skill_norm = Column(String, primary_key=True)  # lower(trim(skill))
+    skill = Column(String, nullable=False)  # Display form of the skill
+    resume_count = Column(Integer, nullable=False, default=0)  # Active resumes with the skill
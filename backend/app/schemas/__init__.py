@@ -9,6 +9,7 @@ from .resume import (
     ResumeStatistics,
     ResumeStatisticsItem,
 )
+from .background_job import BackgroundJob
 from .token import Token, TokenPayload
 from .user import User, UserCreate, UserInDB, UserInDBBase, UserUpdate
 
@@ -27,4 +28,5 @@ __all__ = [
     "ResumeUpdate",
     "ResumeStatistics",
     "ResumeStatisticsItem",
+    "BackgroundJob",
 ]
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""Background job schemas."""
+
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class BackgroundJob(BaseModel):
+    """Status of a background job."""
+    
+    id: UUID
+    kind: str
+    status: str
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    last_error: Optional[str] = None
+    result: Optional[Any] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
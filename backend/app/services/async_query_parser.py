@@ -49,20 +49,12 @@ class AsyncQueryParser(QueryParser):
         terms = self._extract_terms(query_lower)
         
         # Identify components
-        skills = []
         seniority = None
         roles = []
         remaining = []
         
-        # Process terms
-        processed = set()
-        
         # First pass: identify multi-word skills
-        for skill in sorted(self.known_skills, key=len, reverse=True):
-            if re.search(r'\b' + re.escape(skill) + r'\b', query_lower) and skill not in processed:
-                skills.append(skill)
-                for word in skill.split():
-                    processed.add(word)
+        skills, processed = self._match_known_skills(query_lower)
         
         # Second pass: process individual terms
         for term in terms:
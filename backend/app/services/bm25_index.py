@@ -0,0 +1,211 @@
+"""Persistent per-user BM25 inverted index for keyword search."""
+
+import heapq
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.resume import Resume
+from app.models.search_index import BM25Document, BM25Posting
+
+logger = logging.getLogger(__name__)
+
+
+class BM25Index:
+    """
+    BM25 inverted index stored in Postgres.
+    
+    Each resume contributes one ``bm25_documents`` row (its token count) and
+    one ``bm25_postings`` row per distinct term (its term frequency). Queries
+    read only the postings for the query terms, so document frequencies are
+    exact and scoring cost grows with the number of matching postings rather
+    than the size of the corpus.
+    """
+    
+    TOKEN_PATTERN = re.compile(r'\b\w+\b')
+    
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1  # Term frequency saturation parameter
+        self.b = b  # Length normalization parameter
+    
+    def tokenize(self, text: str) -> List[str]:
+        """Split text into lower-cased word tokens."""
+        return self.TOKEN_PATTERN.findall(text.lower())
+    
+    @staticmethod
+    def document_text(resume) -> str:
+        """Combine the searchable fields of a resume or resume row."""
+        skills_text = " ".join(resume.skills) if resume.skills else ""
+        return " ".join(filter(None, [
+            resume.raw_text or "",
+            resume.summary or "",
+            skills_text,
+            resume.current_title or ""
+        ]))
+    
+    def document_terms(self, resume) -> Tuple[Counter, int]:
+        """Return (term frequencies, document length) for a resume."""
+        tokens = self.tokenize(self.document_text(resume))
+        return Counter(tokens), len(tokens)
+    
+    async def index_document(self, db: AsyncSession, resume):
+        """Replace the index entries for a single resume.
+        
+        Does not commit; the caller owns the transaction.
+        """
+        await self.index_documents(db, [resume])
+    
+    async def index_documents(self, db: AsyncSession, resumes: Sequence[Any]):
+        """Replace the index entries for a batch of resumes or resume rows.
+        
+        Rows need ``id``, ``user_id``, ``raw_text``, ``summary``, ``skills``
+        and ``current_title``. Does not commit; the caller owns the transaction.
+        """
+        if not resumes:
+            return
+        
+        resume_ids = [resume.id for resume in resumes]
+        documents = []
+        postings = []
+        for resume in resumes:
+            term_counts, length = self.document_terms(resume)
+            documents.append({
+                "resume_id": resume.id,
+                "user_id": resume.user_id,
+                "length": length
+            })
+            postings.extend(
+                {"resume_id": resume.id, "user_id": resume.user_id, "term": term, "tf": tf}
+                for term, tf in term_counts.items()
+            )
+        
+        await db.execute(delete(BM25Posting).where(BM25Posting.resume_id.in_(resume_ids)))
+        await db.execute(delete(BM25Document).where(BM25Document.resume_id.in_(resume_ids)))
+        await db.execute(insert(BM25Document), documents)
+        if postings:
+            await db.execute(insert(BM25Posting), postings)
+    
+    async def remove_document(self, db: AsyncSession, resume_id):
+        """Drop a resume from the index. Does not commit."""
+        await db.execute(delete(BM25Posting).where(BM25Posting.resume_id == resume_id))
+        await db.execute(delete(BM25Document).where(BM25Document.resume_id == resume_id))
+    
+    async def get_collection_stats(self, db: AsyncSession, user_id: str) -> Tuple[int, float]:
+        """Return (document count, average document length) for a user."""
+        result = await db.execute(
+            select(func.count(BM25Document.resume_id), func.avg(BM25Document.length))
+            .where(BM25Document.user_id == user_id)
+        )
+        doc_count, avg_length = result.one()
+        return doc_count or 0, float(avg_length or 0.0)
+    
+    async def get_coverage(self, db: AsyncSession, user_id: str) -> Tuple[int, int]:
+        """Return (active resumes, indexed active resumes) for a user."""
+        result = await db.execute(
+            select(func.count(Resume.id), func.count(BM25Document.resume_id))
+            .select_from(Resume)
+            .outerjoin(BM25Document, BM25Document.resume_id == Resume.id)
+            .where(Resume.user_id == user_id, Resume.status == 'active')
+        )
+        active_count, indexed_count = result.one()
+        return active_count or 0, indexed_count or 0
+    
+    async def search(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        terms: Iterable[str],
+        limit: int,
+        k1: Optional[float] = None,
+        b: Optional[float] = None
+    ) -> Optional[List[Tuple[str, float]]]:
+        """
+        Score a user's indexed resumes against query terms.
+        
+        Args:
+            db: Database session
+            user_id: Owner of the resumes to search
+            terms: Query terms; multi-word terms are split into tokens
+            limit: Maximum results to return
+            k1: Override for the term frequency saturation parameter
+            b: Override for the length normalization parameter
+        
+        Returns:
+            (resume_id, score) tuples sorted by score, or None if some of the
+            user's active resumes are not indexed yet
+        """
+        # Resumes missing from the index would silently drop out of the results
+        active_count, indexed_count = await self.get_coverage(db, user_id)
+        if indexed_count == 0 or indexed_count < active_count:
+            return None
+        
+        doc_count, avg_length = await self.get_collection_stats(db, user_id)
+        
+        query_terms = {token for term in terms for token in self.tokenize(term)}
+        if not query_terms:
+            return []
+        
+        result = await db.execute(
+            select(BM25Posting.term, BM25Posting.resume_id, BM25Posting.tf, BM25Document.length)
+            .join(BM25Document, BM25Document.resume_id == BM25Posting.resume_id)
+            .where(
+                BM25Posting.user_id == user_id,
+                BM25Posting.term.in_(query_terms)
+            )
+        )
+        
+        postings = defaultdict(list)
+        for term, resume_id, tf, length in result.all():
+            postings[term].append((str(resume_id), tf, length))
+        
+        scores = self.score_postings(
+            postings, doc_count, avg_length,
+            self.k1 if k1 is None else k1,
+            self.b if b is None else b
+        )
+        return heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+    
+    @staticmethod
+    def idf(doc_count: int, doc_freq: int) -> float:
+        """Inverse document frequency, kept positive for very common terms."""
+        return math.log(1 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+    
+    def score_postings(
+        self,
+        postings: Dict[str, List[Tuple[Any, int, int]]],
+        doc_count: int,
+        avg_length: float,
+        k1: float,
+        b: float
+    ) -> Dict[Any, float]:
+        """
+        Accumulate BM25 scores by walking each term's postings list.
+        
+        score = Σ IDF(term) * (tf * (k1 + 1)) / (tf + k1 * (1 - b + b * dl/avgdl))
+        
+        Args:
+            postings: term -> [(doc_key, tf, doc_length)]
+            doc_count: Number of documents in the collection (N)
+            avg_length: Average document length (avgdl)
+        
+        Returns:
+            doc_key -> BM25 score
+        """
+        avg_length = avg_length or 1.0
+        scores = defaultdict(float)
+        for term_postings in postings.values():
+            idf = self.idf(doc_count, len(term_postings))
+            for doc_key, tf, length in term_postings:
+                norm = k1 * (1 - b + b * length / avg_length)
+                scores[doc_key] += idf * (tf * (k1 + 1)) / (tf + norm)
+        return scores
+
+
+# Singleton instance
+bm25_index = BM25Index()
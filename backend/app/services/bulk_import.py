@@ -2,8 +2,9 @@
 
 import asyncio
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from uuid import UUID
 import random
 # import pandas as pd  # TODO: Add pandas to Docker image
@@ -12,21 +13,40 @@ import json
 import io
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, func, update
 
+from app.core.redis import RedisKeys, get_redis_client
+from app.db.session import async_session_maker
 from app.models.user import User
 from app.models.resume import Resume
-from app.models.import_queue import ImportQueueItem, ImportHistory
+from app.models.import_queue import ImportQueueItem, ImportHistory, ImportStatus
 from app.services.linkedin_parser import LinkedInParser
 from app.services.vector_search import vector_search
-from app.services.reindex_service import ReindexService
+from app.services.reindex_service import reindex_service
+from app.services.search_cache import search_result_cache
+from app.services.skill_index import skill_index
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
 class RateLimiter:
-    """Rate limiter for LinkedIn imports to ensure compliance."""
+    """
+    Rate limiter for LinkedIn imports to ensure compliance.
+    
+    Imports are counted in Redis with a sliding window counter per limit:
+    one counter per fixed window, with the previous window's count weighted
+    by how much of it still overlaps the sliding window. Checking all three
+    limits is one MGET instead of three COUNT queries over import_history.
+    Without Redis the limits fall back to counting import_history.
+    """
+    
+    # Limit name -> window length in seconds
+    WINDOWS = {
+        'profiles_per_minute': 60,
+        'profiles_per_hour': 3600,
+        'profiles_per_day': 86400
+    }
     
     def __init__(self):
         self.limits = {
@@ -37,32 +57,71 @@ class RateLimiter:
             'max_delay_seconds': 6
         }
     
-    async def check_rate_limit(self, db: AsyncSession, user_id: UUID) -> bool:
+    def _keys(self, user_id: UUID, window: int, now: float) -> Tuple[str, str]:
+        """Keys of the current and previous fixed window."""
+        bucket = int(now // window)
+        return (
+            RedisKeys.IMPORT_RATE.format(user_id=user_id, window=window, bucket=bucket),
+            RedisKeys.IMPORT_RATE.format(user_id=user_id, window=window, bucket=bucket - 1)
+        )
+    
+    async def get_counts(self, db: Optional[AsyncSession], user_id: UUID) -> Dict[str, float]:
+        """Estimated imports in each sliding window, keyed by limit name."""
+        redis = await get_redis_client()
+        if not redis:
+            return await self._get_history_counts(db, user_id)
+        
+        now = time.time()
+        keys = []
+        for window in self.WINDOWS.values():
+            keys.extend(self._keys(user_id, window, now))
+        values = await redis.mget(keys)
+        
+        counts = {}
+        for i, (name, window) in enumerate(self.WINDOWS.items()):
+            current, previous = (int(value or 0) for value in values[2 * i:2 * i + 2])
+            overlap = 1 - (now % window) / window
+            counts[name] = current + previous * overlap
+        return counts
+    
+    async def remaining(self, db: Optional[AsyncSession], user_id: UUID) -> int:
+        """Imports the user may make now without exceeding any limit."""
+        counts = await self.get_counts(db, user_id)
+        remaining = min(int(self.limits[name] - counts[name]) for name in self.WINDOWS)
+        if remaining <= 0:
+            exceeded = [name for name in self.WINDOWS if counts[name] >= self.limits[name]]
+            logger.warning(f"User {user_id} hit rate limit: {', '.join(exceeded)}")
+        return max(remaining, 0)
+    
+    async def check_rate_limit(self, db: Optional[AsyncSession], user_id: UUID) -> bool:
         """Check if user can import more profiles."""
+        return await self.remaining(db, user_id) > 0
+    
+    async def record_import(self, user_id: UUID):
+        """Count one completed import against the user's limits."""
+        redis = await get_redis_client()
+        if not redis:
+            return  # import_history is counted instead
+        
+        now = time.time()
+        pipe = redis.pipeline(transaction=False)
+        for window in self.WINDOWS.values():
+            key, _ = self._keys(user_id, window, now)
+            pipe.incr(key)
+            # Kept while it is the current or the previous window
+            pipe.expire(key, 2 * window)
+        await pipe.execute()
+    
+    async def _get_history_counts(self, db: Optional[AsyncSession], user_id: UUID) -> Dict[str, float]:
+        """Exact counts from import_history, when Redis is unavailable."""
         now = datetime.utcnow()
-        
-        # Check minute limit
-        minute_ago = now - timedelta(minutes=1)
-        minute_count = await self._get_import_count(db, user_id, minute_ago)
-        if minute_count >= self.limits['profiles_per_minute']:
-            logger.warning(f"User {user_id} hit minute rate limit")
-            return False
-        
-        # Check hourly limit
-        hour_ago = now - timedelta(hours=1)
-        hourly_count = await self._get_import_count(db, user_id, hour_ago)
-        if hourly_count >= self.limits['profiles_per_hour']:
-            logger.warning(f"User {user_id} hit hourly rate limit")
-            return False
-        
-        # Check daily limit
-        day_ago = now - timedelta(days=1)
-        daily_count = await self._get_import_count(db, user_id, day_ago)
-        if daily_count >= self.limits['profiles_per_day']:
-            logger.warning(f"User {user_id} hit daily rate limit")
-            return False
-        
-        return True
+        if db is None:
+            async with async_session_maker() as session:
+                return await self._get_history_counts(session, user_id)
+        return {
+            name: await self._get_import_count(db, user_id, now - timedelta(seconds=window))
+            for name, window in self.WINDOWS.items()
+        }
     
     async def _get_import_count(self, db: AsyncSession, user_id: UUID, since: datetime) -> int:
         """Get import count since a specific time."""
@@ -187,13 +246,32 @@ class LinkedInExportProcessor:
 
 
 class BulkImportService:
-    """Service for managing bulk imports with compliance."""
+    """
+    Service for managing bulk imports with compliance.
     
-    def __init__(self):
+    Each user's queue is worked by one task at a time, pausing a human-like
+    delay between profiles, while up to ``BULK_IMPORT_MAX_ACTIVE_USERS``
+    users' queues progress in parallel. Tasks use their own database
+    sessions and claim items in batches with FOR UPDATE SKIP LOCKED, so
+    several processes can share the queue; a per-user advisory lock keeps a
+    user's queue (and its pacing) with one claimer at a time. Items claimed
+    by a lost worker are pending again after ``BULK_IMPORT_VISIBILITY_TIMEOUT``.
+    """
+    
+    def __init__(self, session_factory=None):
         self.rate_limiter = RateLimiter()
         self.export_processor = LinkedInExportProcessor()
-        self.reindex_service = ReindexService()
-        self.processing_tasks = {}  # Track active processing tasks per user
+        self.reindex_service = reindex_service
+        self.processing_tasks: Dict[UUID, asyncio.Task] = {}  # Track active processing tasks per user
+        self.claim_batch = settings.BULK_IMPORT_CLAIM_BATCH
+        self.visibility_timeout = settings.BULK_IMPORT_VISIBILITY_TIMEOUT
+        self._session_factory = session_factory
+        self._user_slots: Optional[asyncio.Semaphore] = None
+    
+    def _session(self):
+        if self._session_factory is None:
+            self._session_factory = async_session_maker
+        return self._session_factory()
     
     async def add_to_queue(
         self,
@@ -260,8 +338,8 @@ class BulkImportService:
                 'message': 'Queue processing already in progress'
             }
         
-        # Start processing in background
-        task = asyncio.create_task(self._process_queue_async(db, user_id, max_items))
+        # Start processing in background; the task opens its own sessions
+        task = asyncio.create_task(self._process_queue_async(user_id, max_items))
         self.processing_tasks[user_id] = task
         
         return {
@@ -271,91 +349,198 @@ class BulkImportService:
     
     async def _process_queue_async(
         self,
-        db: AsyncSession,
         user_id: UUID,
         max_items: Optional[int] = None
     ):
-        """Async queue processing with compliance delays."""
+        """Work through a user's queue in claimed batches with compliance delays."""
+        if self._user_slots is None:
+            self._user_slots = asyncio.Semaphore(settings.BULK_IMPORT_MAX_ACTIVE_USERS)
+        
         processed = 0
+        claimed: List[ImportQueueItem] = []
         
         try:
-            while True:
-                # Check rate limit
-                if not await self.rate_limiter.check_rate_limit(db, user_id):
-                    logger.info(f"Rate limit reached for user {user_id}")
-                    break
-                
-                # Get next pending item
-                stmt = select(ImportQueueItem).where(
-                    and_(
-                        ImportQueueItem.user_id == user_id,
-                        ImportQueueItem.status == 'pending'
-                    )
-                ).order_by(ImportQueueItem.created_at).limit(1)
-                
-                result = await db.execute(stmt)
-                queue_item = result.scalar_one_or_none()
-                
-                if not queue_item:
-                    logger.info(f"No more items in queue for user {user_id}")
-                    break
-                
-                # Process the item
-                try:
-                    queue_item.status = 'processing'
-                    queue_item.started_at = datetime.utcnow()
-                    await db.commit()
-                    
-                    # Import the profile
-                    resume = await self._import_profile(db, user_id, queue_item.profile_data)
+            async with self._user_slots:
+                while True:
+                    # One rate limit check per batch: claim no more than the limits allow
+                    allowance = await self.rate_limiter.remaining(None, user_id)
+                    if allowance <= 0:
+                        logger.info(f"Rate limit reached for user {user_id}")
+                        break
                     
-                    # Update queue item
-                    queue_item.status = 'completed'
-                    queue_item.completed_at = datetime.utcnow()
-                    queue_item.resume_id = resume.id
-                    
-                    # Create import history record
-                    history = ImportHistory(
-                        user_id=user_id,
-                        resume_id=resume.id,
-                        source=queue_item.source,
-                        status='completed',
-                        imported_at=datetime.utcnow()
-                    )
-                    db.add(history)
+                    limit = min(self.claim_batch, allowance)
+                    if max_items:
+                        limit = min(limit, max_items - processed)
+                    claimed = await self._claim_batch(user_id, limit)
+                    if not claimed:
+                        logger.info(f"No more items in queue for user {user_id}")
+                        break
                     
-                    await db.commit()
-                    processed += 1
+                    imported = []
+                    while claimed:
+                        if processed or imported:
+                            # Human-like delay
+                            delay = self.rate_limiter.get_human_delay()
+                            logger.info(f"Waiting {delay:.1f} seconds before next import")
+                            await asyncio.sleep(delay)
+                        
+                        resume_id = await self._import_item(user_id, claimed[0])
+                        claimed.pop(0)
+                        if resume_id:
+                            imported.append(resume_id)
+                            await self.rate_limiter.record_import(user_id)
                     
-                    # Re-index for search
-                    await self.reindex_service.reindex_resume(db, resume)
+                    processed += len(imported)
+                    if imported:
+                        await self._index_imported(user_id, imported)
                     
-                except Exception as e:
-                    logger.error(f"Error processing queue item {queue_item.id}: {e}")
-                    queue_item.status = 'failed'
-                    queue_item.error_message = str(e)
-                    queue_item.attempts += 1
-                    await db.commit()
-                
-                # Human-like delay
-                delay = self.rate_limiter.get_human_delay()
-                logger.info(f"Waiting {delay:.1f} seconds before next import")
-                await asyncio.sleep(delay)
-                
-                # Check if we've reached max items
-                if max_items and processed >= max_items:
-                    break
+                    # Check if we've reached max items
+                    if max_items and processed >= max_items:
+                        break
                 
         except Exception as e:
             logger.error(f"Error in queue processing for user {user_id}: {e}")
         
         finally:
+            # Hand back items claimed but not attempted
+            if claimed:
+                await self._release(claimed)
             # Remove from active tasks
-            if user_id in self.processing_tasks:
+            if self.processing_tasks.get(user_id) is asyncio.current_task():
                 del self.processing_tasks[user_id]
         
         logger.info(f"Queue processing completed for user {user_id}. Processed: {processed}")
     
+    async def _claim_batch(self, user_id: UUID, limit: int) -> List[ImportQueueItem]:
+        """Mark up to ``limit`` of the user's pending items as processing.
+        
+        Returns nothing while another worker holds the user's queue.
+        """
+        due = (
+            select(ImportQueueItem.id)
+            .where(
+                ImportQueueItem.user_id == user_id,
+                ImportQueueItem.status == ImportStatus.PENDING
+            )
+            .order_by(ImportQueueItem.priority.desc(), ImportQueueItem.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        now = datetime.utcnow()
+        
+        async with self._session() as db:
+            # One claimer per user across processes, so pacing and limits hold
+            locked = (await db.execute(
+                select(func.pg_try_advisory_xact_lock(func.hashtext(f"import_queue:{user_id}")))
+            )).scalar()
+            if not locked:
+                return []
+            
+            # Items claimed by a lost worker are pending again
+            await db.execute(
+                update(ImportQueueItem)
+                .where(
+                    ImportQueueItem.user_id == user_id,
+                    ImportQueueItem.status == ImportStatus.PROCESSING,
+                    ImportQueueItem.started_at < now - timedelta(seconds=self.visibility_timeout)
+                )
+                .values(status=ImportStatus.PENDING)
+            )
+            in_flight = (await db.execute(
+                select(func.count(ImportQueueItem.id)).where(
+                    ImportQueueItem.user_id == user_id,
+                    ImportQueueItem.status == ImportStatus.PROCESSING
+                )
+            )).scalar()
+            if in_flight:
+                await db.commit()
+                return []
+            
+            stmt = (
+                update(ImportQueueItem)
+                .where(ImportQueueItem.id.in_(due.scalar_subquery()))
+                .values(
+                    status=ImportStatus.PROCESSING,
+                    started_at=now,
+                    attempts=func.coalesce(ImportQueueItem.attempts, 0) + 1
+                )
+                .returning(ImportQueueItem)
+                .execution_options(synchronize_session=False)
+            )
+            items = (await db.execute(stmt)).scalars().all()
+            await db.commit()
+        
+        # RETURNING does not keep the queue order
+        return sorted(items, key=lambda item: (-(item.priority or 0), item.created_at))
+    
+    async def _import_item(self, user_id: UUID, queue_item: ImportQueueItem) -> Optional[UUID]:
+        """Import one claimed item and record the outcome in a single commit."""
+        async with self._session() as db:
+            try:
+                # Import the profile
+                resume = await self._import_profile(db, user_id, queue_item.profile_data)
+                
+                # Update queue item
+                await db.execute(
+                    update(ImportQueueItem)
+                    .where(ImportQueueItem.id == queue_item.id)
+                    .values(
+                        status=ImportStatus.COMPLETED,
+                        completed_at=datetime.utcnow(),
+                        resume_id=resume.id,
+                        error_message=None
+                    )
+                )
+                
+                # Create import history record
+                db.add(ImportHistory(
+                    user_id=user_id,
+                    resume_id=resume.id,
+                    source=queue_item.source,
+                    status='completed',
+                    imported_at=datetime.utcnow()
+                ))
+                
+                await db.commit()
+                return resume.id
+                
+            except Exception as e:
+                logger.error(f"Error processing queue item {queue_item.id}: {e}")
+                await db.rollback()
+                await db.execute(
+                    update(ImportQueueItem)
+                    .where(ImportQueueItem.id == queue_item.id)
+                    .values(status=ImportStatus.FAILED, error_message=str(e))
+                )
+                await db.commit()
+                return None
+    
+    async def _release(self, items: List[ImportQueueItem]):
+        """Return claimed items to the queue."""
+        try:
+            async with self._session() as db:
+                await db.execute(
+                    update(ImportQueueItem)
+                    .where(
+                        ImportQueueItem.id.in_([item.id for item in items]),
+                        ImportQueueItem.status == ImportStatus.PROCESSING
+                    )
+                    .values(status=ImportStatus.PENDING)
+                )
+                await db.commit()
+        except Exception as e:
+            # Recovered after the visibility timeout
+            logger.error(f"Error releasing {len(items)} claimed import items: {e}")
+    
+    async def _index_imported(self, user_id: UUID, resume_ids: List[UUID]):
+        """Re-index a batch of imported resumes for search as one background job."""
+        await search_result_cache.bump_version(user_id)
+        await skill_index.invalidate_popular_skills(user_id)
+        try:
+            await self.reindex_service.enqueue_index_batch(resume_ids, user_id=user_id)
+        except Exception as e:
+            logger.error(f"Failed to queue indexing of {len(resume_ids)} imported resumes: {e}")
+    
     async def _import_profile(
         self,
         db: AsyncSession,
@@ -415,20 +600,18 @@ class BulkImportService:
         recent_result = await db.execute(recent_stmt)
         recent_items = recent_result.scalars().all()
         
-        # Check if processing
-        is_processing = user_id in self.processing_tasks and not self.processing_tasks[user_id].done()
+        # Check if processing, here or in another process
+        is_processing = (
+            user_id in self.processing_tasks and not self.processing_tasks[user_id].done()
+        ) or status_counts.get(ImportStatus.PROCESSING, 0) > 0
         
-        # Get rate limit status
-        rate_limit_ok = await self.rate_limiter.check_rate_limit(db, user_id)
-        
-        # Get import counts for rate limits
-        now = datetime.utcnow()
-        hourly_count = await self.rate_limiter._get_import_count(
-            db, user_id, now - timedelta(hours=1)
-        )
-        daily_count = await self.rate_limiter._get_import_count(
-            db, user_id, now - timedelta(days=1)
+        # Get rate limit status and import counts in one lookup
+        counts = await self.rate_limiter.get_counts(db, user_id)
+        rate_limit_ok = all(
+            counts[name] < self.rate_limiter.limits[name] for name in RateLimiter.WINDOWS
         )
+        hourly_count = int(counts['profiles_per_hour'])
+        daily_count = int(counts['profiles_per_day'])
         
         return {
             'status_counts': {
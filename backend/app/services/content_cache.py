@@ -0,0 +1,462 @@
+"""Content-addressed cache of AI results (resume parsing, embeddings)."""
+
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.core.redis import RedisKeys, cache_manager
+from app.models.content_cache import ContentCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+class ContentKind:
+    """Kinds of cached AI results."""
+    
+    RESUME_PARSE = "resume_parse"
+    LINKEDIN_PARSE = "linkedin_parse"
+    EMBEDDING = "embedding"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate token count (rough estimation: 1 token ≈ 4 chars)."""
+    return len(text) // 4 + 1
+
+
+def chat_cost(prompt: str, result: Any) -> float:
+    """Estimated USD cost of a chat completion from its prompt and JSON result."""
+    return (
+        estimate_tokens(prompt) * settings.OPENAI_CHAT_INPUT_COST_PER_1K
+        + estimate_tokens(json.dumps(result)) * settings.OPENAI_CHAT_OUTPUT_COST_PER_1K
+    ) / 1000
+
+
+def embedding_cost(text: str) -> float:
+    """Estimated USD cost of embedding a text."""
+    return estimate_tokens(text) * settings.OPENAI_EMBEDDING_COST_PER_1K / 1000
+
+
+class ContentStore:
+    """Durable tier of the content cache."""
+    
+    async def get(self, content_hash: str, used_since: datetime) -> Optional[Tuple[Any, float, Optional[str]]]:
+        """The cached result, its cost and source hash if used since ``used_since``, counting a hit."""
+        raise NotImplementedError
+    
+    async def put(
+        self,
+        content_hash: str,
+        kind: str,
+        version: str,
+        result: Any,
+        cost_usd: float,
+        source_hash: Optional[str] = None
+    ):
+        raise NotImplementedError
+    
+    async def record_hits(self, hits: Dict[str, int]):
+        """Count hits served by the Redis tier, per content hash."""
+        raise NotImplementedError
+    
+    async def evict(self, unused_since: datetime) -> int:
+        """Delete entries not used since ``unused_since``; returns how many."""
+        raise NotImplementedError
+    
+    async def purge_source(self, source_hash: str) -> int:
+        """Delete the entries derived from one document; returns how many."""
+        raise NotImplementedError
+    
+    async def get_totals(self) -> Dict[str, Dict[str, Any]]:
+        """Entries, hits and dollars saved per kind, since the entries were created."""
+        raise NotImplementedError
+
+
+class PostgresContentStore(ContentStore):
+    """Results in the ``content_cache`` table, shared by all processes and deploys."""
+    
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory
+    
+    def _session(self):
+        if self._session_factory is None:
+            from app.db.session import async_session_maker
+            self._session_factory = async_session_maker
+        return self._session_factory()
+    
+    async def get(self, content_hash: str, used_since: datetime) -> Optional[Tuple[Any, float, Optional[str]]]:
+        stmt = (
+            update(ContentCacheEntry)
+            .where(
+                ContentCacheEntry.content_hash == content_hash,
+                func.coalesce(ContentCacheEntry.last_hit_at, ContentCacheEntry.created_at) >= used_since
+            )
+            .values(hit_count=ContentCacheEntry.hit_count + 1, last_hit_at=func.now())
+            .returning(ContentCacheEntry.result, ContentCacheEntry.cost_usd, ContentCacheEntry.source_hash)
+        )
+        async with self._session() as db:
+            row = (await db.execute(stmt)).first()
+            await db.commit()
+        return (row.result, row.cost_usd, row.source_hash) if row else None
+    
+    async def put(
+        self,
+        content_hash: str,
+        kind: str,
+        version: str,
+        result: Any,
+        cost_usd: float,
+        source_hash: Optional[str] = None
+    ):
+        # Concurrent misses for the same content both compute; the first insert wins
+        stmt = insert(ContentCacheEntry).values(
+            content_hash=content_hash,
+            kind=kind,
+            version=version,
+            result=result,
+            source_hash=source_hash,
+            cost_usd=cost_usd,
+            hit_count=0
+        ).on_conflict_do_nothing(index_elements=["content_hash"])
+        async with self._session() as db:
+            await db.execute(stmt)
+            await db.commit()
+    
+    async def record_hits(self, hits: Dict[str, int]):
+        # One executemany for the batch; entries evicted meanwhile match no row
+        table = ContentCacheEntry.__table__
+        stmt = (
+            table.update()
+            .where(table.c.content_hash == bindparam("b_content_hash"))
+            .values(hit_count=table.c.hit_count + bindparam("b_hits"), last_hit_at=func.now())
+        )
+        params = [{"b_content_hash": content_hash, "b_hits": count} for content_hash, count in hits.items()]
+        async with self._session() as db:
+            await db.execute(stmt, params)
+            await db.commit()
+    
+    async def evict(self, unused_since: datetime) -> int:
+        stmt = delete(ContentCacheEntry).where(
+            func.coalesce(ContentCacheEntry.last_hit_at, ContentCacheEntry.created_at) < unused_since
+        )
+        async with self._session() as db:
+            result = await db.execute(stmt)
+            await db.commit()
+        return result.rowcount
+    
+    async def purge_source(self, source_hash: str) -> int:
+        stmt = delete(ContentCacheEntry).where(ContentCacheEntry.source_hash == source_hash)
+        async with self._session() as db:
+            result = await db.execute(stmt)
+            await db.commit()
+        return result.rowcount
+    
+    async def get_totals(self) -> Dict[str, Dict[str, Any]]:
+        stmt = select(
+            ContentCacheEntry.kind,
+            func.count(),
+            func.coalesce(func.sum(ContentCacheEntry.hit_count), 0),
+            func.coalesce(func.sum(ContentCacheEntry.hit_count * ContentCacheEntry.cost_usd), 0.0)
+        ).group_by(ContentCacheEntry.kind)
+        async with self._session() as db:
+            rows = (await db.execute(stmt)).all()
+        return {
+            kind: {"entries": entries, "hits": int(hits), "saved_usd": float(saved)}
+            for kind, entries, hits, saved in rows
+        }
+
+
+class InMemoryContentStore(ContentStore):
+    """Process-local stand-in for the Postgres store, for tests and development."""
+    
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+    
+    async def get(self, content_hash: str, used_since: datetime) -> Optional[Tuple[Any, float, Optional[str]]]:
+        entry = self._entries.get(content_hash)
+        if not entry or self._last_used(entry) < used_since:
+            return None
+        await self.record_hits({content_hash: 1})
+        return json.loads(entry["result"]), entry["cost_usd"], entry["source_hash"]
+    
+    async def put(
+        self,
+        content_hash: str,
+        kind: str,
+        version: str,
+        result: Any,
+        cost_usd: float,
+        source_hash: Optional[str] = None
+    ):
+        self._entries.setdefault(content_hash, {
+            "kind": kind,
+            "version": version,
+            "result": json.dumps(result),
+            "source_hash": source_hash,
+            "cost_usd": cost_usd,
+            "hit_count": 0,
+            "created_at": datetime.now(timezone.utc),
+            "last_hit_at": None
+        })
+    
+    async def record_hits(self, hits: Dict[str, int]):
+        for content_hash, count in hits.items():
+            entry = self._entries.get(content_hash)
+            if entry:
+                entry["hit_count"] += count
+                entry["last_hit_at"] = datetime.now(timezone.utc)
+    
+    async def evict(self, unused_since: datetime) -> int:
+        expired = [h for h, entry in self._entries.items() if self._last_used(entry) < unused_since]
+        for content_hash in expired:
+            del self._entries[content_hash]
+        return len(expired)
+    
+    async def purge_source(self, source_hash: str) -> int:
+        purged = [h for h, entry in self._entries.items() if entry["source_hash"] == source_hash]
+        for content_hash in purged:
+            del self._entries[content_hash]
+        return len(purged)
+    
+    @staticmethod
+    def _last_used(entry: Dict[str, Any]) -> datetime:
+        return entry["last_hit_at"] or entry["created_at"]
+    
+    async def get_totals(self) -> Dict[str, Dict[str, Any]]:
+        totals: Dict[str, Dict[str, Any]] = {}
+        for entry in self._entries.values():
+            kind = totals.setdefault(entry["kind"], {"entries": 0, "hits": 0, "saved_usd": 0.0})
+            kind["entries"] += 1
+            kind["hits"] += entry["hit_count"]
+            kind["saved_usd"] += entry["hit_count"] * entry["cost_usd"]
+        return totals
+
+
+class ContentCache:
+    """
+    Cache AI results by the content they were computed from.
+    
+    The key is the SHA-256 of the result kind, a version (model plus a hash
+    of the prompt, so editing a prompt or switching models starts afresh)
+    and the whitespace-normalized input text. The same PDF uploaded twice
+    or a LinkedIn profile synced again hits the cache instead of OpenAI.
+    
+    Results live in Redis for ``CONTENT_CACHE_TTL`` and in Postgres until
+    unused for ``CONTENT_CACHE_RETENTION_DAYS``. Entries computed from a
+    resume's text are tagged with its ``source`` and purged with the
+    resume (``purge_source``). Only successful results are cached; a
+    compute function returns None to signal failure.
+    
+    Hits served by Redis are counted in memory and written to Postgres in
+    batches (``flush_hits``), so a hot entry costs no write per hit.
+    """
+    
+    def __init__(self, store: Optional[ContentStore] = None):
+        self.store = store or PostgresContentStore()
+        self.ttl = settings.CONTENT_CACHE_TTL
+        self.retention = timedelta(days=settings.CONTENT_CACHE_RETENTION_DAYS)
+        self.evict_interval = settings.CONTENT_CACHE_EVICT_INTERVAL
+        self.hit_flush_size = settings.CONTENT_CACHE_HIT_FLUSH_SIZE
+        self.hit_flush_interval = settings.CONTENT_CACHE_HIT_FLUSH_INTERVAL
+        self._counters: Dict[str, Dict[str, Any]] = defaultdict(
+            lambda: {"redis_hits": 0, "db_hits": 0, "misses": 0, "saved_usd": 0.0}
+        )
+        self._pending_hits: Dict[str, int] = defaultdict(int)
+        self._last_flush = time.monotonic()
+        self._last_eviction: Optional[float] = None
+    
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Collapse whitespace so re-extracted copies of a document share an entry."""
+        return re.sub(r"\s+", " ", text).strip()
+    
+    @staticmethod
+    def version(model: str, *prompts: str) -> str:
+        """Version of a result: the model plus a hash of the prompts that produced it."""
+        if not prompts:
+            return model
+        prompt_hash = hashlib.sha256("\0".join(prompts).encode()).hexdigest()[:12]
+        return f"{model}:{prompt_hash}"
+    
+    @classmethod
+    def content_hash(cls, kind: str, version: str, text: str) -> str:
+        content = f"{kind}\0{version}\0{cls.normalize_text(text)}"
+        return hashlib.sha256(content.encode()).hexdigest()
+    
+    @classmethod
+    def source_hash(cls, source: Optional[str]) -> Optional[str]:
+        """Hash of the document results were derived from; None for blank text."""
+        normalized = cls.normalize_text(source or "")
+        if not normalized:
+            return None
+        return hashlib.sha256(normalized.encode()).hexdigest()
+    
+    async def get_or_compute(
+        self,
+        kind: str,
+        version: str,
+        text: str,
+        compute_func: Callable[[], Awaitable[Any]],
+        cost: Union[float, Callable[[Any], float]] = 0.0,
+        source: Optional[str] = None
+    ) -> Any:
+        """
+        Return the cached result for this content, or compute and cache it.
+        
+        Args:
+            kind: One of ``ContentKind``
+            version: See ``version``
+            text: The input the result is computed from
+            compute_func: Makes the AI call; returns None on failure
+            cost: Estimated USD cost of the call, or a function of its result
+            source: The document ``text`` comes from (e.g. a resume's raw text),
+                so the entry is purged when that document is deleted
+        """
+        content_hash = self.content_hash(kind, version, text)
+        counters = self._counters[kind]
+        
+        cached = await self._lookup(content_hash, counters)
+        if cached is not None:
+            return cached
+        
+        counters["misses"] += 1
+        result = await compute_func()
+        if result is None:
+            return None
+        
+        cost_usd = cost(result) if callable(cost) else cost
+        source_hash = self.source_hash(source)
+        await self._set_redis(content_hash, result, cost_usd, source_hash)
+        try:
+            await self.store.put(content_hash, kind, version, result, cost_usd, source_hash)
+        except Exception as e:
+            logger.error(f"Content cache write error for {kind} {content_hash[:12]}: {e}")
+        try:
+            await self._evict_expired()
+        except Exception as e:
+            logger.error(f"Content cache eviction error: {e}")
+        return result
+    
+    async def purge_source(self, source: Optional[str]) -> int:
+        """Delete cached results derived from a document, e.g. a deleted resume's text."""
+        source_hash = self.source_hash(source)
+        if not source_hash:
+            return 0
+        await cache_manager.invalidate_tags(RedisKeys.TAG_CONTENT_SOURCE.format(source_hash=source_hash))
+        purged = await self.store.purge_source(source_hash)
+        logger.info(f"Purged {purged} content cache entries for source {source_hash[:12]}")
+        return purged
+    
+    async def flush_hits(self):
+        """Write the Redis hits counted since the last flush to the store."""
+        hits, self._pending_hits = self._pending_hits, defaultdict(int)
+        self._last_flush = time.monotonic()
+        if not hits:
+            return
+        try:
+            await self.store.record_hits(hits)
+        except Exception as e:
+            # Hit counts only feed the report and retention; drop the batch
+            logger.error(f"Content cache hit count error for {len(hits)} entries: {e}")
+    
+    async def _count_hit(self, content_hash: str):
+        self._pending_hits[content_hash] += 1
+        if (
+            sum(self._pending_hits.values()) >= self.hit_flush_size
+            or time.monotonic() - self._last_flush >= self.hit_flush_interval
+        ):
+            await self.flush_hits()
+    
+    async def _evict_expired(self):
+        """Drop entries past retention, at most every ``evict_interval`` seconds per process."""
+        now = time.monotonic()
+        if self._last_eviction is not None and now - self._last_eviction < self.evict_interval:
+            return
+        self._last_eviction = now
+        evicted = await self.store.evict(self._retention_cutoff())
+        if evicted:
+            logger.info(f"Evicted {evicted} content cache entries unused for {self.retention.days} days")
+    
+    def _retention_cutoff(self) -> datetime:
+        return datetime.now(timezone.utc) - self.retention
+    
+    async def _lookup(self, content_hash: str, counters: Dict[str, Any]) -> Any:
+        """Redis first, then Postgres (refilling Redis); None on a miss."""
+        key = RedisKeys.CONTENT_CACHE.format(content_hash=content_hash)
+        cached = (await cache_manager.get_many([key])).get(key)
+        if cached is not None:
+            counters["redis_hits"] += 1
+            counters["saved_usd"] += cached["cost_usd"]
+            await self._count_hit(content_hash)
+            return cached["result"]
+        
+        try:
+            stored = await self.store.get(content_hash, self._retention_cutoff())
+        except Exception as e:
+            logger.error(f"Content cache read error for {content_hash[:12]}: {e}")
+            return None
+        
+        if stored is None:
+            return None
+        result, cost_usd, source_hash = stored
+        counters["db_hits"] += 1
+        counters["saved_usd"] += cost_usd
+        await self._set_redis(content_hash, result, cost_usd, source_hash)
+        return result
+    
+    async def _set_redis(self, content_hash: str, result: Any, cost_usd: float, source_hash: Optional[str]):
+        """Cache in Redis, tagged with the source so ``purge_source`` reaches this copy too."""
+        await cache_manager.set(
+            RedisKeys.CONTENT_CACHE.format(content_hash=content_hash),
+            {"result": result, "cost_usd": cost_usd},
+            ttl=self.ttl,
+            tags=[RedisKeys.TAG_CONTENT_SOURCE.format(source_hash=source_hash)] if source_hash else ()
+        )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit and miss counters of this process, per kind."""
+        stats = {}
+        for kind, counters in self._counters.items():
+            hits = counters["redis_hits"] + counters["db_hits"]
+            lookups = hits + counters["misses"]
+            stats[kind] = {
+                **counters,
+                "saved_usd": round(counters["saved_usd"], 4),
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            }
+        return stats
+    
+    async def get_report(self) -> Dict[str, Any]:
+        """Hit rate and dollars saved per kind, over all processes since entries were created."""
+        await self.flush_hits()
+        totals = await self.store.get_totals()
+        kinds = {}
+        for kind, total in totals.items():
+            # Every entry was computed once (a miss); every hit replaced a call
+            lookups = total["hits"] + total["entries"]
+            kinds[kind] = {
+                **total,
+                "saved_usd": round(total["saved_usd"], 4),
+                "hit_rate": round(total["hits"] / lookups, 3) if lookups else 0.0,
+            }
+        hits = sum(total["hits"] for total in totals.values())
+        lookups = hits + sum(total["entries"] for total in totals.values())
+        return {
+            "kinds": kinds,
+            "hits": hits,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "saved_usd": round(sum(total["saved_usd"] for total in totals.values()), 4),
+            "process": self.get_stats(),
+        }
+
+
+# Singleton instance
+content_cache = ContentCache()
@@ -0,0 +1,158 @@
+"""Two-tier cache for query embeddings (in-process LRU + Redis)."""
+
+import logging
+import re
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.redis import RedisKeys, cache_manager, get_binary_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Cache query embeddings in two tiers:
+    1. In-process LRU of float32 arrays, bounded by total bytes
+    2. Redis, storing vectors as packed little-endian float32 bytes
+
+    Both tiers are keyed by embedding model plus normalized text.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes or settings.EMBEDDING_CACHE_MAX_BYTES
+        self.ttl = cache_manager.embedding_ttl
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._current_bytes = 0
+
+        # Counters
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalize text so trivially different queries share a cache entry."""
+        return re.sub(r"\s+", " ", text).strip().lower()
+
+    def make_key(self, model: str, text: str) -> str:
+        """Build the cache key for a model and text pair."""
+        query_hash = RedisKeys.hash_text(f"{model}:{self.normalize_text(text)}")
+        return RedisKeys.QUERY_EMBEDDING.format(query_hash=query_hash)
+
+    @staticmethod
+    def pack(embedding: List[float]) -> bytes:
+        """Pack an embedding into little-endian float32 bytes."""
+        return np.asarray(embedding, dtype="<f4").tobytes()
+
+    @staticmethod
+    def unpack(data: bytes) -> np.ndarray:
+        """Unpack float32 bytes produced by ``pack``."""
+        return np.frombuffer(data, dtype="<f4")
+
+    def _lru_get(self, key: str) -> Optional[np.ndarray]:
+        vector = self._lru.get(key)
+        if vector is not None:
+            self._lru.move_to_end(key)
+        return vector
+
+    def _lru_put(self, key: str, vector: np.ndarray):
+        if vector.nbytes > self.max_bytes:
+            return
+
+        existing = self._lru.pop(key, None)
+        if existing is not None:
+            self._current_bytes -= existing.nbytes
+
+        self._lru[key] = vector
+        self._current_bytes += vector.nbytes
+
+        # Evict least recently used entries until we fit the byte budget
+        while self._current_bytes > self.max_bytes and self._lru:
+            _, evicted = self._lru.popitem(last=False)
+            self._current_bytes -= evicted.nbytes
+
+    async def get(self, model: str, text: str) -> Optional[List[float]]:
+        """Look up an embedding in the LRU, then Redis."""
+        key = self.make_key(model, text)
+
+        vector = self._lru_get(key)
+        if vector is not None:
+            self.memory_hits += 1
+            return vector.tolist()
+
+        try:
+            redis = await get_binary_redis_client()
+            if redis:
+                data = await redis.get(key)
+                if data:
+                    vector = self.unpack(data)
+                    self._lru_put(key, vector)
+                    self.redis_hits += 1
+                    return vector.tolist()
+        except Exception as e:
+            logger.error(f"Embedding cache read error for {key}: {e}")
+
+        self.misses += 1
+        return None
+
+    async def set(self, model: str, text: str, embedding: List[float]):
+        """Store an embedding in both tiers."""
+        key = self.make_key(model, text)
+        packed = self.pack(embedding)
+        self._lru_put(key, self.unpack(packed))
+
+        try:
+            redis = await get_binary_redis_client()
+            if redis:
+                await redis.setex(key, self.ttl, packed)
+        except Exception as e:
+            logger.error(f"Embedding cache write error for {key}: {e}")
+
+    async def get_or_compute(
+        self,
+        model: str,
+        text: str,
+        compute_func: Callable[[], Awaitable[Optional[List[float]]]]
+    ) -> Optional[List[float]]:
+        """
+        Return a cached embedding or compute and cache it.
+
+        ``compute_func`` should return None on failure so that fallback
+        vectors are never cached.
+        """
+        cached = await self.get(model, text)
+        if cached is not None:
+            return cached
+
+        embedding = await compute_func()
+        if embedding:
+            await self.set(model, text, embedding)
+        return embedding
+
+    def clear(self):
+        """Drop the in-process tier."""
+        self._lru.clear()
+        self._current_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and LRU usage."""
+        lookups = self.memory_hits + self.redis_hits + self.misses
+        hits = self.memory_hits + self.redis_hits
+        return {
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "saved_round_trips": hits,
+            "lru_entries": len(self._lru),
+            "lru_bytes": self._current_bytes,
+            "lru_max_bytes": self.max_bytes
+        }
+
+
+# Singleton instance
+embedding_cache = EmbeddingCache()
@@ -1,5 +1,6 @@
 """Multi-model embedding ensemble for enhanced search accuracy."""
 
+import asyncio
 import logging
 import hashlib
 from typing import List, Dict, Any, Optional, Tuple
@@ -70,22 +71,54 @@ class EmbeddingEnsemble:
         Returns:
             Embedding vector
         """
-        # Generate cache key
-        text_hash = RedisKeys.hash_text(text)
-        cache_key = f"{RedisKeys.EMBEDDING_CACHE}:{model.value}:{text_hash}"
+        embeddings = await self.get_embeddings([(text, model)], use_cache)
+        return embeddings[0]
+    
+    async def get_embeddings(
+        self,
+        requests: List[Tuple[str, EmbeddingModel]],
+        use_cache: bool = True
+    ) -> List[List[float]]:
+        """
+        Get embeddings for several (text, model) pairs.
+        
+        Cached vectors are read with one MGET; the misses are computed
+        concurrently and written back in one pipelined round trip.
+        
+        Args:
+            requests: (text, model) pairs
+            use_cache: Whether to use cached embeddings
+            
+        Returns:
+            Embedding vectors, in the order of ``requests``
+        """
+        if not use_cache:
+            return list(await asyncio.gather(
+                *(self._compute_embedding(text, model) for text, model in requests)
+            ))
+        
+        cache_keys = [self._cache_key(text, model) for text, model in requests]
+        requests_by_key = dict(zip(cache_keys, requests))
         
-        # Try cache first
-        if use_cache:
-            cached = await cache_manager.get_or_set(
-                key=cache_key,
-                fetch_func=lambda: self._compute_embedding(text, model),
-                ttl=cache_manager.embedding_ttl,
-                serialize=True
+        async def compute_missing(missing_keys: List[str]) -> Dict[str, List[float]]:
+            embeddings = await asyncio.gather(
+                *(self._compute_embedding(*requests_by_key[key]) for key in missing_keys)
             )
-            return cached
+            return dict(zip(missing_keys, embeddings))
         
-        # Compute directly
-        return await self._compute_embedding(text, model)
+        embeddings = await cache_manager.get_or_set_many(
+            cache_keys,
+            compute_missing,
+            ttl=cache_manager.embedding_ttl,
+            serialize=True
+        )
+        return [embeddings[key] for key in cache_keys]
+    
+    @staticmethod
+    def _cache_key(text: str, model: EmbeddingModel) -> str:
+        """Cache key of one text's embedding under a model."""
+        text_hash = RedisKeys.hash_text(text)
+        return f"{RedisKeys.EMBEDDING_CACHE}:{model.value}:{text_hash}"
     
     async def _compute_embedding(
         self,
@@ -191,10 +224,8 @@ class EmbeddingEnsemble:
             }
         
         # Get embeddings from each model
-        embeddings = {}
-        for model in models:
-            embedding = await self.get_embedding(text, model, use_cache)
-            embeddings[model] = embedding
+        vectors = await self.get_embeddings([(text, model) for model in models], use_cache)
+        embeddings = dict(zip(models, vectors))
         
         # Combine embeddings (concatenation for now, could use other strategies)
         combined = []
@@ -277,14 +308,10 @@ class EmbeddingEnsemble:
                     except Exception as e:
                         logger.error(f"Batch embedding error: {e}")
                         # Fallback to individual
-                        for text in batch:
-                            emb = await self.get_embedding(text, model)
-                            embeddings.append(emb)
+                        embeddings.extend(await self.get_embeddings([(text, model) for text in batch]))
             else:
                 # Process individually for other models
-                for text in batch:
-                    emb = await self.get_embedding(text, model)
-                    embeddings.append(emb)
+                embeddings.extend(await self.get_embeddings([(text, model) for text in batch]))
         
         return embeddings
     
@@ -1,7 +1,8 @@
 """Embedding generation service using OpenAI."""
 
+import asyncio
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import openai
 from openai import AsyncOpenAI
@@ -20,6 +21,25 @@ class EmbeddingService:
         self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
         self.model = "text-embedding-ada-002"
         self.max_tokens = 8191  # Max tokens for ada-002
+        
+        # Batching limits
+        self.batch_size = settings.EMBEDDING_BATCH_SIZE  # Max inputs per request
+        self.batch_max_tokens = settings.EMBEDDING_BATCH_MAX_TOKENS  # Token budget per request
+        self.batch_concurrency = settings.EMBEDDING_BATCH_CONCURRENCY  # Requests in flight
+        self.batch_max_retries = 3
+        self.batch_retry_delay = 1.0  # Base delay in seconds, doubled per retry
+    
+    def _prepare_text(self, text: str) -> str:
+        """Truncate text to the model limit (rough estimation: 1 token ≈ 4 chars)."""
+        if len(text) > self.max_tokens * 4:
+            text = text[:self.max_tokens * 4]
+            logger.info("Text truncated for embedding generation")
+        return text.strip()
+    
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Estimate token count (rough estimation: 1 token ≈ 4 chars)."""
+        return len(text) // 4 + 1
     
     @retry(
         stop=stop_after_attempt(3),
@@ -39,14 +59,9 @@ class EmbeddingService:
             return None
         
         try:
-            # Truncate text if too long (rough estimation: 1 token ≈ 4 chars)
-            if len(text) > self.max_tokens * 4:
-                text = text[:self.max_tokens * 4]
-                logger.info("Text truncated for embedding generation")
-            
             response = await self.client.embeddings.create(
                 model=self.model,
-                input=text.strip()
+                input=self._prepare_text(text)
             )
             
             embedding = response.data[0].embedding
@@ -60,26 +75,105 @@ class EmbeddingService:
             return None
     
     async def generate_embeddings_batch(
-        self, texts: List[str]
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None
     ) -> List[Optional[List[float]]]:
-        """Generate embeddings for multiple texts.
+        """Generate embeddings for multiple texts using batched API calls.
+        
+        Texts are split into batches bounded by both item count and an
+        estimated token budget. Several batches are sent concurrently, and
+        only the items whose batch failed are retried, in progressively
+        smaller batches so one bad input cannot sink its neighbours.
         
         Args:
             texts: List of texts to generate embeddings for
+            batch_size: Max texts per API call (defaults to EMBEDDING_BATCH_SIZE)
+            max_concurrency: Max API calls in flight (defaults to EMBEDDING_BATCH_CONCURRENCY)
             
         Returns:
-            List of embedding vectors (or None for failed items)
+            List of embedding vectors in input order (or None for failed items)
         """
-        embeddings = []
+        batch_size = batch_size or self.batch_size
+        semaphore = asyncio.Semaphore(max_concurrency or self.batch_concurrency)
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        
+        pending = [
+            (i, self._prepare_text(text))
+            for i, text in enumerate(texts)
+            if text and text.strip()
+        ]
+        
+        for attempt in range(self.batch_max_retries + 1):
+            if not pending:
+                break
+            
+            if attempt > 0:
+                logger.info(f"Retrying {len(pending)} failed embeddings (attempt {attempt + 1})")
+                await asyncio.sleep(min(self.batch_retry_delay * 2 ** (attempt - 1), 10))
+            
+            # Shrink batches on retries to isolate failing inputs
+            attempt_batch_size = max(1, batch_size >> attempt)
+            batches = self._build_batches(pending, attempt_batch_size)
+            
+            async def run_batch(batch: List[Tuple[int, str]]):
+                async with semaphore:
+                    await self._embed_batch(batch, embeddings)
+            
+            await asyncio.gather(*(run_batch(batch) for batch in batches))
+            
+            pending = [(i, text) for i, text in pending if embeddings[i] is None]
         
-        # OpenAI allows batch processing, but we'll process one by one
-        # to handle errors gracefully
-        for text in texts:
-            embedding = await self.generate_embedding(text)
-            embeddings.append(embedding)
+        if pending:
+            logger.error(f"Failed to generate {len(pending)} of {len(texts)} embeddings")
         
         return embeddings
     
+    def _build_batches(
+        self,
+        items: List[Tuple[int, str]],
+        batch_size: int
+    ) -> List[List[Tuple[int, str]]]:
+        """Split (index, text) pairs into batches bounded by size and token budget."""
+        batches = []
+        current: List[Tuple[int, str]] = []
+        current_tokens = 0
+        
+        for index, text in items:
+            tokens = self._estimate_tokens(text)
+            if current and (
+                len(current) >= batch_size
+                or current_tokens + tokens > self.batch_max_tokens
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append((index, text))
+            current_tokens += tokens
+        
+        if current:
+            batches.append(current)
+        
+        return batches
+    
+    async def _embed_batch(
+        self,
+        batch: List[Tuple[int, str]],
+        embeddings: List[Optional[List[float]]]
+    ):
+        """Embed one batch and write results into their input positions."""
+        try:
+            response = await self.client.embeddings.create(
+                model=self.model,
+                input=[text for _, text in batch]
+            )
+            for item in response.data:
+                embeddings[batch[item.index][0]] = item.embedding
+        except Exception as e:
+            # Leave the slots empty; the caller retries only these items
+            logger.warning(f"Embedding batch of {len(batch)} failed: {e}")
+    
     def prepare_resume_text(self, resume_data: dict) -> str:
         """Prepare resume data for embedding generation.
         
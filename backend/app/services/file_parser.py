@@ -1,12 +1,27 @@
 """File parsing service for extracting text from various file formats."""
 
+import asyncio
 import io
+import logging
+import multiprocessing
 import re
-from typing import Optional, Tuple
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple, Union
 
 import PyPDF2
 from docx import Document
 
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class FileParserBusyError(Exception):
+    """Raised when too many files are already waiting for an extraction process."""
+
 
 class FileParser:
     """Service for parsing different file types."""
@@ -29,13 +44,17 @@ class FileParser:
         return True, None
     
     @staticmethod
-    def extract_text_from_pdf(file_content: bytes) -> str:
-        """Extract text from PDF file."""
+    def extract_text_from_pdf(file_content: bytes, max_pages: Optional[int] = None) -> str:
+        """Extract text from PDF file, from at most ``max_pages`` pages."""
         try:
             pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
             text_parts = []
             
-            for page_num in range(len(pdf_reader.pages)):
+            page_count = len(pdf_reader.pages)
+            if max_pages:
+                page_count = min(page_count, max_pages)
+            
+            for page_num in range(page_count):
                 page = pdf_reader.pages[page_num]
                 text = page.extract_text()
                 if text:
@@ -76,12 +95,16 @@ class FileParser:
             raise ValueError(f"Failed to parse TXT: {str(e)}")
     
     @classmethod
-    def extract_text(cls, file_content: bytes, filename: str) -> str:
-        """Extract text from file based on its extension."""
+    def extract_text(cls, file_content: bytes, filename: str, max_pages: Optional[int] = None) -> str:
+        """
+        Extract text from file based on its extension.
+        
+        CPU-bound; on the event loop use ``extract_text_async`` instead.
+        """
         ext = filename.lower().split('.')[-1] if '.' in filename else ''
         
         if ext == 'pdf':
-            text = cls.extract_text_from_pdf(file_content)
+            text = cls.extract_text_from_pdf(file_content, max_pages=max_pages)
         elif ext in ['docx', 'doc']:
             text = cls.extract_text_from_docx(file_content)
         elif ext == 'txt':
@@ -96,4 +119,189 @@ class FileParser:
         if not text:
             raise ValueError("No text content found in file")
         
-        return text
\ No newline at end of file
+        return text
+    
+    @classmethod
+    async def extract_text_async(cls, source: Union[bytes, str], filename: str) -> str:
+        """
+        Extract text in an extraction process, without blocking the event loop.
+        
+        ``source`` is the file content, or the path of an uploaded file; a
+        path is read by the extraction process, not by the API process.
+        """
+        if filename.lower().endswith('.txt'):
+            # Decoding is cheaper than the round trip to a process
+            return cls.extract_text(_read_source(source), filename)
+        return await extraction_pool.extract_text(source, filename)
+
+
+class _CPULimitExceeded(BaseException):
+    """Raised in an extraction process by SIGPROF; a BaseException so parsers cannot swallow it."""
+
+
+def _raise_cpu_limit(signum, frame):
+    raise _CPULimitExceeded()
+
+
+def _read_source(source: Union[bytes, str]) -> bytes:
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            return f.read()
+    return source
+
+
+def _extract_in_worker(source: Union[bytes, str], filename: str, max_pages: int, cpu_seconds: int) -> str:
+    """Extraction process entry point: extract text under a CPU-time limit."""
+    # ITIMER_PROF counts this process's CPU time, so the limit holds per file
+    # even though the process is reused
+    limited = bool(cpu_seconds) and hasattr(signal, "setitimer")
+    if limited:
+        signal.signal(signal.SIGPROF, _raise_cpu_limit)
+        signal.setitimer(signal.ITIMER_PROF, cpu_seconds)
+    try:
+        return FileParser.extract_text(_read_source(source), filename, max_pages=max_pages)
+    except _CPULimitExceeded:
+        raise ValueError(f"File took more than {cpu_seconds}s of CPU time to parse")
+    finally:
+        if limited:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+
+
+class ExtractionPool:
+    """
+    Runs text extraction in a bounded pool of worker processes.
+    
+    PyPDF2 and python-docx are CPU-bound and hold the GIL, so parsing a large
+    document on the event loop stalls every request of the API process. At
+    most ``workers`` files are parsed at once and at most ``max_queue`` wait
+    for a process; beyond that uploads get ``FileParserBusyError``.
+    
+    A caller that gives up (timeout or cancellation) drops its file if it is
+    still waiting; a file already being parsed runs on until it finishes or
+    hits the CPU-time limit, and keeps its process slot until then.
+    """
+    
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        cpu_seconds: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_pages: Optional[int] = None
+    ):
+        self.workers = workers or settings.FILE_PARSER_WORKERS
+        self.max_queue = max_queue if max_queue is not None else settings.FILE_PARSER_MAX_QUEUE
+        self.cpu_seconds = cpu_seconds if cpu_seconds is not None else settings.FILE_PARSER_CPU_SECONDS
+        self.timeout = timeout or settings.FILE_PARSER_TIMEOUT
+        self.max_pages = max_pages if max_pages is not None else settings.FILE_PARSER_MAX_PAGES
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = asyncio.Semaphore(self.workers)
+        self._queued = 0
+        self._running = 0
+        
+        # Metrics
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned processes do not inherit the server's threads, sockets or event loop
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+    
+    async def extract_text(self, source: Union[bytes, str], filename: str) -> str:
+        """Extract text from file content or a file path in a worker process."""
+        if self._queued >= self.max_queue:
+            self.rejected += 1
+            raise FileParserBusyError("Too many files are being parsed, please try again shortly")
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        start = time.perf_counter()
+        try:
+            # Wait for a free process
+            self._queued += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout=self.timeout)
+            finally:
+                self._queued -= 1
+            
+            self._running += 1
+            try:
+                future = self._get_executor().submit(
+                    _extract_in_worker, source, filename, self.max_pages, self.cpu_seconds
+                )
+            except BaseException:
+                self._release()
+                raise
+            # The slot is freed when the process is, not when the caller gives up
+            future.add_done_callback(lambda _: self._release_from_thread(loop))
+            
+            text = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=max(deadline - loop.time(), 0)
+            )
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise ValueError(f"Timed out parsing {filename}")
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        except BrokenProcessPool:
+            # A process died (e.g. killed for memory); start a fresh pool for the next files
+            self.failed += 1
+            self._reset_executor()
+            raise ValueError(f"File parser process crashed while parsing {filename}")
+        except Exception:
+            self.failed += 1
+            raise
+        
+        self.completed += 1
+        self.total_seconds += time.perf_counter() - start
+        return text
+    
+    def _release(self):
+        self._running -= 1
+        self._slots.release()
+    
+    def _release_from_thread(self, loop: asyncio.AbstractEventLoop):
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            pass  # Event loop closed; nothing waits for the slot
+    
+    def _reset_executor(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def shutdown(self):
+        """Stop the worker processes; running extractions are abandoned."""
+        if self._executor is not None:
+            logger.info("Shutting down file parser processes")
+        self._reset_executor()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size, queue depth and outcome counters."""
+        return {
+            "pool_size": self.workers,
+            "running": self._running,
+            "queued": self._queued,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+            "avg_seconds": round(self.total_seconds / self.completed, 3) if self.completed else 0.0,
+        }
+
+
+# Singleton instance
+extraction_pool = ExtractionPool()
@@ -1,33 +1,84 @@
 """Hybrid search service combining keyword and vector search with BM25 algorithm."""
 
+import asyncio
 import math
 import logging
-from typing import List, Dict, Any, Tuple, Optional, Set
+import time
+from typing import List, Dict, Any, Tuple, Optional, Set, Literal
 from collections import Counter
 import re
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, text, and_, or_
 import sqlalchemy as sa
+from app.core.config import settings
+from app.db.session import async_session_maker
 from app.models.resume import Resume
+from app.services.bm25_index import bm25_index
+from app.services.search_card import fetch_search_cards, search_card_load_only, select_search_cards
 from app.services.skill_synonyms import skill_synonyms
 from app.services.vector_search import vector_search
 from app.services.fuzzy_matcher import fuzzy_matcher
 
 logger = logging.getLogger(__name__)
 
+# Result fusion strategies
+FUSION_WEIGHTED = "weighted"
+FUSION_RRF = "rrf"
+FUSION_MODES = (FUSION_WEIGHTED, FUSION_RRF)
+
+# Rank offset for Reciprocal Rank Fusion (Cormack et al. use 60)
+RRF_K = 60
+
+
+class HybridSearchConfig(BaseModel):
+    """Immutable hybrid search settings for a single request."""
+    
+    keyword_weight: float = 0.3
+    vector_weight: float = 0.7
+    k1: float = 1.2  # BM25 term frequency saturation parameter
+    b: float = 0.75  # BM25 length normalization parameter
+    fusion: Literal["weighted", "rrf"] = FUSION_WEIGHTED
+    candidate_pool: Optional[int] = None  # Candidates fetched per leg; defaults to 2 * limit
+    
+    class Config:
+        frozen = True
+    
+    def pool_size(self, limit: int) -> int:
+        """Number of candidates each leg should fetch for a result limit."""
+        return self.candidate_pool or limit * 2
+
+
+# Named presets, keyed by query type
+HYBRID_SEARCH_PRESETS: Dict[str, HybridSearchConfig] = {
+    "default": HybridSearchConfig(),
+    # Technical queries benefit more from keyword matching
+    "technical": HybridSearchConfig(keyword_weight=0.4, vector_weight=0.6),
+    # Soft skills benefit more from semantic understanding
+    "soft_skills": HybridSearchConfig(keyword_weight=0.2, vector_weight=0.8),
+    # Exact matches should heavily favor keywords
+    "exact_match": HybridSearchConfig(keyword_weight=0.7, vector_weight=0.3),
+}
+
+
+def register_search_preset(name: str, config: HybridSearchConfig):
+    """Register (or replace) a named hybrid search preset."""
+    HYBRID_SEARCH_PRESETS[name] = config
+
+
+def get_search_preset(name: Optional[str]) -> HybridSearchConfig:
+    """Look up a preset by name, falling back to the default preset."""
+    return HYBRID_SEARCH_PRESETS.get(name or "default", HYBRID_SEARCH_PRESETS["default"])
+
 
 class HybridSearchService:
-    """Combine keyword search (BM25) with vector search for improved results."""
+    """
+    Combine keyword search (BM25) with vector search for improved results.
+    
+    The service holds no per-request state: weights, BM25 parameters and the
+    fusion strategy come from the HybridSearchConfig passed to ``search``.
+    """
     
-    def __init__(self):
-        # BM25 parameters
-        self.k1 = 1.2  # Term frequency saturation parameter
-        self.b = 0.75  # Length normalization parameter
-        
-        # Hybrid weighting
-        self.keyword_weight = 0.3
-        self.vector_weight = 0.7
-        
     async def search(
         self,
         db: AsyncSession,
@@ -35,7 +86,10 @@ class HybridSearchService:
         user_id: str,
         limit: int = 10,
         filters: Optional[Dict[str, Any]] = None,
-        use_synonyms: bool = True
+        use_synonyms: bool = True,
+        concurrent: Optional[bool] = None,
+        fusion: Optional[str] = None,
+        config: Optional[HybridSearchConfig] = None
     ) -> List[Tuple[Dict[str, Any], float]]:
         """
         Perform hybrid search combining BM25 keyword search and vector search.
@@ -47,31 +101,137 @@ class HybridSearchService:
             limit: Maximum results to return
             filters: Additional filters
             use_synonyms: Whether to expand query with synonyms
+            concurrent: Run both legs concurrently (defaults to HYBRID_SEARCH_CONCURRENT)
+            fusion: Override the config's fusion strategy, "weighted" or "rrf"
+            config: Per-request settings (defaults to the "default" preset)
             
         Returns:
             List of (resume_data, score) tuples
         """
+        results, _ = await self.search_with_metadata(
+            db, query, user_id, limit, filters, use_synonyms, concurrent, fusion, config
+        )
+        return results
+    
+    async def search_with_metadata(
+        self,
+        db: AsyncSession,
+        query: str,
+        user_id: str,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        use_synonyms: bool = True,
+        concurrent: Optional[bool] = None,
+        fusion: Optional[str] = None,
+        config: Optional[HybridSearchConfig] = None
+    ) -> Tuple[List[Tuple[Dict[str, Any], float]], Dict[str, Any]]:
+        """
+        Perform hybrid search and report how each leg went.
+        
+        In concurrent mode the keyword leg runs on its own database session so
+        it can overlap with the vector leg (and with any other work the caller
+        is doing on ``db``). Each leg has its own timeout; if one leg times out
+        or fails, results are built from the other.
+        
+        Returns:
+            Tuple of (results, metadata) where metadata has the execution mode,
+            the effective config, each leg's status ("completed", "timeout" or
+            "error"), result count and elapsed milliseconds, and whether the
+            results are degraded
+        """
+        config = config or get_search_preset("default")
+        if fusion is not None:
+            if fusion not in FUSION_MODES:
+                raise ValueError(f"Unknown fusion mode '{fusion}', expected one of {FUSION_MODES}")
+            config = config.model_copy(update={"fusion": fusion})
+        if concurrent is None:
+            concurrent = settings.HYBRID_SEARCH_CONCURRENT
+        
         # Expand query with synonyms if enabled
         expanded_queries = [query]
         if use_synonyms:
             expanded_queries.extend(skill_synonyms.expand_query(query))
             logger.info(f"Expanded query from '{query}' to {len(expanded_queries)} variations")
         
-        # Perform both searches in parallel
-        keyword_results = await self._keyword_search_bm25(
-            db, expanded_queries, user_id, limit * 2, filters
-        )
-        
-        vector_results = await vector_search.search_similar(
-            query, user_id, limit * 2, filters
-        )
+        pool_size = config.pool_size(limit)
+        start = time.perf_counter()
+        if concurrent:
+            keyword_leg, vector_leg = await asyncio.gather(
+                self._run_leg(
+                    "keyword",
+                    self._keyword_search_own_session(expanded_queries, user_id, pool_size, filters, config),
+                    settings.HYBRID_KEYWORD_TIMEOUT
+                ),
+                self._run_leg(
+                    "vector",
+                    vector_search.search_similar(query, user_id, pool_size, filters),
+                    settings.HYBRID_VECTOR_TIMEOUT
+                )
+            )
+        else:
+            keyword_leg = await self._run_leg(
+                "keyword",
+                self._keyword_search_bm25(db, expanded_queries, user_id, pool_size, filters, config),
+                settings.HYBRID_KEYWORD_TIMEOUT
+            )
+            vector_leg = await self._run_leg(
+                "vector",
+                vector_search.search_similar(query, user_id, pool_size, filters),
+                settings.HYBRID_VECTOR_TIMEOUT
+            )
         
         # Combine and re-rank results
         combined_results = self._combine_results(
-            keyword_results, vector_results, limit
+            keyword_leg.pop("results"), vector_leg.pop("results"), limit, config
         )
         
-        return combined_results
+        metadata = {
+            "mode": "concurrent" if concurrent else "sequential",
+            "fusion": config.fusion,
+            "config": config.model_dump(),
+            "legs": {"keyword": keyword_leg, "vector": vector_leg},
+            "completed_legs": [
+                name for name, leg in (("keyword", keyword_leg), ("vector", vector_leg))
+                if leg["status"] == "completed"
+            ],
+            "degraded": keyword_leg["status"] != "completed" or vector_leg["status"] != "completed",
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+        
+        return combined_results, metadata
+    
+    async def _run_leg(self, name: str, coro, timeout: float) -> Dict[str, Any]:
+        """Await one search leg under a timeout, never raising."""
+        start = time.perf_counter()
+        status = "completed"
+        results = []
+        try:
+            results = await asyncio.wait_for(coro, timeout=timeout)
+        except asyncio.TimeoutError:
+            status = "timeout"
+            logger.warning(f"Hybrid search {name} leg timed out after {timeout}s")
+        except Exception as e:
+            status = "error"
+            logger.error(f"Hybrid search {name} leg failed: {e}")
+        
+        return {
+            "status": status,
+            "count": len(results),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+            "results": results
+        }
+    
+    async def _keyword_search_own_session(
+        self,
+        queries: List[str],
+        user_id: str,
+        limit: int,
+        filters: Optional[Dict[str, Any]] = None,
+        config: Optional[HybridSearchConfig] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Run the BM25 leg on a dedicated session so it can run concurrently."""
+        async with async_session_maker() as session:
+            return await self._keyword_search_bm25(session, queries, user_id, limit, filters, config)
     
     async def _keyword_search_bm25(
         self,
@@ -79,10 +239,15 @@ class HybridSearchService:
         queries: List[str],
         user_id: str,
         limit: int,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        config: Optional[HybridSearchConfig] = None
     ) -> List[Tuple[Dict[str, Any], float]]:
         """
-        Perform BM25-based keyword search using PostgreSQL full-text search.
+        Perform BM25 keyword search over the user's inverted index.
+        
+        Scores come from the persistent BM25 index (exact document frequencies
+        and average document length). Users with active resumes that are not
+        indexed yet fall back to a full text scan.
         
         Args:
             db: Database session
@@ -90,16 +255,78 @@ class HybridSearchService:
             user_id: User ID for filtering
             limit: Maximum results
             filters: Additional filters
+            config: Per-request settings supplying k1 and b
             
         Returns:
             List of (resume_data, score) tuples with BM25 scores
         """
+        config = config or get_search_preset("default")
+        
         # Tokenize and prepare queries
         all_terms = set()
         for query in queries:
             terms = self._tokenize_query(query)
             all_terms.update(terms)
         
+        # Add corrections for common typos/variations
+        corrections = fuzzy_matcher.suggest_corrections(list(all_terms))
+        search_terms = all_terms | {corrected.lower() for corrected in corrections.values()}
+        
+        # Over-fetch from the index since inactive or filtered resumes are dropped below
+        ranked = await bm25_index.search(
+            db, user_id, search_terms, limit * 3, k1=config.k1, b=config.b
+        )
+        if ranked is None:
+            return await self._keyword_search_scan(db, all_terms, user_id, limit, filters, config)
+        if not ranked:
+            return []
+        
+        scores = dict(ranked)
+        conditions = [
+            Resume.id.in_(list(scores.keys())),
+            Resume.user_id == user_id,
+            Resume.status == "active"  # Only show active resumes, not deleted ones
+        ]
+        
+        # Apply additional filters
+        if filters:
+            for key, value in filters.items():
+                if hasattr(Resume, key):
+                    conditions.append(getattr(Resume, key) == value)
+        
+        cards = await fetch_search_cards(db, select_search_cards(and_(*conditions)))
+        
+        scored_results = [
+            (self._resume_to_dict(card, scores[str(card.id)]), scores[str(card.id)])
+            for card in cards
+        ]
+        scored_results.sort(key=lambda x: x[1], reverse=True)
+        
+        return scored_results[:limit]
+    
+    async def _keyword_search_scan(
+        self,
+        db: AsyncSession,
+        all_terms: Set[str],
+        user_id: str,
+        limit: int,
+        filters: Optional[Dict[str, Any]],
+        config: HybridSearchConfig
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Keyword search by scanning resume text, for users not fully in the BM25 index.
+        
+        Args:
+            db: Database session
+            all_terms: Tokenized query terms
+            user_id: User ID for filtering
+            limit: Maximum results
+            filters: Additional filters
+            config: Per-request settings supplying k1 and b
+            
+        Returns:
+            List of (resume_data, score) tuples with approximate BM25 scores
+        """
         # Build search conditions
         conditions = [
             Resume.user_id == user_id,
@@ -169,8 +396,13 @@ class HybridSearchService:
                 if hasattr(Resume, key):
                     conditions.append(getattr(Resume, key) == value)
         
-        # Execute search
-        query_obj = select(Resume).where(and_(*conditions)).limit(limit)
+        # Execute search; scoring needs raw_text, the other large columns stay deferred
+        query_obj = (
+            select(Resume)
+            .options(search_card_load_only(Resume.raw_text))
+            .where(and_(*conditions))
+            .limit(limit)
+        )
         result = await db.execute(query_obj)
         resumes = result.scalars().all()
         
@@ -184,29 +416,31 @@ class HybridSearchService:
         for resume in resumes:
             # Calculate BM25 score
             score = self._calculate_bm25_score(
-                resume, all_terms, doc_count, avg_doc_length
+                resume, all_terms, doc_count, avg_doc_length, config.k1, config.b
             )
             
-            resume_dict = {
-                "id": str(resume.id),
-                "first_name": resume.first_name,
-                "last_name": resume.last_name,
-                "email": resume.email,
-                "location": resume.location,
-                "current_title": resume.current_title,
-                "years_experience": resume.years_experience,
-                "skills": resume.skills or [],
-                "summary": resume.summary,
-                "score": score
-            }
-            
-            scored_results.append((resume_dict, score))
+            scored_results.append((self._resume_to_dict(resume, score), score))
         
         # Sort by score
         scored_results.sort(key=lambda x: x[1], reverse=True)
         
         return scored_results[:limit]
     
+    def _resume_to_dict(self, resume, score: float) -> Dict[str, Any]:
+        """Build the keyword result payload for a resume or search card."""
+        return {
+            "id": str(resume.id),
+            "first_name": resume.first_name,
+            "last_name": resume.last_name,
+            "email": resume.email,
+            "location": resume.location,
+            "current_title": resume.current_title,
+            "years_experience": resume.years_experience,
+            "skills": resume.skills or [],
+            "summary": resume.summary,
+            "score": score
+        }
+    
     def _tokenize_query(self, query: str) -> List[str]:
         """Tokenize query into searchable terms."""
         # Simple tokenization - can be enhanced
@@ -228,10 +462,12 @@ class HybridSearchService:
         resume: Resume,
         terms: Set[str],
         doc_count: int,
-        avg_doc_length: float
+        avg_doc_length: float,
+        k1: float,
+        b: float
     ) -> float:
         """
-        Calculate BM25 score for a resume given search terms.
+        Approximate BM25 score for a resume, used by the text-scan fallback.
         
         BM25 formula:
         score = Σ IDF(term) * (tf * (k1 + 1)) / (tf + k1 * (1 - b + b * dl/avgdl))
@@ -274,8 +510,8 @@ class HybridSearchService:
             idf = math.log((doc_count - df + 0.5) / (df + 0.5))
             
             # BM25 term score
-            term_score = idf * (tf * (self.k1 + 1)) / (
-                tf + self.k1 * (1 - self.b + self.b * doc_length / avg_doc_length)
+            term_score = idf * (tf * (k1 + 1)) / (
+                tf + k1 * (1 - b + b * doc_length / avg_doc_length)
             )
             
             score += term_score
@@ -301,93 +537,76 @@ class HybridSearchService:
         self,
         keyword_results: List[Tuple[Dict[str, Any], float]],
         vector_results: List[Dict[str, Any]],
-        limit: int
+        limit: int,
+        config: Optional[HybridSearchConfig] = None
     ) -> List[Tuple[Dict[str, Any], float]]:
         """
-        Combine keyword and vector search results using weighted scoring.
+        Fuse keyword and vector results into one ranking.
+        
+        Both result lists are indexed by resume id once, so fusion is linear
+        in the number of candidates. Result dicts are copied, never mutated,
+        and ties are broken by resume id so the output is deterministic.
         
         Args:
-            keyword_results: Results from BM25 keyword search
-            vector_results: Results from vector search
+            keyword_results: Results from BM25 keyword search, best first
+            vector_results: Results from vector search, best first
             limit: Maximum results to return
+            config: Weights and fusion strategy; "weighted" fuses weighted
+                max-normalized scores, "rrf" uses weighted Reciprocal Rank Fusion
             
         Returns:
             Combined and re-ranked results
         """
-        # Create score maps
-        keyword_scores = {r[0]["id"]: r[1] for r in keyword_results}
-        vector_scores = {r["resume_id"]: r["score"] for r in vector_results}
+        config = config or get_search_preset("default")
         
-        # Normalize scores to 0-1 range
-        keyword_max = max(keyword_scores.values()) if keyword_scores else 1.0
-        vector_max = max(vector_scores.values()) if vector_scores else 1.0
+        # Index both legs by id: id -> (resume_data, raw score, 1-based rank)
+        keyword_by_id = {}
+        for rank, (resume_data, score) in enumerate(keyword_results, start=1):
+            keyword_by_id.setdefault(resume_data["id"], (resume_data, score, rank))
         
-        # Combine all unique IDs
-        all_ids = set(keyword_scores.keys()) | set(vector_scores.keys())
+        vector_by_id = {}
+        for rank, result in enumerate(vector_results, start=1):
+            vector_by_id.setdefault(result["resume_id"], (result.get("metadata") or {}, result["score"], rank))
         
-        # Calculate hybrid scores
-        hybrid_results = []
+        # Normalize scores to 0-1 range
+        keyword_max = max((entry[1] for entry in keyword_by_id.values()), default=0) or 1.0
+        vector_max = max((entry[1] for entry in vector_by_id.values()), default=0) or 1.0
         
-        for resume_id in all_ids:
-            # Get normalized scores
-            keyword_score = keyword_scores.get(resume_id, 0) / keyword_max
-            vector_score = vector_scores.get(resume_id, 0) / vector_max
+        hybrid_results = []
+        for resume_id in keyword_by_id.keys() | vector_by_id.keys():
+            keyword_entry = keyword_by_id.get(resume_id)
+            vector_entry = vector_by_id.get(resume_id)
             
-            # Calculate weighted hybrid score
-            hybrid_score = (
-                self.keyword_weight * keyword_score +
-                self.vector_weight * vector_score
-            )
+            keyword_score = keyword_entry[1] / keyword_max if keyword_entry else 0.0
+            vector_score = vector_entry[1] / vector_max if vector_entry else 0.0
             
-            # Get resume data (prefer from keyword results as they have full data)
-            resume_data = None
-            for r in keyword_results:
-                if r[0]["id"] == resume_id:
-                    resume_data = r[0]
-                    break
+            if config.fusion == FUSION_RRF:
+                hybrid_score = (
+                    (config.keyword_weight / (RRF_K + keyword_entry[2]) if keyword_entry else 0.0) +
+                    (config.vector_weight / (RRF_K + vector_entry[2]) if vector_entry else 0.0)
+                )
+            else:
+                hybrid_score = (
+                    config.keyword_weight * keyword_score +
+                    config.vector_weight * vector_score
+                )
             
-            if not resume_data:
-                # Get from vector results
-                for r in vector_results:
-                    if r["resume_id"] == resume_id:
-                        resume_data = r.get("metadata", {})
-                        resume_data["id"] = resume_id
-                        break
+            # Prefer keyword data as it has the full resume fields
+            if keyword_entry:
+                resume_data = dict(keyword_entry[0])
+            else:
+                resume_data = dict(vector_entry[0])
+                resume_data["id"] = resume_id
             
-            if resume_data:
-                resume_data["hybrid_score"] = hybrid_score
-                resume_data["keyword_score"] = keyword_score
-                resume_data["vector_score"] = vector_score
-                hybrid_results.append((resume_data, hybrid_score))
+            resume_data["hybrid_score"] = hybrid_score
+            resume_data["keyword_score"] = keyword_score
+            resume_data["vector_score"] = vector_score
+            hybrid_results.append((resume_data, hybrid_score))
         
-        # Sort by hybrid score
-        hybrid_results.sort(key=lambda x: x[1], reverse=True)
+        # Sort by hybrid score, breaking ties by id
+        hybrid_results.sort(key=lambda x: (-x[1], str(x[0]["id"])))
         
         return hybrid_results[:limit]
-    
-    def adjust_weights(self, query_type: str):
-        """
-        Adjust keyword/vector weights based on query type.
-        
-        Args:
-            query_type: Type of query (technical, soft_skills, experience, etc.)
-        """
-        if query_type == "technical":
-            # Technical queries benefit more from keyword matching
-            self.keyword_weight = 0.4
-            self.vector_weight = 0.6
-        elif query_type == "soft_skills":
-            # Soft skills benefit more from semantic understanding
-            self.keyword_weight = 0.2
-            self.vector_weight = 0.8
-        elif query_type == "exact_match":
-            # Exact matches should heavily favor keywords
-            self.keyword_weight = 0.7
-            self.vector_weight = 0.3
-        else:
-            # Default balanced weights
-            self.keyword_weight = 0.3
-            self.vector_weight = 0.7
 
 
 # Singleton instance
@@ -0,0 +1,594 @@
+"""Durable background job queue: brokers, retry policy and workers."""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+from dataclasses import dataclass, fields, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from uuid import UUID, uuid4
+
+from sqlalchemy import desc, func, select, update
+
+from app.core.config import settings
+from app.models.background_job import BackgroundJob, JobStatus
+
+logger = logging.getLogger(__name__)
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help; the job is dead-lettered at once."""
+
+
+@dataclass
+class JobRecord:
+    """A background job as seen by handlers, workers and the status endpoint."""
+    
+    id: UUID
+    kind: str
+    payload: Dict[str, Any]
+    status: str
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    user_id: Optional[UUID] = None
+    locked_by: Optional[str] = None
+    locked_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    result: Any = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    @classmethod
+    def from_model(cls, job: BackgroundJob) -> "JobRecord":
+        return cls(**{field.name: getattr(job, field.name) for field in fields(cls)})
+
+
+JobHandler = Callable[[JobRecord], Awaitable[Any]]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobBroker:
+    """
+    Storage for jobs. A job is claimed by one worker at a time; claiming
+    counts an attempt. Completing or failing a job only takes effect while
+    the worker still holds it, so a job requeued from a lost worker cannot
+    be finished twice.
+    """
+    
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        max_attempts: int,
+        user_id: Optional[UUID] = None,
+        run_at: Optional[datetime] = None
+    ) -> JobRecord:
+        raise NotImplementedError
+    
+    async def claim(self, worker_id: str, kinds: Iterable[str], limit: int) -> List[JobRecord]:
+        """Mark up to ``limit`` due jobs as running for this worker."""
+        raise NotImplementedError
+    
+    async def complete(self, job_id: UUID, worker_id: str, result: Any = None) -> bool:
+        raise NotImplementedError
+    
+    async def fail(
+        self,
+        job_id: UUID,
+        worker_id: str,
+        error: str,
+        retry_at: Optional[datetime]
+    ) -> bool:
+        """Queue the job again at ``retry_at``, or dead-letter it if None."""
+        raise NotImplementedError
+    
+    async def requeue_stale(self, locked_before: datetime) -> int:
+        """Recover running jobs whose worker went away."""
+        raise NotImplementedError
+    
+    async def requeue(self, job_id: UUID) -> bool:
+        """Give a dead-lettered job a fresh set of attempts."""
+        raise NotImplementedError
+    
+    async def get(self, job_id: UUID) -> Optional[JobRecord]:
+        raise NotImplementedError
+    
+    async def list(self, status: Optional[str] = None, limit: int = 50) -> List[JobRecord]:
+        """Most recent jobs, optionally with one status."""
+        raise NotImplementedError
+
+
+class PostgresJobBroker(JobBroker):
+    """Jobs in the ``background_jobs`` table, claimed with FOR UPDATE SKIP LOCKED."""
+    
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory
+    
+    def _session(self):
+        if self._session_factory is None:
+            from app.db.session import async_session_maker
+            self._session_factory = async_session_maker
+        return self._session_factory()
+    
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        max_attempts: int,
+        user_id: Optional[UUID] = None,
+        run_at: Optional[datetime] = None
+    ) -> JobRecord:
+        job = BackgroundJob(
+            id=uuid4(),
+            kind=kind,
+            payload=payload,
+            user_id=user_id,
+            status=JobStatus.QUEUED,
+            attempts=0,
+            max_attempts=max_attempts,
+            run_at=run_at or _utcnow()
+        )
+        async with self._session() as db:
+            db.add(job)
+            await db.commit()
+            await db.refresh(job)
+            return JobRecord.from_model(job)
+    
+    async def claim(self, worker_id: str, kinds: Iterable[str], limit: int) -> List[JobRecord]:
+        # Concurrent workers skip each other's locked rows instead of waiting
+        due = (
+            select(BackgroundJob.id)
+            .where(
+                BackgroundJob.status == JobStatus.QUEUED,
+                BackgroundJob.run_at <= func.now(),
+                BackgroundJob.kind.in_(list(kinds))
+            )
+            .order_by(BackgroundJob.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(BackgroundJob)
+            .where(BackgroundJob.id.in_(due.scalar_subquery()))
+            .values(
+                status=JobStatus.RUNNING,
+                locked_by=worker_id,
+                locked_at=func.now(),
+                attempts=BackgroundJob.attempts + 1
+            )
+            .returning(BackgroundJob)
+            .execution_options(synchronize_session=False)
+        )
+        async with self._session() as db:
+            jobs = (await db.execute(stmt)).scalars().all()
+            await db.commit()
+            return [JobRecord.from_model(job) for job in jobs]
+    
+    async def _finish(self, job_id: UUID, worker_id: str, **values) -> bool:
+        stmt = (
+            update(BackgroundJob)
+            .where(
+                BackgroundJob.id == job_id,
+                BackgroundJob.status == JobStatus.RUNNING,
+                BackgroundJob.locked_by == worker_id
+            )
+            .values(locked_by=None, locked_at=None, **values)
+            .execution_options(synchronize_session=False)
+        )
+        async with self._session() as db:
+            result = await db.execute(stmt)
+            await db.commit()
+            return result.rowcount > 0
+    
+    async def complete(self, job_id: UUID, worker_id: str, result: Any = None) -> bool:
+        return await self._finish(
+            job_id, worker_id,
+            status=JobStatus.SUCCEEDED, result=result, last_error=None, finished_at=func.now()
+        )
+    
+    async def fail(
+        self,
+        job_id: UUID,
+        worker_id: str,
+        error: str,
+        retry_at: Optional[datetime]
+    ) -> bool:
+        if retry_at is None:
+            return await self._finish(
+                job_id, worker_id, status=JobStatus.DEAD, last_error=error, finished_at=func.now()
+            )
+        return await self._finish(
+            job_id, worker_id, status=JobStatus.QUEUED, last_error=error, run_at=retry_at
+        )
+    
+    async def requeue_stale(self, locked_before: datetime) -> int:
+        stale = (
+            BackgroundJob.status == JobStatus.RUNNING,
+            BackgroundJob.locked_at < locked_before
+        )
+        released = dict(locked_by=None, locked_at=None, last_error="Worker lost while running the job")
+        async with self._session() as db:
+            requeued = await db.execute(
+                update(BackgroundJob)
+                .where(*stale, BackgroundJob.attempts < BackgroundJob.max_attempts)
+                .values(status=JobStatus.QUEUED, run_at=func.now(), **released)
+                .execution_options(synchronize_session=False)
+            )
+            dead = await db.execute(
+                update(BackgroundJob)
+                .where(*stale, BackgroundJob.attempts >= BackgroundJob.max_attempts)
+                .values(status=JobStatus.DEAD, finished_at=func.now(), **released)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            return requeued.rowcount + dead.rowcount
+    
+    async def requeue(self, job_id: UUID) -> bool:
+        async with self._session() as db:
+            result = await db.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == job_id, BackgroundJob.status == JobStatus.DEAD)
+                .values(status=JobStatus.QUEUED, attempts=0, run_at=func.now(), finished_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            return result.rowcount > 0
+    
+    async def get(self, job_id: UUID) -> Optional[JobRecord]:
+        async with self._session() as db:
+            job = await db.get(BackgroundJob, job_id)
+            return JobRecord.from_model(job) if job else None
+    
+    async def list(self, status: Optional[str] = None, limit: int = 50) -> List[JobRecord]:
+        stmt = select(BackgroundJob).order_by(desc(BackgroundJob.created_at)).limit(limit)
+        if status:
+            stmt = stmt.where(BackgroundJob.status == status)
+        async with self._session() as db:
+            jobs = (await db.execute(stmt)).scalars().all()
+            return [JobRecord.from_model(job) for job in jobs]
+
+
+class InMemoryJobBroker(JobBroker):
+    """Process-local stand-in for the Postgres broker, for tests and development."""
+    
+    def __init__(self):
+        self._jobs: Dict[UUID, JobRecord] = {}
+    
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        max_attempts: int,
+        user_id: Optional[UUID] = None,
+        run_at: Optional[datetime] = None
+    ) -> JobRecord:
+        now = _utcnow()
+        job = JobRecord(
+            id=uuid4(),
+            kind=kind,
+            payload=payload,
+            status=JobStatus.QUEUED,
+            attempts=0,
+            max_attempts=max_attempts,
+            run_at=run_at or now,
+            user_id=user_id,
+            created_at=now
+        )
+        self._jobs[job.id] = job
+        return replace(job)
+    
+    async def claim(self, worker_id: str, kinds: Iterable[str], limit: int) -> List[JobRecord]:
+        now = _utcnow()
+        kinds = set(kinds)
+        due = sorted(
+            (
+                job for job in self._jobs.values()
+                if job.status == JobStatus.QUEUED and job.run_at <= now and job.kind in kinds
+            ),
+            key=lambda job: job.run_at
+        )[:limit]
+        for job in due:
+            job.status = JobStatus.RUNNING
+            job.locked_by = worker_id
+            job.locked_at = now
+            job.attempts += 1
+        return [replace(job) for job in due]
+    
+    def _held(self, job_id: UUID, worker_id: str) -> Optional[JobRecord]:
+        job = self._jobs.get(job_id)
+        if job and job.status == JobStatus.RUNNING and job.locked_by == worker_id:
+            return job
+        return None
+    
+    async def complete(self, job_id: UUID, worker_id: str, result: Any = None) -> bool:
+        job = self._held(job_id, worker_id)
+        if not job:
+            return False
+        job.status = JobStatus.SUCCEEDED
+        job.result = result
+        job.last_error = None
+        job.finished_at = _utcnow()
+        job.locked_by = job.locked_at = None
+        return True
+    
+    async def fail(
+        self,
+        job_id: UUID,
+        worker_id: str,
+        error: str,
+        retry_at: Optional[datetime]
+    ) -> bool:
+        job = self._held(job_id, worker_id)
+        if not job:
+            return False
+        job.last_error = error
+        job.locked_by = job.locked_at = None
+        if retry_at is None:
+            job.status = JobStatus.DEAD
+            job.finished_at = _utcnow()
+        else:
+            job.status = JobStatus.QUEUED
+            job.run_at = retry_at
+        return True
+    
+    async def requeue_stale(self, locked_before: datetime) -> int:
+        recovered = 0
+        for job in self._jobs.values():
+            if job.status != JobStatus.RUNNING or job.locked_at >= locked_before:
+                continue
+            job.locked_by = job.locked_at = None
+            job.last_error = "Worker lost while running the job"
+            if job.attempts < job.max_attempts:
+                job.status = JobStatus.QUEUED
+                job.run_at = _utcnow()
+            else:
+                job.status = JobStatus.DEAD
+                job.finished_at = _utcnow()
+            recovered += 1
+        return recovered
+    
+    async def requeue(self, job_id: UUID) -> bool:
+        job = self._jobs.get(job_id)
+        if not job or job.status != JobStatus.DEAD:
+            return False
+        job.status = JobStatus.QUEUED
+        job.attempts = 0
+        job.run_at = _utcnow()
+        job.finished_at = None
+        return True
+    
+    async def get(self, job_id: UUID) -> Optional[JobRecord]:
+        job = self._jobs.get(job_id)
+        return replace(job) if job else None
+    
+    async def list(self, status: Optional[str] = None, limit: int = 50) -> List[JobRecord]:
+        jobs = [job for job in self._jobs.values() if not status or job.status == status]
+        jobs.sort(key=lambda job: job.created_at, reverse=True)
+        return [replace(job) for job in jobs[:limit]]
+
+
+class JobQueue:
+    """
+    Job handlers plus the retry policy, on top of a broker.
+    
+    Web processes only ``enqueue``; ``JobWorker`` processes claim and run
+    the jobs. A failed attempt is retried with exponential backoff; after
+    ``max_attempts`` attempts, or on ``PermanentJobError``, the job is
+    dead-lettered (status "dead") and kept for inspection and manual retry.
+    """
+    
+    def __init__(self, broker: Optional[JobBroker] = None):
+        self.broker = broker or self._default_broker()
+        self.handlers: Dict[str, JobHandler] = {}
+        self.max_attempts = settings.JOB_MAX_ATTEMPTS
+        self.retry_base_delay = settings.JOB_RETRY_BASE_DELAY
+        self.retry_max_delay = settings.JOB_RETRY_MAX_DELAY
+    
+    @staticmethod
+    def _default_broker() -> JobBroker:
+        if settings.JOB_BROKER == "memory":
+            return InMemoryJobBroker()
+        return PostgresJobBroker()
+    
+    def register(self, kind: str, handler: JobHandler):
+        """Run ``handler(job)`` for jobs of this kind; its return value is stored as the result."""
+        self.handlers[kind] = handler
+    
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        user_id: Optional[UUID] = None,
+        max_attempts: Optional[int] = None,
+        delay: float = 0
+    ) -> JobRecord:
+        """Persist a job for a worker to run."""
+        job = await self.broker.enqueue(
+            kind,
+            payload,
+            max_attempts=max_attempts or self.max_attempts,
+            user_id=user_id,
+            run_at=_utcnow() + timedelta(seconds=delay) if delay else None
+        )
+        logger.info(f"Enqueued {kind} job {job.id}")
+        return job
+    
+    def retry_delay(self, attempts: int) -> float:
+        """Seconds before the next attempt: doubling per attempt, capped, with jitter."""
+        delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** max(attempts - 1, 0))
+        return delay / 2 + random.uniform(0, delay / 2)
+    
+    async def run_job(self, job: JobRecord, worker_id: str) -> str:
+        """Run one claimed job and record the outcome; returns the job's new status."""
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            await self.broker.fail(job.id, worker_id, f"No handler for job kind {job.kind}", retry_at=None)
+            return JobStatus.DEAD
+        
+        try:
+            result = await handler(job)
+        except asyncio.CancelledError:
+            # Worker shutting down: hand the job back now instead of after the visibility timeout
+            await asyncio.shield(self.broker.fail(job.id, worker_id, "Worker stopped", retry_at=_utcnow()))
+            raise
+        except PermanentJobError as e:
+            logger.error(f"Job {job.id} ({job.kind}) failed permanently: {e}")
+            await self.broker.fail(job.id, worker_id, str(e), retry_at=None)
+            return JobStatus.DEAD
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if job.attempts >= job.max_attempts:
+                logger.error(f"Job {job.id} ({job.kind}) dead-lettered after {job.attempts} attempts: {error}")
+                await self.broker.fail(job.id, worker_id, error, retry_at=None)
+                return JobStatus.DEAD
+            
+            delay = self.retry_delay(job.attempts)
+            logger.warning(
+                f"Job {job.id} ({job.kind}) attempt {job.attempts}/{job.max_attempts} failed, "
+                f"retrying in {delay:.1f}s: {error}"
+            )
+            await self.broker.fail(job.id, worker_id, error, retry_at=_utcnow() + timedelta(seconds=delay))
+            return JobStatus.QUEUED
+        
+        await self.broker.complete(job.id, worker_id, result)
+        return JobStatus.SUCCEEDED
+    
+    async def get(self, job_id: UUID) -> Optional[JobRecord]:
+        return await self.broker.get(job_id)
+    
+    async def list(self, status: Optional[str] = None, limit: int = 50) -> List[JobRecord]:
+        return await self.broker.list(status=status, limit=limit)
+    
+    async def requeue(self, job_id: UUID) -> bool:
+        return await self.broker.requeue(job_id)
+
+
+class JobWorker:
+    """
+    Claims and runs jobs, up to ``concurrency`` at a time.
+    
+    Run one per worker process (``python -m app.worker``), or inside the
+    API process when ``JOB_WORKER_EMBEDDED`` is set. ``stop`` stops
+    claiming and lets running jobs finish; running jobs of a worker that
+    died are requeued by any worker after the visibility timeout.
+    """
+    
+    def __init__(
+        self,
+        queue: JobQueue,
+        concurrency: Optional[int] = None,
+        kinds: Optional[Iterable[str]] = None,
+        poll_interval: Optional[float] = None,
+        worker_id: Optional[str] = None
+    ):
+        self.queue = queue
+        self.concurrency = concurrency or settings.JOB_WORKER_CONCURRENCY
+        self.kinds = list(kinds) if kinds else None
+        self.poll_interval = poll_interval if poll_interval is not None else settings.JOB_POLL_INTERVAL
+        self.visibility_timeout = settings.JOB_VISIBILITY_TIMEOUT
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:6]}"
+        self._tasks: Set[asyncio.Task] = set()
+        self._stopping = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self._last_recovery: Optional[float] = None
+    
+    async def run(self):
+        """Claim and run jobs until ``stop`` is called, then drain running jobs."""
+        self._wakeup = asyncio.Event()
+        logger.info(f"Job worker {self.worker_id} started with concurrency {self.concurrency}")
+        try:
+            while not self._stopping:
+                claimed = await self._claim_and_start()
+                if claimed and len(self._tasks) < self.concurrency:
+                    continue
+                await self._wait_for_work()
+        except asyncio.CancelledError:
+            # Hard shutdown: cancelled jobs hand themselves back to the queue
+            for task in self._tasks:
+                task.cancel()
+            raise
+        finally:
+            if self._tasks:
+                logger.info(f"Job worker {self.worker_id} waiting for {len(self._tasks)} running jobs")
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            logger.info(f"Job worker {self.worker_id} stopped")
+    
+    def stop(self):
+        """Stop claiming new jobs; ``run`` returns once running jobs finish."""
+        self._stopping = True
+        if self._wakeup:
+            self._wakeup.set()
+    
+    async def run_until_idle(self):
+        """Run jobs until none are due and none are running (tests and scripts)."""
+        while True:
+            claimed = await self._claim_and_start()
+            if not claimed and not self._tasks:
+                return
+            if self._tasks and (not claimed or len(self._tasks) >= self.concurrency):
+                await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
+    
+    async def _claim_and_start(self) -> int:
+        """Claim jobs for the free slots and start them; returns how many were claimed."""
+        free = self.concurrency - len(self._tasks)
+        if free <= 0:
+            return 0
+        
+        try:
+            await self._recover_stale()
+            jobs = await self.queue.broker.claim(
+                self.worker_id, self.kinds or list(self.queue.handlers), free
+            )
+        except Exception as e:
+            logger.error(f"Job worker {self.worker_id} could not claim jobs: {e}")
+            return 0
+        
+        for job in jobs:
+            task = asyncio.create_task(self._run(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return len(jobs)
+    
+    async def _run(self, job: JobRecord):
+        try:
+            status = await self.queue.run_job(job, self.worker_id)
+            logger.info(f"Job {job.id} ({job.kind}) attempt {job.attempts}: {status}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # The broker could not record the outcome; the visibility timeout recovers the job
+            logger.error(f"Job {job.id} ({job.kind}) outcome not recorded: {e}")
+        finally:
+            if self._wakeup:
+                self._wakeup.set()
+    
+    async def _recover_stale(self):
+        """Requeue jobs of lost workers, at most every half visibility timeout."""
+        now = time.monotonic()
+        if self._last_recovery is not None and now - self._last_recovery < self.visibility_timeout / 2:
+            return
+        self._last_recovery = now
+        recovered = await self.queue.broker.requeue_stale(
+            _utcnow() - timedelta(seconds=self.visibility_timeout)
+        )
+        if recovered:
+            logger.warning(f"Recovered {recovered} jobs from lost workers")
+    
+    async def _wait_for_work(self):
+        """Sleep until the poll interval passes, a job finishes or ``stop`` is called."""
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+# Singleton instance
+job_queue = JobQueue()
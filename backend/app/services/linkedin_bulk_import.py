@@ -0,0 +1,239 @@
+"""Bulk import of LinkedIn profiles with batched database writes."""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.resume import Resume
+from app.services.linkedin_parser import LinkedInParser
+from app.services.reindex_service import reindex_service
+from app.services.search_cache import search_result_cache
+from app.services.search_skill_fix import normalize_skill_for_storage
+from app.services.skill_index import skill_index
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement, well under the 32767 bind parameters Postgres allows
+INSERT_CHUNK_SIZE = 500
+
+DUPLICATE_MESSAGE = "This profile has already been imported"
+
+
+def normalize_linkedin_url(url: str) -> str:
+    """Remove query parameters and the trailing slash from a profile URL."""
+    return url.split('?')[0].rstrip('/')
+
+
+def build_resume_data(
+    profile: Dict[str, Any],
+    parsed_data: Dict[str, Any],
+    user_id: UUID,
+    linkedin_url: str
+) -> Dict[str, Any]:
+    """Resume column values for an imported profile and its parsed data."""
+    now = datetime.utcnow()
+    return {
+        "user_id": user_id,
+        "first_name": parsed_data.get("first_name", ""),
+        "last_name": parsed_data.get("last_name", ""),
+        "email": profile.get("email") or parsed_data.get("email", ""),  # Use email from Chrome extension if provided
+        "phone": profile.get("phone") or parsed_data.get("phone", ""),  # Use phone from Chrome extension if provided
+        "location": profile.get("location") or "",
+        "summary": profile.get("about") or "",
+        "current_title": profile.get("headline") or "",
+        "years_experience": profile.get("years_experience") or parsed_data.get("years_experience", 0),
+        "skills": [normalize_skill_for_storage(skill) for skill in (profile.get("skills") or [])],
+        "keywords": parsed_data.get("keywords", []),
+        "linkedin_url": linkedin_url,
+        "linkedin_data": profile,
+        "last_linkedin_sync": now,
+        "status": "active",
+        "parse_status": "completed",
+        "parsed_at": now,
+        "raw_text": parsed_data.get("raw_text", ""),
+        "parsed_data": parsed_data
+    }
+
+
+class LinkedInBulkImporter:
+    """
+    Import a batch of LinkedIn profiles for one user.
+    
+    Importing profiles one at a time costs three duplicate-check queries,
+    an AI parse and a commit per profile, all in sequence. Here the whole
+    batch is checked for duplicates in one query, profiles are parsed
+    concurrently (at most ``LINKEDIN_IMPORT_PARSE_CONCURRENCY`` at once),
+    the resumes are written with one multi-row INSERT and a single commit,
+    and embedding and vector indexing is queued as one batch job.
+    """
+    
+    def __init__(self, parser: Optional[LinkedInParser] = None, parse_concurrency: Optional[int] = None):
+        self._parser = parser
+        self.parse_concurrency = parse_concurrency or settings.LINKEDIN_IMPORT_PARSE_CONCURRENCY
+    
+    @property
+    def parser(self) -> LinkedInParser:
+        if self._parser is None:
+            self._parser = LinkedInParser()
+        return self._parser
+    
+    async def import_profiles(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        profiles: Sequence[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Import profiles, reporting the outcome of each in request order.
+        
+        Args:
+            db: Database session
+            user_id: The importing user, who owns the new resumes
+            profiles: Profile data as sent by the Chrome extension
+        
+        Returns:
+            Counts of imported, duplicate and failed profiles, and one
+            detail entry per profile
+        """
+        details: List[Optional[Dict[str, Any]]] = [None] * len(profiles)
+        urls = [normalize_linkedin_url(profile["linkedin_url"]) for profile in profiles]
+        
+        # Duplicates of earlier imports, or of an earlier entry in this batch
+        existing = await self._existing_urls(db, user_id, set(urls))
+        pending: List[int] = []
+        for i, url in enumerate(urls):
+            if url in existing:
+                details[i] = self._duplicate(profiles[i])
+            else:
+                existing.add(url)
+                pending.append(i)
+        
+        # Parse concurrently, keeping each profile's failure to itself
+        parsed = await self._parse_all([profiles[i] for i in pending])
+        to_insert: List[int] = []
+        rows: List[Dict[str, Any]] = []
+        for i, parsed_data in zip(pending, parsed):
+            if isinstance(parsed_data, Exception):
+                logger.error(f"Failed to parse LinkedIn profile {profiles[i]['linkedin_url']}: {parsed_data}")
+                details[i] = self._failure(profiles[i], str(parsed_data))
+                continue
+            to_insert.append(i)
+            rows.append(build_resume_data(profiles[i], parsed_data, user_id, urls[i]))
+        
+        # Write all new resumes in one transaction
+        inserted: Dict[str, UUID] = {}
+        if rows:
+            try:
+                inserted = await self._insert_rows(db, rows)
+                await db.commit()
+            except Exception as e:
+                logger.error(f"Failed to insert {len(rows)} LinkedIn profiles for user {user_id}: {e}")
+                await db.rollback()
+                for i in to_insert:
+                    details[i] = self._failure(profiles[i], f"Failed to import profile: {str(e)}")
+                to_insert = []
+        
+        for i in to_insert:
+            resume_id = inserted.get(urls[i])
+            if resume_id is None:
+                # Imported concurrently since the duplicate check
+                details[i] = self._duplicate(profiles[i])
+            else:
+                details[i] = {
+                    "linkedin_url": profiles[i]["linkedin_url"],
+                    "success": True,
+                    "is_duplicate": False,
+                    "candidate_id": resume_id
+                }
+        
+        if inserted:
+            await search_result_cache.bump_version(user_id)
+            await skill_index.invalidate_popular_skills(user_id)
+            try:
+                await reindex_service.enqueue_index_batch(list(inserted.values()), user_id=user_id)
+            except Exception as e:
+                # The resumes are saved; a re-index picks them up
+                logger.error(f"Failed to queue indexing of {len(inserted)} imported profiles: {e}")
+        
+        logger.info(
+            f"Bulk imported {len(inserted)} of {len(profiles)} LinkedIn profiles for user {user_id}"
+        )
+        return {
+            "total": len(profiles),
+            "imported": sum(1 for detail in details if detail["success"]),
+            "duplicates": sum(1 for detail in details if detail.get("is_duplicate")),
+            "failed": sum(1 for detail in details if not detail["success"] and not detail.get("is_duplicate")),
+            "details": details
+        }
+    
+    async def _existing_urls(self, db: AsyncSession, user_id: UUID, urls: Iterable[str]) -> Set[str]:
+        """Normalized URLs the user has already imported, in one query."""
+        urls = list(urls)
+        if not urls:
+            return set()
+        
+        # Older imports may have stored the URL with a trailing slash
+        stmt = select(Resume.linkedin_url).where(
+            Resume.user_id == user_id,
+            Resume.status != 'deleted',
+            Resume.linkedin_url.in_(urls + [url + '/' for url in urls])
+        )
+        result = await db.execute(stmt)
+        return {normalize_linkedin_url(url) for url in result.scalars().all()}
+    
+    async def _parse_all(self, profiles: Sequence[Dict[str, Any]]) -> List[Any]:
+        """Parsed data for each profile, or the exception parsing it raised."""
+        semaphore = asyncio.Semaphore(self.parse_concurrency)
+        
+        async def parse(profile: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.parser.parse_linkedin_data(dict(profile))
+        
+        return await asyncio.gather(*(parse(profile) for profile in profiles), return_exceptions=True)
+    
+    async def _insert_rows(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> Dict[str, UUID]:
+        """Insert resumes with multi-row INSERTs; returns linkedin_url -> id of inserted rows.
+        
+        Rows that hit the per-user LinkedIn URL constraint (a concurrent
+        import of the same profile) are skipped rather than failing the
+        batch; any other constraint violation still raises. Does not commit.
+        """
+        inserted = {}
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            stmt = (
+                insert(Resume)
+                .values(rows[start:start + INSERT_CHUNK_SIZE])
+                .on_conflict_do_nothing(constraint="resumes_user_id_linkedin_url_key")
+                .returning(Resume.id, Resume.linkedin_url)
+            )
+            result = await db.execute(stmt)
+            inserted.update({row.linkedin_url: row.id for row in result.all()})
+        return inserted
+    
+    @staticmethod
+    def _duplicate(profile: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "linkedin_url": profile["linkedin_url"],
+            "success": False,
+            "is_duplicate": True,
+            "error": DUPLICATE_MESSAGE
+        }
+    
+    @staticmethod
+    def _failure(profile: Dict[str, Any], error: str) -> Dict[str, Any]:
+        return {
+            "linkedin_url": profile["linkedin_url"],
+            "success": False,
+            "error": error
+        }
+
+
+# Singleton instance
+linkedin_bulk_importer = LinkedInBulkImporter()
@@ -9,6 +9,7 @@ from datetime import datetime
 from openai import AsyncOpenAI
 
 from app.core.config import settings
+from app.services.content_cache import ContentCache, ContentKind, chat_cost, content_cache
 
 try:
     from app.services.search_skill_fix import (
@@ -338,18 +339,20 @@ Phone: {profile_data.get('phone', '') or 'Not provided'}
 About: {profile_data.get('about', '')[:500] if profile_data.get('about') else ''}
 Skills: {', '.join([normalize_skill_for_storage(s) for s in profile_data.get('skills', [])[:20]])}"""
         
+        # A re-synced profile with unchanged text reuses the earlier parse
+        cached = await content_cache.get_or_compute(
+            ContentKind.LINKEDIN_PARSE,
+            ContentCache.version(self.model, system_prompt),
+            user_prompt,
+            lambda: self._complete_json(system_prompt, user_prompt),
+            cost=lambda result: chat_cost(system_prompt + user_prompt, result),
+            source=profile_data.get("full_text")  # Stored as the resume's raw text
+        )
+        if cached is None:
+            return None
+        
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0,
-                response_format={"type": "json_object"}
-            )
-            
-            parsed = json.loads(response.choices[0].message.content)
+            parsed = dict(cached)
             
             # Normalize skills
             if parsed.get("skills"):
@@ -375,6 +378,26 @@ Skills: {', '.join([normalize_skill_for_storage(s) for s in profile_data.get('sk
             logger.info(f"Successfully parsed LinkedIn profile with AI: {parsed.get('first_name')} {parsed.get('last_name')}")
             return parsed
             
+        except Exception as e:
+            logger.error(f"AI parsing error: {str(e)}")
+            return None
+    
+    async def _complete_json(self, system_prompt: str, user_prompt: str) -> Optional[Dict[str, Any]]:
+        """The raw JSON object from OpenAI, or None on error."""
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0,
+                response_format={"type": "json_object"}
+            )
+            
+            parsed = json.loads(response.choices[0].message.content)
+            return parsed if isinstance(parsed, dict) else None
+            
         except Exception as e:
             logger.error(f"AI parsing error: {str(e)}")
             return None
\ No newline at end of file
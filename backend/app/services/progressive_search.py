@@ -6,21 +6,23 @@ import time
 from typing import List, Dict, Any, Optional, Tuple, AsyncGenerator
 from uuid import UUID
 from datetime import datetime, timezone
-import json
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_, and_, cast
-from sqlalchemy.types import String as SQLString
+from sqlalchemy import select, or_, and_, cast
 
+from app.db.session import async_session_maker
 from app.models.resume import Resume
 from app.services.vector_search import vector_search
 from app.services.query_parser import query_parser
 from app.services.async_query_parser import async_query_parser
-from app.services.hybrid_search import hybrid_search
+from app.services.hybrid_search import hybrid_search, get_search_preset
+from app.services.search_cache import search_result_cache
+from app.services.search_card import fetch_search_cards, select_search_cards
+from app.services.skill_index import skill_index
 from app.services.gpt4_query_analyzer import gpt4_analyzer
 from app.services.candidate_analytics import candidate_analytics_service
 from app.services.career_dna import career_dna_service
-from app.core.redis import get_redis_client
+from app.core.redis import RedisKeys
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -29,20 +31,18 @@ logger = logging.getLogger(__name__)
 class ProgressiveSearchEngine:
     """
     Implements a multi-stage progressive search that delivers results incrementally:
-    1. Instant Results: Cache hits and basic keyword matches (<50ms)
+    1. Instant Results: Basic keyword matches, or the whole search from cache (<50ms)
     2. Enhanced Results: Vector search with skill matching (<200ms)
     3. Intelligent Results: Deep analysis with explanations (<500ms)
     """
     
-    def __init__(self):
-        self.cache_ttl = 3600  # 1 hour cache
-        self.redis_client = None
-        
-    async def _get_redis(self):
-        """Get Redis client lazily."""
-        if not self.redis_client:
-            self.redis_client = await get_redis_client()
-        return self.redis_client
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory
+    
+    def _session(self):
+        if self._session_factory is None:
+            self._session_factory = async_session_maker
+        return self._session_factory()
     
     async def search_progressive(
         self,
@@ -50,18 +50,359 @@ class ProgressiveSearchEngine:
         query: str,
         user_id: UUID,
         limit: int = 10,
-        filters: Optional[dict] = None
+        filters: Optional[dict] = None,
+        pipelined: Optional[bool] = None
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Perform progressive search that yields results in stages.
         
+        Stage 1 runs on the local query parser so it never waits on OpenAI.
+        AI typo correction and GPT-4.1-mini query analysis run as a background
+        task; once it finishes an ``analysis`` event is yielded with the
+        refined query analysis, and the stages after it use the refined parse.
+        The analysis is awaited before stage 3 at the latest.
+        
+        In pipelined mode (PROGRESSIVE_SEARCH_PIPELINED) stage 2 is started
+        together with stage 1 on the local parse instead of after it. Events
+        are still yielded in stage order.
+        
+        Each stage has a deadline (PROGRESSIVE_STAGE*_DEADLINE, in seconds
+        after the search started). A stage that misses it is cancelled and
+        yields partial results with ``partial`` set: stage 1 yields nothing,
+        stage 2 yields the stage 1 results and stage 3 yields the stage 2
+        results with basic explanations. The wait for the AI analysis before
+        stage 3 has its own deadline (PROGRESSIVE_ANALYSIS_DEADLINE); when it
+        is missed, stage 3 runs on the local parse.
+        
+        Closing the generator (e.g. when the client disconnects) cancels all
+        stages and the analysis that are still running.
+        
+        Final results are cached per user under a hash of the normalized
+        query, filters and limit at the user's corpus version (see
+        SearchResultCache); a cache hit yields a single final event with
+        ``cached`` set. Identical searches running at the same time share
+        one computation and receive the same events. The shared search runs
+        on a session of its own rather than on ``db``, since it can outlive
+        the request that started it.
+        
         Yields:
-            Dictionary with stage info and results
+            Dictionary with stage info and results. Stage events carry
+            ``timing_ms`` (since the search started), ``stage_timing_ms``
+            (time spent in that stage) and ``stage_timings_ms`` (all timings
+            so far, including "parse" and, once known, "analysis").
         """
+        start_time = time.time()
+        cache_key = await search_result_cache.cache_key(user_id, query, filters, limit)
+        cached = await self._get_cached_results(cache_key)
+        if cached:
+            logger.info(f"[PROGRESSIVE] Cache hit for '{query}'")
+            yield self._cached_event(query, user_id, cached, start_time)
+            return
+        
+        flight_key = cache_key or RedisKeys.SEARCH_CACHE.format(
+            user_id=user_id, query_hash=search_result_cache.fingerprint(query, filters, limit)
+        )
+        stream = search_result_cache.coalesce(
+            flight_key,
+            lambda: self._shared_search(query, user_id, limit, filters, pipelined, cache_key)
+        )
+        try:
+            async for event in stream:
+                yield event
+        finally:
+            await stream.aclose()
+    
+    async def _shared_search(
+        self,
+        query: str,
+        user_id: UUID,
+        limit: int,
+        filters: Optional[dict],
+        pipelined: Optional[bool],
+        cache_key: Optional[str]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Run ``_search_stages`` on its own session, closed once the stages are."""
+        async with self._session() as db:
+            stages = self._search_stages(db, query, user_id, limit, filters, pipelined, cache_key)
+            try:
+                async for event in stages:
+                    yield event
+            finally:
+                await stages.aclose()
+    
+    async def _search_stages(
+        self,
+        db: AsyncSession,
+        query: str,
+        user_id: UUID,
+        limit: int,
+        filters: Optional[dict],
+        pipelined: Optional[bool],
+        cache_key: Optional[str]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Run the three stages of ``search_progressive`` (uncached)."""
+        if pipelined is None:
+            pipelined = settings.PROGRESSIVE_SEARCH_PIPELINED
+        
         start_time = time.time()
         search_id = f"search_{user_id}_{int(time.time() * 1000)}"
+        stage_timings = {}
+        
+        # Parse locally for the instant stage
+        parse_start = time.time()
+        parsed_query = query_parser.parse_query(query)
+        frontend_query_analysis, search_suggestions = self._local_query_analysis(query, parsed_query)
+        stage_timings["parse"] = self._elapsed_ms(parse_start)
+        
+        # AI typo correction + GPT-4.1-mini analysis in the background
+        analysis_task = asyncio.create_task(self._analyze_query(query, parsed_query))
+        
+        stage1_task = asyncio.create_task(self._timed(
+            self._stage1_instant_results(db, query, user_id, limit, filters, parsed_query)
+        ))
+        stage2_task = None
+        stage3_task = None
+        if pipelined:
+            # Concurrent hybrid search runs its keyword leg on its own session,
+            # so stage 2 never shares ``db`` with stage 1
+            stage2_task = asyncio.create_task(self._timed(
+                self._stage2_enhanced_results(
+                    db, query, user_id, limit * 2, filters, parsed_query, [], concurrent=True
+                )
+            ))
+        
+        logger.info(f"Progressive search started: '{query}' for user {user_id} (pipelined={pipelined})")
+        print(f"\n[PROGRESSIVE SEARCH] Started for query: '{query}'")
         
-        # Parse query once for all stages (use async parser with AI typo correction)
+        try:
+            # Stage 1: Instant Results (Basic Keyword)
+            stage1_complete = await self._await_stage(
+                stage1_task, start_time, settings.PROGRESSIVE_STAGE1_DEADLINE, db=db
+            )
+            if stage1_complete:
+                stage1_results, stage_timings["instant"] = stage1_task.result()
+            else:
+                logger.warning(f"[PROGRESSIVE] Stage 1 missed its deadline for query: {query}")
+                stage1_results, stage_timings["instant"] = [], self._elapsed_ms(start_time)
+            
+            yield {
+                "stage": "instant",
+                "stage_number": 1,
+                "total_stages": 3,
+                "search_id": search_id,
+                "query": query,
+                "parsed_query": frontend_query_analysis,
+                "suggestions": search_suggestions,
+                "results": stage1_results,
+                "count": len(stage1_results),
+                "timing_ms": int((time.time() - start_time) * 1000),
+                "stage_timing_ms": stage_timings["instant"],
+                "stage_timings_ms": dict(stage_timings),
+                "analysis_pending": not analysis_task.done(),
+                "pipelined": pipelined,
+                "partial": not stage1_complete,
+                "is_final": False
+            }
+            
+            # Use the AI analysis for stage 2 if it has already arrived
+            analysis = None
+            if analysis_task.done():
+                analysis = analysis_task.result()
+                parsed_query = analysis["parsed_query"]
+                frontend_query_analysis = analysis["query_analysis"]
+                search_suggestions = analysis["suggestions"]
+                stage_timings["analysis"] = analysis["elapsed_ms"]
+                yield self._analysis_event(search_id, query, analysis, start_time)
+            
+            # Stage 2: Enhanced Results (Vector Search + Skill Matching)
+            logger.info(f"[PROGRESSIVE] Starting Stage 2 for query: {query}")
+            stage_start = time.time()
+            if stage2_task is None:
+                stage2_task = asyncio.create_task(self._timed(
+                    self._stage2_enhanced_results(
+                        db, query, user_id, limit * 2, filters, parsed_query, stage1_results
+                    )
+                ))
+            stage2_complete = await self._await_stage(
+                stage2_task, start_time, settings.PROGRESSIVE_STAGE2_DEADLINE, db=db
+            )
+            if stage2_complete:
+                (stage2_results, hybrid_metadata), stage_timings["enhanced"] = stage2_task.result()
+                logger.info(f"[PROGRESSIVE] Stage 2 returned {len(stage2_results)} results")
+            else:
+                logger.warning(f"[PROGRESSIVE] Stage 2 missed its deadline, yielding stage 1 results")
+                stage2_results, hybrid_metadata = [], None
+                stage_timings["enhanced"] = self._elapsed_ms(stage_start)
+            
+            # Merge and deduplicate results
+            merged_results = self._merge_results(stage1_results, stage2_results, limit)
+            
+            print(f"[PROGRESSIVE] Stage 2 yielding {len(merged_results)} results")
+            if merged_results and len(merged_results) > 0:
+                first_result = merged_results[0][0]
+                print(f"[PROGRESSIVE] First result has availability: {first_result.get('availability_score')}")
+            
+            yield {
+                "stage": "enhanced", 
+                "stage_number": 2,
+                "total_stages": 3,
+                "search_id": search_id,
+                "query": query,
+                "parsed_query": frontend_query_analysis,
+                "suggestions": search_suggestions,
+                "results": merged_results,
+                "count": len(merged_results),
+                "timing_ms": int((time.time() - start_time) * 1000),
+                "stage_timing_ms": stage_timings["enhanced"],
+                "stage_timings_ms": dict(stage_timings),
+                "hybrid_search": hybrid_metadata,
+                "analysis_pending": analysis is None,
+                "partial": not stage2_complete,
+                "is_final": False
+            }
+            
+            # Stage 3 explains matches against the AI analysis, so wait for it now,
+            # up to its own deadline so a slow LLM call leaves stage 3 its budget
+            if analysis is None and await self._await_stage(
+                analysis_task, start_time, settings.PROGRESSIVE_ANALYSIS_DEADLINE
+            ):
+                analysis = analysis_task.result()
+                parsed_query = analysis["parsed_query"]
+                frontend_query_analysis = analysis["query_analysis"]
+                search_suggestions = analysis["suggestions"]
+                stage_timings["analysis"] = analysis["elapsed_ms"]
+                yield self._analysis_event(search_id, query, analysis, start_time)
+            
+            # Stage 3: Intelligent Results (Deep Analysis + Explanations)
+            stage_start = time.time()
+            stage3_task = asyncio.create_task(self._timed(
+                self._stage3_intelligent_results(db, merged_results, query, parsed_query, user_id)
+            ))
+            stage3_complete = await self._await_stage(
+                stage3_task, start_time, settings.PROGRESSIVE_STAGE3_DEADLINE
+            )
+            if stage3_complete:
+                final_results, stage_timings["intelligent"] = stage3_task.result()
+            else:
+                logger.warning(f"[PROGRESSIVE] Stage 3 missed its deadline, yielding basic explanations")
+                final_results = merged_results
+                for resume_data, score in final_results:
+                    if not resume_data.get("match_explanation"):
+                        resume_data["match_explanation"] = self._generate_basic_explanation(
+                            resume_data, parsed_query, score
+                        )
+                stage_timings["intelligent"] = self._elapsed_ms(stage_start)
+            
+            final_event = {
+                "stage": "intelligent",
+                "stage_number": 3,
+                "total_stages": 3,
+                "search_id": search_id,
+                "query": query,
+                "parsed_query": frontend_query_analysis,
+                "suggestions": search_suggestions,
+                "results": final_results[:limit],
+                "count": len(final_results[:limit]),
+                "timing_ms": int((time.time() - start_time) * 1000),
+                "stage_timing_ms": stage_timings["intelligent"],
+                "stage_timings_ms": dict(stage_timings),
+                "partial": not stage3_complete,
+                "is_final": True,
+                "search_quality_score": self._calculate_quality_score(final_results[:limit], parsed_query)
+            }
+            
+            # Only complete searches are cached; partial results would stick around
+            if stage1_complete and stage2_complete and stage3_complete:
+                await self._cache_results(cache_key, final_event)
+            
+            yield final_event
+        finally:
+            # Don't leave stages or the LLM call running if the client went away,
+            # and let them unwind before the session is closed
+            pending = {
+                task for task in (analysis_task, stage1_task, stage2_task, stage3_task)
+                if task is not None and not task.done()
+            }
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+    
+    @staticmethod
+    def _elapsed_ms(start: float) -> int:
+        """Milliseconds since ``start``."""
+        return int((time.time() - start) * 1000)
+    
+    async def _timed(self, coro) -> Tuple[Any, int]:
+        """Await a stage and return (result, milliseconds it took)."""
+        start = time.time()
+        result = await coro
+        return result, self._elapsed_ms(start)
+    
+    @staticmethod
+    async def _await_stage(
+        task: asyncio.Task,
+        start_time: float,
+        deadline: float,
+        db: Optional[AsyncSession] = None
+    ) -> bool:
+        """
+        Wait for a stage task until ``deadline`` seconds after ``start_time``.
+        
+        Returns True if the task finished in time; otherwise cancels it,
+        waits for it to unwind and returns False. A deadline of 0 waits
+        indefinitely. Pass the stage's ``db`` to roll it back after a
+        cancellation, so the next stage gets a usable session.
+        """
+        timeout = max(0.0, start_time + deadline - time.time()) if deadline > 0 else None
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+        if task in done:
+            return True
+        
+        task.cancel()
+        await asyncio.wait({task})
+        if db is not None:
+            try:
+                await db.rollback()
+            except Exception as e:
+                logger.warning(f"[PROGRESSIVE] Rollback after a cancelled stage failed: {e}")
+        return False
+    
+    def _analysis_event(
+        self,
+        search_id: str,
+        query: str,
+        analysis: Dict[str, Any],
+        start_time: float
+    ) -> Dict[str, Any]:
+        """Build the event that streams the AI query analysis to the client."""
+        return {
+            "stage": "analysis",
+            "search_id": search_id,
+            "query": query,
+            "parsed_query": analysis["query_analysis"],
+            "suggestions": analysis["suggestions"],
+            "corrected_query": analysis["parsed_query"].get("corrected_query"),
+            "results": [],
+            "count": 0,
+            "timing_ms": int((time.time() - start_time) * 1000),
+            "stage_timing_ms": analysis["elapsed_ms"],
+            "is_final": False
+        }
+    
+    async def _analyze_query(self, query: str, local_parse: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run AI typo correction and GPT-4.1-mini analysis for a query.
+        
+        Never raises: falls back to the local parse and rule-based analysis.
+        
+        Returns:
+            Dictionary with the refined ``parsed_query``, frontend
+            ``query_analysis``, ``suggestions`` and ``elapsed_ms``
+        """
+        analysis_start = time.time()
+        
+        # Parse with AI typo correction
         try:
             parsed_query = await async_query_parser.parse_query_async(query)
             logger.info(f"[PROGRESSIVE] Using AI-powered query parser with corrections")
@@ -70,23 +411,18 @@ class ProgressiveSearchEngine:
             logger.info(f"[PROGRESSIVE] Corrected query: {parsed_query.get('corrected_query')}")
         except Exception as e:
             logger.warning(f"[PROGRESSIVE] AI parser failed, falling back to basic parser: {e}")
-            parsed_query = query_parser.parse_query(query)
-        
-        required_skills = parsed_query["skills"]
-        primary_skill = parsed_query.get("primary_skill")
+            parsed_query = dict(local_parse)
         
         # Get advanced analysis using GPT4 for Mind Reader Search
-        search_suggestions = []
         try:
             # Use corrected query if available, otherwise use original query
-            query_for_analysis = parsed_query.get("corrected_query", query)
+            query_for_analysis = parsed_query.get("corrected_query") or query
             
             # IMPORTANT: When we have a corrected query, we need to ensure the parsed_query
             # contains the corrected skills for the fallback enhanced parse
             if parsed_query.get("corrected_query") and parsed_query.get("corrected_query") != query:
                 # Re-parse the corrected query to ensure we have the right skills
-                from app.services.query_parser import query_parser as basic_parser
-                corrected_parse = basic_parser.parse_query(parsed_query["corrected_query"])
+                corrected_parse = query_parser.parse_query(parsed_query["corrected_query"])
                 # Update the skills in parsed_query with the corrected ones
                 if corrected_parse.get("skills"):
                     parsed_query["skills"] = corrected_parse["skills"]
@@ -115,135 +451,86 @@ class ProgressiveSearchEngine:
             logger.info(f"[PROGRESSIVE] Secondary skills: {frontend_query_analysis['secondary_skills']}")
             logger.info(f"[PROGRESSIVE] Implied skills: {frontend_query_analysis['implied_skills']}")
             logger.info(f"[PROGRESSIVE] Suggestions: {search_suggestions}")
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.warning(f"GPT4 analysis failed, using enhanced basic analysis: {e}")
-            # Use the enhanced basic parse from GPT4 analyzer
-            try:
-                enhanced_basic = gpt4_analyzer._enhance_basic_parse(parsed_query)
-                frontend_query_analysis = {
-                    "primary_skills": enhanced_basic.get("primary_skills", parsed_query.get("skills", [])),
-                    "secondary_skills": enhanced_basic.get("secondary_skills", []),
-                    "implied_skills": enhanced_basic.get("implied_skills", []),
-                    "experience_level": enhanced_basic.get("experience_level", self._determine_experience_level(parsed_query)),
-                    "role_type": enhanced_basic.get("role_type", parsed_query.get("roles", ["any"])[0] if parsed_query.get("roles") else "any"),
-                    "search_intent": enhanced_basic.get("search_intent", "technical" if parsed_query.get("skills") else "general"),
-                    "corrected_query": parsed_query.get("corrected_query") if parsed_query.get("corrected_query") != query else None,
-                    "original_query": query if parsed_query.get("corrected_query") else None
-                }
-                # Get suggestions from enhanced basic analysis
-                search_suggestions = gpt4_analyzer.get_search_suggestions(enhanced_basic)
-                logger.info(f"[PROGRESSIVE] Using enhanced basic analysis - secondary skills: {frontend_query_analysis['secondary_skills']}")
-                
-                # CRITICAL FIX: If we still have no secondary skills but we have primary skills,
-                # force populate them based on the primary skills
-                if (not frontend_query_analysis.get("secondary_skills") and 
-                    frontend_query_analysis.get("primary_skills")):
-                    logger.warning("[PROGRESSIVE] No secondary skills found, forcing population")
-                    
-                    # Manual skill mappings as last resort
-                    skill_map = {
-                        "javascript": ["react", "node.js", "typescript", "vue", "angular"],
-                        "python": ["django", "flask", "fastapi", "pandas", "numpy"],
-                        "java": ["spring", "spring boot", "hibernate", "maven", "gradle"],
-                        "aws": ["docker", "terraform", "kubernetes", "lambda", "s3"],
-                        "react": ["redux", "next.js", "styled-components", "webpack", "jest"],
-                        "go": ["microservices", "grpc", "docker", "kubernetes", "prometheus"],
-                        "golang": ["microservices", "grpc", "docker", "kubernetes", "prometheus"],
-                    }
-                    
-                    for primary_skill in frontend_query_analysis["primary_skills"]:
-                        skill_lower = primary_skill.lower()
-                        if skill_lower in skill_map:
-                            frontend_query_analysis["secondary_skills"] = skill_map[skill_lower]
-                            logger.info(f"[PROGRESSIVE] Force populated secondary skills: {skill_map[skill_lower]}")
-                            break
-            except Exception as e2:
-                logger.error(f"Enhanced basic analysis also failed: {e2}")
-                # Ultimate fallback
-                frontend_query_analysis = {
-                    "primary_skills": parsed_query.get("skills", []),
-                    "secondary_skills": [],
-                    "implied_skills": [],
-                    "experience_level": self._determine_experience_level(parsed_query),
-                    "role_type": parsed_query.get("roles", ["any"])[0] if parsed_query.get("roles") else "any",
-                    "search_intent": "technical" if parsed_query.get("skills") else "general",
-                    "corrected_query": parsed_query.get("corrected_query") if parsed_query.get("corrected_query") != query else None,
-                    "original_query": query if parsed_query.get("corrected_query") else None
-                }
+            frontend_query_analysis, search_suggestions = self._local_query_analysis(query, parsed_query)
         
-        logger.info(f"Progressive search started: '{query}' for user {user_id}")
-        print(f"\n[PROGRESSIVE SEARCH] Started for query: '{query}'")
-        
-        # Stage 1: Instant Results (Cache + Basic Keyword)
-        stage1_results = await self._stage1_instant_results(
-            db, query, user_id, limit, filters, parsed_query
-        )
-        
-        yield {
-            "stage": "instant",
-            "stage_number": 1,
-            "total_stages": 3,
-            "search_id": search_id,
-            "query": query,
-            "parsed_query": frontend_query_analysis,
-            "suggestions": search_suggestions,
-            "results": stage1_results,
-            "count": len(stage1_results),
-            "timing_ms": int((time.time() - start_time) * 1000),
-            "is_final": False
-        }
-        
-        # Stage 2: Enhanced Results (Vector Search + Skill Matching)
-        logger.info(f"[PROGRESSIVE] Starting Stage 2 for query: {query}")
-        stage2_results = await self._stage2_enhanced_results(
-            db, query, user_id, limit * 2, filters, parsed_query, stage1_results
-        )
-        logger.info(f"[PROGRESSIVE] Stage 2 returned {len(stage2_results)} results")
-        
-        # Merge and deduplicate results
-        merged_results = self._merge_results(stage1_results, stage2_results, limit)
-        
-        print(f"[PROGRESSIVE] Stage 2 yielding {len(merged_results)} results")
-        if merged_results and len(merged_results) > 0:
-            first_result = merged_results[0][0]
-            print(f"[PROGRESSIVE] First result has availability: {first_result.get('availability_score')}")
-        
-        yield {
-            "stage": "enhanced", 
-            "stage_number": 2,
-            "total_stages": 3,
-            "search_id": search_id,
-            "query": query,
-            "parsed_query": frontend_query_analysis,
+        return {
+            "parsed_query": parsed_query,
+            "query_analysis": frontend_query_analysis,
             "suggestions": search_suggestions,
-            "results": merged_results,
-            "count": len(merged_results),
-            "timing_ms": int((time.time() - start_time) * 1000),
-            "is_final": False
+            "elapsed_ms": self._elapsed_ms(analysis_start)
         }
+    
+    def _local_query_analysis(
+        self,
+        query: str,
+        parsed_query: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Build the frontend query analysis without calling OpenAI.
         
-        # Stage 3: Intelligent Results (Deep Analysis + Explanations)
-        final_results = await self._stage3_intelligent_results(
-            db, merged_results, query, parsed_query, user_id
-        )
-        
-        # Cache the final results
-        await self._cache_results(query, user_id, final_results)
+        Returns:
+            Tuple of (frontend query analysis, search suggestions)
+        """
+        search_suggestions = []
+        # Use the enhanced basic parse from GPT4 analyzer
+        try:
+            enhanced_basic = gpt4_analyzer._enhance_basic_parse(parsed_query)
+            frontend_query_analysis = {
+                "primary_skills": enhanced_basic.get("primary_skills", parsed_query.get("skills", [])),
+                "secondary_skills": enhanced_basic.get("secondary_skills", []),
+                "implied_skills": enhanced_basic.get("implied_skills", []),
+                "experience_level": enhanced_basic.get("experience_level", self._determine_experience_level(parsed_query)),
+                "role_type": enhanced_basic.get("role_type", parsed_query.get("roles", ["any"])[0] if parsed_query.get("roles") else "any"),
+                "search_intent": enhanced_basic.get("search_intent", "technical" if parsed_query.get("skills") else "general"),
+                "corrected_query": parsed_query.get("corrected_query") if parsed_query.get("corrected_query") != query else None,
+                "original_query": query if parsed_query.get("corrected_query") else None
+            }
+            # Get suggestions from enhanced basic analysis
+            search_suggestions = gpt4_analyzer.get_search_suggestions(enhanced_basic)
+            logger.info(f"[PROGRESSIVE] Using enhanced basic analysis - secondary skills: {frontend_query_analysis['secondary_skills']}")
+            
+            # CRITICAL FIX: If we still have no secondary skills but we have primary skills,
+            # force populate them based on the primary skills
+            if (not frontend_query_analysis.get("secondary_skills") and 
+                frontend_query_analysis.get("primary_skills")):
+                logger.warning("[PROGRESSIVE] No secondary skills found, forcing population")
+                
+                # Manual skill mappings as last resort
+                skill_map = {
+                    "javascript": ["react", "node.js", "typescript", "vue", "angular"],
+                    "python": ["django", "flask", "fastapi", "pandas", "numpy"],
+                    "java": ["spring", "spring boot", "hibernate", "maven", "gradle"],
+                    "aws": ["docker", "terraform", "kubernetes", "lambda", "s3"],
+                    "react": ["redux", "next.js", "styled-components", "webpack", "jest"],
+                    "go": ["microservices", "grpc", "docker", "kubernetes", "prometheus"],
+                    "golang": ["microservices", "grpc", "docker", "kubernetes", "prometheus"],
+                }
+                
+                for primary_skill in frontend_query_analysis["primary_skills"]:
+                    skill_lower = primary_skill.lower()
+                    if skill_lower in skill_map:
+                        frontend_query_analysis["secondary_skills"] = skill_map[skill_lower]
+                        logger.info(f"[PROGRESSIVE] Force populated secondary skills: {skill_map[skill_lower]}")
+                        break
+        except Exception as e2:
+            logger.error(f"Enhanced basic analysis also failed: {e2}")
+            # Ultimate fallback
+            frontend_query_analysis = {
+                "primary_skills": parsed_query.get("skills", []),
+                "secondary_skills": [],
+                "implied_skills": [],
+                "experience_level": self._determine_experience_level(parsed_query),
+                "role_type": parsed_query.get("roles", ["any"])[0] if parsed_query.get("roles") else "any",
+                "search_intent": "technical" if parsed_query.get("skills") else "general",
+                "corrected_query": parsed_query.get("corrected_query") if parsed_query.get("corrected_query") != query else None,
+                "original_query": query if parsed_query.get("corrected_query") else None
+            }
         
-        yield {
-            "stage": "intelligent",
-            "stage_number": 3,
-            "total_stages": 3,
-            "search_id": search_id,
-            "query": query,
-            "parsed_query": frontend_query_analysis,
-            "suggestions": search_suggestions,
-            "results": final_results[:limit],
-            "count": len(final_results[:limit]),
-            "timing_ms": int((time.time() - start_time) * 1000),
-            "is_final": True,
-            "search_quality_score": self._calculate_quality_score(final_results[:limit], parsed_query)
-        }
+        return frontend_query_analysis, search_suggestions
     
     async def _stage1_instant_results(
         self,
@@ -255,15 +542,9 @@ class ProgressiveSearchEngine:
         parsed_query: Dict[str, Any]
     ) -> List[Tuple[dict, float]]:
         """
-        Stage 1: Return instant results from cache or basic keyword search.
+        Stage 1: Return instant results from a basic keyword search.
         Target: <50ms
         """
-        # Try cache first
-        cached = await self._get_cached_results(query, user_id)
-        if cached:
-            logger.info(f"Stage 1: Cache hit for '{query}'")
-            return cached[:limit]
-        
         # Quick keyword search for exact skill matches
         if parsed_query["skills"]:
             results = await self._quick_skill_search(db, user_id, parsed_query["skills"], limit)
@@ -282,11 +563,18 @@ class ProgressiveSearchEngine:
         limit: int,
         filters: Optional[dict],
         parsed_query: Dict[str, Any],
-        stage1_results: List[Tuple[dict, float]]
-    ) -> List[Tuple[dict, float]]:
+        stage1_results: List[Tuple[dict, float]],
+        concurrent: Optional[bool] = None
+    ) -> Tuple[List[Tuple[dict, float]], Dict[str, Any]]:
         """
         Stage 2: Enhanced results with hybrid search (BM25 + vector).
         Target: <200ms
+        
+        ``concurrent`` is passed to hybrid search; with True, ``db`` is not
+        used, so the stage can run while stage 1 still holds the session.
+        
+        Returns:
+            Tuple of (results, hybrid search metadata with per-leg status and timings)
         """
         # Get query analysis to determine query type
         try:
@@ -295,25 +583,30 @@ class ProgressiveSearchEngine:
         except:
             query_type = "technical"
         
-        # Adjust hybrid search weights based on query type
-        hybrid_search.adjust_weights(query_type)
+        # Pick per-request hybrid search weights based on query type
+        search_config = get_search_preset(query_type)
         
         # Perform hybrid search
         logger.info(f"[STAGE2] Performing hybrid search for query: {query}")
-        hybrid_results = await hybrid_search.search(
+        hybrid_results, hybrid_metadata = await hybrid_search.search_with_metadata(
             db=db,
             query=query,
             user_id=str(user_id),
             limit=limit,
             filters=filters,
-            use_synonyms=True
+            use_synonyms=True,
+            concurrent=concurrent,
+            config=search_config
         )
         
-        logger.info(f"[STAGE2] Hybrid search returned {len(hybrid_results) if hybrid_results else 0} results")
+        logger.info(
+            f"[STAGE2] Hybrid search returned {len(hybrid_results) if hybrid_results else 0} results "
+            f"(legs: {hybrid_metadata['completed_legs']}, {hybrid_metadata['elapsed_ms']}ms)"
+        )
         
         if not hybrid_results:
             logger.warning("[STAGE2] No hybrid results found, returning empty")
-            return []
+            return [], hybrid_metadata
         
         # Apply skill-based scoring enhancements
         enhanced_results = []
@@ -373,7 +666,7 @@ class ProgressiveSearchEngine:
         
         logger.info(f"Stage 2: Hybrid search found {len(enhanced_results)} results with query type '{query_type}'")
         
-        return enhanced_results
+        return enhanced_results, hybrid_metadata
     
     async def _stage3_intelligent_results(
         self,
@@ -490,24 +783,6 @@ class ProgressiveSearchEngine:
         else:
             return vector_score * 0.05
     
-    def _resume_to_dict(self, resume: Resume) -> dict:
-        """Convert resume model to dictionary."""
-        return {
-            "id": str(resume.id),
-            "first_name": resume.first_name,
-            "last_name": resume.last_name,
-            "email": resume.email,
-            "phone": resume.phone,
-            "location": resume.location,
-            "current_title": resume.current_title,
-            "summary": resume.summary,
-            "years_experience": resume.years_experience,
-            "skills": resume.skills or [],
-            "keywords": resume.keywords or [],
-            "created_at": resume.created_at,
-            "view_count": resume.view_count or 0
-        }
-    
     def _merge_results(
         self,
         stage1: List[Tuple[dict, float]],
@@ -679,26 +954,19 @@ class ProgressiveSearchEngine:
         limit: int
     ) -> List[Tuple[dict, float]]:
         """Quick search for exact skill matches."""
-        # Build query for skill matches
-        skill_conditions = []
-        for skill in skills[:3]:  # Limit to first 3 skills for speed
-            skill_conditions.append(
-                func.cast(Resume.skills, SQLString).ilike(f'%"{skill}"%')
-            )
-        
-        stmt = select(Resume).where(
+        # Resumes with any of the first 3 skills, via the resume_skills index
+        stmt = select_search_cards(
             Resume.user_id == user_id,
             Resume.status == 'active',
-            or_(*skill_conditions)
+            skill_index.has_any_skill(skills[:3], user_id)
         ).limit(limit)
         
-        result = await db.execute(stmt)
-        resumes = result.scalars().all()
+        resumes = await fetch_search_cards(db, stmt)
         
         # Convert to result format with basic scoring
         results = []
         for resume in resumes:
-            resume_data = self._resume_to_dict(resume)
+            resume_data = resume.to_dict()
             
             # Count matching skills for basic score
             matching_count = 0
@@ -731,19 +999,18 @@ class ProgressiveSearchEngine:
                 Resume.summary.ilike(pattern)
             ])
         
-        stmt = select(Resume).where(
+        stmt = select_search_cards(
             Resume.user_id == user_id,
             Resume.status == 'active',
             or_(*conditions)
         ).limit(limit)
         
-        result = await db.execute(stmt)
-        resumes = result.scalars().all()
+        resumes = await fetch_search_cards(db, stmt)
         
         # Basic scoring based on term matches
         results = []
         for resume in resumes:
-            resume_data = self._resume_to_dict(resume)
+            resume_data = resume.to_dict()
             score = 0.3  # Base score
             
             # Boost for title matches
@@ -757,66 +1024,55 @@ class ProgressiveSearchEngine:
         
         return results
     
-    async def _cache_results(
-        self,
-        query: str,
-        user_id: UUID,
-        results: List[Tuple[dict, float]]
-    ):
-        """Cache search results."""
-        try:
-            redis = await self._get_redis()
-            if not redis:
-                return
-            
-            cache_key = f"search:{user_id}:{query.lower()}"
-            
-            # Prepare data for caching (limit size)
-            cache_data = []
-            for resume_data, score in results[:20]:  # Cache top 20
-                # Remove large fields for cache efficiency
-                cached_resume = {
-                    k: v for k, v in resume_data.items()
-                    if k not in ["summary", "parsed_data", "raw_text"]
-                }
-                cache_data.append((cached_resume, score))
-            
-            # Store in Redis with TTL
-            await redis.setex(
-                cache_key,
-                self.cache_ttl,
-                json.dumps(cache_data, default=str)
-            )
-            
-            logger.info(f"Cached {len(cache_data)} results for '{query}'")
-            
-        except Exception as e:
-            logger.error(f"Error caching results: {e}")
+    async def _cache_results(self, cache_key: Optional[str], final_event: Dict[str, Any]):
+        """Cache the final event of a complete search."""
+        cache_data = {
+            "parsed_query": final_event["parsed_query"],
+            "suggestions": final_event["suggestions"],
+            "search_quality_score": final_event["search_quality_score"],
+            "results": [
+                # Drop large fields for cache efficiency
+                ({k: v for k, v in resume_data.items() if k not in ["parsed_data", "raw_text"]}, score)
+                for resume_data, score in final_event["results"]
+            ]
+        }
+        await search_result_cache.set(cache_key, cache_data)
+        logger.info(f"Cached {len(cache_data['results'])} results for '{final_event['query']}'")
+    
+    async def _get_cached_results(self, cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Get a cached final event, as stored by ``_cache_results``."""
+        cached = await search_result_cache.get(cache_key)
+        if cached:
+            # Convert results back to tuples
+            cached["results"] = [(item[0], item[1]) for item in cached["results"]]
+        return cached
     
-    async def _get_cached_results(
+    def _cached_event(
         self,
         query: str,
-        user_id: UUID
-    ) -> Optional[List[Tuple[dict, float]]]:
-        """Get cached search results."""
-        try:
-            redis = await self._get_redis()
-            if not redis:
-                return None
-            
-            cache_key = f"search:{user_id}:{query.lower()}"
-            cached = await redis.get(cache_key)
-            
-            if cached:
-                data = json.loads(cached)
-                # Convert back to tuples
-                return [(item[0], item[1]) for item in data]
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error getting cached results: {e}")
-            return None
+        user_id: UUID,
+        cached: Dict[str, Any],
+        start_time: float
+    ) -> Dict[str, Any]:
+        """Build the single final event served from the cache."""
+        return {
+            "stage": "intelligent",
+            "stage_number": 3,
+            "total_stages": 3,
+            "search_id": f"search_{user_id}_{int(time.time() * 1000)}",
+            "query": query,
+            "parsed_query": cached["parsed_query"],
+            "suggestions": cached["suggestions"],
+            "results": cached["results"],
+            "count": len(cached["results"]),
+            "timing_ms": self._elapsed_ms(start_time),
+            "stage_timing_ms": self._elapsed_ms(start_time),
+            "stage_timings_ms": {},
+            "partial": False,
+            "cached": True,
+            "is_final": True,
+            "search_quality_score": cached["search_quality_score"]
+        }
     
     def _determine_experience_level(self, parsed_query: Dict[str, Any]) -> str:
         """Determine experience level from parsed query."""
@@ -1,7 +1,8 @@
 """Query parser for extracting skills and requirements from search queries."""
 
 import re
-from typing import List, Dict, Set, Any
+from functools import lru_cache
+from typing import List, Dict, Set, Any, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -106,6 +107,64 @@ class QueryParser:
             "should", "could", "may", "might", "must", "can", "need",
             "experience", "years", "year", "looking", "seeking", "required"
         }
+        
+        # Precompile the skill matcher once instead of per query
+        self._build_skill_matcher()
+        
+        # LRU of parse results keyed on the normalized query
+        self._parse_cached = lru_cache(maxsize=1024)(self._parse_normalized)
+    
+    def _build_skill_matcher(self):
+        """Compile a single longest-first alternation over all known skills.
+        
+        The pattern is wrapped in a lookahead so that every position in the
+        query is scanned and overlapping matches (e.g. "js" inside
+        "node.js") are still found, exactly like a per-skill search.
+        """
+        self._skills_by_length = sorted(self.known_skills, key=len, reverse=True)
+        self._skill_rank = {skill: i for i, skill in enumerate(self._skills_by_length)}
+        self._skill_patterns = {
+            skill: re.compile(r'\b' + re.escape(skill) + r'\b')
+            for skill in self._skills_by_length
+        }
+        alternation = '|'.join(re.escape(skill) for skill in self._skills_by_length)
+        self._skill_matcher = re.compile(r'(?=\b(' + alternation + r')\b)')
+        
+        # Shorter skills that can match at the same position as a longer one
+        # are necessarily its prefixes (e.g. "node" for "node.js")
+        self._skill_prefixes = {
+            skill: [
+                other for other in self._skills_by_length
+                if len(other) < len(skill) and skill.startswith(other)
+            ]
+            for skill in self._skills_by_length
+        }
+    
+    def _match_known_skills(self, query_lower: str) -> Tuple[List[str], Set[str]]:
+        """Find known skills in a normalized query, longest first.
+        
+        Returns:
+            Tuple of (matched skills, words consumed by those skills)
+        """
+        found = set()
+        for match in self._skill_matcher.finditer(query_lower):
+            skill = match.group(1)
+            found.add(skill)
+            for shorter in self._skill_prefixes[skill]:
+                if shorter not in found and self._skill_patterns[shorter].match(query_lower, match.start()):
+                    found.add(shorter)
+        
+        skills = []
+        processed = set()
+        for skill in sorted(found, key=self._skill_rank.__getitem__):
+            # Skip skills whose words were already consumed by a longer skill
+            if skill not in processed:
+                skills.append(skill)
+                # Mark all words in this skill as processed
+                for word in skill.split():
+                    processed.add(word)
+        
+        return skills, processed
     
     def parse_query(self, query: str) -> Dict[str, Any]:
         """
@@ -126,6 +185,19 @@ class QueryParser:
         query_lower = query.lower().strip()
         query_lower = re.sub(r'\s+', ' ', query_lower)
         
+        result = self._parse_cached(query_lower)
+        
+        # Copy so callers can mutate the result without poisoning the cache
+        return {
+            **result,
+            "skills": list(result["skills"]),
+            "roles": list(result["roles"]),
+            "remaining_terms": list(result["remaining_terms"]),
+            "original_query": query
+        }
+    
+    def _parse_normalized(self, query_lower: str) -> Dict[str, Any]:
+        """Parse a lower-cased, whitespace-normalized query (cached by parse_query)."""
         # Keep original for comparison
         original_query_lower = query_lower
         
@@ -147,23 +219,13 @@ class QueryParser:
         terms = self._extract_terms(query_lower)
         
         # Identify components
-        skills = []
         seniority = None
         roles = []
         remaining = []
         
-        # Process terms
-        processed = set()
-        
         # First pass: identify multi-word skills
-        for skill in sorted(self.known_skills, key=len, reverse=True):
-            # Use word boundary matching to prevent substring matches
-            # This prevents 'r' from matching inside 'Developer'
-            if re.search(r'\b' + re.escape(skill) + r'\b', query_lower) and skill not in processed:
-                skills.append(skill)
-                # Mark all words in this skill as processed
-                for word in skill.split():
-                    processed.add(word)
+        # Word boundary matching prevents 'r' from matching inside 'Developer'
+        skills, processed = self._match_known_skills(query_lower)
         
         # Second pass: process individual terms
         for term in terms:
@@ -219,7 +281,7 @@ class QueryParser:
             "roles": roles,
             "experience_years": experience_years,
             "remaining_terms": remaining,
-            "original_query": query,
+            "original_query": original_query_lower,
             "corrected_query": corrected_query if corrected_query != original_query_lower else None
         }
         
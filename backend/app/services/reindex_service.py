@@ -1,21 +1,54 @@
 """Service for re-indexing resumes in vector search."""
 
+import json
 import logging
-from typing import Optional, List
+import time
+from typing import Any, Dict, Optional, List
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, func
 
+from app.core.redis import get_redis_client, RedisKeys
+from app.db.session import async_session_maker
 from app.models.resume import Resume
+from app.services.bm25_index import bm25_index
+from app.services.embeddings import embedding_service
+from app.services.job_queue import JobRecord, job_queue
+from app.services.search_cache import search_result_cache
+from app.services.skill_index import skill_index
 from app.services.vector_search import vector_search
 
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
 logger = logging.getLogger(__name__)
 
 
+# Job kind for embedding and indexing a batch of new resumes
+INDEX_BATCH_JOB = "resume.index_batch"
+
+
 class ReindexService:
     """Handle re-indexing of resumes in vector search."""
     
+    # Columns needed to index a resume without loading the whole row
+    INDEX_COLUMNS = (
+        Resume.id,
+        Resume.user_id,
+        Resume.first_name,
+        Resume.last_name,
+        Resume.current_title,
+        Resume.summary,
+        Resume.skills,
+        Resume.keywords,
+        Resume.location,
+        Resume.parsed_data,
+        Resume.raw_text
+    )
+    
     async def reindex_resume(self, db: AsyncSession, resume: Resume) -> bool:
         """Re-index a single resume in vector search.
         
@@ -31,13 +64,10 @@ class ReindexService:
             search_text = self._build_search_text(resume)
             
             # Build metadata
-            metadata = {
-                "user_id": str(resume.user_id),  # CRITICAL: Include user_id for security
-                "name": f"{resume.first_name} {resume.last_name}",
-                "title": resume.current_title,
-                "location": resume.location,
-                "skills": resume.skills or []
-            }
+            metadata = self._build_metadata(resume)
+            
+            # Update the keyword (BM25) and skill indexes; a failure here must not block vector indexing
+            await self.index_keywords(db, [resume])
             
             # Index in vector search
             logger.info(f"Re-indexing resume {resume.id} for {metadata['name']}")
@@ -51,9 +81,14 @@ class ReindexService:
             if embedding:
                 resume.embedding = embedding
                 await db.commit()
+                await search_result_cache.bump_version(resume.user_id)
+                await skill_index.invalidate_popular_skills(resume.user_id)
                 logger.info(f"Successfully re-indexed resume {resume.id}")
                 return True
             else:
+                await db.commit()  # Keep the keyword index update
+                await search_result_cache.bump_version(resume.user_id)
+                await skill_index.invalidate_popular_skills(resume.user_id)
                 logger.warning(f"Failed to generate embedding for resume {resume.id}")
                 return False
                 
@@ -61,6 +96,27 @@ class ReindexService:
             logger.error(f"Error re-indexing resume {resume.id}: {e}")
             return False
     
+    async def index_keywords(self, db: AsyncSession, resumes) -> bool:
+        """Refresh the keyword (BM25) and skill indexes for resumes in a savepoint.
+        
+        Resumes need ``id`` and ``user_id`` set, so flush new ones first.
+        Failures are logged, not raised, so they never block the caller's
+        write. Does not commit; the caller owns the transaction.
+        
+        Returns:
+            bool: True if the indexes were updated
+        """
+        if not resumes:
+            return True
+        try:
+            async with db.begin_nested():
+                await bm25_index.index_documents(db, resumes)
+                await skill_index.index_documents(db, resumes)
+            return True
+        except Exception as e:
+            logger.error(f"Error updating keyword indexes for {len(resumes)} resumes starting at {resumes[0].id}: {e}")
+            return False
+    
     async def reindex_resume_by_id(self, db: AsyncSession, resume_id: UUID) -> bool:
         """Re-index a resume by ID.
         
@@ -108,44 +164,224 @@ class ReindexService:
             "failed_ids": failed_ids
         }
     
-    async def reindex_all_resumes(self, db: AsyncSession, batch_size: int = 100) -> dict:
-        """Re-index all active resumes.
+    async def reindex_all_resumes(
+        self,
+        db: AsyncSession,
+        batch_size: int = 100,
+        restart: bool = False
+    ) -> dict:
+        """Re-index all active resumes with a streaming pipeline.
+        
+        Pages through active resumes by primary key (keyset pagination),
+        loading only the columns needed for indexing. Each page is embedded
+        in one batched call, upserted to Qdrant without waiting for the write
+        to apply, written to the BM25 keyword index, and checkpointed in
+        Redis so an interrupted run resumes after the last completed page.
         
         Args:
             db: Database session
-            batch_size: Number of resumes to process at once
+            batch_size: Number of resumes per page
+            restart: Ignore any saved checkpoint and start from the beginning
             
         Returns:
-            dict: Results with total count and success count
+            dict: Results with counts, throughput and peak RSS
         """
-        # Get all active resumes
-        stmt = select(Resume).where(Resume.status == 'active')
-        result = await db.execute(stmt)
-        resumes = result.scalars().all()
+        start_time = time.time()
         
-        total_count = len(resumes)
-        success_count = 0
+        checkpoint = None if restart else await self.get_checkpoint()
+        if checkpoint:
+            last_id = UUID(checkpoint["last_id"])
+            processed = checkpoint["processed"]
+            success_count = checkpoint["success"]
+            logger.info(f"Resuming re-index after {last_id} ({processed} already processed)")
+        else:
+            last_id = None
+            processed = 0
+            success_count = 0
         
-        # Process in batches
-        for i in range(0, total_count, batch_size):
-            batch = resumes[i:i + batch_size]
-            for resume in batch:
-                if await self.reindex_resume(db, resume):
-                    success_count += 1
+        total_count = (await db.execute(
+            select(func.count(Resume.id)).where(Resume.status == 'active')
+        )).scalar() or 0
+        
+        failed_ids = []
+        processed_this_run = 0
+        
+        while True:
+            stmt = select(*self.INDEX_COLUMNS).where(Resume.status == 'active')
+            if last_id is not None:
+                stmt = stmt.where(Resume.id > last_id)
+            stmt = stmt.order_by(Resume.id).limit(batch_size)
+            
+            rows = (await db.execute(stmt)).all()
+            if not rows:
+                break
             
-            logger.info(f"Re-indexed batch {i // batch_size + 1}: {i + len(batch)}/{total_count}")
+            page_failed_ids = await self._index_rows(db, rows)
+            failed_ids.extend(page_failed_ids)
+            
+            processed += len(rows)
+            processed_this_run += len(rows)
+            success_count += len(rows) - len(page_failed_ids)
+            last_id = rows[-1].id
+            
+            await self._save_checkpoint({
+                "last_id": str(last_id),
+                "processed": processed,
+                "success": success_count
+            })
+            logger.info(f"Re-indexed {processed}/{total_count} resumes ({success_count} succeeded)")
         
+        await self.clear_checkpoint()
+        
+        elapsed = time.time() - start_time
         return {
-            "total": total_count,
+            "total": processed,
             "success": success_count,
-            "failed": total_count - success_count
+            "failed": processed - success_count,
+            "failed_ids": failed_ids[:100],
+            "resumed": checkpoint is not None,
+            "elapsed_seconds": round(elapsed, 2),
+            "resumes_per_second": round(processed_this_run / elapsed, 2) if elapsed > 0 else 0.0,
+            "peak_rss_mb": self._peak_rss_mb()
+        }
+    
+    async def index_resumes(self, db: AsyncSession, resume_ids: List[UUID]) -> dict:
+        """Embed and index a batch of active resumes with batched calls.
+        
+        Args:
+            db: Database session
+            resume_ids: IDs of the resumes to index
+        
+        Returns:
+            dict: Results with success count and failed IDs
+        """
+        rows = (await db.execute(
+            select(*self.INDEX_COLUMNS)
+            .where(Resume.id.in_(resume_ids), Resume.status == 'active')
+            .order_by(Resume.id)
+        )).all()
+        failed_ids = await self._index_rows(db, rows) if rows else []
+        
+        return {
+            "total": len(rows),
+            "success": len(rows) - len(failed_ids),
+            "failed": len(failed_ids),
+            "failed_ids": failed_ids
+        }
+    
+    async def enqueue_index_batch(self, resume_ids: List[UUID], user_id: Optional[UUID] = None) -> JobRecord:
+        """Queue a batch of resumes for embedding and indexing by a job worker."""
+        return await job_queue.enqueue(
+            INDEX_BATCH_JOB, {"resume_ids": [str(resume_id) for resume_id in resume_ids]}, user_id=user_id
+        )
+    
+    async def run_index_batch_job(self, job: JobRecord) -> Dict[str, Any]:
+        """Job handler: index a batch, raising on failure so the queue retries.
+        
+        Points and index rows are upserts, so retrying the whole batch is safe.
+        """
+        resume_ids = [UUID(resume_id) for resume_id in job.payload["resume_ids"]]
+        async with async_session_maker() as db:
+            results = await self.index_resumes(db, resume_ids)
+        if results["failed"]:
+            raise Exception(f"Failed to index {results['failed']} of {results['total']} resumes")
+        return results
+    
+    async def _index_rows(self, db: AsyncSession, rows) -> List[str]:
+        """Embed, upsert and keyword-index a page of resume rows, then commit.
+        
+        Rows need the ``INDEX_COLUMNS``. Returns the IDs that failed.
+        """
+        failed_ids = []
+        
+        # Embed the whole page in batched API calls
+        texts = [self._build_search_text(row) for row in rows]
+        embeddings = await embedding_service.generate_embeddings_batch(texts)
+        
+        points = []
+        updates = []
+        for row, embedding in zip(rows, embeddings):
+            if embedding is None:
+                failed_ids.append(str(row.id))
+                continue
+            points.append((str(row.id), embedding, self._build_metadata(row)))
+            updates.append({"id": row.id, "embedding": embedding})
+        
+        # Upsert the page to Qdrant in a single request
+        if points:
+            try:
+                await vector_search.upsert_embeddings(points, wait=False)
+            except Exception as e:
+                logger.error(f"Error upserting re-index page starting at {rows[0].id}: {e}")
+                failed_ids.extend(str(item["id"]) for item in updates)
+                updates = []
+        
+        # Refresh the keyword (BM25) and skill indexes for the whole page
+        await self.index_keywords(db, rows)
+        
+        # Bulk update embeddings in the database
+        if updates:
+            await db.execute(update(Resume), updates)
+        await db.commit()
+        page_users = {row.user_id for row in rows}
+        await search_result_cache.bump_version(*page_users)
+        await skill_index.invalidate_popular_skills(*page_users)
+        
+        return failed_ids
+    
+    async def get_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """Get the saved re-index checkpoint, if any."""
+        try:
+            redis = await get_redis_client()
+            if not redis:
+                return None
+            data = await redis.get(RedisKeys.REINDEX_CHECKPOINT)
+            return json.loads(data) if data else None
+        except Exception as e:
+            logger.error(f"Error reading re-index checkpoint: {e}")
+            return None
+    
+    async def _save_checkpoint(self, checkpoint: Dict[str, Any]):
+        """Persist re-index progress."""
+        try:
+            redis = await get_redis_client()
+            if redis:
+                await redis.set(RedisKeys.REINDEX_CHECKPOINT, json.dumps(checkpoint))
+        except Exception as e:
+            logger.error(f"Error saving re-index checkpoint: {e}")
+    
+    async def clear_checkpoint(self):
+        """Remove the re-index checkpoint."""
+        try:
+            redis = await get_redis_client()
+            if redis:
+                await redis.delete(RedisKeys.REINDEX_CHECKPOINT)
+        except Exception as e:
+            logger.error(f"Error clearing re-index checkpoint: {e}")
+    
+    @staticmethod
+    def _peak_rss_mb() -> Optional[float]:
+        """Peak resident set size of this process in MB."""
+        if resource is None:
+            return None
+        # ru_maxrss is reported in kilobytes on Linux
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    
+    def _build_metadata(self, resume) -> Dict[str, Any]:
+        """Build the vector search payload for a resume or resume row."""
+        return {
+            "user_id": str(resume.user_id),  # CRITICAL: Include user_id for security
+            "name": f"{resume.first_name} {resume.last_name}",
+            "title": resume.current_title,
+            "location": resume.location,
+            "skills": resume.skills or []
         }
     
-    def _build_search_text(self, resume: Resume) -> str:
+    def _build_search_text(self, resume) -> str:
         """Build searchable text from resume data.
         
         Args:
-            resume: Resume object
+            resume: Resume object or row with the same attributes
             
         Returns:
             str: Combined text for embedding
@@ -189,4 +425,5 @@ class ReindexService:
 
 
 # Create singleton instance
-reindex_service = ReindexService()
\ No newline at end of file
+reindex_service = ReindexService()
+job_queue.register(INDEX_BATCH_JOB, reindex_service.run_index_batch_job)
\ No newline at end of file
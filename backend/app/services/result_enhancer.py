@@ -1,8 +1,9 @@
 """Result enhancement service using GPT-4.1-mini for intelligent explanations."""
 
+import asyncio
 import logging
 import json
-from typing import List, Dict, Any, Tuple, Optional
+from typing import AsyncIterator, List, Dict, Any, Tuple, Optional
 from openai import AsyncOpenAI
 
 from app.core.config import settings
@@ -25,6 +26,11 @@ class ResultEnhancer:
         self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY) if settings.OPENAI_API_KEY else None
         self.model = settings.OPENAI_MODEL  # gpt-4.1-mini-2025-04-14
         
+        # Shared by every search so concurrent requests stay within the rate limit
+        self.semaphore = asyncio.Semaphore(settings.ENHANCEMENT_CONCURRENCY)
+        self.timeout = settings.ENHANCEMENT_TIMEOUT
+        self.batch_size = settings.ENHANCEMENT_BATCH_SIZE
+        
     async def enhance_results(
         self,
         results: List[Tuple[dict, float]],
@@ -47,35 +53,161 @@ class ResultEnhancer:
         if not self.client or not results:
             return results
         
-        # Enhance top results
-        enhanced_results = []
+        top_results = list(results[:limit])
+        async for index, enhanced in self.iter_enhanced_results(results, query, parsed_query, limit):
+            top_results[index] = enhanced
         
-        for i, (resume_data, score) in enumerate(results[:limit]):
-            try:
-                # Generate enhancement for this candidate
-                enhancement = await self._enhance_single_result(
-                    resume_data,
-                    score,
-                    query,
-                    parsed_query,
-                    rank=i + 1
-                )
-                
-                # Add enhancement to resume data
-                enhanced_resume = resume_data.copy()
-                enhanced_resume.update(enhancement)
-                
-                enhanced_results.append((enhanced_resume, score))
+        # Add remaining results without enhancement
+        return top_results + list(results[limit:])
+    
+    async def iter_enhanced_results(
+        self,
+        results: List[Tuple[dict, float]],
+        query: str,
+        parsed_query: Dict[str, Any],
+        limit: int = 10,
+        batch_size: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, Tuple[dict, float]]]:
+        """
+        Enhance the top results concurrently, yielding each as it finishes.
+        
+        Cached enhancements are read with one MGET and yielded first. The
+        misses are generated in parallel, bounded by the shared semaphore,
+        each with a deadline of ``timeout`` seconds. Candidates that time out,
+        fail or are missing from a batched response get the basic
+        enhancement instead, which is not cached.
+        
+        Args:
+            results: List of (resume_data, score) tuples
+            query: Original search query
+            parsed_query: Parsed query analysis
+            limit: Number of results to enhance
+            batch_size: Candidates per completion call (defaults to
+                ENHANCEMENT_BATCH_SIZE); above 1 uses a batched prompt
+            
+        Yields:
+            (index in results, enhanced (resume_data, score)) as each completes
+        """
+        if not self.client or not results:
+            return
+        
+        query_hash = RedisKeys.hash_text(query)
+        top_results = results[:limit]
+        cache_keys = [
+            self._cache_key(query_hash, resume_data) for resume_data, _ in top_results
+        ]
+        cached = await cache_manager.get_many(cache_keys)
+        
+        missing = []
+        for index, ((resume_data, score), cache_key) in enumerate(zip(top_results, cache_keys)):
+            if cache_key in cached:
+                yield index, self._apply_enhancement(resume_data, score, cached[cache_key])
+            else:
+                missing.append(index)
+        
+        if not missing:
+            return
+        
+        batch_size = max(1, batch_size or self.batch_size)
+        tasks = [
+            asyncio.create_task(self._enhance_batch(
+                [(index, *top_results[index]) for index in missing[i:i + batch_size]],
+                query,
+                parsed_query,
+                query_hash
+            ))
+            for i in range(0, len(missing), batch_size)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    enhancements = await next_done
+                except Exception as e:
+                    logger.error(f"Error enhancing results: {e}")
+                    continue
                 
-            except Exception as e:
-                logger.error(f"Error enhancing result {i+1}: {e}")
-                # Keep original if enhancement fails
-                enhanced_results.append((resume_data, score))
+                for index, enhancement in enhancements.items():
+                    resume_data, score = top_results[index]
+                    yield index, self._apply_enhancement(resume_data, score, enhancement)
+        finally:
+            # The caller stopped listening or a search deadline passed
+            for task in tasks:
+                task.cancel()
+    
+    async def _enhance_batch(
+        self,
+        items: List[Tuple[int, dict, float]],
+        query: str,
+        parsed_query: Dict[str, Any],
+        query_hash: str
+    ) -> Dict[int, Dict[str, Any]]:
+        """Generate and cache enhancements for (index, resume_data, score) items.
         
-        # Add remaining results without enhancement
-        enhanced_results.extend(results[limit:])
+        Failed candidates get the basic enhancement, uncached, so the next
+        search retries them.
+        """
+        try:
+            generated = await asyncio.wait_for(
+                self._generate_with_limit(items, query, parsed_query),
+                timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Enhancement of {len(items)} candidates timed out after {self.timeout}s")
+            generated = {}
         
-        return enhanced_results
+        resumes = {index: resume_data for index, resume_data, _ in items}
+        succeeded = {
+            index: enhancement for index, enhancement in generated.items()
+            if enhancement is not None
+        }
+        if succeeded:
+            await cache_manager.set_many(
+                {
+                    self._cache_key(query_hash, resumes[index]): enhancement
+                    for index, enhancement in succeeded.items()
+                },
+                ttl=3600,  # 1 hour cache
+                tags={
+                    self._cache_key(query_hash, resumes[index]): self._cache_tags(query_hash, resumes[index])
+                    for index in succeeded
+                }
+            )
+        
+        return {
+            index: succeeded[index] if index in succeeded
+            else self._generate_basic_enhancement(resume_data, score, parsed_query)
+            for index, resume_data, score in items
+        }
+    
+    async def _generate_with_limit(
+        self,
+        items: List[Tuple[int, dict, float]],
+        query: str,
+        parsed_query: Dict[str, Any]
+    ) -> Dict[int, Optional[Dict[str, Any]]]:
+        """Generate enhancements once a slot of the shared semaphore is free.
+        
+        Candidates whose enhancement failed map to None.
+        """
+        async with self.semaphore:
+            if len(items) > 1:
+                return await self._generate_batch_enhancements(items, query, parsed_query)
+            
+            index, resume_data, score = items[0]
+            return {index: await self._request_enhancement(
+                resume_data, score, query, parsed_query, rank=index + 1
+            )}
+    
+    @staticmethod
+    def _apply_enhancement(
+        resume_data: dict,
+        score: float,
+        enhancement: Dict[str, Any]
+    ) -> Tuple[dict, float]:
+        """Copy of a result with the enhancement added to its resume data."""
+        enhanced_resume = resume_data.copy()
+        enhanced_resume.update(enhancement)
+        return enhanced_resume, score
     
     async def _enhance_single_result(
         self,
@@ -87,19 +219,33 @@ class ResultEnhancer:
     ) -> Dict[str, Any]:
         """Enhance a single search result."""
         # Check cache first
-        cache_key = f"enhancement:{RedisKeys.hash_text(query)}:{resume_data['id']}"
+        query_hash = RedisKeys.hash_text(query)
         
         cached = await cache_manager.get_or_set(
-            key=cache_key,
+            key=self._cache_key(query_hash, resume_data),
             fetch_func=lambda: self._generate_enhancement(
                 resume_data, score, query, parsed_query, rank
             ),
             ttl=3600,  # 1 hour cache
-            serialize=True
+            serialize=True,
+            tags=self._cache_tags(query_hash, resume_data)
         )
         
         return cached
     
+    @staticmethod
+    def _cache_key(query_hash: str, resume_data: dict) -> str:
+        """Cache key of one candidate's enhancement for a query."""
+        return f"enhancement:{query_hash}:{resume_data['id']}"
+    
+    @staticmethod
+    def _cache_tags(query_hash: str, resume_data: dict) -> Tuple[str, str]:
+        """Tags that invalidate an enhancement when the resume or query changes."""
+        return (
+            RedisKeys.TAG_RESUME.format(resume_id=resume_data['id']),
+            RedisKeys.TAG_QUERY.format(query_hash=query_hash)
+        )
+    
     async def _generate_enhancement(
         self,
         resume_data: dict,
@@ -108,7 +254,21 @@ class ResultEnhancer:
         parsed_query: Dict[str, Any],
         rank: int
     ) -> Dict[str, Any]:
-        """Generate AI enhancement for a candidate."""
+        """Generate AI enhancement for a candidate, or the basic one on error."""
+        enhancement = await self._request_enhancement(resume_data, score, query, parsed_query, rank)
+        if enhancement is None:
+            return self._generate_basic_enhancement(resume_data, score, parsed_query)
+        return enhancement
+    
+    async def _request_enhancement(
+        self,
+        resume_data: dict,
+        score: float,
+        query: str,
+        parsed_query: Dict[str, Any],
+        rank: int
+    ) -> Optional[Dict[str, Any]]:
+        """Request an AI enhancement for a candidate, returning None on error."""
         try:
             # Build the prompt
             system_prompt = self._build_enhancement_system_prompt()
@@ -135,8 +295,47 @@ class ResultEnhancer:
             
         except Exception as e:
             logger.error(f"Error generating enhancement: {e}")
-            # Return basic enhancement
-            return self._generate_basic_enhancement(resume_data, score, parsed_query)
+            return None
+    
+    async def _generate_batch_enhancements(
+        self,
+        items: List[Tuple[int, dict, float]],
+        query: str,
+        parsed_query: Dict[str, Any]
+    ) -> Dict[int, Optional[Dict[str, Any]]]:
+        """Generate enhancements for several candidates in one completion.
+        
+        Candidates missing from the response, or all of them if the call
+        fails, map to None.
+        """
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": self._build_batch_system_prompt()},
+                    {"role": "user", "content": self._build_batch_user_prompt(items, query, parsed_query)}
+                ],
+                temperature=0.3,  # Lower temperature for consistency
+                max_tokens=400 * len(items),
+                response_format={"type": "json_object"}
+            )
+            
+            candidates = json.loads(response.choices[0].message.content).get("candidates", [])
+            by_id = {
+                str(candidate.get("id")): candidate
+                for candidate in candidates if isinstance(candidate, dict)
+            }
+        except Exception as e:
+            logger.error(f"Error generating batch enhancement: {e}")
+            by_id = {}
+        
+        enhancements = {}
+        for index, resume_data, score in items:
+            enhancement = by_id.get(str(resume_data['id']))
+            if enhancement is not None:
+                enhancement = {key: value for key, value in enhancement.items() if key != "id"}
+            enhancements[index] = enhancement
+        return enhancements
     
     def _build_enhancement_system_prompt(self) -> str:
         """Build system prompt for enhancement generation."""
@@ -191,6 +390,28 @@ Missing Skills: {', '.join(analysis.get('missing', []))}
         
         return f"Analyze this candidate match:\n{candidate_summary}"
     
+    def _build_batch_system_prompt(self) -> str:
+        """Build system prompt for enhancing several candidates at once."""
+        return self._build_enhancement_system_prompt() + """
+
+Several candidates are given, each introduced by "Candidate ID: <id>".
+Respond with {"candidates": [...]} holding one object per candidate with the
+fields above plus "id" set to that candidate's ID."""
+    
+    def _build_batch_user_prompt(
+        self,
+        items: List[Tuple[int, dict, float]],
+        query: str,
+        parsed_query: Dict[str, Any]
+    ) -> str:
+        """Build user prompt with the details of several candidates."""
+        sections = [
+            f"Candidate ID: {resume_data['id']}\n"
+            + self._build_enhancement_user_prompt(resume_data, score, query, parsed_query, rank=index + 1)
+            for index, resume_data, score in items
+        ]
+        return "Analyze these candidate matches:\n" + "\n".join(sections)
+    
     def _generate_basic_enhancement(
         self,
         resume_data: dict,
@@ -8,28 +8,11 @@ from typing import Dict, List, Optional
 from openai import AsyncOpenAI
 
 from app.core.config import settings
+from app.services.content_cache import ContentCache, ContentKind, chat_cost, content_cache
 
 logger = logging.getLogger(__name__)
 
-
-class ResumeParser:
-    """Service for parsing resume content using AI."""
-    
-    def __init__(self):
-        """Initialize the resume parser."""
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-        self.model = settings.OPENAI_MODEL  # Using gpt-4o-mini for better performance and cost efficiency
-    
-    async def parse_resume(self, text: str) -> Dict:
-        """Parse resume text using OpenAI to extract structured data.
-        
-        Args:
-            text: Raw resume text
-            
-        Returns:
-            Dictionary containing parsed resume data
-        """
-        system_prompt = """You are an expert resume parser. Extract the following information from the resume text and return it as a JSON object:
+SYSTEM_PROMPT = """You are an expert resume parser. Extract the following information from the resume text and return it as a JSON object:
 
 {
     "first_name": "string",
@@ -68,13 +51,49 @@ Important:
 - If information is not found, use null
 - Clean and standardize phone numbers and emails"""
 
+
+class ResumeParser:
+    """Service for parsing resume content using AI."""
+    
+    def __init__(self):
+        """Initialize the resume parser."""
+        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.model = settings.OPENAI_MODEL  # Using gpt-4o-mini for better performance and cost efficiency
+    
+    async def parse_resume(self, text: str) -> Dict:
+        """Parse resume text using OpenAI to extract structured data.
+        
+        Args:
+            text: Raw resume text
+            
+        Returns:
+            Dictionary containing parsed resume data
+        """
         user_prompt = f"Parse this resume:\n\n{text[:4000]}"  # Limit text to avoid token limits
         
+        # The same resume uploaded again (or by another recruiter) reuses the parse
+        parsed_data = await content_cache.get_or_compute(
+            ContentKind.RESUME_PARSE,
+            ContentCache.version(self.model, SYSTEM_PROMPT),
+            user_prompt,
+            lambda: self._parse_with_openai(user_prompt),
+            cost=lambda result: chat_cost(SYSTEM_PROMPT + user_prompt, result),
+            source=text
+        )
+        if parsed_data is None:
+            # Return basic extraction as fallback
+            return self._basic_extraction(text)
+        
+        # Validate and clean the parsed data
+        return self._validate_parsed_data(parsed_data)
+    
+    async def _parse_with_openai(self, user_prompt: str) -> Optional[Dict]:
+        """The raw JSON object from OpenAI, or None on error."""
         try:
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.1,
@@ -83,14 +102,11 @@ Important:
             
             content = response.choices[0].message.content
             parsed_data = json.loads(content)
-            
-            # Validate and clean the parsed data
-            return self._validate_parsed_data(parsed_data)
+            return parsed_data if isinstance(parsed_data, dict) else None
             
         except Exception as e:
             logger.error(f"Error parsing resume with AI: {e}")
-            # Return basic extraction as fallback
-            return self._basic_extraction(text)
+            return None
     
     def _validate_parsed_data(self, data: Dict) -> Dict:
         """Validate and clean parsed resume data."""
@@ -1,19 +1,25 @@
 """Resume processing service for background tasks."""
 
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
+from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
 from app import crud
 from app.models.resume import Resume
+from app.services.content_cache import ContentKind, content_cache, embedding_cost
 from app.services.embeddings import embedding_service
+from app.services.job_queue import JobRecord, PermanentJobError, job_queue
 from app.services.resume_parser import resume_parser
 from app.services.vector_search import vector_search
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Job kind for parsing, embedding and indexing one resume
+RESUME_PROCESS_JOB = "resume.process"
+
 
 class ResumeProcessor:
     """Service for processing resumes (parsing and embedding generation)."""
@@ -33,6 +39,21 @@ class ResumeProcessor:
             expire_on_commit=False
         )
     
+    async def enqueue(self, resume_id: Any, user_id: Optional[UUID] = None) -> JobRecord:
+        """Queue a resume for processing by a job worker."""
+        return await job_queue.enqueue(
+            RESUME_PROCESS_JOB, {"resume_id": str(resume_id)}, user_id=user_id
+        )
+    
+    async def run_job(self, job: JobRecord) -> Dict[str, Any]:
+        """Job handler: process a resume, raising on failure so the queue retries."""
+        resume_id = job.payload["resume_id"]
+        async with self.async_session() as db:
+            if not await crud.resume.get(db, id=resume_id):
+                raise PermanentJobError(f"Resume {resume_id} not found")
+            processed = await self.process_resume(db, resume_id, raise_errors=True)
+        return {"resume_id": resume_id, "processed": processed}
+    
     async def process_resume_background(self, resume_id: str) -> bool:
         """Process a resume in background with its own database session."""
         async with self.async_session() as db:
@@ -41,12 +62,13 @@ class ResumeProcessor:
             finally:
                 await db.close()
     
-    async def process_resume(self, db: AsyncSession, resume_id: str) -> bool:
+    async def process_resume(self, db: AsyncSession, resume_id: str, raise_errors: bool = False) -> bool:
         """Process a resume by parsing and generating embeddings.
         
         Args:
             db: Database session
             resume_id: ID of the resume to process
+            raise_errors: Re-raise failures after marking the resume failed
             
         Returns:
             True if successful, False otherwise
@@ -85,7 +107,14 @@ class ResumeProcessor:
                 # Generate embedding
                 logger.info(f"Generating embedding for resume {resume_id}")
                 resume_text = embedding_service.prepare_resume_text(update_data)
-                embedding = await embedding_service.generate_embedding(resume_text)
+                embedding = await content_cache.get_or_compute(
+                    ContentKind.EMBEDDING,
+                    embedding_service.model,
+                    resume_text,
+                    lambda: embedding_service.generate_embedding(resume_text),
+                    cost=embedding_cost(resume_text),
+                    source=resume.raw_text
+                )
                 
                 if embedding:
                     # Update resume with parsed data and mark as completed
@@ -111,7 +140,9 @@ class ResumeProcessor:
                         await vector_search.index_resume(
                             resume_id=resume_id,
                             text=resume_text,
-                            metadata=metadata
+                            metadata=metadata,
+                            # Reuse the embedding rather than requesting it again
+                            embedding=embedding if embedding_service.model == settings.EMBEDDING_MODEL else None
                         )
                         logger.info(f"Indexed resume {resume_id} in Qdrant")
                     except Exception as e:
@@ -150,7 +181,9 @@ class ResumeProcessor:
                     )
             except:
                 pass
-                
+            
+            if raise_errors:
+                raise
             return False
     
     async def _update_embedding(
@@ -172,4 +205,5 @@ class ResumeProcessor:
 
 
 # Singleton instance
-resume_processor = ResumeProcessor()
\ No newline at end of file
+resume_processor = ResumeProcessor()
+job_queue.register(RESUME_PROCESS_JOB, resume_processor.run_job)
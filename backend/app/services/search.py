@@ -5,18 +5,20 @@ import re
 from typing import List, Optional, Tuple, Dict, Any, AsyncGenerator
 from uuid import UUID
 
-from sqlalchemy import select, or_, and_, func, cast, text
-from sqlalchemy.types import String as SQLString
+from sqlalchemy import select, or_, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.resume import Resume
 from app.services.vector_search import vector_search
+from app.services.search_card import fetch_search_cards, select_search_cards
+from app.services.skill_index import skill_index
 from app.services.search_skill_fix import (
     create_skill_search_conditions,
     enhance_search_query_for_skills
 )
 from app.services.query_parser import query_parser
+from app.services.skill_tier_scorer import skill_tier_scorer
 from app.services.search_metrics import search_metrics
 from app.services.progressive_search import progressive_search
 from app.services.gpt4_query_analyzer import gpt4_analyzer
@@ -82,124 +84,29 @@ class SearchService:
                 resume_ids = [r["resume_id"] for r in vector_results]
                 logger.info(f"Vector search returned IDs: {resume_ids[:5]}...")  # Log first 5
                 
-                # Fetch full resume data from PostgreSQL - CRITICAL: Filter by user_id AND status
-                stmt = select(Resume).where(
+                # Fetch resume cards from PostgreSQL - CRITICAL: Filter by user_id AND status
+                stmt = select_search_cards(
                     Resume.id.in_(resume_ids),
                     Resume.user_id == user_id,  # SECURITY: Only show user's own resumes
                     Resume.status == "active"   # FILTER: Only show active resumes, not deleted ones
                 )
-                result = await db.execute(stmt)
-                resumes = {str(r.id): r for r in result.scalars().all()}
+                resumes = {str(card.id): card for card in await fetch_search_cards(db, stmt)}
                 logger.info(f"Found {len(resumes)} resumes in PostgreSQL matching vector IDs for user {user_id}")
                 
+                # Parse the query once for the whole batch
+                parsed_query = query_parser.parse_query(query)
+                required_skills = parsed_query["skills"]
+                logger.info(f"Parsed query for '{query}': required_skills={required_skills}, primary={parsed_query.get('primary_skill')}")
+                
                 # Combine results with scores
-                search_results = []
+                candidates = []
                 for vr in vector_results:
                     resume_id = str(vr["resume_id"])  # Ensure it's a string
                     if resume_id in resumes:
-                        resume = resumes[resume_id]
-                        resume_data = {
-                            "id": str(resume.id),
-                            "first_name": resume.first_name,
-                            "last_name": resume.last_name,
-                            "email": resume.email,
-                            "phone": resume.phone,
-                            "location": resume.location,
-                            "current_title": resume.current_title,
-                            "summary": resume.summary,
-                            "years_experience": resume.years_experience,
-                            "skills": resume.skills or [],
-                            "keywords": resume.keywords or [],
-                            "created_at": resume.created_at,
-                            "view_count": resume.view_count or 0
-                        }
-                        
-                        # Enhanced skill matching with query parser
-                        original_score = vr["score"]
-                        
-                        # Parse the query to extract required skills
-                        parsed_query = query_parser.parse_query(query)
-                        required_skills = parsed_query["skills"]
-                        primary_skill = parsed_query.get("primary_skill")
-                        print(f"*** PARSED QUERY for '{query}': required_skills={required_skills}, primary={primary_skill}")
-                        
-                        if resume.skills and required_skills:
-                            # Calculate skill match score with primary skill weighting
-                            resume_skills_lower = [skill.lower() for skill in resume.skills if skill]
-                            matched_skills = []
-                            matched_primary = False
-                            total_required = len(required_skills)
-                            
-                            # Check which skills match
-                            for required_skill in required_skills:
-                                # Check for exact match or partial match
-                                if any(required_skill in skill for skill in resume_skills_lower):
-                                    matched_skills.append(required_skill)
-                                    if required_skill == primary_skill:
-                                        matched_primary = True
-                            
-                            # Calculate weighted score
-                            # Primary skill is worth 60% of the score if it's the only required skill
-                            # or 50% if there are multiple required skills
-                            if total_required == 1:
-                                skill_match_ratio = 1.0 if matched_primary else 0.0
-                            else:
-                                primary_weight = 0.5 if primary_skill else 0
-                                secondary_weight = (1.0 - primary_weight) / (total_required - 1) if total_required > 1 else 0
-                                
-                                weighted_score = 0.0
-                                if matched_primary:
-                                    weighted_score += primary_weight
-                                
-                                # Add score for secondary skills
-                                secondary_matches = len([s for s in matched_skills if s != primary_skill])
-                                if total_required > 1:
-                                    weighted_score += secondary_matches * secondary_weight
-                                
-                                skill_match_ratio = weighted_score
-                            
-                            # Store match details
-                            resume_data["_matched_skills"] = matched_skills
-                            resume_data["_has_primary"] = matched_primary
-                            resume_data["_skill_match_ratio"] = skill_match_ratio
-                            
-                            # 5-tier system based on skill matches
-                            if skill_match_ratio == 1.0:
-                                # Tier 1: All skills match (100%)
-                                hybrid_score = min(1.0, original_score * 1.5)
-                                resume_data["_skill_tier"] = 1
-                                tier_name = "TIER 1 PERFECT"
-                                print(f"*** {tier_name}: {resume.first_name} {resume.last_name} has ALL skills - boosted to {hybrid_score:.3f}")
-                            elif matched_primary and skill_match_ratio >= 0.75:
-                                # Tier 2: Has primary skill + most secondary (75%+)
-                                hybrid_score = original_score * 0.8
-                                resume_data["_skill_tier"] = 2
-                                tier_name = "TIER 2 PRIMARY+"
-                                print(f"*** {tier_name}: {resume.first_name} {resume.last_name} has primary + secondary - score: {hybrid_score:.3f}")
-                            elif matched_primary and skill_match_ratio >= 0.5:
-                                # Tier 3: Has primary skill only (50-74%)
-                                hybrid_score = original_score * 0.5
-                                resume_data["_skill_tier"] = 3
-                                tier_name = "TIER 3 PRIMARY"
-                                print(f"*** {tier_name}: {resume.first_name} {resume.last_name} has primary skill only - score: {hybrid_score:.3f}")
-                            elif not matched_primary and len(matched_skills) > 0:
-                                # Tier 4: Has secondary skills only
-                                hybrid_score = original_score * 0.2
-                                resume_data["_skill_tier"] = 4
-                                tier_name = "TIER 4 SECONDARY"
-                                print(f"*** {tier_name}: {resume.first_name} {resume.last_name} has secondary skills only - score: {hybrid_score:.3f}")
-                            else:
-                                # Tier 5: No relevant skills (0%)
-                                hybrid_score = original_score * 0.05
-                                resume_data["_skill_tier"] = 5
-                                tier_name = "TIER 5 NO MATCH"
-                                print(f"*** {tier_name}: {resume.first_name} {resume.last_name} has NO required skills - score: {hybrid_score:.3f}")
-                            
-                            search_results.append((resume_data, hybrid_score))
-                            logger.info(f"{tier_name} for {resume.first_name} {resume.last_name}: matched={matched_skills}, primary={matched_primary}, score={hybrid_score:.3f}")
-                        else:
-                            # No skills to match or no skills in resume
-                            search_results.append((resume_data, original_score))
+                        candidates.append((resumes[resume_id].to_dict(), vr["score"]))
+                
+                # Tiered skill scoring (tiers 1-5) as a separate stage
+                search_results = skill_tier_scorer.score_batch(candidates, parsed_query)
                 
                 # Sort with multiple criteria: first by skill tier, then by score
                 # This ensures candidates with all skills always rank above those with partial matches
@@ -283,7 +190,7 @@ class SearchService:
         logger.info(f"Query: '{query}'")
         
         # Build query - CRITICAL: Filter by user_id
-        stmt = select(Resume).where(
+        stmt = select_search_cards(
             Resume.status == 'active',
             Resume.parse_status == 'completed',
             Resume.user_id == user_id  # SECURITY: Only show user's own resumes
@@ -314,7 +221,7 @@ class SearchService:
                 # If this term might be a skill, add skill-specific conditions
                 if any(term.lower() in var.lower() for var in query_variations):
                     logger.info(f"Term '{term}' identified as potential skill")
-                    skill_conditions = create_skill_search_conditions(term, Resume)
+                    skill_conditions = create_skill_search_conditions(term, Resume, user_id)
                     logger.info(f"Created {len(skill_conditions)} skill-specific conditions")
                     search_conditions.append(or_(*basic_conditions, *skill_conditions))
                 else:
@@ -335,13 +242,8 @@ class SearchService:
                 stmt = stmt.where(Resume.years_experience <= filters["max_experience"])
             
             if filters.get("skills"):
-                # For each skill, check if it exists in the skills JSON array
-                for skill in filters["skills"]:
-                    # Use PostgreSQL JSON operators
-                    # Cast JSON to text and use ILIKE for case-insensitive search
-                    stmt = stmt.where(
-                        func.cast(Resume.skills, SQLString).ilike(f'%"{skill}"%')
-                    )
+                # Every skill must be present (case-insensitive, via resume_skills)
+                stmt = stmt.where(skill_index.has_all_skills(filters["skills"], user_id))
         
         # Log the final SQL conditions (simplified)
         logger.info(f"\nTotal search conditions: {len(search_conditions) if search_terms else 0}")
@@ -353,8 +255,7 @@ class SearchService:
         fetch_limit = limit * 5 if is_skill_search else limit * 2
         logger.info(f"Fetching up to {fetch_limit} results (skill search: {is_skill_search})")
         
-        result = await db.execute(stmt.limit(fetch_limit))
-        resumes = result.scalars().all()
+        resumes = await fetch_search_cards(db, stmt.limit(fetch_limit))
         logger.info(f"Query returned {len(resumes)} resumes")
         
         # Debug: Log all found resumes
@@ -367,24 +268,22 @@ class SearchService:
         if is_skill_search and len(resumes) < fetch_limit:
             logger.info("Adding explicit exact skill match search...")
             # Search for resumes with exact skill match that might have been missed
-            exact_skill_stmt = select(Resume).where(
+            exact_skill_stmt = select_search_cards(
                 Resume.status == 'active',
                 Resume.parse_status == 'completed',
                 Resume.user_id == user_id  # SECURITY: Only show user's own resumes
             )
             
             # Add exact skill conditions
-            skill_conditions = []
-            for term in search_terms:
-                for variation in enhance_search_query_for_skills(term):
-                    skill_conditions.append(
-                        cast(Resume.skills, SQLString).ilike(f'%"{variation}"%')
-                    )
+            skill_variations = [
+                variation
+                for term in search_terms
+                for variation in enhance_search_query_for_skills(term)
+            ]
             
-            if skill_conditions:
-                exact_skill_stmt = exact_skill_stmt.where(or_(*skill_conditions))
-                exact_result = await db.execute(exact_skill_stmt.limit(50))
-                exact_matches = exact_result.scalars().all()
+            if skill_variations:
+                exact_skill_stmt = exact_skill_stmt.where(skill_index.has_any_skill(skill_variations, user_id))
+                exact_matches = await fetch_search_cards(db, exact_skill_stmt.limit(50))
                 
                 # Add any missing exact matches
                 existing_ids = {r.id for r in resumes}
@@ -417,21 +316,7 @@ class SearchService:
                         score += 0.3
                         logger.info(f"Partial skill match for '{term}' in {resume.first_name} {resume.last_name}")
             
-            resume_data = {
-                "id": str(resume.id),
-                "first_name": resume.first_name,
-                "last_name": resume.last_name,
-                "email": resume.email,
-                "phone": resume.phone,
-                "location": resume.location,
-                "current_title": resume.current_title,
-                "summary": resume.summary,
-                "years_experience": resume.years_experience,
-                "skills": resume.skills or [],
-                "keywords": resume.keywords or [],
-                "created_at": resume.created_at,
-                "view_count": resume.view_count or 0
-            }
+            resume_data = resume.to_dict()
             
             # Enhanced skill matching for keyword search
             parsed_query = query_parser.parse_query(query)
@@ -497,12 +382,12 @@ class SearchService:
     ) -> List[Tuple[dict, float]]:
         """Find similar resumes to a given resume."""
         # Get the resume - CRITICAL: Ensure it belongs to the user
-        stmt = select(Resume).where(
+        stmt = select_search_cards(
             Resume.id == resume_id,
             Resume.user_id == user_id  # SECURITY: Only access user's own resumes
         )
-        result = await db.execute(stmt)
-        resume = result.scalar_one_or_none()
+        cards = await fetch_search_cards(db, stmt)
+        resume = cards[0] if cards else None
         
         if not resume:
             return []
@@ -616,11 +501,7 @@ class SearchService:
                             Resume.current_title.ilike(f"%{found_level}%"),
                             Resume.summary.ilike(f"%{found_level}%")
                         ),
-                        or_(
-                            func.cast(Resume.skills, SQLString).ilike(f'%"{found_tech}"%'),
-                            func.cast(Resume.skills, SQLString).ilike(f'%"{found_tech.title()}"%'),
-                            func.cast(Resume.skills, SQLString).ilike(f'%"{found_tech.upper()}"%')
-                        )
+                        skill_index.has_any_skill([found_tech], user_id)
                     )
                 )
             )
@@ -635,8 +516,7 @@ class SearchService:
                     or_(
                         Resume.current_title.ilike(f"%{found_tech}%"),
                         Resume.summary.ilike(f"%{found_tech}%"),
-                        func.cast(Resume.skills, SQLString).ilike(f'%"{found_tech}"%'),
-                        func.cast(Resume.skills, SQLString).ilike(f'%"{found_tech.title()}"%')
+                        skill_index.has_any_skill([found_tech], user_id)
                     )
                 )
                 tech_count_result = await db.execute(tech_count_stmt)
@@ -660,7 +540,7 @@ class SearchService:
                 # Count actual resumes with this keyword
                 # Use enhanced skill search for better matching
                 if keyword.lower() in ['websphere', 'websphere message broker', 'websphere mq', 'wmb', 'ibm mq']:
-                    skill_conditions = create_skill_search_conditions(keyword, Resume)
+                    skill_conditions = create_skill_search_conditions(keyword, Resume, user_id)
                     count_stmt = select(func.count(Resume.id)).where(
                         Resume.status == 'active',
                         Resume.user_id == user_id,  # SECURITY: Only count user's own resumes
@@ -673,7 +553,7 @@ class SearchService:
                         or_(
                             Resume.summary.ilike(f"%{keyword}%"),
                             Resume.current_title.ilike(f"%{keyword}%"),
-                            func.cast(Resume.skills, SQLString).ilike(f'%"{keyword}"%')
+                            skill_index.has_any_skill([keyword], user_id)
                         )
                     )
                 count_result = await db.execute(count_stmt)
@@ -689,25 +569,13 @@ class SearchService:
         
         # Search for skills in the database that match the query
         if len(suggestions) < 10:
-            # Query to find skills that match
-            skill_stmt = text("""
-                SELECT DISTINCT skill, COUNT(*) as count
-                FROM resumes, jsonb_array_elements_text(skills::jsonb) as skill
-                WHERE status = 'active' 
-                AND user_id = :user_id
-                AND LOWER(skill) LIKE LOWER(:query)
-                GROUP BY skill
-                ORDER BY count DESC
-                LIMIT 10
-            """)
-            
             try:
                 logger.info(f"Searching for skills matching '{query}'")
-                result = await db.execute(skill_stmt, {"query": f"%{query}%", "user_id": user_id})
-                skill_matches = result.all()
+                skill_matches = await skill_index.matching_skills(db, user_id, query, limit=10)
                 logger.info(f"Found {len(skill_matches)} matching skills in database")
                 
-                for skill, count in skill_matches:
+                for match in skill_matches:
+                    skill, count = match["skill"], match["count"]
                     if skill and skill not in [s["query"] for s in suggestions]:
                         suggestions.append({
                             "query": skill,
@@ -718,40 +586,6 @@ class SearchService:
                         logger.info(f"Added skill suggestion: '{skill}' with {count} matches")
             except Exception as e:
                 logger.error(f"Error searching skills: {e}", exc_info=True)
-                
-                # Fallback: Try a simpler approach
-                try:
-                    logger.info("Trying fallback skill search method")
-                    fallback_stmt = select(Resume.skills).where(
-                        Resume.skills.isnot(None),
-                        Resume.user_id == user_id,  # SECURITY: Only search user's own resumes
-                        cast(Resume.skills, SQLString).ilike(f'%{query}%')
-                    ).limit(20)
-                    
-                    fallback_result = await db.execute(fallback_stmt)
-                    all_skills_lists = fallback_result.scalars().all()
-                    
-                    # Count occurrences of matching skills
-                    skill_counts = {}
-                    for skills_list in all_skills_lists:
-                        if skills_list:
-                            for skill in skills_list:
-                                if skill and query.lower() in skill.lower():
-                                    skill_counts[skill] = skill_counts.get(skill, 0) + 1
-                    
-                    # Add top matching skills
-                    for skill, count in sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)[:5]:
-                        if skill not in [s["query"] for s in suggestions]:
-                            suggestions.append({
-                                "query": skill,
-                                "count": count,
-                                "confidence": 0.8,
-                                "category": "skill"
-                            })
-                            logger.info(f"Added fallback skill: '{skill}' with {count} matches")
-                            
-                except Exception as fallback_error:
-                    logger.error(f"Fallback skill search also failed: {fallback_error}")
         
         # Get job titles from existing resumes that match the full query
         if len(suggestions) < 10:
@@ -791,39 +625,17 @@ class SearchService:
         limit: int = 30
     ) -> List[Dict[str, Any]]:
         """Get popular skills and technologies from resumes."""
-        # Get all resumes with skills - CRITICAL: Filter by user_id
-        stmt = select(Resume.skills).where(
-            Resume.skills.isnot(None),
-            Resume.status == 'active',
-            Resume.user_id == user_id  # SECURITY: Only show user's own tags
-        )
-        
-        result = await db.execute(stmt)
-        all_skills = result.scalars().all()
-        
-        # Count skill occurrences
-        skill_counts = {}
-        for skills_list in all_skills:
-            if skills_list:
-                for skill in skills_list:
-                    skill_lower = skill.lower()
-                    if skill_lower in skill_counts:
-                        skill_counts[skill_lower]["count"] += 1
-                    else:
-                        skill_counts[skill_lower] = {
-                            "name": skill,
-                            "count": 1,
-                            "category": self._categorize_skill(skill_lower)
-                        }
-        
-        # Sort by count and return top skills
-        sorted_skills = sorted(
-            skill_counts.values(),
-            key=lambda x: x["count"],
-            reverse=True
-        )
-        
-        return sorted_skills[:limit]
+        # Top-k of the maintained per-user skill counts (cached) - CRITICAL: Filter by user_id
+        popular = await skill_index.popular_skills(db, user_id, limit)
+        
+        return [
+            {
+                "name": row["skill"],
+                "count": row["count"],
+                "category": self._categorize_skill(row["skill_norm"])
+            }
+            for row in popular
+        ]
     
     def _categorize_skill(self, skill: str) -> str:
         """Categorize a skill based on common patterns."""
@@ -922,14 +734,19 @@ class SearchService:
         Yields:
             Stage results with timing and metadata
         """
-        async for stage_result in progressive_search.search_progressive(
+        stream = progressive_search.search_progressive(
             db=db,
             query=query,
             user_id=user_id,
             limit=limit,
             filters=filters
-        ):
-            yield stage_result
+        )
+        try:
+            async for stage_result in stream:
+                yield stage_result
+        finally:
+            # Close the engine right away so it cancels stages still in flight
+            await stream.aclose()
 
 
 # Create singleton instance
@@ -0,0 +1,202 @@
+"""Versioned search result cache with single-flight coalescing."""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.redis import RedisKeys, get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """One in-progress computation whose events are shared by every caller."""
+    
+    def __init__(self):
+        self.events: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.changed = asyncio.Condition()
+        self.task: Optional[asyncio.Task] = None
+
+
+class SearchResultCache:
+    """
+    Cache search results per user, invalidated by a corpus version.
+    
+    Entries are keyed on a hash of the normalized query, the filters and the
+    limit, together with the user's corpus version. Writes to a user's
+    resumes bump the version, so every older entry stops being read at once
+    (O(1), no SCAN); they expire on their own after the TTL.
+    
+    Identical searches that run at the same time in this process are
+    coalesced: the first one computes, the others replay its events.
+    """
+    
+    def __init__(self):
+        self.ttl = settings.SEARCH_CACHE_TTL
+        self._flights: Dict[str, _Flight] = {}
+    
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Case- and whitespace-insensitive form of a query."""
+        return " ".join(query.lower().split())
+    
+    def fingerprint(self, query: str, filters: Optional[dict], limit: int) -> str:
+        """Fixed-length hash of everything that determines a result list."""
+        payload = json.dumps(
+            {"query": self.normalize_query(query), "filters": filters or {}, "limit": limit},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+    
+    async def corpus_version(self, user_id: Any) -> Optional[int]:
+        """Current corpus version of a user, or None without Redis."""
+        try:
+            redis_client = await get_redis_client()
+            if not redis_client:
+                return None
+            version = await redis_client.get(RedisKeys.CORPUS_VERSION.format(user_id=user_id))
+            return int(version or 0)
+        except Exception as e:
+            logger.error(f"Error reading corpus version for user {user_id}: {e}")
+            return None
+    
+    async def bump_version(self, *user_ids: Any):
+        """Invalidate every cached search of these users."""
+        try:
+            redis_client = await get_redis_client()
+            if not redis_client:
+                return
+            for user_id in set(user_ids):
+                await redis_client.incr(RedisKeys.CORPUS_VERSION.format(user_id=user_id))
+        except Exception as e:
+            logger.error(f"Error bumping corpus version for users {user_ids}: {e}")
+    
+    async def cache_key(
+        self,
+        user_id: Any,
+        query: str,
+        filters: Optional[dict],
+        limit: int
+    ) -> Optional[str]:
+        """
+        Key for a search at the user's current corpus version.
+        
+        Resolve the key before computing results: if the corpus changes in
+        the meantime the results are stored under the old version and are
+        never served.
+        """
+        version = await self.corpus_version(user_id)
+        if version is None:
+            return None
+        return RedisKeys.SEARCH_CACHE.format(
+            user_id=user_id,
+            query_hash=f"v{version}:{self.fingerprint(query, filters, limit)}"
+        )
+    
+    async def get(self, cache_key: Optional[str]) -> Optional[Any]:
+        """Cached value for a key from ``cache_key``."""
+        if not cache_key:
+            return None
+        try:
+            redis_client = await get_redis_client()
+            if not redis_client:
+                return None
+            cached = await redis_client.get(cache_key)
+            return json.loads(cached) if cached else None
+        except Exception as e:
+            logger.error(f"Error reading search cache {cache_key}: {e}")
+            return None
+    
+    async def set(self, cache_key: Optional[str], value: Any):
+        """Store a JSON-serializable value under a key from ``cache_key``."""
+        if not cache_key:
+            return
+        try:
+            redis_client = await get_redis_client()
+            if not redis_client:
+                return
+            await redis_client.setex(cache_key, self.ttl, json.dumps(value, default=str))
+        except Exception as e:
+            logger.error(f"Error writing search cache {cache_key}: {e}")
+    
+    async def coalesce(
+        self,
+        flight_key: str,
+        stream_factory: Callable[[], AsyncIterator[Any]]
+    ) -> AsyncIterator[Any]:
+        """
+        Run ``stream_factory()`` once for all concurrent callers with this key.
+        
+        The first caller starts the stream in a background task; every
+        caller, including the first, receives all of its events in order. The
+        stream is cancelled once the last caller has gone away.
+        
+        The stream outlives the caller that started it, so it must not use
+        anything scoped to that caller's request, such as its db session.
+        """
+        flight = self._flights.get(flight_key)
+        if flight is None:
+            flight = _Flight()
+            self._flights[flight_key] = flight
+            flight.task = asyncio.create_task(self._produce(flight_key, flight, stream_factory))
+        else:
+            logger.info(f"Joining in-flight search {flight_key}")
+        
+        flight.subscribers += 1
+        position = 0
+        try:
+            while True:
+                async with flight.changed:
+                    await flight.changed.wait_for(lambda: position < len(flight.events) or flight.done)
+                while position < len(flight.events):
+                    yield flight.events[position]
+                    position += 1
+                if flight.done and position == len(flight.events):
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+        finally:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done:
+                # Nobody is listening any more; stop computing
+                if self._flights.get(flight_key) is flight:
+                    del self._flights[flight_key]
+                flight.task.cancel()
+                # Let the stream clean up (cancel its own tasks) before returning
+                await asyncio.wait({flight.task})
+    
+    async def _produce(
+        self,
+        flight_key: str,
+        flight: _Flight,
+        stream_factory: Callable[[], AsyncIterator[Any]]
+    ):
+        """Pump events from the stream into a flight."""
+        stream = stream_factory()
+        try:
+            async for event in stream:
+                async with flight.changed:
+                    flight.events.append(event)
+                    flight.changed.notify_all()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            flight.error = e
+        finally:
+            await stream.aclose()
+            if self._flights.get(flight_key) is flight:
+                del self._flights[flight_key]
+            async with flight.changed:
+                flight.done = True
+                flight.changed.notify_all()
+
+
+# Singleton instance
+search_result_cache = SearchResultCache()
@@ -0,0 +1,130 @@
+"""Lightweight resume projection shared by the search hot paths."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from sqlalchemy.sql import Select
+
+from app.models.resume import Resume
+
+# Columns a search result needs, in SearchCard field order
+SEARCH_CARD_COLUMNS = (
+    Resume.id,
+    Resume.first_name,
+    Resume.last_name,
+    Resume.email,
+    Resume.phone,
+    Resume.location,
+    Resume.current_title,
+    Resume.summary,
+    Resume.years_experience,
+    Resume.skills,
+    Resume.keywords,
+    Resume.created_at,
+    Resume.view_count,
+)
+
+# Large columns that search never needs for every candidate
+HEAVY_COLUMNS = (
+    Resume.raw_text,
+    Resume.parsed_data,
+    Resume.linkedin_data,
+    Resume.embedding,
+    Resume.ai_analysis,
+    Resume.match_scores,
+)
+
+
+@dataclass(slots=True)
+class SearchCard:
+    """The columns of a resume that search results are built from."""
+    
+    id: UUID
+    first_name: str
+    last_name: str
+    email: Optional[str]
+    phone: Optional[str]
+    location: Optional[str]
+    current_title: Optional[str]
+    summary: Optional[str]
+    years_experience: Optional[int]
+    skills: Optional[List[str]]
+    keywords: Optional[List[str]]
+    created_at: Optional[datetime]
+    view_count: Optional[int]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Build the result payload used across search endpoints."""
+        return {
+            "id": str(self.id),
+            "first_name": self.first_name,
+            "last_name": self.last_name,
+            "email": self.email,
+            "phone": self.phone,
+            "location": self.location,
+            "current_title": self.current_title,
+            "summary": self.summary,
+            "years_experience": self.years_experience,
+            "skills": self.skills or [],
+            "keywords": self.keywords or [],
+            "created_at": self.created_at,
+            "view_count": self.view_count or 0
+        }
+
+
+def select_search_cards(*criteria) -> Select:
+    """Select only the search card columns of resumes matching ``criteria``."""
+    return select(*SEARCH_CARD_COLUMNS).where(*criteria)
+
+
+async def fetch_search_cards(db: AsyncSession, stmt: Select) -> List[SearchCard]:
+    """Execute a ``select_search_cards`` statement."""
+    result = await db.execute(stmt)
+    return [SearchCard(*row) for row in result.all()]
+
+
+def search_card_load_only(*extra_columns):
+    """
+    Loader option restricting ORM ``Resume`` queries to the card columns.
+    
+    For paths that need a few more columns on ORM objects (e.g. ``raw_text``
+    for scoring); every other column is deferred.
+    """
+    return load_only(*SEARCH_CARD_COLUMNS, *extra_columns)
+
+
+async def load_heavy_columns(
+    db: AsyncSession,
+    resume_ids: Iterable[Any],
+    user_id: Any,
+    columns: Sequence = HEAVY_COLUMNS
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch large columns for a handful of resumes, e.g. the final top-k.
+    
+    Deferred columns cannot lazy-load on an async session, so callers that
+    need them ask for the few resumes they are about to show.
+    
+    Returns:
+        resume id (str) -> {column name: value}
+    """
+    resume_ids = list(resume_ids)
+    if not resume_ids:
+        return {}
+    
+    result = await db.execute(
+        select(Resume.id, *columns).where(
+            Resume.id.in_(resume_ids),
+            Resume.user_id == user_id  # SECURITY: Only load the user's own resumes
+        )
+    )
+    names = [column.key for column in columns]
+    return {
+        str(row[0]): dict(zip(names, row[1:]))
+        for row in result.all()
+    }
@@ -11,6 +11,7 @@ from sqlalchemy.orm import selectinload
 
 from app.models.resume import Resume
 from app.services.embeddings import embedding_service
+from app.services.skill_index import skill_index
 from app.services.vector_search import vector_search
 
 logger = logging.getLogger(__name__)
@@ -94,9 +95,9 @@ class SearchService:
                 skill_conditions = []
                 for i, skill in enumerate(filters["skills"]):
                     param_name = f"skill_{i}"
-                    # Use exact match (case-insensitive) instead of LIKE for skill filters
-                    skill_conditions.append(f"EXISTS (SELECT 1 FROM json_array_elements_text(r.skills::json) s WHERE LOWER(s) = LOWER(:{param_name}))")
-                    params[param_name] = skill
+                    # Use exact match (case-insensitive) on the normalized resume_skills rows
+                    skill_conditions.append(f"EXISTS (SELECT 1 FROM resume_skills rs WHERE rs.resume_id = r.id AND rs.skill_norm = :{param_name})")
+                    params[param_name] = skill_index.normalize(skill)
                 
                 if skill_conditions:
                     filter_conditions.append(f"({' OR '.join(skill_conditions)})")
@@ -129,14 +130,14 @@ class SearchService:
                     skill_conditions.append(f"""(
                         r.current_title ~* '\\y{skill}\\y'
                         OR r.summary ~* '\\y{skill}\\y' 
-                        OR EXISTS (SELECT 1 FROM json_array_elements_text(r.skills::json) s WHERE s ~* '\\y{skill}\\y')
+                        OR EXISTS (SELECT 1 FROM resume_skills rs WHERE rs.resume_id = r.id AND rs.skill_norm ~ '\\y{skill}\\y')
                     )""")
                 else:
                     # Use LIKE for longer terms
                     skill_conditions.append(f"""(
                         LOWER(r.current_title) LIKE :{param_name}
                         OR LOWER(r.summary) LIKE :{param_name} 
-                        OR EXISTS (SELECT 1 FROM json_array_elements_text(r.skills::json) s WHERE LOWER(s) LIKE :{param_name})
+                        OR EXISTS (SELECT 1 FROM resume_skills rs WHERE rs.resume_id = r.id AND rs.skill_norm LIKE :{param_name})
                     )""")
                     params[param_name] = f"%{skill}%"
             
@@ -540,7 +541,7 @@ class SearchService:
                 conditions.append(f"""(
                     LOWER(current_title) LIKE :{param_name}
                     OR LOWER(summary) LIKE :{param_name}
-                    OR EXISTS (SELECT 1 FROM json_array_elements_text(skills::json) s WHERE LOWER(s) LIKE :{param_name})
+                    OR EXISTS (SELECT 1 FROM resume_skills rs WHERE rs.resume_id = resumes.id AND rs.skill_norm LIKE :{param_name})
                 )""")
                 params[param_name] = f"%{keyword}%"
             
@@ -699,11 +700,13 @@ class SearchService:
                     s2.skill_value as skill2,
                     COUNT(*) as pair_count
                 FROM 
-                    (SELECT LOWER(json_array_elements_text(skills::json)) as skill_value, id 
-                     FROM resumes WHERE status = 'active') s1
+                    (SELECT rs.skill_norm as skill_value, rs.resume_id as id
+                     FROM resume_skills rs JOIN resumes r ON r.id = rs.resume_id
+                     WHERE r.status = 'active') s1
                 JOIN 
-                    (SELECT LOWER(json_array_elements_text(skills::json)) as skill_value, id 
-                     FROM resumes WHERE status = 'active') s2
+                    (SELECT rs.skill_norm as skill_value, rs.resume_id as id
+                     FROM resume_skills rs JOIN resumes r ON r.id = rs.resume_id
+                     WHERE r.status = 'active') s2
                 ON s1.id = s2.id AND s1.skill_value != s2.skill_value
                 WHERE s1.skill_value LIKE :query_pattern
                 GROUP BY s1.skill_value, s2.skill_value
@@ -719,7 +722,7 @@ class SearchService:
         
         result = await db.execute(
             text(sql_query), 
-            {"query_pattern": f"%{query}%"}
+            {"query_pattern": f"%{skill_index.normalize(query)}%"}
         )
         related_skills = result.fetchall()
         
@@ -857,13 +860,13 @@ class SearchService:
         sql_query = """
             WITH skill_counts AS (
                 SELECT 
-                    LOWER(skill_value) as skill,
+                    rs.skill_norm as skill,
                     COUNT(*) as count
-                FROM resumes r,
-                    json_array_elements_text(r.skills) as skill_value
+                FROM resume_skills rs
+                JOIN resumes r ON r.id = rs.resume_id
                 WHERE r.status = 'active'
                 AND r.parse_status = 'completed'
-                GROUP BY LOWER(skill_value)
+                GROUP BY rs.skill_norm
                 ORDER BY count DESC
                 LIMIT :limit
             )
@@ -3,17 +3,21 @@
 import logging
 import re
 from typing import List, Set
-from sqlalchemy import or_, func, String, text
-from sqlalchemy.sql.expression import cast
+
+from app.services.skill_index import skill_index
 
 logger = logging.getLogger(__name__)
 
-def create_skill_search_conditions(skill_query: str, resume_model):
+def create_skill_search_conditions(skill_query: str, resume_model, user_id=None):
     """Create search conditions for skills that handle case variations and common formats.
     
+    Skills are matched through the normalized ``resume_skills`` table, which is
+    already case-insensitive, so only the spacing variations need expanding.
+    
     Args:
         skill_query: The skill to search for (e.g., "WebSphere", "websphere", "web sphere")
         resume_model: The Resume SQLAlchemy model
+        user_id: Owner of the resumes, narrows the skill lookups to their index rows
         
     Returns:
         List of SQLAlchemy conditions to use with OR
@@ -21,45 +25,21 @@ def create_skill_search_conditions(skill_query: str, resume_model):
     logger.info(f"\n--- Creating skill search conditions for: '{skill_query}' ---")
     conditions = []
     
-    # Normalize the skill query
-    skill_lower = skill_query.lower()
-    skill_title = skill_query.title()
-    skill_upper = skill_query.upper()
-    
     # Handle camelCase/PascalCase by adding spaces
     # "WebSphere" -> "Web Sphere"
     skill_spaced = re.sub(r'(?<!^)(?=[A-Z])', ' ', skill_query).strip()
-    skill_spaced_lower = skill_spaced.lower()
-    
-    # Common variations to check
-    variations = [
-        skill_query,  # Original
-        skill_lower,  # lowercase
-        skill_title,  # Title Case
-        skill_upper,  # UPPERCASE
-        skill_spaced,  # With spaces
-        skill_spaced_lower,  # with spaces lowercase
-    ]
     
-    # Remove duplicates
-    variations = list(set(variations))
+    # Common variations to check (case is handled by the normalized skills)
+    variations = list({skill_query.lower(), skill_spaced.lower()})
     logger.info(f"Skill variations to search: {variations}")
     
-    # Check skills JSON array for each variation
-    for variation in variations:
-        # Exact match in JSON array
-        condition_str = f'%"{variation}"%'
-        logger.info(f"Adding JSON skill search: {condition_str}")
-        conditions.append(
-            cast(resume_model.skills, String).ilike(condition_str)
-        )
-        
-        # Match with common suffixes/prefixes
-        for suffix in ['', ' Developer', ' Engineer', ' Expert', ' Specialist']:
-            if suffix and not variation.endswith(suffix.lower()):
-                conditions.append(
-                    cast(resume_model.skills, String).ilike(f'%"{variation}{suffix}"%')
-                )
+    # Exact skill names, also with common suffixes
+    skill_names = [
+        f"{variation}{suffix}"
+        for variation in variations
+        for suffix in ['', ' developer', ' engineer', ' expert', ' specialist']
+    ]
+    conditions.append(skill_index.has_any_skill(skill_names, user_id))
     
     # Also check in raw text and summary for broader matching
     for field in [resume_model.raw_text, resume_model.summary, resume_model.current_title]:
@@ -67,16 +47,9 @@ def create_skill_search_conditions(skill_query: str, resume_model):
             conditions.append(field.ilike(f'%{skill_query}%'))
             conditions.append(field.ilike(f'%{skill_spaced}%'))
     
-    # PostgreSQL specific: Use JSON operators for more precise matching
-    # This checks if any element in the skills array contains the search term
-    jsonb_query = f"""
-        EXISTS (
-            SELECT 1 FROM jsonb_array_elements_text(skills::jsonb) AS skill
-            WHERE skill ILIKE '%{skill_query}%'
-        )
-        """
-    logger.info(f"Adding JSONB array search for partial matches")
-    conditions.append(text(jsonb_query))
+    # Any skill containing the search term (trigram index on resume_skills)
+    logger.info(f"Adding partial skill search")
+    conditions.append(skill_index.has_skill_like(skill_query, user_id))
     
     logger.info(f"Total conditions created: {len(conditions)}")
     return conditions
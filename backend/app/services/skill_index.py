@@ -0,0 +1,185 @@
+"""Normalized resume skills for indexed skill filtering."""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import and_, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis import RedisKeys, cache_manager, get_redis_client
+from app.models.resume import Resume
+from app.models.search_index import ResumeSkill, UserSkillCount
+
+logger = logging.getLogger(__name__)
+
+
+class SkillIndex:
+    """
+    Skill filters over the ``resume_skills`` table.
+    
+    Each resume has one row per distinct lower-cased, trimmed skill. Rows are
+    written by database triggers whenever ``resumes.skills`` changes, so every
+    write path keeps them current; re-indexing rebuilds them from Python.
+    Filters use the (user_id, skill_norm) btree index for exact matches and
+    the trigram index on skill_norm for partial matches, instead of casting
+    the ``skills`` JSON to text for every row.
+    
+    Per-user skill frequencies live in ``user_skill_counts``, which triggers
+    on ``resume_skills`` keep current as skills and resume statuses change.
+    The top of that table is cached in Redis and dropped on resume writes.
+    """
+    
+    # Same characters the migration's btrim() strips
+    TRIM_CHARS = " \t\r\n"
+    
+    def normalize(self, skill: str) -> str:
+        """Normalized form stored in ``resume_skills.skill_norm``."""
+        return skill.strip(self.TRIM_CHARS).lower()
+    
+    def document_skills(self, skills: Optional[Iterable[Any]]) -> Dict[str, str]:
+        """Return normalized skill -> skill as written, for a skills list."""
+        normalized = {}
+        for skill in skills or []:
+            if not isinstance(skill, str):
+                continue
+            cleaned = skill.strip(self.TRIM_CHARS)
+            if not cleaned:
+                continue
+            skill_norm = cleaned.lower()
+            # Match the migration, which keeps min(skill) per normalized skill
+            if skill_norm not in normalized or cleaned < normalized[skill_norm]:
+                normalized[skill_norm] = cleaned
+        return normalized
+    
+    async def index_documents(self, db: AsyncSession, resumes: Sequence[Any]):
+        """Rebuild the skill rows for a batch of resumes or resume rows.
+        
+        Rows need ``id``, ``user_id`` and ``skills``; rows without ``status``
+        are treated as active. Does not commit; the caller owns the
+        transaction.
+        """
+        if not resumes:
+            return
+        
+        rows = [
+            {
+                "resume_id": resume.id,
+                "user_id": resume.user_id,
+                "skill_norm": skill_norm,
+                "skill": skill,
+                "active": getattr(resume, "status", "active") == "active"
+            }
+            for resume in resumes
+            for skill_norm, skill in self.document_skills(resume.skills).items()
+        ]
+        # Same lock order on user_skill_counts as the database triggers
+        rows.sort(key=lambda row: row["skill_norm"])
+        await db.execute(delete(ResumeSkill).where(ResumeSkill.resume_id.in_([resume.id for resume in resumes])))
+        if rows:
+            await db.execute(insert(ResumeSkill), rows)
+    
+    def _skill_subquery(self, user_id: Optional[Any], *criteria):
+        """Resume ids with a matching skill row; ``user_id`` enables the index."""
+        stmt = select(ResumeSkill.resume_id).where(*criteria)
+        if user_id is not None:
+            stmt = stmt.where(ResumeSkill.user_id == user_id)
+        return stmt
+    
+    def has_any_skill(self, skills: Iterable[str], user_id: Optional[Any] = None):
+        """Condition: the resume has at least one of ``skills`` (case-insensitive)."""
+        skill_norms = {self.normalize(skill) for skill in skills if skill}
+        return Resume.id.in_(self._skill_subquery(user_id, ResumeSkill.skill_norm.in_(skill_norms)))
+    
+    def has_all_skills(self, skills: Iterable[str], user_id: Optional[Any] = None):
+        """Condition: the resume has every one of ``skills`` (case-insensitive)."""
+        return and_(*(self.has_any_skill([skill], user_id) for skill in skills if skill))
+    
+    def has_skill_like(self, fragment: str, user_id: Optional[Any] = None):
+        """Condition: one of the resume's skills contains ``fragment``."""
+        pattern = f"%{self.normalize(fragment)}%"
+        return Resume.id.in_(self._skill_subquery(user_id, ResumeSkill.skill_norm.like(pattern)))
+    
+    def has_skill_matching(self, regex: str, user_id: Optional[Any] = None):
+        """Condition: one of the resume's skills matches a (lower-case) regex."""
+        return Resume.id.in_(self._skill_subquery(user_id, ResumeSkill.skill_norm.op("~")(regex)))
+    
+    async def matching_skills(
+        self,
+        db: AsyncSession,
+        user_id: Any,
+        fragment: str,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Skills containing ``fragment`` across a user's active resumes.
+        
+        Returns:
+            [{"skill", "count"}] sorted by the number of resumes, descending
+        """
+        result = await db.execute(
+            select(UserSkillCount.skill, UserSkillCount.resume_count)
+            .where(
+                UserSkillCount.user_id == user_id,
+                UserSkillCount.skill_norm.like(f"%{self.normalize(fragment)}%")
+            )
+            .order_by(UserSkillCount.resume_count.desc(), UserSkillCount.skill_norm)
+            .limit(limit)
+        )
+        return [{"skill": skill, "count": count} for skill, count in result.all()]
+    
+    async def popular_skills(
+        self,
+        db: AsyncSession,
+        user_id: Any,
+        limit: int = 30
+    ) -> List[Dict[str, Any]]:
+        """
+        Most common skills across a user's active resumes.
+        
+        Serves the top ``POPULAR_SKILLS_CACHE_SIZE`` skills from Redis; larger
+        limits read ``user_skill_counts`` directly.
+        
+        Returns:
+            [{"skill", "skill_norm", "count"}] sorted by count, descending
+        """
+        cache_size = settings.POPULAR_SKILLS_CACHE_SIZE
+        if limit > cache_size:
+            return await self._top_skills(db, user_id, limit)
+        
+        popular = await cache_manager.get_or_set(
+            RedisKeys.POPULAR_SKILLS.format(user_id=user_id),
+            lambda: self._top_skills(db, user_id, cache_size),
+            ttl=settings.POPULAR_SKILLS_CACHE_TTL
+        )
+        return popular[:limit]
+    
+    async def _top_skills(self, db: AsyncSession, user_id: Any, limit: int) -> List[Dict[str, Any]]:
+        """Read the top-k rows of ``user_skill_counts``."""
+        result = await db.execute(
+            select(UserSkillCount.skill_norm, UserSkillCount.skill, UserSkillCount.resume_count)
+            .where(UserSkillCount.user_id == user_id)
+            .order_by(UserSkillCount.resume_count.desc(), UserSkillCount.skill_norm)
+            .limit(limit)
+        )
+        return [
+            {"skill": skill, "skill_norm": skill_norm, "count": count}
+            for skill_norm, skill, count in result.all()
+        ]
+    
+    async def invalidate_popular_skills(self, *user_ids: Any):
+        """Drop cached popular skills after resumes of these users were written."""
+        redis_client = await get_redis_client()
+        if not redis_client or not user_ids:
+            return
+        
+        try:
+            await redis_client.delete(
+                *{RedisKeys.POPULAR_SKILLS.format(user_id=user_id) for user_id in user_ids}
+            )
+        except Exception as e:
+            logger.error(f"Error invalidating popular skills for users {user_ids}: {e}")
+
+
+# Singleton instance
+skill_index = SkillIndex()
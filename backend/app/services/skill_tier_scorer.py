@@ -0,0 +1,153 @@
+"""Tiered skill-match scoring for search results."""
+
+import logging
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SkillTierScorer:
+    """
+    Score a batch of candidates against one pre-parsed query using a 5-tier system:
+    1. All required skills match (score boosted 1.5x, capped at 1.0)
+    2. Primary skill + most secondary skills (75%+)
+    3. Primary skill only (50-74%)
+    4. Secondary skills only
+    5. No relevant skills
+    """
+    
+    TIER_MULTIPLIERS = {
+        2: 0.8,
+        3: 0.5,
+        4: 0.2,
+        5: 0.05
+    }
+    
+    @staticmethod
+    def skill_set(skills: Optional[Iterable[str]]) -> FrozenSet[str]:
+        """Precompute the lower-cased skill set for a resume."""
+        return frozenset(skill.lower() for skill in skills or [] if skill)
+    
+    @staticmethod
+    def match_skills(
+        required_skills: List[str],
+        primary_skill: Optional[str],
+        resume_skills: FrozenSet[str]
+    ) -> Tuple[List[str], bool]:
+        """
+        Find which required skills a resume has.
+        
+        A required skill matches if it equals a resume skill or is a substring
+        of one (e.g. "python" matches "python 3").
+        
+        Returns:
+            Tuple of (matched skills, whether the primary skill matched)
+        """
+        matched = []
+        matched_primary = False
+        for required_skill in required_skills:
+            if required_skill in resume_skills or any(
+                required_skill in skill for skill in resume_skills
+            ):
+                matched.append(required_skill)
+                if required_skill == primary_skill:
+                    matched_primary = True
+        return matched, matched_primary
+    
+    @staticmethod
+    def match_ratio(
+        required_skills: List[str],
+        primary_skill: Optional[str],
+        matched_skills: List[str],
+        matched_primary: bool
+    ) -> float:
+        """
+        Weighted skill-match ratio.
+        
+        The primary skill is worth 100% if it's the only required skill,
+        or 50% if there are multiple required skills.
+        """
+        total_required = len(required_skills)
+        if total_required == 1:
+            return 1.0 if matched_primary else 0.0
+        
+        primary_weight = 0.5 if primary_skill else 0
+        secondary_weight = (1.0 - primary_weight) / (total_required - 1)
+        
+        weighted_score = primary_weight if matched_primary else 0.0
+        secondary_matches = len([s for s in matched_skills if s != primary_skill])
+        weighted_score += secondary_matches * secondary_weight
+        
+        return weighted_score
+    
+    @staticmethod
+    def tier_for(skill_match_ratio: float, matched_primary: bool, matched_count: int) -> int:
+        """Map a match ratio to a skill tier (1 = best, 5 = no match)."""
+        if skill_match_ratio == 1.0:
+            return 1
+        elif matched_primary and skill_match_ratio >= 0.75:
+            return 2
+        elif matched_primary and skill_match_ratio >= 0.5:
+            return 3
+        elif not matched_primary and matched_count > 0:
+            return 4
+        return 5
+    
+    def score_batch(
+        self,
+        candidates: List[Tuple[Dict[str, Any], float]],
+        parsed_query: Dict[str, Any]
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Apply tiered skill scoring to a batch of candidates.
+        
+        Args:
+            candidates: (resume_data, vector_score) tuples; resume_data needs "skills"
+            parsed_query: Output of ``query_parser.parse_query`` for the request
+        
+        Returns:
+            (resume_data, tiered_score) tuples in input order. Scored candidates
+            get ``_skill_tier``, ``_matched_skills``, ``_has_primary`` and
+            ``_skill_match_ratio`` set on their resume_data.
+        """
+        required_skills = parsed_query["skills"]
+        primary_skill = parsed_query.get("primary_skill")
+        
+        scored = []
+        for resume_data, original_score in candidates:
+            if not resume_data.get("skills") or not required_skills:
+                # No skills to match or no skills in resume
+                scored.append((resume_data, original_score))
+                continue
+            
+            resume_skills = self.skill_set(resume_data["skills"])
+            
+            matched_skills, matched_primary = self.match_skills(
+                required_skills, primary_skill, resume_skills
+            )
+            skill_match_ratio = self.match_ratio(
+                required_skills, primary_skill, matched_skills, matched_primary
+            )
+            tier = self.tier_for(skill_match_ratio, matched_primary, len(matched_skills))
+            
+            if tier == 1:
+                score = min(1.0, original_score * 1.5)
+            else:
+                score = original_score * self.TIER_MULTIPLIERS[tier]
+            
+            resume_data["_matched_skills"] = matched_skills
+            resume_data["_has_primary"] = matched_primary
+            resume_data["_skill_match_ratio"] = skill_match_ratio
+            resume_data["_skill_tier"] = tier
+            
+            logger.debug(
+                f"Tier {tier} for {resume_data.get('first_name')} {resume_data.get('last_name')}: "
+                f"matched={matched_skills}, primary={matched_primary}, score={score:.3f}"
+            )
+            scored.append((resume_data, score))
+        
+        return scored
+
+
+# Singleton instance
+skill_tier_scorer = SkillTierScorer()
@@ -25,7 +25,10 @@ from app.schemas.submission import (
     CampaignUpdate
 )
 from app.services.email_service_production import email_service
+from app.services.reindex_service import reindex_service
 from app.services.resume_parser import ResumeParser
+from app.services.search_cache import search_result_cache
+from app.services.skill_index import skill_index
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -460,16 +463,16 @@ class SubmissionService:
                 
                 # Use FileParser to extract text based on file type
                 if resume_filename:
-                    # FileParser.extract_text uses filename to determine format
+                    # FileParser uses the filename to determine the format
                     try:
-                        extracted_text = FileParser.extract_text(file_content, resume_filename)
+                        extracted_text = await FileParser.extract_text_async(file_content, resume_filename)
                         logger.info(f"Successfully extracted {len(extracted_text)} characters from {resume_filename}")
                     except Exception as e:
                         logger.error(f"Error extracting text from {resume_filename}: {e}")
                 else:
                     # Fallback to PDF if no filename provided
                     try:
-                        extracted_text = FileParser.extract_text_from_pdf(file_content)
+                        extracted_text = await FileParser.extract_text_async(file_content, "resume.pdf")
                         logger.info(f"Successfully extracted {len(extracted_text)} characters from uploaded file (assumed PDF)")
                     except Exception as pdf_error:
                         logger.warning(f"PDF parsing failed: {pdf_error}")
@@ -496,6 +499,7 @@ class SubmissionService:
         submission: CandidateSubmission
     ):
         """Process submission into resume database."""
+        resume = None
         try:
             if submission.submission_type == SubmissionType.UPDATE:
                 # Update existing resume
@@ -618,7 +622,22 @@ class SubmissionService:
             submission.status = SubmissionStatus.PROCESSED.value  # Convert to string
             submission.processed_at = datetime.utcnow()
             
+            # Keyword index the new or changed resume in the same transaction
+            if resume is not None:
+                await db.flush()
+                await reindex_service.index_keywords(db, [resume])
+            
             await db.commit()
+            await search_result_cache.bump_version(submission.recruiter_id)
+            await skill_index.invalidate_popular_skills(submission.recruiter_id)
+            
+            # Embedding and vector indexing run in the background
+            if resume is not None:
+                try:
+                    await reindex_service.enqueue_index_batch([resume.id], user_id=submission.recruiter_id)
+                except Exception as e:
+                    # The resume is saved; a re-index picks it up
+                    logger.error(f"Failed to queue indexing of submitted resume {resume.id}: {e}")
             
         except Exception as e:
             logger.error(f"Error processing submission: {e}")
@@ -0,0 +1,210 @@
+"""Streaming file uploads: multipart bodies written to disk as they arrive."""
+
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import Request
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+
+logger = logging.getLogger(__name__)
+
+# Room for the multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadRejectedError(ValueError):
+    """The upload is malformed or of a type that is not allowed."""
+
+
+class UploadTooLargeError(UploadRejectedError):
+    """The upload exceeds its size limit; raised as soon as the limit is crossed."""
+
+
+@dataclass
+class SpooledUpload:
+    """An uploaded file on disk, with the size and SHA-256 computed while receiving it."""
+    
+    path: str
+    filename: str
+    content_type: Optional[str]
+    size: int
+    sha256: str
+    
+    @property
+    def extension(self) -> str:
+        return self.filename.lower().rsplit('.', 1)[-1] if '.' in self.filename else ''
+    
+    def cleanup(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class _UploadWriter:
+    """MultipartParser callbacks that write one file field to a temp file."""
+    
+    def __init__(self, field: str, max_size: int, allowed_extensions: Optional[Iterable[str]]):
+        self.field = field.encode()
+        self.max_size = max_size
+        self.allowed_extensions = {ext.lower().lstrip('.') for ext in allowed_extensions or ()}
+        self.upload: Optional[SpooledUpload] = None
+        self._file = None
+        self._hash = None
+        self._headers = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._writing = False
+    
+    def callbacks(self):
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+    
+    def on_part_begin(self):
+        self._headers = {}
+    
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+    
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+    
+    def on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+    
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if options.get(b"name") != self.field or self.upload is not None or self._file is not None:
+            return  # Other form fields are skipped
+        
+        filename = options.get(b"filename", b"").decode("utf-8", errors="replace")
+        if not filename:
+            raise UploadRejectedError(f"Form field '{self.field.decode()}' is not a file")
+        ext = filename.lower().rsplit('.', 1)[-1] if '.' in filename else ''
+        if self.allowed_extensions and ext not in self.allowed_extensions:
+            # Rejected before any of the file is received
+            raise UploadRejectedError(
+                f"File type .{ext} not allowed. Allowed types: "
+                f"{', '.join('.' + e for e in sorted(self.allowed_extensions))}"
+            )
+        
+        content_type = self._headers.get(b"content-type")
+        self._file = tempfile.NamedTemporaryFile(delete=False, suffix=f".{ext}" if ext else "")
+        self._hash = hashlib.sha256()
+        self._writing = True
+        self.upload = SpooledUpload(
+            path=self._file.name,
+            filename=filename,
+            content_type=content_type.decode("latin-1") if content_type else None,
+            size=0,
+            sha256=""
+        )
+    
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if not self._writing:
+            return
+        chunk = data[start:end]
+        self.upload.size += len(chunk)
+        if self.upload.size > self.max_size:
+            raise UploadTooLargeError(
+                f"File size exceeds maximum allowed size of {self.max_size / 1024 / 1024:g}MB"
+            )
+        self._hash.update(chunk)
+        self._file.write(chunk)
+    
+    def on_part_end(self):
+        if self._writing:
+            self._writing = False
+            self._file.close()
+            self.upload.sha256 = self._hash.hexdigest()
+    
+    def abort(self):
+        if self._file is not None:
+            self._file.close()
+        if self.upload is not None:
+            self.upload.cleanup()
+
+
+def multipart_file_body(field: str = "file") -> Dict[str, Any]:
+    """OpenAPI request body for an endpoint that reads its file with ``receive_upload``."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": [field],
+                        "properties": {field: {"type": "string", "format": "binary"}},
+                    }
+                }
+            },
+        }
+    }
+
+
+async def receive_upload(
+    request: Request,
+    field: str = "file",
+    max_size: int = 10 * 1024 * 1024,
+    allowed_extensions: Optional[Iterable[str]] = None
+) -> SpooledUpload:
+    """
+    Stream the file in a multipart/form-data field to a temp file.
+    
+    Unlike ``UploadFile``, the body is never held in memory and the upload
+    is rejected as soon as it is too large or of the wrong type, without
+    receiving the rest. The caller owns the returned file and must call
+    ``cleanup()``.
+    
+    Raises:
+        UploadTooLargeError: The file is larger than ``max_size`` bytes
+        UploadRejectedError: The body is not multipart, has no such file
+            field, or the file type is not allowed
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise UploadRejectedError("Expected a multipart/form-data upload")
+    
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_size + MULTIPART_OVERHEAD:
+        raise UploadTooLargeError(
+            f"File size exceeds maximum allowed size of {max_size / 1024 / 1024:g}MB"
+        )
+    
+    writer = _UploadWriter(field, max_size, allowed_extensions)
+    parser = MultipartParser(boundary, writer.callbacks())
+    try:
+        async for chunk in request.stream():
+            if chunk:
+                parser.write(chunk)
+        parser.finalize()
+    except MultipartParseError as e:
+        writer.abort()
+        raise UploadRejectedError(f"Malformed upload: {e}")
+    except BaseException:
+        # Too large, not allowed, or the client went away
+        writer.abort()
+        raise
+    
+    if writer.upload is None or writer._writing:
+        writer.abort()
+        raise UploadRejectedError(f"No file received in form field '{field}'")
+    
+    logger.info(f"Received upload {writer.upload.filename}: {writer.upload.size} bytes")
+    return writer.upload
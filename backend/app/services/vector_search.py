@@ -1,10 +1,12 @@
 """Vector search service using Qdrant."""
 
+import asyncio
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 
-from qdrant_client import QdrantClient
+import httpx
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.models import (
     Distance, 
     VectorParams, 
@@ -18,6 +20,7 @@ from openai import AsyncOpenAI
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.core.config import settings
+from app.services.embedding_cache import embedding_cache
 
 logger = logging.getLogger(__name__)
 
@@ -27,25 +30,36 @@ class VectorSearchService:
     
     def __init__(self):
         """Initialize Qdrant client and OpenAI."""
-        # Initialize Qdrant client
+        # Initialize async Qdrant client with a bounded connection pool so
+        # concurrent searches share keep-alive connections instead of
+        # blocking the event loop on a synchronous client.
         qdrant_url = settings.QDRANT_URL
         qdrant_api_key = settings.QDRANT_API_KEY
+        limits = httpx.Limits(
+            max_connections=settings.QDRANT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.QDRANT_MAX_CONNECTIONS
+        )
         
         if qdrant_url and "localhost" not in qdrant_url and "127.0.0.1" not in qdrant_url:
             # Cloud Qdrant
-            self.client = QdrantClient(
+            self.client = AsyncQdrantClient(
                 url=qdrant_url,
                 api_key=qdrant_api_key,
-                timeout=30
+                timeout=settings.QDRANT_TIMEOUT,
+                limits=limits
             )
         else:
             # Local Qdrant
-            self.client = QdrantClient(
+            self.client = AsyncQdrantClient(
                 host="localhost",
                 port=6333,
-                timeout=30
+                timeout=settings.QDRANT_TIMEOUT,
+                limits=limits
             )
         
+        # Per-call deadline for Qdrant operations
+        self.request_timeout = settings.QDRANT_REQUEST_TIMEOUT
+        
         # Collection name
         self.collection_name = settings.QDRANT_COLLECTION_NAME
         
@@ -54,50 +68,73 @@ class VectorSearchService:
         if settings.OPENAI_API_KEY:
             self.openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
         
-        # Ensure collection exists
-        self._ensure_collection()
+        # Collection is ensured lazily on first use, since the client is async
+        self._collection_ready = False
+        self._collection_lock = asyncio.Lock()
+    
+    async def _call(self, coro, timeout: Optional[float] = None):
+        """Await a Qdrant client call with a per-call deadline."""
+        return await asyncio.wait_for(coro, timeout=timeout or self.request_timeout)
+    
+    async def ensure_collection_exists(self) -> bool:
+        """Ensure the collection exists once per process.
+        
+        Returns:
+            bool: True if the collection is available, False otherwise
+        """
+        if self._collection_ready:
+            return True
+        
+        async with self._collection_lock:
+            if not self._collection_ready:
+                self._collection_ready = await self._ensure_collection()
+        
+        return self._collection_ready
     
-    def _ensure_collection(self):
+    async def _ensure_collection(self) -> bool:
         """Ensure the collection exists in Qdrant with proper indexes."""
         try:
             # Check if collection exists
-            collections = self.client.get_collections()
+            collections = await self._call(self.client.get_collections())
             exists = any(c.name == self.collection_name for c in collections.collections)
             
             if not exists:
                 # Create collection with OpenAI embedding dimensions
-                self.client.create_collection(
+                await self._call(self.client.create_collection(
                     collection_name=self.collection_name,
                     vectors_config=VectorParams(
                         size=1536,  # OpenAI ada-002 embeddings
                         distance=Distance.COSINE
                     )
-                )
+                ))
                 logger.info(f"Created Qdrant collection: {self.collection_name}")
                 
                 # Create indexes immediately after collection creation
-                self._create_indexes()
+                await self._create_indexes()
             else:
                 logger.info(f"Qdrant collection exists: {self.collection_name}")
                 
                 # Ensure indexes exist on existing collection
-                self._create_indexes()
+                await self._create_indexes()
+            
+            return True
                 
         except Exception as e:
             logger.warning(f"Could not ensure Qdrant collection: {e}")
             logger.warning("Qdrant is not available - vector search will be disabled")
             # Continue anyway - will fail on actual operations if Qdrant is not available
+            return False
     
-    def _create_indexes(self):
+    async def _create_indexes(self):
         """Create necessary indexes on the collection."""
         try:
             # Create index on user_id field - CRITICAL for filtering
             try:
-                self.client.create_payload_index(
+                await self._call(self.client.create_payload_index(
                     collection_name=self.collection_name,
                     field_name="user_id",
                     field_schema="keyword"  # Simple string type for compatibility
-                )
+                ))
                 logger.info("Created index on 'user_id' field")
             except Exception as e:
                 if "already exists" not in str(e).lower():
@@ -105,11 +142,11 @@ class VectorSearchService:
             
             # Create index on resume_id field
             try:
-                self.client.create_payload_index(
+                await self._call(self.client.create_payload_index(
                     collection_name=self.collection_name,
                     field_name="resume_id",
                     field_schema="keyword"  # Simple string type for compatibility
-                )
+                ))
                 logger.info("Created index on 'resume_id' field")
             except Exception as e:
                 if "already exists" not in str(e).lower():
@@ -119,8 +156,12 @@ class VectorSearchService:
             logger.warning(f"Error creating indexes: {e}")
     
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    async def get_embedding(self, text: str, use_ensemble: bool = False) -> List[float]:
-        """Get embedding for text using OpenAI or ensemble."""
+    async def get_embedding(self, text: str, use_ensemble: bool = False, cache: bool = True) -> List[float]:
+        """Get embedding for text using OpenAI or ensemble.
+        
+        ``cache=False`` skips the query embedding cache, for document texts
+        that would only push search queries out of it.
+        """
         if use_ensemble:
             # Use embedding ensemble for better quality
             from app.services.embedding_ensemble import embedding_ensemble
@@ -131,6 +172,19 @@ class VectorSearchService:
             logger.warning("OpenAI API key not configured - returning empty embedding")
             return [0.0] * 1536
         
+        if cache:
+            embedding = await embedding_cache.get_or_compute(
+                settings.EMBEDDING_MODEL,
+                text,
+                lambda: self._fetch_embedding(text)
+            )
+        else:
+            embedding = await self._fetch_embedding(text)
+        # Return empty embedding on error to allow the app to continue
+        return embedding or [0.0] * 1536
+    
+    async def _fetch_embedding(self, text: str) -> Optional[List[float]]:
+        """Fetch an embedding from OpenAI, returning None on error."""
         try:
             response = await self.openai_client.embeddings.create(
                 model=settings.EMBEDDING_MODEL,
@@ -139,14 +193,20 @@ class VectorSearchService:
             return response.data[0].embedding
         except Exception as e:
             logger.error(f"Error getting embedding: {e}")
-            # Return empty embedding on error to allow the app to continue
-            return [0.0] * 1536
+            return None
     
-    async def index_resume(self, resume_id: str, text: str, metadata: Dict[str, Any]):
-        """Index a resume in Qdrant."""
+    async def index_resume(
+        self,
+        resume_id: str,
+        text: str,
+        metadata: Dict[str, Any],
+        embedding: Optional[List[float]] = None
+    ):
+        """Index a resume in Qdrant, with its embedding if already computed."""
         try:
-            # Get embedding
-            embedding = await self.get_embedding(text)
+            # Get embedding, bypassing the query embedding cache
+            if embedding is None:
+                embedding = await self.get_embedding(text, cache=False)
             
             # CRITICAL: Ensure user_id is in metadata
             if "user_id" not in metadata:
@@ -164,10 +224,11 @@ class VectorSearchService:
             )
             
             # Upsert to Qdrant
-            self.client.upsert(
+            await self.ensure_collection_exists()
+            await self._call(self.client.upsert(
                 collection_name=self.collection_name,
                 points=[point]
-            )
+            ))
             
             logger.info(f"Indexed resume {resume_id} in Qdrant")
             return embedding
@@ -177,6 +238,46 @@ class VectorSearchService:
             # Return None but don't fail - allows app to work without vector search
             return None
     
+    async def upsert_embeddings(
+        self,
+        items: List[Tuple[str, List[float], Dict[str, Any]]],
+        wait: bool = False
+    ) -> int:
+        """Upsert precomputed embeddings in one Qdrant request.
+        
+        Args:
+            items: (resume_id, embedding, metadata) tuples; metadata must include user_id
+            wait: Whether to wait for Qdrant to apply the write before returning
+            
+        Returns:
+            int: Number of points sent
+        """
+        points = []
+        for resume_id, embedding, metadata in items:
+            # CRITICAL: Ensure user_id is in metadata
+            if "user_id" not in metadata:
+                logger.error(f"SECURITY WARNING: Attempting to index resume {resume_id} without user_id!")
+                continue
+            points.append(PointStruct(
+                id=resume_id,
+                vector=embedding,
+                payload={
+                    "resume_id": resume_id,
+                    **metadata
+                }
+            ))
+        
+        if not points:
+            return 0
+        
+        await self.ensure_collection_exists()
+        await self._call(self.client.upsert(
+            collection_name=self.collection_name,
+            points=points,
+            wait=wait
+        ))
+        return len(points)
+    
     async def search_similar(
         self, 
         query: str, 
@@ -214,13 +315,14 @@ class VectorSearchService:
             qdrant_filter = Filter(must=conditions) if conditions else None
             
             # Search
-            results = self.client.search(
+            await self.ensure_collection_exists()
+            results = await self._call(self.client.search(
                 collection_name=self.collection_name,
                 query_vector=query_embedding,
                 query_filter=qdrant_filter,
                 limit=limit,
                 with_payload=True
-            )
+            ))
             
             # Format results
             formatted_results = []
@@ -241,10 +343,10 @@ class VectorSearchService:
     async def delete_resume(self, resume_id: str):
         """Delete a resume from Qdrant."""
         try:
-            self.client.delete(
+            await self._call(self.client.delete(
                 collection_name=self.collection_name,
                 points_selector=[resume_id]
-            )
+            ))
             logger.info(f"Deleted resume {resume_id} from Qdrant")
         except Exception as e:
             logger.error(f"Error deleting resume {resume_id}: {e}")
@@ -253,16 +355,16 @@ class VectorSearchService:
         """Get information about the collection."""
         try:
             # Try to get basic info without full collection details
-            collections = self.client.get_collections()
+            collections = await self._call(self.client.get_collections())
             collection_exists = any(c.name == self.collection_name for c in collections.collections)
             
             if collection_exists:
                 # Try to count points
                 try:
-                    count_result = self.client.count(
+                    count_result = await self._call(self.client.count(
                         collection_name=self.collection_name,
                         exact=False  # Approximate count is faster
-                    )
+                    ))
                     points_count = count_result.count
                 except:
                     points_count = "unknown"
@@ -297,13 +399,13 @@ class VectorSearchService:
             limit = 100
             
             while True:
-                result = self.client.scroll(
+                result = await self._call(self.client.scroll(
                     collection_name=self.collection_name,
                     limit=limit,
                     offset=offset,
                     with_payload=False,
                     with_vectors=False
-                )
+                ))
                 
                 points, next_offset = result
                 
@@ -319,6 +421,13 @@ class VectorSearchService:
         except Exception as e:
             logger.error(f"Error getting all IDs from vector search: {e}")
             return set()
+    
+    async def close(self):
+        """Close the pooled Qdrant connections."""
+        try:
+            await self.client.close()
+        except Exception as e:
+            logger.warning(f"Error closing Qdrant client: {e}")
 
 
 # Singleton instance
@@ -0,0 +1,59 @@
+"""Background job worker process.
+
+Runs jobs enqueued by the web processes (resume parsing, embedding and
+indexing). Start one or more next to the API:
+
+    python -m app.worker [--concurrency 4] [--kind resume.process ...]
+
+Deployments without a dedicated worker (Railway, the dev and minimal
+compose files) run one inside the API process instead; see
+``JOB_WORKER_EMBEDDED``. Set it to false wherever this process runs.
+"""
+
+import argparse
+import asyncio
+import signal
+from typing import Tuple
+
+from app.core.config import settings
+from app.core.logging_config import configure_logging
+from app.services.content_cache import content_cache
+from app.services.job_queue import JobWorker, job_queue
+
+# Handlers register themselves with the job queue on import
+import app.services.reindex_service  # noqa: F401
+import app.services.resume_processor  # noqa: F401
+
+
+def start_embedded_worker() -> Tuple[JobWorker, asyncio.Task]:
+    """Start a worker on the running event loop (API lifespan); stop it with ``worker.stop()`` and await the task."""
+    worker = JobWorker(job_queue)
+    return worker, asyncio.create_task(worker.run())
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run background jobs")
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY,
+        help="Jobs to run at once"
+    )
+    parser.add_argument(
+        "--kind", action="append", dest="kinds",
+        help="Only run jobs of this kind (repeatable); defaults to all registered kinds"
+    )
+    args = parser.parse_args()
+    
+    configure_logging()
+    worker = JobWorker(job_queue, concurrency=args.concurrency, kinds=args.kinds)
+    
+    # Finish running jobs on shutdown
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    
+    await worker.run()
+    await content_cache.flush_hits()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Benchmark BM25 postings traversal against a full text scan.
+
+Builds synthetic corpora of 1k/10k/100k resumes from the generators in
+generate_100_test_resumes.py and, for a set of queries, compares:
+- scan: counting every query term in every document (the old keyword path)
+- index: walking only the postings lists of the query terms with exact
+  document frequencies, as BM25Index.search does after its postings query
+
+Usage:
+    python scripts/benchmark_bm25_index.py [sizes...]
+"""
+
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.bm25_index import BM25Index
+from generate_100_test_resumes import (
+    generate_100_resumes,
+    generate_skills_for_role,
+    generate_summary,
+    generate_work_experience,
+    ROLE_SKILLS,
+    PROGRAMMING_LANGUAGES,
+    FRAMEWORKS,
+    DATABASES,
+)
+
+QUERIES = [
+    "python aws",
+    "senior react developer",
+    "kubernetes terraform docker",
+    "machine learning tensorflow",
+    "rust",
+]
+
+
+def build_corpus(size: int):
+    """Expand the 100 reference resumes into a corpus of ``size`` documents."""
+    random.seed(42)
+    templates = generate_100_resumes()
+    roles = list(ROLE_SKILLS.keys())
+    extra_pool = PROGRAMMING_LANGUAGES + FRAMEWORKS + DATABASES
+    
+    corpus = []
+    for i in range(size):
+        if i < len(templates):
+            template = templates[i]
+            role = template["current_title"]
+            skills = template["skills"]
+            summary = template["summary"]
+            experience = template["work_experience"]
+        else:
+            role = roles[i % len(roles)]
+            years = random.randint(1, 15)
+            skills = generate_skills_for_role(role) + random.sample(extra_pool, 2)
+            summary = generate_summary(f"Candidate {i}", role, years, skills)
+            experience = generate_work_experience(role, years, skills)
+        
+        raw_text = " ".join(
+            [summary] + [f"{exp['title']} at {exp['company']}. {exp['description']}" for exp in experience]
+        )
+        corpus.append(SimpleNamespace(
+            id=i,
+            raw_text=raw_text,
+            summary=summary,
+            skills=skills,
+            current_title=role
+        ))
+    return corpus
+
+
+def build_index(index: BM25Index, corpus):
+    """Build in-memory postings equivalent to the bm25_postings table."""
+    postings = defaultdict(list)
+    total_length = 0
+    for doc in corpus:
+        term_counts, length = index.document_terms(doc)
+        total_length += length
+        for term, tf in term_counts.items():
+            postings[term].append((doc.id, tf, length))
+    return postings, total_length / len(corpus)
+
+
+def scan_search(index: BM25Index, corpus, terms, limit):
+    """Score every document by scanning its text (old keyword path)."""
+    doc_count = len(corpus)
+    scores = []
+    for doc in corpus:
+        text = index.document_text(doc).lower()
+        length = len(text.split())
+        score = 0.0
+        for term in terms:
+            tf = text.count(term)
+            if tf == 0:
+                continue
+            df = max(1, doc_count / 10)
+            score += index.idf(doc_count, df) * (tf * (index.k1 + 1)) / (
+                tf + index.k1 * (1 - index.b + index.b * length / 500.0)
+            )
+        if score > 0:
+            scores.append((doc.id, score))
+    scores.sort(key=lambda x: x[1], reverse=True)
+    return scores[:limit]
+
+
+def index_search(index: BM25Index, postings, doc_count, avg_length, terms, limit):
+    """Score documents by walking the postings of the query terms."""
+    query_postings = {term: postings[term] for term in terms if term in postings}
+    scores = index.score_postings(query_postings, doc_count, avg_length, index.k1, index.b)
+    return sorted(scores.items(), key=lambda x: x[1], reverse=True)[:limit]
+
+
+def timed(func, repeats=5):
+    samples = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(samples)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    index = BM25Index()
+    
+    print(f"{'docs':>8} {'build ms':>10} {'scan ms':>10} {'index ms':>10} {'speedup':>9} {'postings/q':>11}")
+    print("=" * 64)
+    
+    for size in sizes:
+        corpus = build_corpus(size)
+        
+        start = time.perf_counter()
+        postings, avg_length = build_index(index, corpus)
+        build_ms = (time.perf_counter() - start) * 1000
+        
+        scan_total = 0.0
+        index_total = 0.0
+        touched = 0
+        for query in QUERIES:
+            terms = set(index.tokenize(query))
+            _, scan_ms = timed(lambda: scan_search(index, corpus, terms, 20), repeats=1 if size >= 100_000 else 3)
+            ranked, index_ms = timed(lambda: index_search(index, postings, size, avg_length, terms, 20))
+            scan_total += scan_ms
+            index_total += index_ms
+            touched += sum(len(postings.get(term, [])) for term in terms)
+            
+            # Every indexed hit must contain at least one query term as a token
+            for doc_id, _ in ranked:
+                assert terms & set(index.tokenize(index.document_text(corpus[doc_id])))
+        
+        scan_avg = scan_total / len(QUERIES)
+        index_avg = index_total / len(QUERIES)
+        print(
+            f"{size:>8} {build_ms:>10.0f} {scan_avg:>10.2f} {index_avg:>10.2f} "
+            f"{scan_avg / index_avg:>8.1f}x {touched // len(QUERIES):>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
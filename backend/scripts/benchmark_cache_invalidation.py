@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Benchmark SCAN-based against tag-based cache invalidation.
+
+Fills a stand-in Redis (the in-memory fallback) with 1M keys spread over
+1000 users, then invalidates one user's keys both ways:
+- the previous ``invalidate_pattern``: SCAN the whole keyspace, one DELETE
+- ``cache_manager.invalidate_tags``: pop the user's tag set in chunks
+
+The stand-in counts round trips, and the report adds an estimated network
+cost per round trip (``--rtt-ms``), since that is what dominates on a real
+Redis.
+
+Usage:
+    python scripts/benchmark_cache_invalidation.py [--keys 1000000] [--users 1000] [--rtt-ms 0.5]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import app.core.redis as redis_module
+from app.core.cache_fallback import InMemoryCache, InMemoryPipeline
+from app.core.redis import RedisKeys, cache_manager
+
+SCAN_COUNT = 10  # redis-py's default SCAN COUNT hint
+
+
+class CountingPipeline(InMemoryPipeline):
+    """Pipeline that counts as a single round trip."""
+    
+    async def execute(self):
+        # Commands inside a pipeline share its round trip
+        round_trips = self._cache.round_trips
+        results = await super().execute()
+        self._cache.round_trips = round_trips + 1
+        return results
+
+
+class CountingRedis(InMemoryCache):
+    """In-memory stand-in for Redis that counts client round trips."""
+    
+    def __init__(self):
+        super().__init__()
+        self.round_trips = 0
+    
+    async def spop(self, key, count=None):
+        self.round_trips += 1
+        return await super().spop(key, count)
+    
+    async def delete(self, *keys):
+        self.round_trips += 1
+        return await super().delete(*keys)
+    
+    async def unlink(self, *keys):
+        self.round_trips += 1
+        return await super().delete(*keys)
+    
+    async def scan_iter(self, match=None, count=None):
+        scanned = 0
+        async for key in super().scan_iter():
+            scanned += 1
+            if scanned % (count or SCAN_COUNT) == 0:
+                self.round_trips += 1
+            if match is None or key.startswith(match.rstrip("*")):
+                yield key
+        self.round_trips += 1
+    
+    def pipeline(self, transaction=True):
+        return CountingPipeline(self)
+
+
+def user_tag(user: int) -> str:
+    return RedisKeys.TAG_USER.format(user_id=f"user{user}")
+
+
+async def populate(redis_client: CountingRedis, total_keys: int, users: int):
+    """Write ``total_keys`` cached entries, each tagged with its user."""
+    per_user = total_keys // users
+    for user in range(users):
+        keys = [f"search:user{user}:{i}" for i in range(per_user)]
+        pipe = redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.setex(key, 3600, "{}")
+        pipe.sadd(RedisKeys.CACHE_TAG.format(tag=user_tag(user)), *keys)
+        await pipe.execute()
+    return per_user
+
+
+async def scan_invalidate(redis_client: CountingRedis, pattern: str) -> int:
+    """The previous CacheManager.invalidate_pattern."""
+    keys = []
+    async for key in redis_client.scan_iter(match=pattern):
+        keys.append(key)
+    if keys:
+        return await redis_client.delete(*keys)
+    return 0
+
+
+async def measure(redis_client: CountingRedis, label: str, invalidate, rtt_ms: float):
+    redis_client.round_trips = 0
+    start = time.perf_counter()
+    deleted = await invalidate()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    network_ms = redis_client.round_trips * rtt_ms
+    print(
+        f"{label:<8} deleted {deleted:>6} keys | {redis_client.round_trips:>7} round trips | "
+        f"{elapsed_ms:>8.1f}ms local + {network_ms:>8.1f}ms network = {elapsed_ms + network_ms:>9.1f}ms"
+    )
+    return deleted
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="Estimated network round trip")
+    args = parser.parse_args()
+    
+    print("Cache invalidation benchmark")
+    print("=" * 60)
+    
+    redis_client = CountingRedis()
+    original_client = redis_module.redis_client
+    redis_module.redis_client = redis_client
+    try:
+        start = time.perf_counter()
+        per_user = await populate(redis_client, args.keys, args.users)
+        print(f"Populated {per_user * args.users} keys ({per_user} per user) in {time.perf_counter() - start:.1f}s\n")
+        
+        scanned = await measure(
+            redis_client, "SCAN",
+            lambda: scan_invalidate(redis_client, "search:user0:*"),
+            args.rtt_ms
+        )
+        tagged = await measure(
+            redis_client, "tags",
+            lambda: cache_manager.invalidate_tags(user_tag(1)),
+            args.rtt_ms
+        )
+        assert scanned == tagged == per_user, (scanned, tagged, per_user)
+        assert await redis_client.get("search:user1:0") is None
+        assert await redis_client.get("search:user2:0") == "{}"
+        
+        # Invalidating an unknown or already invalidated tag is one round trip
+        await measure(redis_client, "empty", lambda: cache_manager.invalidate_tags(user_tag(1)), args.rtt_ms)
+        
+        # Keys written through the cache manager register under their tags
+        await cache_manager.set("search:new:0", {"results": []}, tags=[user_tag("new")])
+        assert await cache_manager.invalidate_tags(user_tag("new")) == 1
+        assert await redis_client.get("search:new:0") is None
+        
+        print(f"\nInvalidation stats: {cache_manager.get_invalidation_stats()}")
+    finally:
+        redis_module.redis_client = original_client
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark EmbeddingService.generate_embeddings_batch against a fake OpenAI.
+
+The stand-in charges a fixed round-trip latency per request plus a small
+per-item cost, and can fail a fraction of requests to exercise retries.
+Reports items/sec for batch sizes 1, 16 and 128.
+
+Usage:
+    python scripts/benchmark_embedding_batches.py [num_texts] [failure_rate]
+"""
+
+import asyncio
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.embeddings import embedding_service
+
+
+class FakeEmbeddings:
+    """Mimics ``AsyncOpenAI().embeddings``."""
+
+    def __init__(self, latency: float, per_item: float, failure_rate: float):
+        self.latency = latency
+        self.per_item = per_item
+        self.failure_rate = failure_rate
+        self.calls = 0
+
+    async def create(self, model: str, input):
+        self.calls += 1
+        inputs = input if isinstance(input, list) else [input]
+        await asyncio.sleep(self.latency + self.per_item * len(inputs))
+        if random.random() < self.failure_rate:
+            raise RuntimeError("simulated rate limit")
+        return SimpleNamespace(data=[
+            SimpleNamespace(index=i, embedding=[float(len(text) % 7)] * 8)
+            for i, text in enumerate(inputs)
+        ])
+
+
+async def main():
+    num_texts = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    failure_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+
+    texts = [f"Resume {i}: Senior Python developer with AWS and Django " * 5 for i in range(num_texts)]
+    original_client = embedding_service.client
+    embedding_service.batch_max_retries = 5
+    embedding_service.batch_retry_delay = 0.05
+    logging.getLogger("app.services.embeddings").setLevel(logging.ERROR)
+
+    print(f"Embedding {num_texts} texts (80ms round trip, {failure_rate:.0%} request failure rate)")
+    print("=" * 70)
+    print(f"{'batch size':>10} {'requests':>10} {'seconds':>10} {'items/sec':>12} {'missing':>10}")
+
+    try:
+        for batch_size in (1, 16, 128):
+            fake = FakeEmbeddings(latency=0.08, per_item=0.0002, failure_rate=failure_rate)
+            embedding_service.client = SimpleNamespace(embeddings=fake)
+
+            start = time.perf_counter()
+            embeddings = await embedding_service.generate_embeddings_batch(texts, batch_size=batch_size)
+            elapsed = time.perf_counter() - start
+
+            # Results must come back in input order
+            for text, embedding in zip(texts, embeddings):
+                if embedding is not None:
+                    assert embedding[0] == float(len(text.strip()) % 7)
+
+            missing = sum(1 for e in embeddings if e is None)
+            print(f"{batch_size:>10} {fake.calls:>10} {elapsed:>10.2f} {num_texts / elapsed:>12.1f} {missing:>10}")
+    finally:
+        embedding_service.client = original_client
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Benchmark event loop latency while resumes are parsed concurrently.
+
+Extracts text from N generated resumes (half PDF, half DOCX) at once and
+measures how late a 10ms ticker fires while they are in flight. The first
+case parses on the event loop, as uploads did before; the second uses the
+extraction process pool.
+
+Usage:
+    python scripts/benchmark_file_parser.py [files] [pages]
+"""
+
+import asyncio
+import io
+import sys
+import time
+from pathlib import Path
+from statistics import mean
+
+from docx import Document
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.file_parser import ExtractionPool, FileParser
+
+LINE = "Senior Python developer with {i} years of FastAPI, PostgreSQL, Redis and AWS experience"
+
+
+def make_pdf(pages: int, lines_per_page: int = 40) -> bytes:
+    """A minimal multi-page PDF with one text line per row."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Page tree, once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+    for page in range(pages):
+        rows = [b"BT /F1 10 Tf 40 800 Td 12 TL"]
+        for i in range(lines_per_page):
+            rows.append(b"(" + LINE.format(i=page * lines_per_page + i).encode() + b") Tj T*")
+        rows.append(b"ET")
+        stream = b"\n".join(rows)
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % ref for ref in page_refs), pages
+    )
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def make_docx(paragraphs: int) -> bytes:
+    """A DOCX resume with paragraphs and a skills table."""
+    document = Document()
+    for i in range(paragraphs):
+        document.add_paragraph(LINE.format(i=i))
+    table = document.add_table(rows=paragraphs // 10 or 1, cols=3)
+    for row in table.rows:
+        for cell in row.cells:
+            cell.text = "Python, FastAPI, PostgreSQL"
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float = 0.01):
+    """Record how late a periodic ticker wakes up."""
+    lags = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - start - interval) * 1000)
+    return lags
+
+
+async def _extract_on_loop(file_content: bytes, filename: str) -> str:
+    await asyncio.sleep(0)
+    return FileParser.extract_text(file_content, filename)
+
+
+async def run_case(name: str, extract, files):
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_loop_lag(stop))
+
+    start = time.perf_counter()
+    texts = await asyncio.gather(*[extract(content, filename) for filename, content in files])
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    stop.set()
+    lags = await lag_task
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99) - 1] if lags else 0.0
+
+    print(f"\n{name}")
+    print(f"  files:           {len(texts)} ({sum(len(text) for text in texts)} characters)")
+    print(f"  wall time:       {wall_ms:.1f} ms")
+    print(f"  loop lag mean:   {mean(lags) if lags else 0.0:.1f} ms")
+    print(f"  loop lag p99:    {p99:.1f} ms")
+    print(f"  loop lag max:    {max(lags) if lags else 0.0:.1f} ms")
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    pdf = make_pdf(pages)
+    docx = make_docx(pages * 40)
+    files = [
+        (f"resume_{i}.pdf", pdf) if i % 2 == 0 else (f"resume_{i}.docx", docx)
+        for i in range(count)
+    ]
+
+    print(f"File parser benchmark: {count} files, {pages} pages each "
+          f"(PDF {len(pdf) // 1024} KB, DOCX {len(docx) // 1024} KB)")
+    print("=" * 70)
+
+    await run_case("On the event loop (previous behaviour)", _extract_on_loop, files)
+
+    pool = ExtractionPool(max_queue=count)
+    try:
+        # Start the processes outside the measurement
+        await asyncio.gather(*[pool.extract_text(pdf, "warmup.pdf") for _ in range(pool.workers)])
+        await run_case(f"Extraction pool ({pool.workers} processes)", pool.extract_text, files)
+        print(f"  pool stats:      {pool.get_stats()}")
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
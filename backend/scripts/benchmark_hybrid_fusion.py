@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Benchmark HybridSearchService._combine_results at 1k keyword + 1k vector candidates.
+
+Compares the previous fusion (linear scans of both result lists for every
+id, quadratic overall) with the id-indexed fusion for the weighted and
+RRF strategies. Half of the candidates appear in both legs.
+
+Usage:
+    python scripts/benchmark_hybrid_fusion.py [candidates_per_leg] [iterations]
+"""
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.hybrid_search import hybrid_search, HybridSearchConfig, FUSION_WEIGHTED, FUSION_RRF
+
+
+def make_candidates(count: int):
+    """Build keyword and vector legs sharing half of their ids."""
+    rng = random.Random(count)
+    keyword_ids = [f"resume-{i:06d}" for i in range(count)]
+    vector_ids = [f"resume-{i:06d}" for i in range(count // 2, count // 2 + count)]
+    
+    keyword_results = sorted(
+        (({"id": rid, "first_name": "Test", "skills": ["Python"]}, rng.uniform(0, 12)) for rid in keyword_ids),
+        key=lambda x: x[1], reverse=True
+    )
+    vector_results = sorted(
+        ({"resume_id": rid, "score": rng.uniform(0.2, 0.95), "metadata": {"name": "Test"}} for rid in vector_ids),
+        key=lambda x: x["score"], reverse=True
+    )
+    return keyword_results, vector_results
+
+
+def legacy_combine(keyword_results, vector_results, limit, keyword_weight=0.3, vector_weight=0.7):
+    """The previous quadratic fusion, kept here for comparison."""
+    keyword_scores = {r[0]["id"]: r[1] for r in keyword_results}
+    vector_scores = {r["resume_id"]: r["score"] for r in vector_results}
+    keyword_max = max(keyword_scores.values()) if keyword_scores else 1.0
+    vector_max = max(vector_scores.values()) if vector_scores else 1.0
+    
+    hybrid_results = []
+    for resume_id in set(keyword_scores.keys()) | set(vector_scores.keys()):
+        keyword_score = keyword_scores.get(resume_id, 0) / keyword_max
+        vector_score = vector_scores.get(resume_id, 0) / vector_max
+        hybrid_score = keyword_weight * keyword_score + vector_weight * vector_score
+        
+        resume_data = None
+        for r in keyword_results:
+            if r[0]["id"] == resume_id:
+                resume_data = r[0]
+                break
+        if not resume_data:
+            for r in vector_results:
+                if r["resume_id"] == resume_id:
+                    resume_data = dict(r.get("metadata", {}))
+                    resume_data["id"] = resume_id
+                    break
+        
+        hybrid_results.append((resume_data, hybrid_score))
+    
+    hybrid_results.sort(key=lambda x: x[1], reverse=True)
+    return hybrid_results[:limit]
+
+
+def timed(func, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    keyword_results, vector_results = make_candidates(count)
+    limit = 20
+    weighted = HybridSearchConfig(fusion=FUSION_WEIGHTED)
+    rrf = HybridSearchConfig(fusion=FUSION_RRF)
+    
+    print(f"Fusing {count} keyword + {count} vector candidates (median of {iterations} runs)")
+    print("=" * 60)
+    
+    legacy_ms = timed(lambda: legacy_combine(keyword_results, vector_results, limit), iterations)
+    weighted_ms = timed(
+        lambda: hybrid_search._combine_results(keyword_results, vector_results, limit, weighted),
+        iterations
+    )
+    rrf_ms = timed(
+        lambda: hybrid_search._combine_results(keyword_results, vector_results, limit, rrf),
+        iterations
+    )
+    
+    # The weighted strategy must rank exactly like the old fusion
+    legacy_ids = [r[0]["id"] for r in legacy_combine(keyword_results, vector_results, limit)]
+    weighted_ids = [
+        r[0]["id"] for r in hybrid_search._combine_results(keyword_results, vector_results, limit, weighted)
+    ]
+    assert legacy_ids == weighted_ids, "weighted fusion diverged from the previous ranking"
+    
+    print(f"{'legacy (quadratic)':<22} {legacy_ms:>10.2f} ms")
+    print(f"{'weighted (id map)':<22} {weighted_ms:>10.2f} ms  {legacy_ms / weighted_ms:>7.1f}x")
+    print(f"{'rrf (id map)':<22} {rrf_ms:>10.2f} ms  {legacy_ms / rrf_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark QueryParser skill matching over the queries in common_search_examples.py.
+
+Compares three ways of running the first (known-skill) pass and parse_query:
+- per-skill regex: the previous loop, one re.search per known skill per query
+- compiled matcher: the single precompiled alternation built at init
+- parse_query (cached): full parse with the normalized-query LRU warm
+
+Usage:
+    python scripts/benchmark_query_parser.py [iterations]
+"""
+
+import contextlib
+import io
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.query_parser import QueryParser
+
+# common_search_examples prints its guide on import
+with contextlib.redirect_stdout(io.StringIO()):
+    from common_search_examples import COMMON_SEARCHES
+
+
+def legacy_match(parser: QueryParser, query_lower: str):
+    """The previous first pass: sort and search every known skill per query."""
+    skills = []
+    processed = set()
+    for skill in sorted(parser.known_skills, key=len, reverse=True):
+        if re.search(r'\b' + re.escape(skill) + r'\b', query_lower) and skill not in processed:
+            skills.append(skill)
+            for word in skill.split():
+                processed.add(word)
+    return skills, processed
+
+
+def timed(func, queries, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for query in queries:
+            func(query)
+    return (time.perf_counter() - start) / (iterations * len(queries)) * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    parser = QueryParser()
+    queries = [q for group in COMMON_SEARCHES.values() for q in group]
+    normalized = [re.sub(r'\s+', ' ', q.lower().strip()) for q in queries]
+
+    # Both matchers must agree
+    for query in normalized:
+        assert legacy_match(parser, query) == parser._match_known_skills(query), query
+
+    legacy_us = timed(lambda q: legacy_match(parser, q), normalized, iterations)
+    compiled_us = timed(parser._match_known_skills, normalized, iterations)
+    uncached_us = timed(parser._parse_normalized, normalized, iterations)
+    for query in queries:
+        parser.parse_query(query)
+    cached_us = timed(parser.parse_query, queries, iterations)
+
+    print(f"{len(queries)} queries from common_search_examples.py, {len(parser.known_skills)} known skills")
+    print("=" * 70)
+    print(f"{'per-skill regex (skill pass)':<34} {legacy_us:>10.1f} us/query")
+    print(f"{'compiled matcher (skill pass)':<34} {compiled_us:>10.1f} us/query  ({legacy_us / compiled_us:.1f}x)")
+    print(f"{'parse_query (uncached)':<34} {uncached_us:>10.1f} us/query")
+    print(f"{'parse_query (LRU warm)':<34} {cached_us:>10.1f} us/query")
+    print(f"LRU: {parser._parse_cached.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
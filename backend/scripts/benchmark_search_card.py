@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Benchmark full-row resume loading against the search card projection.
+
+Seeds a throwaway user with synthetic resumes (10k by default) inside a
+transaction that is rolled back at the end, so nothing is persisted. Each
+resume carries realistic heavy columns: raw text, parsed data, LinkedIn
+data, AI analysis and a 1536-float JSON embedding.
+
+For the query shapes used by the search hot paths it compares:
+- before: ``select(Resume)`` loading every column into ORM objects
+- after: ``select_search_cards`` loading only the card columns
+
+and reports the median milliseconds per query and the decoded payload size
+of the returned rows. The heavy columns for a final top 5 are fetched
+separately with ``load_heavy_columns`` to show what lazy loading costs.
+
+Usage:
+    python scripts/benchmark_search_card.py [size]
+"""
+
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import cast, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import String as SQLString
+
+from app.db.session import engine
+from app.models.resume import Resume
+from app.models.user import User
+from app.services.search_card import (
+    SEARCH_CARD_COLUMNS,
+    fetch_search_cards,
+    load_heavy_columns,
+    select_search_cards,
+)
+from benchmark_bm25_index import build_corpus
+
+EMBEDDING_DIMENSIONS = 1536
+INSERT_BATCH = 500
+REPEATS = 5
+
+
+def build_rows(user_id, size: int):
+    """Turn the synthetic corpus into resume rows with heavy columns."""
+    rng = random.Random(7)
+    rows = []
+    for doc in build_corpus(size):
+        first_name, last_name = f"Candidate{doc.id}", "Bench"
+        rows.append({
+            "id": uuid4(),
+            "user_id": user_id,
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": f"candidate{doc.id}@example.com",
+            "location": "Remote",
+            "current_title": doc.current_title,
+            "summary": doc.summary,
+            "years_experience": rng.randint(1, 15),
+            "skills": doc.skills,
+            "keywords": doc.skills[:5],
+            "raw_text": doc.raw_text,
+            "parsed_data": {"summary": doc.summary, "skills": doc.skills, "text": doc.raw_text},
+            "linkedin_data": {"headline": doc.current_title, "about": doc.summary},
+            "ai_analysis": {"strengths": doc.skills[:3], "summary": doc.summary},
+            "match_scores": {"history": [rng.random() for _ in range(10)]},
+            "embedding": [round(rng.uniform(-1, 1), 8) for _ in range(EMBEDDING_DIMENSIONS)],
+            "status": "active",
+            "parse_status": "completed",
+        })
+    return rows
+
+
+def payload_bytes(rows) -> int:
+    """Approximate bytes transferred as the JSON size of the decoded rows."""
+    return sum(len(json.dumps(list(row), default=str)) for row in rows)
+
+
+async def median_ms(session: AsyncSession, run) -> float:
+    samples = []
+    for _ in range(REPEATS):
+        session.expunge_all()  # Force ORM objects to be rebuilt every run
+        start = time.perf_counter()
+        await run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        session = AsyncSession(bind=conn, expire_on_commit=False)
+        try:
+            user_id = uuid4()
+            await session.execute(insert(User), [{
+                "id": user_id,
+                "email": f"bench-{user_id}@example.com",
+                "username": f"bench-{user_id}",
+            }])
+            
+            print(f"Seeding {size} resumes (rolled back afterwards)...")
+            rows = build_rows(user_id, size)
+            for i in range(0, len(rows), INSERT_BATCH):
+                await session.execute(insert(Resume), rows[i:i + INSERT_BATCH])
+            ids = [row["id"] for row in rows]
+            del rows
+            
+            owned = (Resume.user_id == user_id, Resume.status == "active")
+            shapes = {
+                "skill filter, 20 rows": (
+                    *owned, cast(Resume.skills, SQLString).ilike('%"Python"%')
+                ),
+                "title/summary keyword, 20 rows": (
+                    *owned, or_(Resume.current_title.ilike("%engineer%"), Resume.summary.ilike("%engineer%"))
+                ),
+                "id hydration, 60 rows": (
+                    *owned, Resume.id.in_(random.Random(1).sample(ids, 60))
+                ),
+                "raw text keyword, 100 rows": (
+                    *owned, Resume.raw_text.ilike("%python%")
+                ),
+            }
+            limits = {"skill filter, 20 rows": 20, "title/summary keyword, 20 rows": 20,
+                      "id hydration, 60 rows": 60, "raw text keyword, 100 rows": 100}
+            
+            print(f"\n{'query':<32} {'before ms':>10} {'after ms':>10} {'before KB':>10} {'after KB':>10} {'reduction':>10}")
+            print("=" * 88)
+            for name, criteria in shapes.items():
+                limit = limits[name]
+                full_stmt = select(Resume).where(*criteria).limit(limit)
+                card_stmt = select_search_cards(*criteria).limit(limit)
+                
+                async def run_before():
+                    result = await session.execute(full_stmt)
+                    return [resume.first_name for resume in result.scalars().all()]
+                
+                async def run_after():
+                    return [card.to_dict() for card in await fetch_search_cards(session, card_stmt)]
+                
+                before_ms = await median_ms(session, run_before)
+                after_ms = await median_ms(session, run_after)
+                
+                full_rows = (await session.execute(
+                    select(*Resume.__table__.columns).where(*criteria).limit(limit)
+                )).all()
+                card_rows = (await session.execute(
+                    select(*SEARCH_CARD_COLUMNS).where(*criteria).limit(limit)
+                )).all()
+                before_kb = payload_bytes(full_rows) / 1024
+                after_kb = payload_bytes(card_rows) / 1024
+                print(
+                    f"{name:<32} {before_ms:>10.2f} {after_ms:>10.2f} {before_kb:>10.1f} {after_kb:>10.1f} "
+                    f"{before_kb / max(after_kb, 0.001):>9.1f}x"
+                )
+            
+            top_ids = ids[:5]
+            heavy_ms = await median_ms(session, lambda: load_heavy_columns(session, top_ids, user_id))
+            heavy = await load_heavy_columns(session, top_ids, user_id)
+            heavy_kb = sum(len(json.dumps(columns, default=str)) for columns in heavy.values()) / 1024
+            print(f"\nLazy heavy columns for the final top 5: {heavy_ms:.2f} ms, {heavy_kb:.1f} KB")
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Micro-benchmark per-request CPU time of the tiered skill scoring in search_resumes.
+
+Compares the previous behaviour (query parsed once per candidate) with the
+scoring stage (query parsed once per request, one batch scored against
+precomputed skill sets). search_resumes fetches ``limit * 2`` candidates.
+
+Usage:
+    python scripts/benchmark_search_scoring.py [iterations]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.query_parser import query_parser
+from app.services.skill_tier_scorer import skill_tier_scorer
+
+SKILL_POOL = [
+    "Python", "Django", "Flask", "FastAPI", "AWS", "Docker", "Kubernetes", "React",
+    "TypeScript", "JavaScript", "Node.js", "PostgreSQL", "Redis", "Java", "Spring Boot",
+    "Go", "Terraform", "GraphQL", "Kafka", "Machine Learning", "Pandas", "SQL"
+]
+
+QUERIES = [
+    "Senior Python Developer with AWS",
+    "React and TypeScript frontend engineer",
+    "DevOps engineer with Kubernetes and Terraform",
+    "Java Spring Boot microservices",
+]
+
+
+def make_candidates(count: int):
+    rng = random.Random(count)
+    return [
+        (
+            {
+                "id": str(i),
+                "first_name": f"Candidate{i}",
+                "last_name": "Bench",
+                "skills": rng.sample(SKILL_POOL, rng.randint(3, 12)),
+            },
+            rng.random(),
+        )
+        for i in range(count)
+    ]
+
+
+def score_per_candidate_parse(query, candidates):
+    """Previous behaviour: parse_query runs inside the per-result loop."""
+    results = []
+    for candidate in candidates:
+        parsed_query = query_parser.parse_query(query)
+        results.extend(skill_tier_scorer.score_batch([candidate], parsed_query))
+    return results
+
+
+def score_once(query, candidates):
+    """Scoring stage: one parse per request, one batch."""
+    parsed_query = query_parser.parse_query(query)
+    return skill_tier_scorer.score_batch(candidates, parsed_query)
+
+
+def measure(func, query, candidates, iterations):
+    start = time.process_time()
+    for _ in range(iterations):
+        # Fresh dicts so per-candidate annotations don't accumulate
+        func(query, [(dict(data), score) for data, score in candidates])
+    return (time.process_time() - start) / iterations * 1000
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print("Per-request CPU time for tiered skill scoring (ms, mean over queries)")
+    print("=" * 70)
+    print(f"{'limit':>6} {'candidates':>11} {'parse per result':>18} {'parse once':>12} {'speedup':>9}")
+
+    for limit in (10, 50, 200):
+        candidates = make_candidates(limit * 2)
+        before = sum(measure(score_per_candidate_parse, q, candidates, iterations) for q in QUERIES) / len(QUERIES)
+        after = sum(measure(score_once, q, candidates, iterations) for q in QUERIES) / len(QUERIES)
+        print(f"{limit:>6} {len(candidates):>11} {before:>18.2f} {after:>12.2f} {before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Benchmark skill filtering on the JSON column against resume_skills.
+
+Seeds a throwaway user with synthetic resumes (50k by default) inside a
+transaction that is rolled back at the end, so nothing is persisted. The
+resume_skills rows are written by the triggers from the add_resume_skills
+migration, which must be applied first.
+
+For each skill query shape used by search it compares:
+- before: casting ``resumes.skills`` to text / expanding the JSON array
+  for every resume, and counting popular tags in Python
+- after: the ``skill_index`` conditions and aggregates over resume_skills
+
+and reports the median milliseconds per query and the number of rows
+returned by each side.
+
+Usage:
+    python scripts/benchmark_skill_index.py [size]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import and_, cast, insert, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import String as SQLString
+
+from app.db.session import engine
+from app.models.resume import Resume
+from app.models.user import User
+from app.services.skill_index import skill_index
+from benchmark_bm25_index import build_corpus
+
+INSERT_BATCH = 1000
+REPEATS = 5
+
+
+def build_rows(user_id, size: int):
+    """Turn the synthetic corpus into minimal resume rows."""
+    return [
+        {
+            "id": uuid4(),
+            "user_id": user_id,
+            "first_name": f"Candidate{doc.id}",
+            "last_name": "Bench",
+            "current_title": doc.current_title,
+            "summary": doc.summary,
+            "skills": doc.skills,
+            "status": "active",
+            "parse_status": "completed",
+        }
+        for doc in build_corpus(size)
+    ]
+
+
+def json_skill(skill: str):
+    """The old exact skill filter: the quoted skill anywhere in the JSON text."""
+    return cast(Resume.skills, SQLString).ilike(f'%"{skill}"%')
+
+
+async def python_popular_tags(session: AsyncSession, user_id, limit: int):
+    """The old get_popular_tags: load every skills list and count in Python."""
+    result = await session.execute(
+        select(Resume.skills).where(
+            Resume.skills.isnot(None),
+            Resume.status == 'active',
+            Resume.user_id == user_id
+        )
+    )
+    counts = {}
+    for skills in result.scalars().all():
+        for skill in skills or []:
+            counts[skill.lower()] = counts.get(skill.lower(), 0) + 1
+    return sorted(counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+async def json_skill_suggestions(session: AsyncSession, user_id, query: str):
+    """The old suggestion query: expand every skills array of the user."""
+    result = await session.execute(text("""
+        SELECT skill, COUNT(*) as count
+        FROM resumes, jsonb_array_elements_text(skills::jsonb) as skill
+        WHERE status = 'active' AND user_id = :user_id
+        AND LOWER(skill) LIKE LOWER(:query)
+        GROUP BY skill
+        ORDER BY count DESC
+        LIMIT 10
+    """), {"query": f"%{query}%", "user_id": user_id})
+    return result.all()
+
+
+async def timed(run):
+    samples = []
+    rows = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        rows = await run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), len(rows)
+
+
+async def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        session = AsyncSession(bind=conn, expire_on_commit=False)
+        try:
+            user_id = uuid4()
+            await session.execute(insert(User), [{
+                "id": user_id,
+                "email": f"bench-{user_id}@example.com",
+                "username": f"bench-{user_id}",
+            }])
+            
+            print(f"Seeding {size} resumes (rolled back afterwards)...")
+            rows = build_rows(user_id, size)
+            for i in range(0, len(rows), INSERT_BATCH):
+                await session.execute(insert(Resume), rows[i:i + INSERT_BATCH])
+            del rows
+            await session.execute(text("ANALYZE resumes"))
+            await session.execute(text("ANALYZE resume_skills"))
+            skill_rows = (await session.execute(text(
+                "SELECT count(*) FROM resume_skills WHERE user_id = :user_id"
+            ), {"user_id": user_id})).scalar()
+            print(f"resume_skills rows: {skill_rows}")
+            
+            owned = (Resume.user_id == user_id, Resume.status == 'active')
+            
+            def ids(*criteria):
+                async def run():
+                    return (await session.execute(select(Resume.id).where(*owned, *criteria))).all()
+                return run
+            
+            shapes = {
+                "all of python, aws": (
+                    ids(and_(json_skill("python"), json_skill("aws"))),
+                    ids(skill_index.has_all_skills(["python", "aws"], user_id)),
+                ),
+                "any of react, vue, angular": (
+                    ids(or_(json_skill("react"), json_skill("vue"), json_skill("angular"))),
+                    ids(skill_index.has_any_skill(["react", "vue", "angular"], user_id)),
+                ),
+                "skill contains 'script'": (
+                    ids(text(
+                        "EXISTS (SELECT 1 FROM jsonb_array_elements_text(resumes.skills::jsonb) AS skill "
+                        "WHERE skill ILIKE '%script%')"
+                    )),
+                    ids(skill_index.has_skill_like("script", user_id)),
+                ),
+                "skill suggestions for 'java'": (
+                    lambda: json_skill_suggestions(session, user_id, "java"),
+                    lambda: skill_index.matching_skills(session, user_id, "java", limit=10),
+                ),
+                "popular tags, top 30": (
+                    lambda: python_popular_tags(session, user_id, 30),
+                    lambda: skill_index.popular_skills(session, user_id, 30),
+                ),
+            }
+            
+            print(f"\n{'query':<30} {'before ms':>10} {'after ms':>10} {'speedup':>8} {'rows':>12}")
+            print("=" * 74)
+            for name, (before, after) in shapes.items():
+                before_ms, before_rows = await timed(before)
+                after_ms, after_rows = await timed(after)
+                print(
+                    f"{name:<30} {before_ms:>10.2f} {after_ms:>10.2f} "
+                    f"{before_ms / max(after_ms, 0.001):>7.1f}x {before_rows:>5} / {after_rows:<5}"
+                )
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Benchmark event loop latency under concurrent vector searches.
+
+Runs N concurrent ``search_similar`` calls against an in-process Qdrant
+stand-in and measures how late a 10ms ticker fires while they are in flight.
+The blocking stand-in mimics the old synchronous ``QdrantClient`` (the
+network round trip runs on the event loop); the async stand-in mimics
+``AsyncQdrantClient``.
+
+Usage:
+    python scripts/benchmark_vector_search_concurrency.py [concurrency] [latency_ms]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from statistics import mean
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.vector_search import vector_search
+
+
+class AsyncQdrantStandIn:
+    """Qdrant stand-in whose round trip yields to the event loop."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def search(self, limit: int = 10, **kwargs):
+        await asyncio.sleep(self.latency)
+        return [
+            SimpleNamespace(score=1.0 - i / 100, payload={"resume_id": f"r{i}", "user_id": "bench"})
+            for i in range(limit)
+        ]
+
+
+class BlockingQdrantStandIn(AsyncQdrantStandIn):
+    """Qdrant stand-in whose round trip blocks the loop like the old sync client."""
+
+    async def search(self, limit: int = 10, **kwargs):
+        time.sleep(self.latency)
+        return [
+            SimpleNamespace(score=1.0 - i / 100, payload={"resume_id": f"r{i}", "user_id": "bench"})
+            for i in range(limit)
+        ]
+
+
+async def _fake_embedding(text: str, use_ensemble: bool = False):
+    return [0.0] * 1536
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float = 0.01):
+    """Record how late a periodic ticker wakes up."""
+    lags = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - start - interval) * 1000)
+    return lags
+
+
+async def run_case(name: str, client, concurrency: int):
+    vector_search.client = client
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_loop_lag(stop))
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        vector_search.search_similar(f"python developer {i}", user_id="bench", limit=10)
+        for i in range(concurrency)
+    ])
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    stop.set()
+    lags = await lag_task
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99) - 1] if lags else 0.0
+
+    print(f"\n{name}")
+    print(f"  searches:        {len(results)} ({sum(len(r) for r in results)} hits)")
+    print(f"  wall time:       {wall_ms:.1f} ms")
+    print(f"  loop lag mean:   {mean(lags) if lags else 0.0:.1f} ms")
+    print(f"  loop lag p99:    {p99:.1f} ms")
+    print(f"  loop lag max:    {max(lags) if lags else 0.0:.1f} ms")
+
+
+async def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 20.0) / 1000
+
+    # Skip OpenAI and collection setup; only the Qdrant round trip is measured
+    vector_search.get_embedding = _fake_embedding
+    vector_search._collection_ready = True
+    original_client = vector_search.client
+
+    print(f"Concurrent search_similar benchmark: {concurrency} calls, {latency * 1000:.0f} ms per round trip")
+    print("=" * 70)
+
+    try:
+        await run_case("Blocking client (previous behaviour)", BlockingQdrantStandIn(latency), concurrency)
+        await run_case("Async client", AsyncQdrantStandIn(latency), concurrency)
+    finally:
+        vector_search.client = original_client
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Test bulk import queue processing.
+
+Runs against the in-memory Redis fallback, with the queue table replaced
+by an in-memory queue, and checks that:
+- rate limits are sliding window counters read with one MGET
+- several users' queues progress in parallel, each paced by the human delay
+- no more than BULK_IMPORT_MAX_ACTIVE_USERS users are processed at once
+- a user stops at the rate limit, and unclaimed items stay pending
+- indexing is queued once per claimed batch
+- items claimed but not imported are released when processing is cancelled
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import app.core.redis as redis_module
+import app.services.bulk_import as bulk_module
+from app.core.cache_fallback import InMemoryCache
+from app.services.bulk_import import BulkImportService, RateLimiter
+
+DELAY = 0.05
+
+
+class CountingRedis(InMemoryCache):
+    """In-memory stand-in for Redis that counts reads."""
+    
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+    
+    async def get(self, key):
+        self.reads += 1
+        return await super().get(key)
+    
+    async def mget(self, keys):
+        self.reads += 1
+        return [await InMemoryCache.get(self, key) for key in keys]
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+    
+    def time(self) -> float:
+        return self.now
+
+
+class FakeReindexService:
+    def __init__(self):
+        self.batches = []
+    
+    async def enqueue_index_batch(self, resume_ids, user_id=None):
+        self.batches.append((list(resume_ids), user_id))
+
+
+class FakeCache:
+    async def bump_version(self, *user_ids):
+        pass
+    
+    async def invalidate_popular_skills(self, *user_ids):
+        pass
+
+
+class InMemoryQueueService(BulkImportService):
+    """BulkImportService over an in-memory queue instead of import_queue."""
+    
+    def __init__(self, queue_sizes, claim_batch=10):
+        super().__init__(session_factory=lambda: None)
+        self.rate_limiter.limits.update(min_delay_seconds=DELAY, max_delay_seconds=DELAY)
+        self.reindex_service = FakeReindexService()
+        self.claim_batch = claim_batch
+        self.items = {
+            user_id: [
+                SimpleNamespace(id=uuid4(), status="pending", priority=0, created_at=datetime.utcnow(), profile_data={})
+                for _ in range(size)
+            ]
+            for user_id, size in queue_sizes.items()
+        }
+        self.import_times = {user_id: [] for user_id in queue_sizes}
+        self.active_users = set()
+        self.max_active_users = 0
+        self.claims = []
+    
+    async def _claim_batch(self, user_id, limit):
+        self.active_users.add(user_id)
+        self.max_active_users = max(self.max_active_users, len(self.active_users))
+        batch = [item for item in self.items[user_id] if item.status == "pending"][:limit]
+        for item in batch:
+            item.status = "processing"
+        self.claims.append((user_id, len(batch)))
+        if not batch:
+            self.active_users.discard(user_id)
+        return batch
+    
+    async def _import_item(self, user_id, queue_item):
+        self.import_times[user_id].append(time.perf_counter())
+        queue_item.status = "completed"
+        return uuid4()
+    
+    async def _release(self, items):
+        for item in items:
+            if item.status == "processing":
+                item.status = "pending"
+    
+    def count(self, user_id, status):
+        return sum(1 for item in self.items[user_id] if item.status == status)
+
+
+def fresh_redis() -> CountingRedis:
+    redis_module.redis_client = CountingRedis()
+    bulk_module.search_result_cache = FakeCache()
+    bulk_module.skill_index = FakeCache()
+    return redis_module.redis_client
+
+
+async def run_queues(service, users, max_items=None):
+    for user_id in users:
+        await service.process_queue(None, user_id, max_items=max_items)
+    await asyncio.gather(*list(service.processing_tasks.values()))
+
+
+async def test_sliding_window():
+    redis = fresh_redis()
+    clock = FakeClock(1_000_040.0)  # 20s into a minute
+    real_time = bulk_module.time
+    bulk_module.time = clock
+    try:
+        limiter = RateLimiter()
+        user_id = uuid4()
+        for _ in range(10):
+            await limiter.record_import(user_id)
+        
+        redis.reads = 0
+        assert await limiter.remaining(None, user_id) == 0
+        assert redis.reads == 1, redis.reads
+        print("✅ three rate limits checked with one Redis read")
+        
+        # 30s into the next minute, half of the previous minute still counts
+        clock.now += 70
+        counts = await limiter.get_counts(None, user_id)
+        assert counts["profiles_per_minute"] == 5, counts
+        assert counts["profiles_per_hour"] == 10 and counts["profiles_per_day"] == 10, counts
+        assert await limiter.remaining(None, user_id) == 5
+        
+        clock.now += 60
+        assert await limiter.remaining(None, user_id) == 10
+        print("✅ minute window slides: 10 → 5 → 0 counted imports over two minutes")
+    finally:
+        bulk_module.time = real_time
+
+
+async def test_users_in_parallel():
+    fresh_redis()
+    users = [uuid4() for _ in range(3)]
+    service = InMemoryQueueService({user_id: 4 for user_id in users}, claim_batch=2)
+    
+    start = time.perf_counter()
+    await run_queues(service, users)
+    elapsed = time.perf_counter() - start
+    
+    for user_id in users:
+        times = service.import_times[user_id]
+        assert service.count(user_id, "completed") == 4
+        gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+        assert len(times) == 4 and min(gaps) >= DELAY * 0.9, gaps
+    # Sequential processing would take 11 delays
+    assert elapsed < 6 * DELAY, elapsed
+    print(f"✅ 3 users × 4 profiles in {elapsed:.2f}s, each user paced by {DELAY}s")
+    
+    assert len(service.reindex_service.batches) == 6, service.reindex_service.batches
+    assert all(len(ids) == 2 for ids, _ in service.reindex_service.batches)
+    assert not service.processing_tasks
+    print("✅ indexing queued once per claimed batch of 2")
+
+
+async def test_max_active_users():
+    fresh_redis()
+    users = [uuid4() for _ in range(4)]
+    service = InMemoryQueueService({user_id: 2 for user_id in users})
+    service._user_slots = asyncio.Semaphore(2)
+    
+    await run_queues(service, users)
+    assert service.max_active_users == 2, service.max_active_users
+    assert all(service.count(user_id, "completed") == 2 for user_id in users)
+    print("✅ at most 2 users processed at once with 2 slots")
+
+
+async def test_rate_limit_stops_user():
+    fresh_redis()
+    user_id = uuid4()
+    service = InMemoryQueueService({user_id: 5})
+    service.rate_limiter.limits["profiles_per_minute"] = 3
+    
+    await run_queues(service, [user_id])
+    assert service.count(user_id, "completed") == 3
+    assert service.count(user_id, "pending") == 2
+    assert service.claims == [(user_id, 3)], service.claims
+    print("✅ rate limit of 3/minute: 3 claimed and imported, 2 left pending")
+    
+    result = await service.process_queue(None, user_id)
+    await asyncio.gather(*list(service.processing_tasks.values()))
+    assert result["status"] == "processing_started"
+    assert service.count(user_id, "pending") == 2
+    print("✅ restarting within the window imports nothing more")
+
+
+async def test_cancel_releases_claims():
+    fresh_redis()
+    user_id = uuid4()
+    service = InMemoryQueueService({user_id: 5})
+    
+    await service.process_queue(None, user_id)
+    task = service.processing_tasks[user_id]
+    await asyncio.sleep(DELAY * 1.5)  # Mid-batch
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    
+    completed = service.count(user_id, "completed")
+    assert 1 <= completed < 5, completed
+    assert service.count(user_id, "pending") == 5 - completed
+    assert service.count(user_id, "processing") == 0
+    print(f"✅ cancelled after {completed} imports: the other {5 - completed} claimed items are pending again")
+
+
+async def main():
+    print("Testing bulk import queue")
+    print("=" * 60)
+    
+    await test_sliding_window()
+    await test_users_in_parallel()
+    await test_max_active_users()
+    await test_rate_limit_stops_user()
+    await test_cancel_releases_claims()
+    
+    print("\nAll bulk import queue tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Test the batch CacheManager API and its callers.
+
+Runs against the in-memory Redis fallback, counting round trips, and
+checks that:
+- get_many / set_many cost one round trip each
+- get_or_set_many fetches only the misses, in a single call
+- ResultEnhancer reads 10 cached enhancements in one round trip
+- EmbeddingEnsemble reads and writes several embeddings in one round trip each
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import app.core.redis as redis_module
+from app.core.cache_fallback import InMemoryCache, InMemoryPipeline
+from app.core.redis import cache_manager
+from app.services.embedding_ensemble import EmbeddingEnsemble, EmbeddingModel
+from app.services.result_enhancer import ResultEnhancer
+
+
+class CountingPipeline(InMemoryPipeline):
+    """Pipeline that counts as a single round trip."""
+    
+    async def execute(self):
+        round_trips = self._cache.round_trips
+        results = await super().execute()
+        self._cache.round_trips = round_trips + 1
+        return results
+
+
+class CountingRedis(InMemoryCache):
+    """In-memory stand-in for Redis that counts client round trips."""
+    
+    def __init__(self):
+        super().__init__()
+        self.round_trips = 0
+    
+    async def get(self, key):
+        self.round_trips += 1
+        return await super().get(key)
+    
+    async def mget(self, keys):
+        self.round_trips += 1
+        return [await InMemoryCache.get(self, key) for key in keys]
+    
+    async def setex(self, key, seconds, value):
+        self.round_trips += 1
+        return await super().setex(key, seconds, value)
+    
+    def pipeline(self, transaction=True):
+        return CountingPipeline(self)
+
+
+class FakeCompletions:
+    """Chat completions returning a fixed enhancement."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    async def create(self, **kwargs):
+        self.calls += 1
+        content = json.dumps({"match_explanation": "Strong Python background", "overall_fit": "strong"})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class FakeEmbeddings:
+    """Embeddings returning a vector derived from the input length."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    async def create(self, model, input, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[float(len(input)), 1.0])])
+
+
+redis_client = CountingRedis()
+
+
+async def round_trips(coro):
+    """Await a coroutine and return its result and the round trips it made."""
+    redis_client.round_trips = 0
+    result = await coro
+    return result, redis_client.round_trips
+
+
+async def test_get_many_set_many():
+    values = {f"batch:{i}": {"value": i} for i in range(10)}
+    _, trips = await round_trips(cache_manager.set_many(values, ttl=60, tags={"batch:0": ["test:batch"]}))
+    assert trips == 1, trips
+    
+    cached, trips = await round_trips(cache_manager.get_many([*values, "batch:missing"]))
+    assert trips == 1, trips
+    assert cached == values, cached
+    print("✅ get_many / set_many: one round trip each, misses left out")
+
+
+async def test_get_or_set_many():
+    await cache_manager.set_many({f"many:{i}": i for i in range(4)})
+    fetched_keys = []
+    
+    async def fetch_many(missing):
+        fetched_keys.append(missing)
+        return {key: None if key == "many:9" else key for key in missing}
+    
+    keys = [f"many:{i}" for i in range(10)]
+    values, trips = await round_trips(cache_manager.get_or_set_many(keys, fetch_many))
+    assert fetched_keys == [keys[4:]], fetched_keys
+    assert trips == 2, trips
+    assert [values.get(key) for key in keys] == [0, 1, 2, 3, *keys[4:9], None]
+    
+    # Values fetched as None are not cached, so only that key is fetched again
+    await cache_manager.get_or_set_many(keys, fetch_many)
+    assert fetched_keys[-1] == ["many:9"], fetched_keys
+    print("✅ get_or_set_many: one MGET, one fetch for the misses, one pipelined write")
+
+
+async def test_result_enhancer():
+    enhancer = ResultEnhancer()
+    completions = FakeCompletions()
+    enhancer.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    results = [
+        ({"id": f"resume-{i}", "first_name": "Ada", "skills": ["Python"]}, 0.9 - i / 100)
+        for i in range(12)
+    ]
+    parsed_query = {"primary_skills": ["python"]}
+    
+    enhanced, trips = await round_trips(enhancer.enhance_results(results, "python developer", parsed_query))
+    # One MGET, then each enhancement is written as soon as it is generated
+    assert completions.calls == 10 and trips == 1 + 10, (completions.calls, trips)
+    assert all(data["overall_fit"] == "strong" for data, _ in enhanced[:10])
+    assert enhanced[10:] == results[10:]
+    
+    cached, trips = await round_trips(enhancer.enhance_results(results, "python developer", parsed_query))
+    assert completions.calls == 10 and trips == 1, (completions.calls, trips)
+    assert cached == enhanced
+    print(f"✅ ResultEnhancer: 10 cached enhancements in {trips} round trip")
+
+
+async def test_embedding_ensemble():
+    ensemble = EmbeddingEnsemble()
+    embeddings = FakeEmbeddings()
+    ensemble.openai_client = SimpleNamespace(embeddings=embeddings)
+    requests = [(text, EmbeddingModel.OPENAI_SMALL) for text in ["python", "golang", "rust"]]
+    
+    vectors, trips = await round_trips(ensemble.get_embeddings(requests))
+    assert vectors == [[6.0, 1.0], [6.0, 1.0], [4.0, 1.0]], vectors
+    assert embeddings.calls == 3 and trips == 2, (embeddings.calls, trips)
+    
+    vector, trips = await round_trips(ensemble.get_embedding("rust"))
+    assert vector == [4.0, 1.0] and embeddings.calls == 3 and trips == 1
+    print("✅ EmbeddingEnsemble: embeddings read and written in one round trip each")
+
+
+async def main():
+    print("Testing batch cache operations")
+    print("=" * 60)
+    
+    original_client = redis_module.redis_client
+    redis_module.redis_client = redis_client
+    try:
+        await test_get_many_set_many()
+        await test_get_or_set_many()
+        await test_result_enhancer()
+        await test_embedding_ensemble()
+    finally:
+        redis_module.redis_client = original_client
+    
+    print("\nAll batch cache tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
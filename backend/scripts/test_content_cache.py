@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Test the content-hash cache of AI results.
+
+Runs against the in-memory Redis fallback and an in-memory store in place
+of the ``content_cache`` table, and checks that:
+- the same resume parsed twice calls OpenAI once
+- whitespace differences from re-extraction share an entry
+- changing the model or prompt starts a new entry
+- failed calls (None) are not cached
+- an entry evicted from Redis is served from the store and refilled
+- the report shows the hit rate and estimated dollars saved
+- Redis hits are written to the store in batches, not one write per hit
+- entries unused for the retention period are evicted and not served
+- entries derived from a resume's text are purged with the resume
+"""
+
+import asyncio
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import app.core.redis as redis_module
+from app.core.cache_fallback import InMemoryCache
+from app.services import content_cache as content_cache_module
+from app.services.content_cache import (
+    ContentCache,
+    ContentKind,
+    InMemoryContentStore,
+    chat_cost,
+    embedding_cost
+)
+from app.services.resume_parser import ResumeParser
+
+RESUME = """Jane Doe
+jane@example.com  |  Berlin
+
+Senior Python Engineer with 8 years of experience in FastAPI and PostgreSQL."""
+
+PARSED = {
+    "first_name": "Jane",
+    "last_name": "Doe",
+    "email": "jane@example.com",
+    "location": "Berlin",
+    "current_title": "Senior Python Engineer",
+    "years_experience": 8,
+    "skills": ["Python", "FastAPI", "PostgreSQL"],
+    "keywords": ["python", "backend"]
+}
+
+
+class FakeCompletions:
+    """Stands in for ``client.chat.completions``, counting calls."""
+    
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+    
+    async def create(self, **kwargs):
+        self.calls += 1
+        if self.result is None:
+            raise RuntimeError("OpenAI unavailable")
+        message = SimpleNamespace(content=json.dumps(self.result))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def fresh_cache() -> ContentCache:
+    """A content cache over empty Redis and an empty store."""
+    redis_module.redis_client = InMemoryCache()
+    cache = ContentCache(store=InMemoryContentStore())
+    content_cache_module.content_cache = cache
+    return cache
+
+
+def fake_parser(result) -> ResumeParser:
+    parser = ResumeParser()
+    parser.model = "gpt-4o-mini"
+    parser.client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(result)))
+    return parser
+
+
+async def test_resume_parse_hits():
+    cache = fresh_cache()
+    import app.services.resume_parser as resume_parser_module
+    resume_parser_module.content_cache = cache
+    parser = fake_parser(PARSED)
+    completions = parser.client.chat.completions
+    
+    first = await parser.parse_resume(RESUME)
+    second = await parser.parse_resume(RESUME)
+    assert completions.calls == 1, completions.calls
+    assert first == second and first["first_name"] == "Jane"
+    print("✅ same resume parsed twice calls OpenAI once")
+    
+    # Re-extracted text with different whitespace
+    reflowed = RESUME.replace("  |  ", " | ").replace("\n\n", "\n") + "\n"
+    third = await parser.parse_resume(reflowed)
+    assert completions.calls == 1, completions.calls
+    assert third == first
+    print("✅ whitespace differences share a cache entry")
+    
+    # Another model means another entry
+    parser.model = "gpt-4o"
+    await parser.parse_resume(RESUME)
+    assert completions.calls == 2, completions.calls
+    print("✅ changing the model starts a new entry")
+    
+    stats = cache.get_stats()[ContentKind.RESUME_PARSE]
+    assert stats["redis_hits"] == 2 and stats["misses"] == 2, stats
+    assert stats["hit_rate"] == 0.5, stats
+
+
+async def test_failures_not_cached():
+    cache = fresh_cache()
+    import app.services.resume_parser as resume_parser_module
+    resume_parser_module.content_cache = cache
+    parser = fake_parser(None)
+    completions = parser.client.chat.completions
+    
+    first = await parser.parse_resume(RESUME)
+    await parser.parse_resume(RESUME)
+    assert completions.calls == 2, completions.calls
+    assert first["email"] == "jane@example.com"  # Basic extraction fallback
+    assert await cache.store.get_totals() == {}
+    print("✅ failed parses fall back to basic extraction and are not cached")
+
+
+async def test_prompt_version():
+    v1 = ContentCache.version("gpt-4o-mini", "Extract the name.")
+    v2 = ContentCache.version("gpt-4o-mini", "Extract the name and email.")
+    assert v1 != v2 and v1.startswith("gpt-4o-mini:")
+    assert ContentCache.content_hash(ContentKind.RESUME_PARSE, v1, "text") != \
+        ContentCache.content_hash(ContentKind.RESUME_PARSE, v2, "text")
+    assert ContentCache.content_hash(ContentKind.RESUME_PARSE, v1, "text") != \
+        ContentCache.content_hash(ContentKind.LINKEDIN_PARSE, v1, "text")
+    print("✅ prompt edits and result kinds get separate keys")
+
+
+async def test_store_refills_redis():
+    cache = fresh_cache()
+    calls = 0
+    
+    async def embed():
+        nonlocal calls
+        calls += 1
+        return [0.1, 0.2, 0.3]
+    
+    cost = embedding_cost(RESUME)
+    await cache.get_or_compute(ContentKind.EMBEDDING, "text-embedding-ada-002", RESUME, embed, cost=cost)
+    
+    # Another deploy: Redis is empty but the table is not
+    redis_module.redis_client = InMemoryCache()
+    result = await cache.get_or_compute(ContentKind.EMBEDDING, "text-embedding-ada-002", RESUME, embed, cost=cost)
+    assert result == [0.1, 0.2, 0.3] and calls == 1, calls
+    
+    result = await cache.get_or_compute(ContentKind.EMBEDDING, "text-embedding-ada-002", RESUME, embed, cost=cost)
+    assert calls == 1, calls
+    stats = cache.get_stats()[ContentKind.EMBEDDING]
+    assert stats["db_hits"] == 1 and stats["redis_hits"] == 1 and stats["misses"] == 1, stats
+    print("✅ entries missing from Redis are served from the store and refilled")
+
+
+async def test_report():
+    cache = fresh_cache()
+    
+    async def parse():
+        return PARSED
+    
+    version = ContentCache.version("gpt-4o-mini", "prompt")
+    cost = chat_cost("prompt" + RESUME, PARSED)
+    for _ in range(4):
+        await cache.get_or_compute(ContentKind.RESUME_PARSE, version, RESUME, parse, cost=lambda r: cost)
+    
+    report = await cache.get_report()
+    kind = report["kinds"][ContentKind.RESUME_PARSE]
+    assert kind["entries"] == 1 and kind["hits"] == 3, kind
+    assert report["hit_rate"] == 0.75, report
+    assert abs(report["saved_usd"] - round(3 * cost, 4)) < 1e-9, (report["saved_usd"], cost)
+    print(f"✅ report: hit rate {report['hit_rate']:.0%}, ${3 * cost:.6f} saved on 3 hits")
+
+
+class CountingStore(InMemoryContentStore):
+    """In-memory store counting the hit batches written to it."""
+    
+    def __init__(self):
+        super().__init__()
+        self.hit_writes = 0
+    
+    async def record_hits(self, hits):
+        self.hit_writes += 1
+        await super().record_hits(hits)
+
+
+async def test_hits_batched():
+    fresh_cache()
+    store = CountingStore()
+    cache = ContentCache(store=store)
+    cache.hit_flush_size = 5
+    
+    async def embed():
+        return [0.1, 0.2, 0.3]
+    
+    for _ in range(10):
+        await cache.get_or_compute(ContentKind.EMBEDDING, "text-embedding-ada-002", RESUME, embed)
+    
+    # 9 Redis hits: one batch of 5, four still counted in memory
+    assert store.hit_writes == 1, store.hit_writes
+    await cache.flush_hits()
+    assert store.hit_writes == 2, store.hit_writes
+    totals = await store.get_totals()
+    assert totals[ContentKind.EMBEDDING]["hits"] == 9, totals
+    print("✅ Redis hits are written in batches (2 writes for 9 hits)")
+
+
+async def test_retention():
+    cache = fresh_cache()
+    calls = 0
+    
+    async def parse():
+        nonlocal calls
+        calls += 1
+        return PARSED
+    
+    await cache.get_or_compute(ContentKind.RESUME_PARSE, "v1", RESUME, parse)
+    entry = next(iter(cache.store._entries.values()))
+    entry["created_at"] = datetime.now(timezone.utc) - cache.retention - timedelta(days=1)
+    
+    # Expired entries are not served from the store, even before eviction
+    redis_module.redis_client = InMemoryCache()
+    await cache.get_or_compute(ContentKind.RESUME_PARSE, "v1", RESUME, parse)
+    assert calls == 2, calls
+    
+    # The next write sweeps entries past retention
+    cache._last_eviction = None
+    await cache.get_or_compute(ContentKind.RESUME_PARSE, "v1", "Another resume", parse)
+    assert len(cache.store._entries) == 1, cache.store._entries
+    print("✅ entries unused past retention are not served and are evicted")
+
+
+async def test_purge_source():
+    cache = fresh_cache()
+    calls = 0
+    
+    async def parse():
+        nonlocal calls
+        calls += 1
+        return PARSED
+    
+    prompt = f"Parse this resume:\n\n{RESUME}"
+    await cache.get_or_compute(ContentKind.RESUME_PARSE, "v1", prompt, parse, source=RESUME)
+    await cache.get_or_compute(ContentKind.EMBEDDING, "ada", "Jane Doe Python", parse, source=RESUME)
+    await cache.get_or_compute(ContentKind.RESUME_PARSE, "v1", "Another resume", parse, source="Another resume")
+    
+    purged = await cache.purge_source(RESUME + "\n")
+    assert purged == 2, purged
+    assert len(cache.store._entries) == 1
+    
+    # Redis copies are gone too
+    await cache.get_or_compute(ContentKind.RESUME_PARSE, "v1", prompt, parse, source=RESUME)
+    assert calls == 4, calls
+    print("✅ purging a resume's text drops its cached parses and embeddings")
+
+
+async def main():
+    print("Testing content cache")
+    print("=" * 60)
+    
+    await test_resume_parse_hits()
+    await test_failures_not_cached()
+    await test_prompt_version()
+    await test_store_refills_redis()
+    await test_report()
+    await test_hits_batched()
+    await test_retention()
+    await test_purge_source()
+    
+    print("\nAll content cache tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Test off-loop text extraction in FileParser.
+
+Checks that:
+- PDFs and DOCX files are extracted in worker processes
+- PDF extraction stops at the page cap
+- an extraction over its CPU-time limit is aborted
+- uploads beyond the queue bound are turned away
+- a cancelled upload that still waits for a process is dropped
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import app.services.file_parser as file_parser_module
+from app.services.file_parser import ExtractionPool, FileParser, FileParserBusyError
+from benchmark_file_parser import make_docx, make_pdf
+
+
+async def test_extracts_in_processes():
+    pool = ExtractionPool(workers=2, max_pages=50)
+    try:
+        pdf_text, docx_text = await asyncio.gather(
+            pool.extract_text(make_pdf(2, lines_per_page=3), "resume.pdf"),
+            pool.extract_text(make_docx(5), "resume.docx"),
+        )
+    finally:
+        pool.shutdown()
+    assert "Senior Python developer with 5 years" in pdf_text, pdf_text
+    assert "Senior Python developer with 4 years" in docx_text, docx_text
+    assert pool.get_stats()["completed"] == 2
+    print("✅ PDF and DOCX extracted in worker processes")
+
+
+async def test_page_cap():
+    pool = ExtractionPool(workers=1, max_pages=3)
+    try:
+        text = await pool.extract_text(make_pdf(10, lines_per_page=1), "resume.pdf")
+    finally:
+        pool.shutdown()
+    assert "with 2 years" in text and "with 3 years" not in text, text
+    print("✅ PDF extraction stopped at 3 of 10 pages")
+
+
+def test_cpu_limit():
+    def spin(file_content, filename, max_pages=None):
+        while True:
+            pass
+
+    original = FileParser.extract_text
+    FileParser.extract_text = spin
+    start = time.perf_counter()
+    try:
+        file_parser_module._extract_in_worker(b"", "resume.pdf", 50, 1)
+    except ValueError as e:
+        assert "CPU time" in str(e), e
+    else:
+        raise AssertionError("CPU limit not enforced")
+    finally:
+        FileParser.extract_text = original
+    elapsed = time.perf_counter() - start
+    assert elapsed < 3, elapsed
+    print(f"✅ extraction aborted at the CPU-time limit after {elapsed:.1f}s")
+
+
+async def test_busy_and_cancel():
+    pool = ExtractionPool(workers=1, max_queue=1)
+    pdf = make_pdf(20)
+    try:
+        running = asyncio.create_task(pool.extract_text(pdf, "running.pdf"))
+        await asyncio.sleep(0.05)
+        waiting = asyncio.create_task(pool.extract_text(pdf, "waiting.pdf"))
+        await asyncio.sleep(0.05)
+        assert pool.get_stats()["queued"] == 1, pool.get_stats()
+
+        try:
+            await pool.extract_text(pdf, "rejected.pdf")
+        except FileParserBusyError:
+            pass
+        else:
+            raise AssertionError("Queue bound not enforced")
+
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert await running
+    finally:
+        pool.shutdown()
+
+    stats = pool.get_stats()
+    assert stats["queued"] == 0 and stats["running"] == 0, stats
+    assert (stats["completed"], stats["cancelled"], stats["rejected"]) == (1, 1, 1), stats
+    print("✅ uploads beyond the queue bound rejected; cancelled upload dropped")
+
+
+async def main():
+    print("Testing off-loop file parsing")
+    print("=" * 60)
+
+    await test_extracts_in_processes()
+    await test_page_cap()
+    test_cpu_limit()
+    await test_busy_and_cancel()
+
+    print("\nAll file parser tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Test that hybrid search result fusion is deterministic and side-effect free."""
+
+import copy
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.hybrid_search import hybrid_search, HybridSearchConfig, FUSION_MODES
+
+
+def make_results():
+    """Small legs with overlapping ids and deliberate score ties."""
+    keyword_results = [
+        ({"id": "c", "first_name": "Carol"}, 4.0),
+        ({"id": "a", "first_name": "Alice"}, 2.0),
+        ({"id": "b", "first_name": "Bob"}, 2.0),
+        ({"id": "e", "first_name": "Eve"}, 1.0),
+    ]
+    vector_results = [
+        {"resume_id": "d", "score": 0.9, "metadata": {"name": "Dan"}},
+        {"resume_id": "a", "score": 0.6, "metadata": {"name": "Alice"}},
+        {"resume_id": "f", "score": 0.6, "metadata": {"name": "Fay"}},
+        {"resume_id": "g", "score": 0.6, "metadata": {"name": "Gus"}},
+    ]
+    return keyword_results, vector_results
+
+
+def fingerprint(fusion: str):
+    keyword_results, vector_results = make_results()
+    fused = hybrid_search._combine_results(
+        keyword_results, vector_results, 10, HybridSearchConfig(fusion=fusion)
+    )
+    return [(data["id"], round(score, 12)) for data, score in fused]
+
+
+def test_repeatable():
+    """Repeated fusion of the same input gives the same ranking."""
+    for fusion in FUSION_MODES:
+        first = fingerprint(fusion)
+        for _ in range(50):
+            assert fingerprint(fusion) == first, f"{fusion} fusion is not repeatable"
+    print("✅ fusion output is repeatable")
+
+
+def test_ties_broken_by_id():
+    """Candidates with equal hybrid scores are ordered by id."""
+    for fusion in FUSION_MODES:
+        ranking = fingerprint(fusion)
+        for (id1, score1), (id2, score2) in zip(ranking, ranking[1:]):
+            assert score1 > score2 or (score1 == score2 and id1 < id2), f"{fusion}: bad order {ranking}"
+    print("✅ ties are broken by resume id")
+
+
+def test_inputs_not_mutated():
+    """Fusion copies result dicts instead of annotating shared metadata."""
+    keyword_results, vector_results = make_results()
+    keyword_before = copy.deepcopy(keyword_results)
+    vector_before = copy.deepcopy(vector_results)
+    for fusion in FUSION_MODES:
+        hybrid_search._combine_results(
+            keyword_results, vector_results, 10, HybridSearchConfig(fusion=fusion)
+        )
+    assert keyword_results == keyword_before
+    assert vector_results == vector_before
+    print("✅ input results are not mutated")
+
+
+def test_independent_of_hash_seed():
+    """The ranking does not depend on string hash randomization."""
+    if os.environ.get("FUSION_FINGERPRINT_ONLY"):
+        return
+    outputs = set()
+    for seed in ("0", "1", "12345"):
+        env = dict(os.environ, PYTHONHASHSEED=seed, FUSION_FINGERPRINT_ONLY="1")
+        output = subprocess.run(
+            [sys.executable, __file__], env=env, capture_output=True, text=True, check=True
+        ).stdout
+        outputs.add(output)
+    assert len(outputs) == 1, "fusion output depends on PYTHONHASHSEED"
+    print("✅ fusion output is identical across hash seeds")
+
+
+def main():
+    if os.environ.get("FUSION_FINGERPRINT_ONLY"):
+        for fusion in FUSION_MODES:
+            print(fusion, fingerprint(fusion))
+        return
+    
+    print("Testing hybrid search fusion")
+    print("=" * 60)
+    test_repeatable()
+    test_ties_broken_by_id()
+    test_inputs_not_mutated()
+    test_independent_of_hash_seed()
+    print("\nAll fusion tests passed")
+
+
+if __name__ == "__main__":
+    main()
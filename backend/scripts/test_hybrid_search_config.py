@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Test that concurrent hybrid searches each rank with their own config.
+
+Fires searches with mixed query types in parallel against fake keyword and
+vector legs with random latency, so the requests interleave, and checks
+that every response was fused with the weights of its own preset.
+"""
+
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import app.services.hybrid_search as hybrid_module
+from app.services.hybrid_search import (
+    hybrid_search,
+    get_search_preset,
+    register_search_preset,
+    HybridSearchConfig,
+    HYBRID_SEARCH_PRESETS,
+)
+
+# "shared" is the top hit of both legs, so its hybrid score equals
+# keyword_weight + vector_weight; "kw-only" only appears in the keyword leg
+KEYWORD_RESULTS = [({"id": "shared", "first_name": "Sam"}, 8.0), ({"id": "kw-only", "first_name": "Kim"}, 4.0)]
+VECTOR_RESULTS = [{"resume_id": "shared", "score": 0.9, "metadata": {"name": "Sam"}}]
+
+
+async def fake_keyword_leg(queries, user_id, limit, filters=None, config=None):
+    await asyncio.sleep(random.uniform(0, 0.02))
+    return list(KEYWORD_RESULTS)
+
+
+class FakeVectorSearch:
+    async def search_similar(self, query, user_id=None, limit=10, filters=None):
+        await asyncio.sleep(random.uniform(0, 0.02))
+        return list(VECTOR_RESULTS)
+
+
+async def run_search(query_type: str):
+    config = get_search_preset(query_type)
+    results, metadata = await hybrid_search.search_with_metadata(
+        db=None,
+        query=f"{query_type} query",
+        user_id="user-1",
+        limit=5,
+        use_synonyms=False,
+        concurrent=True,
+        config=config
+    )
+    return query_type, config, results, metadata
+
+
+async def test_concurrent_presets():
+    """Mixed query types in flight together keep their own weights."""
+    query_types = ["technical", "soft_skills", "exact_match", "default"] * 25
+    random.shuffle(query_types)
+    
+    responses = await asyncio.gather(*(run_search(query_type) for query_type in query_types))
+    
+    for query_type, config, results, metadata in responses:
+        assert metadata["config"]["keyword_weight"] == config.keyword_weight, query_type
+        assert metadata["config"]["vector_weight"] == config.vector_weight, query_type
+        
+        scores = {data["id"]: score for data, score in results}
+        assert abs(scores["shared"] - (config.keyword_weight + config.vector_weight)) < 1e-9, query_type
+        assert abs(scores["kw-only"] - config.keyword_weight * 0.5) < 1e-9, query_type
+    
+    print(f"✅ {len(responses)} concurrent searches each used their own preset")
+
+
+def test_config_is_immutable():
+    """Presets cannot be changed in place by a request."""
+    preset = get_search_preset("technical")
+    try:
+        preset.keyword_weight = 0.99
+    except Exception:
+        pass
+    assert get_search_preset("technical").keyword_weight == 0.4
+    print("✅ presets are immutable")
+
+
+def test_registry():
+    """Unknown names fall back to the default and new presets can be registered."""
+    assert get_search_preset("no-such-type") == HYBRID_SEARCH_PRESETS["default"]
+    assert get_search_preset(None) == HYBRID_SEARCH_PRESETS["default"]
+    
+    register_search_preset("keyword_heavy", HybridSearchConfig(keyword_weight=0.9, vector_weight=0.1, fusion="rrf"))
+    assert get_search_preset("keyword_heavy").fusion == "rrf"
+    del HYBRID_SEARCH_PRESETS["keyword_heavy"]
+    print("✅ preset registry lookups and registration work")
+
+
+async def main():
+    print("Testing per-request hybrid search config")
+    print("=" * 60)
+    
+    original_vector_search = hybrid_module.vector_search
+    original_keyword_leg = hybrid_search._keyword_search_own_session
+    hybrid_module.vector_search = FakeVectorSearch()
+    hybrid_search._keyword_search_own_session = fake_keyword_leg
+    try:
+        await test_concurrent_presets()
+    finally:
+        hybrid_module.vector_search = original_vector_search
+        hybrid_search._keyword_search_own_session = original_keyword_leg
+    
+    test_config_is_immutable()
+    test_registry()
+    print("\nAll config tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Test the durable job queue.
+
+Uses the in-memory broker and fake handlers, then checks that:
+- a job runs once and stores its result
+- a failing job is retried with backoff until it succeeds
+- a job is dead-lettered after max_attempts, or at once on PermanentJobError
+- a dead-lettered job can be requeued with a fresh set of attempts
+- a worker runs at most ``concurrency`` jobs at a time
+- jobs of a lost worker are recovered after the visibility timeout
+- stopping a worker lets running jobs finish and claims nothing new
+"""
+
+import asyncio
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.background_job import JobStatus
+from app.services.job_queue import (
+    InMemoryJobBroker, JobQueue, JobWorker, PermanentJobError, _utcnow
+)
+
+
+def make_queue() -> JobQueue:
+    queue = JobQueue(InMemoryJobBroker())
+    queue.retry_base_delay = 0
+    queue.retry_max_delay = 0
+    return queue
+
+
+async def test_success():
+    queue = make_queue()
+    
+    async def handler(job):
+        return {"doubled": job.payload["n"] * 2}
+    
+    queue.register("double", handler)
+    job = await queue.enqueue("double", {"n": 21})
+    await JobWorker(queue, concurrency=2, poll_interval=0.01).run_until_idle()
+    
+    job = await queue.get(job.id)
+    assert job.status == JobStatus.SUCCEEDED, job.status
+    assert job.attempts == 1 and job.result == {"doubled": 42}
+    assert job.finished_at is not None and job.locked_by is None
+    print("✅ job ran once and stored its result")
+
+
+async def test_retry_then_success():
+    queue = make_queue()
+    calls = []
+    
+    async def flaky(job):
+        calls.append(job.attempts)
+        if len(calls) < 3:
+            raise ConnectionError("OpenAI unavailable")
+        return "ok"
+    
+    queue.register("flaky", flaky)
+    job = await queue.enqueue("flaky", {}, max_attempts=5)
+    await JobWorker(queue, poll_interval=0.01).run_until_idle()
+    
+    job = await queue.get(job.id)
+    assert calls == [1, 2, 3], calls
+    assert job.status == JobStatus.SUCCEEDED and job.attempts == 3
+    print("✅ failed attempts retried until success")
+
+
+async def test_backoff():
+    queue = JobQueue(InMemoryJobBroker())
+    queue.retry_base_delay = 10
+    queue.retry_max_delay = 60
+    for attempts, cap in [(1, 10), (2, 20), (3, 40), (4, 60), (10, 60)]:
+        delays = [queue.retry_delay(attempts) for _ in range(50)]
+        assert all(cap / 2 <= delay <= cap for delay in delays), (attempts, delays)
+    
+    # A failed attempt is queued again for later, not run at once
+    async def failing(job):
+        raise RuntimeError("boom")
+    
+    queue.register("failing", failing)
+    job = await queue.enqueue("failing", {})
+    await JobWorker(queue, poll_interval=0.01).run_until_idle()
+    job = await queue.get(job.id)
+    assert job.status == JobStatus.QUEUED and job.attempts == 1
+    assert job.run_at >= _utcnow() + timedelta(seconds=4), job.run_at
+    assert job.last_error == "RuntimeError: boom"
+    print("✅ retries back off exponentially with jitter")
+
+
+async def test_dead_letter():
+    queue = make_queue()
+    
+    async def failing(job):
+        raise RuntimeError("parse error")
+    
+    async def permanent(job):
+        raise PermanentJobError("Resume not found")
+    
+    queue.register("failing", failing)
+    queue.register("permanent", permanent)
+    failing_job = await queue.enqueue("failing", {}, max_attempts=3)
+    permanent_job = await queue.enqueue("permanent", {}, max_attempts=3)
+    unknown_job = await queue.broker.enqueue("unknown", {}, max_attempts=3)
+    worker = JobWorker(queue, poll_interval=0.01, kinds=["failing", "permanent", "unknown"])
+    await worker.run_until_idle()
+    
+    failing_job = await queue.get(failing_job.id)
+    assert failing_job.status == JobStatus.DEAD and failing_job.attempts == 3
+    permanent_job = await queue.get(permanent_job.id)
+    assert permanent_job.status == JobStatus.DEAD and permanent_job.attempts == 1
+    assert permanent_job.last_error == "Resume not found"
+    unknown_job = await queue.get(unknown_job.id)
+    assert unknown_job.status == JobStatus.DEAD and "No handler" in unknown_job.last_error
+    
+    dead = await queue.list(status=JobStatus.DEAD)
+    assert {job.id for job in dead} == {failing_job.id, permanent_job.id, unknown_job.id}
+    print("✅ jobs dead-lettered after max attempts or on permanent errors")
+    
+    # Fix the handler and retry the dead-lettered job
+    async def fixed(job):
+        return "ok"
+    
+    queue.register("failing", fixed)
+    assert await queue.requeue(failing_job.id)
+    assert not await queue.requeue(failing_job.id)
+    await worker.run_until_idle()
+    failing_job = await queue.get(failing_job.id)
+    assert failing_job.status == JobStatus.SUCCEEDED and failing_job.attempts == 1
+    print("✅ dead-lettered job requeued and succeeded")
+
+
+async def test_concurrency_bound():
+    queue = make_queue()
+    running = 0
+    max_running = 0
+    
+    async def slow(job):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+    
+    queue.register("slow", slow)
+    for _ in range(20):
+        await queue.enqueue("slow", {})
+    await JobWorker(queue, concurrency=4, poll_interval=0.01).run_until_idle()
+    
+    assert max_running == 4, max_running
+    succeeded = await queue.list(status=JobStatus.SUCCEEDED, limit=100)
+    assert len(succeeded) == 20
+    print("✅ worker ran at most 4 jobs at a time")
+
+
+async def test_stale_recovery():
+    queue = make_queue()
+    
+    async def handler(job):
+        return "ok"
+    
+    queue.register("job", handler)
+    job = await queue.enqueue("job", {})
+    
+    # A worker claims the job and dies without finishing it
+    [claimed] = await queue.broker.claim("lost-worker", ["job"], 1)
+    assert not await queue.broker.requeue_stale(_utcnow() - timedelta(seconds=60))
+    
+    # Recovered once its lock is older than the visibility timeout
+    queue.broker._jobs[job.id].locked_at -= timedelta(seconds=1000)
+    await JobWorker(queue, poll_interval=0.01).run_until_idle()
+    
+    job = await queue.get(job.id)
+    assert job.status == JobStatus.SUCCEEDED and job.attempts == 2, (job.status, job.attempts)
+    
+    # The lost worker cannot finish the job once it was recovered
+    assert not await queue.broker.complete(claimed.id, "lost-worker", "late")
+    assert (await queue.get(job.id)).result == "ok"
+    print("✅ job of a lost worker recovered after the visibility timeout")
+
+
+async def test_graceful_stop():
+    queue = make_queue()
+    started = asyncio.Event()
+    
+    async def slow(job):
+        started.set()
+        await asyncio.sleep(0.1)
+        return "done"
+    
+    queue.register("slow", slow)
+    first = await queue.enqueue("slow", {})
+    worker = JobWorker(queue, concurrency=1, poll_interval=0.01)
+    run = asyncio.create_task(worker.run())
+    await started.wait()
+    second = await queue.enqueue("slow", {})
+    worker.stop()
+    await asyncio.wait_for(run, timeout=2)
+    
+    assert (await queue.get(first.id)).status == JobStatus.SUCCEEDED
+    second = await queue.get(second.id)
+    assert second.status == JobStatus.QUEUED and second.attempts == 0
+    print("✅ stopped worker finished its running job and claimed no more")
+    
+    # A cancelled job is handed back at once instead of waiting for the visibility timeout
+    started.clear()
+    worker = JobWorker(queue, concurrency=1, poll_interval=0.01)
+    run = asyncio.create_task(worker.run())
+    await started.wait()
+    run.cancel()
+    await asyncio.gather(run, return_exceptions=True)
+    await asyncio.sleep(0)
+    second = await queue.get(second.id)
+    assert second.status == JobStatus.QUEUED and second.last_error == "Worker stopped", second
+    print("✅ cancelled job handed back to the queue")
+
+
+async def main():
+    print("Testing the durable job queue")
+    print("=" * 60)
+    
+    await test_success()
+    await test_retry_then_success()
+    await test_backoff()
+    await test_dead_letter()
+    await test_concurrency_bound()
+    await test_stale_recovery()
+    await test_graceful_stop()
+    
+    print("\nAll job queue tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Test the bulk LinkedIn import engine.
+
+Replaces the database calls and the AI parser with in-memory stand-ins
+that count calls, and checks that:
+- the whole batch is checked for duplicates in one query
+- repeats within the batch and earlier imports are reported as duplicates
+- profiles are parsed concurrently, never more than the limit at once
+- new resumes are written with one INSERT and one commit
+- indexing is queued as one batch job for the inserted resumes
+- results stay per-profile, in request order
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import app.services.linkedin_bulk_import as bulk_module
+from app.services.linkedin_bulk_import import LinkedInBulkImporter
+
+USER_ID = uuid4()
+PARSE_DELAY = 0.05
+
+
+class FakeParser:
+    """Parses after a delay, tracking how many parses overlap."""
+    
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+    
+    async def parse_linkedin_data(self, profile_data):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(PARSE_DELAY)
+            if profile_data["linkedin_url"] in self.fail_on:
+                raise ValueError("unparseable profile")
+            first, last = profile_data["name"].split()
+            return {"first_name": first, "last_name": last, "keywords": ["python"], "raw_text": ""}
+        finally:
+            self.in_flight -= 1
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+    
+    async def commit(self):
+        self.commits += 1
+    
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeReindexService:
+    def __init__(self):
+        self.batches = []
+    
+    async def enqueue_index_batch(self, resume_ids, user_id=None):
+        self.batches.append((list(resume_ids), user_id))
+
+
+class FakeCache:
+    async def bump_version(self, *user_ids):
+        pass
+    
+    async def invalidate_popular_skills(self, *user_ids):
+        pass
+
+
+class InMemoryImporter(LinkedInBulkImporter):
+    """Importer over an in-memory set of already imported URLs."""
+    
+    def __init__(self, parser, existing=(), raced=(), **kwargs):
+        super().__init__(parser=parser, **kwargs)
+        self.existing = set(existing)
+        self.raced = set(raced)  # Imported by another request after the duplicate check
+        self.lookups = []
+        self.inserts = []
+    
+    async def _existing_urls(self, db, user_id, urls):
+        self.lookups.append(set(urls))
+        return {url for url in urls if url in self.existing or url + '/' in self.existing}
+    
+    async def _insert_rows(self, db, rows):
+        self.inserts.append(rows)
+        return {row["linkedin_url"]: uuid4() for row in rows if row["linkedin_url"] not in self.raced}
+
+
+def profile(n: int, url: str = None) -> dict:
+    return {
+        "linkedin_url": url or f"https://www.linkedin.com/in/person-{n}",
+        "name": f"Person {n}",
+        "headline": "Engineer",
+        "skills": ["python"]
+    }
+
+
+def install_fakes() -> FakeReindexService:
+    reindex = FakeReindexService()
+    bulk_module.reindex_service = reindex
+    bulk_module.search_result_cache = FakeCache()
+    bulk_module.skill_index = FakeCache()
+    return reindex
+
+
+async def test_bulk_import():
+    reindex = install_fakes()
+    profiles = [profile(n) for n in range(20)]
+    profiles.append(profile(3, "https://www.linkedin.com/in/person-3/?trk=search"))  # Repeat within the batch
+    profiles.append(profile(20, "https://www.linkedin.com/in/already-imported"))
+    parser = FakeParser()
+    importer = InMemoryImporter(
+        parser,
+        existing={"https://www.linkedin.com/in/already-imported/"},
+        parse_concurrency=5
+    )
+    db = FakeSession()
+    
+    start = time.perf_counter()
+    results = await importer.import_profiles(db, USER_ID, profiles)
+    elapsed = time.perf_counter() - start
+    
+    assert len(importer.lookups) == 1 and len(importer.lookups[0]) == 21, importer.lookups
+    assert len(importer.inserts) == 1 and len(importer.inserts[0]) == 20, [len(rows) for rows in importer.inserts]
+    assert db.commits == 1, db.commits
+    print("✅ 22 profiles: 1 duplicate query, 1 INSERT, 1 commit")
+    
+    assert parser.calls == 20 and parser.max_in_flight == 5, (parser.calls, parser.max_in_flight)
+    assert elapsed < 20 * PARSE_DELAY / 2, elapsed
+    print(f"✅ 20 parses ran 5 at a time in {elapsed:.2f}s (sequential: {20 * PARSE_DELAY:.2f}s)")
+    
+    assert results["total"] == 22 and results["imported"] == 20, results
+    assert results["duplicates"] == 2 and results["failed"] == 0, results
+    details = results["details"]
+    assert [detail["linkedin_url"] for detail in details] == [p["linkedin_url"] for p in profiles]
+    assert details[0]["success"] and details[0]["candidate_id"] is not None
+    assert details[20]["is_duplicate"] and details[21]["is_duplicate"]
+    print("✅ per-profile results in request order, duplicates in and across batches detected")
+    
+    assert len(reindex.batches) == 1, reindex.batches
+    resume_ids, user_id = reindex.batches[0]
+    assert len(resume_ids) == 20 and user_id == USER_ID
+    print("✅ indexing queued as one batch job")
+
+
+async def test_failures_stay_per_profile():
+    reindex = install_fakes()
+    profiles = [profile(n) for n in range(4)]
+    parser = FakeParser(fail_on={profiles[1]["linkedin_url"]})
+    importer = InMemoryImporter(parser, raced={profiles[2]["linkedin_url"]})
+    
+    results = await importer.import_profiles(FakeSession(), USER_ID, profiles)
+    details = results["details"]
+    assert not details[1]["success"] and "unparseable" in details[1]["error"], details[1]
+    assert details[2]["is_duplicate"], details[2]
+    assert details[0]["success"] and details[3]["success"]
+    assert (results["imported"], results["duplicates"], results["failed"]) == (2, 1, 1), results
+    assert len(reindex.batches[0][0]) == 2
+    print("✅ a failed parse and a concurrent duplicate affect only their own profiles")
+
+
+async def test_insert_failure():
+    reindex = install_fakes()
+    
+    class FailingImporter(InMemoryImporter):
+        async def _insert_rows(self, db, rows):
+            raise RuntimeError("connection lost")
+    
+    db = FakeSession()
+    results = await FailingImporter(FakeParser()).import_profiles(db, USER_ID, [profile(n) for n in range(3)])
+    assert results["failed"] == 3 and db.rollbacks == 1, results
+    assert all("connection lost" in detail["error"] for detail in results["details"])
+    assert reindex.batches == []
+    print("✅ a failed INSERT rolls back and reports every profile as failed")
+
+
+async def main():
+    print("Testing bulk LinkedIn import")
+    print("=" * 60)
+    
+    await test_bulk_import()
+    await test_failures_stay_per_profile()
+    await test_insert_failure()
+    
+    print("\nAll bulk LinkedIn import tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
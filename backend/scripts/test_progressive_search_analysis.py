@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Test that progressive search stage 1 does not wait on LLM query analysis.
+
+Replaces the AI typo corrector and GPT-4.1-mini analyzer with deliberately
+slow fakes and the search stages with fast fakes, then checks that:
+- stage 1 is yielded long before the analysis finishes
+- the analysis is streamed as its own event and used by later stages
+- a fast analysis is picked up before stage 2
+- closing the stream cancels the in-flight analysis
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import app.services.progressive_search as progressive_module
+from app.services.progressive_search import ProgressiveSearchEngine
+
+QUERY = "senior pythn developer"
+ANALYZER_DELAY = 1.0
+
+
+class SlowAsyncQueryParser:
+    """Stands in for the AI typo-correcting parser."""
+    
+    def __init__(self, delay: float):
+        self.delay = delay
+    
+    async def parse_query_async(self, query):
+        await asyncio.sleep(self.delay / 2)
+        return {
+            "skills": ["python"],
+            "primary_skill": "python",
+            "seniority": "senior",
+            "roles": ["developer"],
+            "experience_years": None,
+            "remaining_terms": [],
+            "original_query": query,
+            "corrected_query": "senior python developer",
+            "corrections": [{"original": "pythn", "corrected": "python"}],
+        }
+
+
+class SlowAnalyzer:
+    """Stands in for gpt4_analyzer."""
+    
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.cancelled = False
+    
+    async def analyze_query(self, query):
+        try:
+            await asyncio.sleep(self.delay / 2)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {
+            "primary_skills": ["python"],
+            "secondary_skills": ["django", "fastapi"],
+            "implied_skills": ["git"],
+            "experience_level": "senior",
+            "role_type": "developer",
+            "search_intent": "technical",
+        }
+    
+    def get_search_suggestions(self, analysis):
+        return [f"{skill} developer" for skill in analysis.get("secondary_skills", [])]
+    
+    def _enhance_basic_parse(self, parsed):
+        return {**parsed, "primary_skills": parsed.get("skills", []), "secondary_skills": ["local"]}
+
+
+class FakeSession:
+    """Stands in for the search's own database session, logging its use."""
+    
+    def __init__(self, log=None):
+        self.log = log if log is not None else []
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self.log.append("close")
+    
+    async def rollback(self):
+        self.log.append("rollback")
+
+
+class FakeStagesEngine(ProgressiveSearchEngine):
+    """Progressive engine with fast in-memory stages."""
+    
+    def __init__(self, stage1_delay: float = 0.0):
+        super().__init__(session_factory=FakeSession)
+        self.stage1_delay = stage1_delay
+        self.stage_parses = {}
+    
+    async def _stage1_instant_results(self, db, query, user_id, limit, filters, parsed_query):
+        self.stage_parses["instant"] = parsed_query
+        await asyncio.sleep(self.stage1_delay)
+        return [({"id": "r1", "first_name": "Ada", "last_name": "L", "skills": ["Python"]}, 0.9)]
+    
+    async def _stage2_enhanced_results(self, db, query, user_id, limit, filters, parsed_query, stage1_results,
+                                       concurrent=None):
+        self.stage_parses["enhanced"] = parsed_query
+        await asyncio.sleep(0.01)
+        return list(stage1_results), {"completed_legs": ["keyword", "vector"], "elapsed_ms": 10}
+    
+    async def _stage3_intelligent_results(self, db, results, query, parsed_query, user_id):
+        self.stage_parses["intelligent"] = parsed_query
+        return results
+    
+    async def _get_cached_results(self, cache_key):
+        return None
+    
+    async def _cache_results(self, cache_key, final_event):
+        pass
+
+
+async def collect(engine, stop_after=None):
+    """Run a search, returning (event, seconds since start) pairs.
+    
+    Runs in sequential mode so stage 2 waits for stage 1 and can pick up
+    an analysis that finished in the meantime.
+    """
+    events = []
+    start = time.perf_counter()
+    stream = engine.search_progressive(db=None, query=QUERY, user_id=uuid4(), limit=5, pipelined=False)
+    async for event in stream:
+        events.append((event, time.perf_counter() - start))
+        if stop_after and event["stage"] == stop_after:
+            await stream.aclose()
+            break
+    return events
+
+
+async def test_stage1_independent_of_llm(analyzer):
+    """Stage 1 arrives before the slow analysis; stage 3 uses the analysis."""
+    engine = FakeStagesEngine()
+    events = await collect(engine)
+    stages = [event["stage"] for event, _ in events]
+    assert stages == ["instant", "enhanced", "analysis", "intelligent"], stages
+    
+    instant, instant_at = events[0]
+    assert instant_at < ANALYZER_DELAY / 4, f"stage 1 took {instant_at:.3f}s"
+    assert instant["analysis_pending"] is True
+    assert instant["stage_timings_ms"]["instant"] < 100
+    assert "parse" in instant["stage_timings_ms"]
+    
+    analysis, analysis_at = events[2]
+    assert analysis_at >= ANALYZER_DELAY * 0.9
+    assert analysis["parsed_query"]["secondary_skills"] == ["django", "fastapi"]
+    assert analysis["corrected_query"] == "senior python developer"
+    
+    # Stage 1 ran on the local parse, stage 3 on the AI-corrected parse
+    assert "corrections" not in engine.stage_parses["instant"]
+    assert engine.stage_parses["intelligent"]["corrections"]
+    assert events[-1][0]["stage_timings_ms"]["analysis"] >= ANALYZER_DELAY * 900
+    print(f"✅ stage 1 after {instant_at * 1000:.0f}ms, analysis after {analysis_at * 1000:.0f}ms")
+
+
+async def test_fast_analysis_feeds_stage2():
+    """An analysis that finishes during stage 1 is used by stage 2."""
+    progressive_module.async_query_parser = SlowAsyncQueryParser(0.02)
+    progressive_module.gpt4_analyzer = SlowAnalyzer(0.02)
+    engine = FakeStagesEngine(stage1_delay=0.2)
+    events = await collect(engine)
+    stages = [event["stage"] for event, _ in events]
+    assert stages == ["instant", "analysis", "enhanced", "intelligent"], stages
+    assert engine.stage_parses["enhanced"]["corrections"]
+    print("✅ analysis that arrives during stage 1 is used by stage 2")
+
+
+async def test_close_cancels_analysis():
+    """Closing the stream after stage 1 cancels the pending analysis."""
+    analyzer = SlowAnalyzer(ANALYZER_DELAY)
+    progressive_module.async_query_parser = SlowAsyncQueryParser(0.0)
+    progressive_module.gpt4_analyzer = analyzer
+    await collect(FakeStagesEngine(stage1_delay=0.05), stop_after="instant")
+    await asyncio.sleep(0)
+    assert analyzer.cancelled, "analysis was not cancelled"
+    print("✅ closing the stream cancels the in-flight analysis")
+
+
+async def main():
+    print("Testing progressive search with a slow query analyzer")
+    print("=" * 60)
+    
+    original_parser = progressive_module.async_query_parser
+    original_analyzer = progressive_module.gpt4_analyzer
+    try:
+        analyzer = SlowAnalyzer(ANALYZER_DELAY)
+        progressive_module.async_query_parser = SlowAsyncQueryParser(ANALYZER_DELAY)
+        progressive_module.gpt4_analyzer = analyzer
+        await test_stage1_independent_of_llm(analyzer)
+        await test_fast_analysis_feeds_stage2()
+        await test_close_cancels_analysis()
+    finally:
+        progressive_module.async_query_parser = original_parser
+        progressive_module.gpt4_analyzer = original_analyzer
+    
+    print("\nAll progressive search analysis tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
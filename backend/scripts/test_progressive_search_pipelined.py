@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""Test pipelined progressive search, stage deadlines and disconnect handling.
+
+Uses fake stages with controllable latency and a fast fake query analyzer,
+then checks that:
+- in pipelined mode stage 2 overlaps stage 1 but events stay in order
+- in sequential mode stage 2 only starts after stage 1
+- a stage that misses its deadline is cancelled and yields partial results
+- a cancelled stage is unwound and its session rolled back before the next stage
+- a slow query analysis is cut off at its own deadline, leaving stage 3 its budget
+- closing the stream cancels every stage still in flight
+- a WebSocket disconnect cancels the search mid-stage
+"""
+
+import asyncio
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from uuid import uuid4
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi import WebSocketDisconnect
+
+import app.services.progressive_search as progressive_module
+from app.api.v1.endpoints.search_progressive import _until_disconnect
+from app.services.progressive_search import ProgressiveSearchEngine
+from test_progressive_search_analysis import FakeSession, SlowAnalyzer, SlowAsyncQueryParser
+
+QUERY = "senior python developer"
+STAGE1 = [({"id": "r1", "first_name": "Ada", "last_name": "L", "skills": ["Python"]}, 0.9)]
+STAGE2 = [({"id": "r2", "first_name": "Grace", "last_name": "H", "skills": ["Python", "Go"]}, 0.8)]
+
+
+class TimedStagesEngine(ProgressiveSearchEngine):
+    """Progressive engine whose stages sleep for configurable delays."""
+    
+    def __init__(self, stage1_delay=0.0, stage2_delay=0.0, stage3_delay=0.0):
+        super().__init__(session_factory=lambda: FakeSession(self.log))
+        self.delays = {"instant": stage1_delay, "enhanced": stage2_delay, "intelligent": stage3_delay}
+        self.started = {}
+        self.cancelled = set()
+        self.log = []
+        self.sessions = set()
+        self.stage2_concurrent = None
+        self.origin = time.perf_counter()
+    
+    async def _run(self, stage, result):
+        self.started[stage] = time.perf_counter() - self.origin
+        self.log.append(f"start {stage}")
+        try:
+            await asyncio.sleep(self.delays[stage])
+        except asyncio.CancelledError:
+            self.cancelled.add(stage)
+            self.log.append(f"cancelled {stage}")
+            raise
+        return result
+    
+    async def _stage1_instant_results(self, db, query, user_id, limit, filters, parsed_query):
+        self.sessions.add(db)
+        return await self._run("instant", [(dict(data), score) for data, score in STAGE1])
+    
+    async def _stage2_enhanced_results(self, db, query, user_id, limit, filters, parsed_query, stage1_results,
+                                       concurrent=None):
+        self.stage2_concurrent = concurrent
+        self.sessions.add(db)
+        results = [(dict(data), score) for data, score in STAGE2]
+        return await self._run("enhanced", (results, {"completed_legs": ["keyword", "vector"], "elapsed_ms": 1}))
+    
+    async def _stage3_intelligent_results(self, db, results, query, parsed_query, user_id):
+        self.sessions.add(db)
+        results = await self._run("intelligent", results)
+        for resume_data, _ in results:
+            resume_data["match_explanation"] = "AI explanation"
+        return results
+    
+    async def _get_cached_results(self, cache_key):
+        return None
+    
+    async def _cache_results(self, cache_key, final_event):
+        pass
+
+
+@contextmanager
+def deadlines(stage1=None, stage2=None, stage3=None, analysis=None):
+    """Temporarily override the stage deadlines."""
+    settings = progressive_module.settings
+    names = (
+        "PROGRESSIVE_STAGE1_DEADLINE",
+        "PROGRESSIVE_STAGE2_DEADLINE",
+        "PROGRESSIVE_STAGE3_DEADLINE",
+        "PROGRESSIVE_ANALYSIS_DEADLINE"
+    )
+    original = {name: getattr(settings, name) for name in names}
+    try:
+        for name, value in zip(names, (stage1, stage2, stage3, analysis)):
+            if value is not None:
+                setattr(settings, name, value)
+        yield
+    finally:
+        for name, value in original.items():
+            setattr(settings, name, value)
+
+
+async def collect(engine, pipelined, stop_after=None):
+    """Run a search, returning (event, seconds since start) pairs."""
+    events = []
+    engine.origin = start = time.perf_counter()
+    stream = engine.search_progressive(
+        db=None, query=QUERY, user_id=uuid4(), limit=5, pipelined=pipelined
+    )
+    async for event in stream:
+        events.append((event, time.perf_counter() - start))
+        if stop_after and event["stage"] == stop_after:
+            await stream.aclose()
+            break
+    return events
+
+
+def result_stages(events):
+    return [event["stage"] for event, _ in events if event["stage"] != "analysis"]
+
+
+async def test_pipelined_overlaps_stages():
+    """Stage 2 starts with stage 1 and is ready as soon as stage 1 is."""
+    engine = TimedStagesEngine(stage1_delay=0.3, stage2_delay=0.3)
+    events = await collect(engine, pipelined=True)
+    assert result_stages(events) == ["instant", "enhanced", "intelligent"], result_stages(events)
+    assert engine.started["enhanced"] < 0.05, engine.started
+    assert engine.stage2_concurrent is True
+    
+    enhanced_at = next(at for event, at in events if event["stage"] == "enhanced")
+    assert enhanced_at < 0.45, f"stage 2 yielded after {enhanced_at:.3f}s"
+    assert events[0][0]["pipelined"] is True
+    assert not any(event.get("partial") for event, _ in events)
+    print(f"✅ pipelined: stage 2 yielded after {enhanced_at * 1000:.0f}ms (stages take 300ms each)")
+
+
+async def test_sequential_waits_for_stage1():
+    """Without pipelining stage 2 starts once stage 1 is done."""
+    engine = TimedStagesEngine(stage1_delay=0.3, stage2_delay=0.3)
+    events = await collect(engine, pipelined=False)
+    assert result_stages(events) == ["instant", "enhanced", "intelligent"]
+    assert engine.started["enhanced"] >= 0.3, engine.started
+    
+    enhanced_at = next(at for event, at in events if event["stage"] == "enhanced")
+    assert enhanced_at >= 0.6
+    print(f"✅ sequential: stage 2 yielded after {enhanced_at * 1000:.0f}ms")
+
+
+async def test_deadlines_yield_partial_results():
+    """Slow stages are cut off at their deadlines and yield what is known."""
+    engine = TimedStagesEngine(stage2_delay=5.0, stage3_delay=5.0)
+    with deadlines(stage2=0.2, stage3=0.4):
+        events = await collect(engine, pipelined=True)
+    assert result_stages(events) == ["instant", "enhanced", "intelligent"]
+    
+    by_stage = {event["stage"]: (event, at) for event, at in events}
+    instant, _ = by_stage["instant"]
+    enhanced, enhanced_at = by_stage["enhanced"]
+    final, final_at = by_stage["intelligent"]
+    
+    assert instant["partial"] is False
+    assert enhanced["partial"] is True and enhanced["hybrid_search"] is None
+    assert [data["id"] for data, _ in enhanced["results"]] == ["r1"]
+    assert 0.2 <= enhanced_at < 0.35, enhanced_at
+    
+    assert final["partial"] is True and final["is_final"] is True
+    explanation = final["results"][0][0]["match_explanation"]
+    assert explanation and explanation != "AI explanation", explanation
+    assert 0.4 <= final_at < 0.55, final_at
+    await asyncio.sleep(0)
+    assert engine.cancelled == {"enhanced", "intelligent"}, engine.cancelled
+    print(f"✅ deadlines: stage 2 cut off at {enhanced_at * 1000:.0f}ms, stage 3 at {final_at * 1000:.0f}ms")
+    
+    engine = TimedStagesEngine(stage1_delay=5.0)
+    with deadlines(stage1=0.1):
+        events = await collect(engine, pipelined=True)
+    instant, instant_at = events[0]
+    assert instant["stage"] == "instant" and instant["partial"] is True
+    assert instant["results"] == [] and instant_at < 0.2
+    assert [data["id"] for data, _ in events[-1][0]["results"]] == ["r2"]
+    print(f"✅ deadlines: stage 1 cut off at {instant_at * 1000:.0f}ms, stage 2 still completes")
+
+
+async def test_cancelled_stage_releases_session():
+    """Stage 2 only starts on the session once the cancelled stage 1 is unwound and rolled back."""
+    engine = TimedStagesEngine(stage1_delay=5.0)
+    with deadlines(stage1=0.1):
+        await collect(engine, pipelined=False)
+    assert engine.log[:4] == ["start instant", "cancelled instant", "rollback", "start enhanced"], engine.log
+    print("✅ a cancelled stage 1 is awaited and rolled back before stage 2 reuses the session")
+
+
+async def test_slow_analysis_leaves_stage3_budget():
+    """A slow LLM analysis is cut off at its own deadline, not stage 3's."""
+    analyzer = SlowAnalyzer(5.0)
+    progressive_module.gpt4_analyzer = analyzer
+    engine = TimedStagesEngine(stage3_delay=0.1)
+    with deadlines(stage3=0.5, analysis=0.2):
+        events = await collect(engine, pipelined=True)
+    final, final_at = events[-1]
+    assert final["partial"] is False, final
+    assert final["results"][0][0]["match_explanation"] == "AI explanation"
+    assert not any(event["stage"] == "analysis" for event, _ in events)
+    assert analyzer.cancelled
+    assert 0.3 <= final_at < 0.45, final_at
+    print(f"✅ analysis cut off at 200ms, stage 3 completed at {final_at * 1000:.0f}ms")
+
+
+async def test_close_cancels_in_flight_stages():
+    """Closing the stream after stage 1 cancels the speculative stage 2."""
+    analyzer = SlowAnalyzer(5.0)
+    progressive_module.gpt4_analyzer = analyzer
+    engine = TimedStagesEngine(stage1_delay=0.05, stage2_delay=5.0)
+    await collect(engine, pipelined=True, stop_after="instant")
+    await asyncio.sleep(0)
+    assert "enhanced" in engine.cancelled
+    assert analyzer.cancelled
+    print("✅ closing the stream cancels stage 2 and the analysis")
+
+
+class FakeWebSocket:
+    """Minimal WebSocket that reports a disconnect after a delay."""
+    
+    def __init__(self, disconnect_after: float):
+        self.disconnect_after = disconnect_after
+    
+    async def receive(self):
+        await asyncio.sleep(self.disconnect_after)
+        return {"type": "websocket.disconnect", "code": 1001}
+
+
+async def test_websocket_disconnect_cancels_search():
+    """A client that leaves mid-stage cancels the search right away."""
+    engine = TimedStagesEngine(stage2_delay=5.0)
+    stream = engine.search_progressive(db=None, query=QUERY, user_id=uuid4(), limit=5, pipelined=True)
+    stages = []
+    start = time.perf_counter()
+    try:
+        async for stage_result in _until_disconnect(FakeWebSocket(0.2), stream):
+            stages.append(stage_result["stage"])
+        raise AssertionError("disconnect was not detected")
+    except WebSocketDisconnect:
+        pass
+    elapsed = time.perf_counter() - start
+    
+    assert [stage for stage in stages if stage != "analysis"] == ["instant"], stages
+    assert elapsed < 0.4, f"disconnect took {elapsed:.3f}s to stop the search"
+    assert "enhanced" in engine.cancelled
+    print(f"✅ WebSocket disconnect stopped the search after {elapsed * 1000:.0f}ms")
+
+
+async def main():
+    print("Testing pipelined progressive search")
+    print("=" * 60)
+    
+    original_parser = progressive_module.async_query_parser
+    original_analyzer = progressive_module.gpt4_analyzer
+    try:
+        progressive_module.async_query_parser = SlowAsyncQueryParser(0.0)
+        progressive_module.gpt4_analyzer = SlowAnalyzer(0.0)
+        await test_pipelined_overlaps_stages()
+        await test_sequential_waits_for_stage1()
+        await test_deadlines_yield_partial_results()
+        await test_cancelled_stage_releases_session()
+        await test_close_cancels_in_flight_stages()
+        await test_slow_analysis_leaves_stage3_budget()
+        progressive_module.gpt4_analyzer = SlowAnalyzer(0.0)
+        await test_websocket_disconnect_cancels_search()
+    finally:
+        progressive_module.async_query_parser = original_parser
+        progressive_module.gpt4_analyzer = original_analyzer
+    
+    print("\nAll pipelined progressive search tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Test concurrent, bounded result enhancement.
+
+Uses a fake chat client whose latency varies per candidate and the
+in-memory Redis fallback, then checks that:
+- candidates are enhanced concurrently and returned in rank order
+- results stream back as each candidate finishes, fastest first
+- the shared semaphore bounds completions in flight across searches
+- a slow candidate falls back to the basic enhancement after the timeout
+- failed completions and candidates missing from a batched response fall
+  back too, and none of these fallbacks are cached
+- batched mode enhances several candidates in one completion call
+"""
+
+import asyncio
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import app.core.redis as redis_module
+from app.core.cache_fallback import InMemoryCache
+from app.services.result_enhancer import ResultEnhancer
+
+PARSED_QUERY = {"primary_skills": ["python"], "secondary_skills": []}
+
+
+class FakeCompletions:
+    """Chat completions that sleep per candidate and track concurrency."""
+    
+    def __init__(self, latencies):
+        self.latencies = latencies
+        self.failing = set()  # Names whose completions raise
+        self.omitted = set()  # Names left out of batched responses
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    async def create(self, messages, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            prompt = messages[-1]["content"]
+            names = re.findall(r"Candidate: (\w+)", prompt)
+            await asyncio.sleep(max(self.latencies.get(name, 0.05) for name in names))
+            if self.failing.intersection(names):
+                raise RuntimeError("OpenAI unavailable")
+            
+            enhancements = [
+                {"match_explanation": f"{name} knows Python", "overall_fit": "strong"}
+                for name in names
+            ]
+            if "Candidate ID:" in prompt:
+                ids = re.findall(r"Candidate ID: (\S+)", prompt)
+                content = {"candidates": [
+                    dict(e, id=i) for e, i, name in zip(enhancements, ids, names) if name not in self.omitted
+                ]}
+            else:
+                content = enhancements[0]
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(content)))])
+        finally:
+            self.in_flight -= 1
+
+
+def make_enhancer(latencies, concurrency=8, timeout=5.0):
+    enhancer = ResultEnhancer()
+    completions = FakeCompletions(latencies)
+    enhancer.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    enhancer.semaphore = asyncio.Semaphore(concurrency)
+    enhancer.timeout = timeout
+    enhancer.batch_size = 1
+    return enhancer, completions
+
+
+def make_results(names, prefix="r"):
+    return [
+        ({"id": f"{prefix}-{name}", "first_name": name, "last_name": "X", "skills": ["Python"]}, 0.9 - i / 100)
+        for i, name in enumerate(names)
+    ]
+
+
+async def test_concurrent_in_rank_order():
+    latencies = {"Ada": 0.3, "Bob": 0.1, "Cy": 0.2, "Di": 0.25, "Ed": 0.15}
+    enhancer, completions = make_enhancer(latencies)
+    results = make_results(latencies, prefix="order")
+    
+    start = time.perf_counter()
+    enhanced = await enhancer.enhance_results(results, "python developer", PARSED_QUERY, limit=5)
+    elapsed = time.perf_counter() - start
+    
+    assert elapsed < 0.5, f"took {elapsed:.2f}s, sequential would be {sum(latencies.values()):.2f}s"
+    assert [data["first_name"] for data, _ in enhanced] == list(latencies)
+    assert all(data["match_explanation"] == f"{data['first_name']} knows Python" for data, _ in enhanced)
+    assert completions.max_in_flight == 5
+    print(f"✅ 5 candidates enhanced in {elapsed:.2f}s (sequential: {sum(latencies.values()):.2f}s)")
+
+
+async def test_streams_as_completed():
+    latencies = {"Ada": 0.3, "Bob": 0.1, "Cy": 0.2}
+    enhancer, _ = make_enhancer(latencies)
+    results = make_results(latencies, prefix="stream")
+    
+    order = [
+        index async for index, _ in enhancer.iter_enhanced_results(results, "python developer", PARSED_QUERY)
+    ]
+    assert order == [1, 2, 0], order
+    
+    # Cached enhancements come back at once
+    start = time.perf_counter()
+    order = [
+        index async for index, _ in enhancer.iter_enhanced_results(results, "python developer", PARSED_QUERY)
+    ]
+    assert order == [0, 1, 2] and time.perf_counter() - start < 0.05, order
+    print("✅ enhancements stream back fastest first; cached ones immediately")
+
+
+async def test_shared_semaphore():
+    names = [f"Cand{i}" for i in range(6)]
+    enhancer, completions = make_enhancer({name: 0.1 for name in names}, concurrency=3)
+    
+    await asyncio.gather(
+        enhancer.enhance_results(make_results(names, prefix="s1"), "python developer", PARSED_QUERY),
+        enhancer.enhance_results(make_results(names, prefix="s2"), "golang developer", PARSED_QUERY),
+    )
+    assert completions.calls == 12
+    assert completions.max_in_flight == 3, completions.max_in_flight
+    print("✅ two searches share the limit of 3 completions in flight")
+
+
+async def test_timeout_falls_back():
+    latencies = {"Fast": 0.05, "Slow": 5.0}
+    enhancer, _ = make_enhancer(latencies, timeout=0.2)
+    results = make_results(latencies, prefix="timeout")
+    
+    start = time.perf_counter()
+    enhanced = await enhancer.enhance_results(results, "python developer", PARSED_QUERY)
+    elapsed = time.perf_counter() - start
+    
+    assert elapsed < 0.5, elapsed
+    assert enhanced[0][0]["match_explanation"] == "Fast knows Python"
+    assert enhanced[1][0]["overall_fit"] in ("excellent", "strong", "good", "fair", "poor")
+    assert enhanced[1][0]["match_explanation"] != "Slow knows Python"
+    
+    # The fallback was not cached, so the slow candidate is retried
+    enhancer.client.chat.completions.latencies["Slow"] = 0.05
+    enhanced = await enhancer.enhance_results(results, "python developer", PARSED_QUERY)
+    assert enhanced[1][0]["match_explanation"] == "Slow knows Python"
+    print(f"✅ a slow candidate fell back to the basic enhancement after {elapsed:.2f}s")
+
+
+async def test_failures_not_cached():
+    latencies = {"Ada": 0.05, "Bob": 0.05}
+    enhancer, completions = make_enhancer(latencies)
+    results = make_results(latencies, prefix="failed")
+    
+    completions.failing = {"Bob"}
+    enhanced = await enhancer.enhance_results(results, "python developer", PARSED_QUERY)
+    assert enhanced[0][0]["match_explanation"] == "Ada knows Python"
+    assert enhanced[1][0]["match_explanation"] != "Bob knows Python"
+    
+    completions.failing = set()
+    calls = completions.calls
+    enhanced = await enhancer.enhance_results(results, "python developer", PARSED_QUERY)
+    assert enhanced[1][0]["match_explanation"] == "Bob knows Python"
+    assert completions.calls == calls + 1, "only the failed candidate should be retried"
+    print("✅ a failed completion falls back without caching the fallback")
+    
+    names = ["Cy", "Di", "Ed"]
+    enhancer, completions = make_enhancer({name: 0.05 for name in names})
+    results = make_results(names, prefix="failed-batch")
+    
+    async def enhance():
+        enhanced = [None] * 3
+        async for index, result in enhancer.iter_enhanced_results(
+            results, "python developer", PARSED_QUERY, batch_size=3
+        ):
+            enhanced[index] = result
+        return [data["match_explanation"] == f"{data['first_name']} knows Python" for data, _ in enhanced]
+    
+    completions.failing = {"Cy"}
+    assert await enhance() == [False, False, False]
+    completions.failing = set()
+    completions.omitted = {"Di"}
+    assert await enhance() == [True, False, True] and completions.calls == 2
+    completions.omitted = set()
+    assert await enhance() == [True, True, True] and completions.calls == 3
+    print("✅ a failed batch, then a candidate missing from the response, are retried on the next search")
+
+
+async def test_batched_prompt():
+    latencies = {"Ada": 0.1, "Bob": 0.1, "Cy": 0.1, "Di": 0.1, "Ed": 0.1}
+    enhancer, completions = make_enhancer(latencies)
+    results = make_results(latencies, prefix="batch")
+    
+    enhanced = [None] * 5
+    async for index, result in enhancer.iter_enhanced_results(
+        results, "python developer", PARSED_QUERY, batch_size=5
+    ):
+        enhanced[index] = result
+    assert completions.calls == 1, completions.calls
+    assert all(data["match_explanation"] == f"{data['first_name']} knows Python" for data, _ in enhanced)
+    assert all("id" not in data or data["id"].startswith("batch-") for data, _ in enhanced)
+    print("✅ batched mode enhanced 5 candidates in one completion")
+
+
+async def main():
+    print("Testing concurrent result enhancement")
+    print("=" * 60)
+    
+    original_client = redis_module.redis_client
+    redis_module.redis_client = InMemoryCache()
+    try:
+        await test_concurrent_in_rank_order()
+        await test_streams_as_completed()
+        await test_shared_semaphore()
+        await test_timeout_falls_back()
+        await test_failures_not_cached()
+        await test_batched_prompt()
+    finally:
+        redis_module.redis_client = original_client
+    
+    print("\nAll result enhancement tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Test the versioned progressive search cache and single-flight coalescing.
+
+Uses the in-memory Redis fallback and fake stages, then checks that:
+- cache keys are fixed-length hashes of the normalized query, filters and limit
+- a corpus version bump stops older entries from being served
+- a complete search is served from cache as a single final event
+- ten identical concurrent searches run the stages once
+- a coalesced search keeps running while anyone listens, and stops after
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from uuid import uuid4
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import app.services.progressive_search as progressive_module
+import app.services.search_cache as search_cache_module
+from app.core.cache_fallback import InMemoryCache
+from app.services.progressive_search import ProgressiveSearchEngine
+from app.services.search_cache import SearchResultCache
+from test_progressive_search_analysis import SlowAnalyzer, SlowAsyncQueryParser
+from test_progressive_search_pipelined import QUERY, TimedStagesEngine
+
+redis_client = InMemoryCache()
+
+
+async def fake_redis_client():
+    return redis_client
+
+
+class CachingEngine(TimedStagesEngine):
+    """Fake stages, real result caching, counting how often stage 1 runs."""
+    
+    _get_cached_results = ProgressiveSearchEngine._get_cached_results
+    _cache_results = ProgressiveSearchEngine._cache_results
+    
+    def __init__(self, **delays):
+        super().__init__(**delays)
+        self.runs = 0
+    
+    async def _stage1_instant_results(self, *args):
+        self.runs += 1
+        return await super()._stage1_instant_results(*args)
+
+
+async def run_search(engine, user_id, query=QUERY, filters=None):
+    return [event async for event in engine.search_progressive(
+        db=None, query=query, user_id=user_id, limit=5, filters=filters, pipelined=True
+    )]
+
+
+def result_stages(events):
+    return [event["stage"] for event in events if event["stage"] != "analysis"]
+
+
+async def test_cache_keys():
+    cache = SearchResultCache()
+    user_id = uuid4()
+    key = await cache.cache_key(user_id, "Senior  Python Developer ", {"skills": ["python"]}, 10)
+    assert key == await cache.cache_key(user_id, "senior python developer", {"skills": ["python"]}, 10)
+    assert key != await cache.cache_key(user_id, "senior python developer", {"skills": ["go"]}, 10)
+    assert key != await cache.cache_key(user_id, "senior python developer", {"skills": ["python"]}, 20)
+    
+    long_key = await cache.cache_key(user_id, "python " * 10_000, None, 10)
+    assert len(long_key) == len(await cache.cache_key(user_id, "go", None, 10)), long_key
+    print(f"✅ keys are normalized and fixed-length: {key}")
+
+
+async def test_version_bump_invalidates():
+    cache = SearchResultCache()
+    user_id, other_user = uuid4(), uuid4()
+    key = await cache.cache_key(user_id, QUERY, None, 10)
+    other_key = await cache.cache_key(other_user, QUERY, None, 10)
+    await cache.set(key, {"results": [1]})
+    await cache.set(other_key, {"results": [2]})
+    
+    await cache.bump_version(user_id)
+    assert await cache.get(await cache.cache_key(user_id, QUERY, None, 10)) is None
+    assert await cache.get(await cache.cache_key(other_user, QUERY, None, 10)) == {"results": [2]}
+    print("✅ a version bump invalidates only that user's searches")
+
+
+async def test_complete_search_is_cached():
+    engine = CachingEngine()
+    user_id = uuid4()
+    first = await run_search(engine, user_id)
+    assert result_stages(first) == ["instant", "enhanced", "intelligent"]
+    
+    second = await run_search(engine, user_id, query="  SENIOR python   developer")
+    assert len(second) == 1 and second[0]["cached"] is True and second[0]["is_final"] is True
+    assert [data["id"] for data, _ in second[0]["results"]] == [data["id"] for data, _ in first[-1]["results"]]
+    assert engine.runs == 1
+    
+    await search_cache_module.search_result_cache.bump_version(user_id)
+    third = await run_search(engine, user_id)
+    assert result_stages(third) == ["instant", "enhanced", "intelligent"] and engine.runs == 2
+    print("✅ complete searches are served from cache until the corpus changes")
+
+
+async def test_partial_search_is_not_cached():
+    engine = CachingEngine(stage3_delay=5.0)
+    user_id = uuid4()
+    settings = progressive_module.settings
+    original = settings.PROGRESSIVE_STAGE3_DEADLINE
+    settings.PROGRESSIVE_STAGE3_DEADLINE = 0.1
+    try:
+        await run_search(engine, user_id)
+    finally:
+        settings.PROGRESSIVE_STAGE3_DEADLINE = original
+    
+    engine.delays["intelligent"] = 0.0
+    events = await run_search(engine, user_id)
+    assert result_stages(events) == ["instant", "enhanced", "intelligent"] and engine.runs == 2
+    print("✅ searches that missed a deadline are not cached")
+
+
+async def test_concurrent_searches_coalesce():
+    engine = CachingEngine(stage1_delay=0.05, stage2_delay=0.1)
+    user_id = uuid4()
+    results = await asyncio.gather(*(run_search(engine, user_id) for _ in range(10)))
+    
+    assert engine.runs == 1, f"stages ran {engine.runs} times"
+    for events in results:
+        assert result_stages(events) == ["instant", "enhanced", "intelligent"]
+        assert events[-1]["search_id"] == results[0][-1]["search_id"]
+    print("✅ ten identical concurrent searches ran the stages once")
+
+
+async def test_coalesced_search_cancellation():
+    engine = CachingEngine(stage2_delay=5.0)
+    user_id = uuid4()
+    streams = [
+        engine.search_progressive(db=None, query=QUERY, user_id=user_id, limit=5, pipelined=True)
+        for _ in range(2)
+    ]
+    for stream in streams:
+        assert (await stream.__anext__())["stage"] in ("instant", "analysis")
+    
+    await streams[0].aclose()
+    await asyncio.sleep(0)
+    assert "enhanced" not in engine.cancelled, "search stopped while a caller was still listening"
+    
+    await streams[1].aclose()
+    await asyncio.sleep(0)
+    assert "enhanced" in engine.cancelled
+    assert engine.runs == 1
+    print("✅ the shared search stops once the last caller leaves")
+
+
+async def test_shared_search_outlives_first_caller():
+    engine = CachingEngine(stage2_delay=0.1)
+    user_id = uuid4()
+    request_db = object()  # Closed by get_db once its request ends
+    streams = [
+        engine.search_progressive(db=request_db, query=QUERY, user_id=user_id, limit=5, pipelined=True)
+        for _ in range(2)
+    ]
+    for stream in streams:
+        await stream.__anext__()
+    
+    await streams[0].aclose()
+    events = [event async for event in streams[1]]
+    assert events[-1]["stage"] == "intelligent" and events[-1]["partial"] is False, events[-1]
+    assert request_db not in engine.sessions and len(engine.sessions) == 1, engine.sessions
+    assert engine.log.count("close") == 1 and engine.log[-1] == "close", engine.log
+    print("✅ the shared search runs on its own session and finishes after the first caller leaves")
+
+
+async def main():
+    print("Testing the progressive search result cache")
+    print("=" * 60)
+    
+    original_redis = search_cache_module.get_redis_client
+    original_parser = progressive_module.async_query_parser
+    original_analyzer = progressive_module.gpt4_analyzer
+    try:
+        search_cache_module.get_redis_client = fake_redis_client
+        progressive_module.async_query_parser = SlowAsyncQueryParser(0.0)
+        progressive_module.gpt4_analyzer = SlowAnalyzer(0.0)
+        await test_cache_keys()
+        await test_version_bump_invalidates()
+        await test_complete_search_is_cached()
+        await test_partial_search_is_not_cached()
+        await test_concurrent_searches_coalesce()
+        await test_coalesced_search_cancellation()
+        await test_shared_search_outlives_first_caller()
+    finally:
+        search_cache_module.get_redis_client = original_redis
+        progressive_module.async_query_parser = original_parser
+        progressive_module.gpt4_analyzer = original_analyzer
+    
+    print("\nAll search result cache tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Test streaming uploads.
+
+Feeds ``receive_upload`` a synthetic multipart body generated chunk by
+chunk, as the ASGI server delivers it, and checks that:
+- a 400 MB recording is written to disk with the right size and SHA-256
+  while the peak resident memory of the process grows by a few MB
+- an upload over the limit is aborted after the limit, not at the end
+- a disallowed file type is rejected before its content is received
+- the temp file is removed when an upload is aborted
+"""
+
+import asyncio
+import hashlib
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.upload_stream import UploadRejectedError, UploadTooLargeError, receive_upload
+
+BOUNDARY = "----promtitude-test-boundary"
+CHUNK_SIZE = 64 * 1024
+MB = 1024 * 1024
+
+
+class FakeUploadRequest:
+    """Stands in for a Starlette Request with a streamed multipart body."""
+
+    def __init__(self, filename: str, size: int, send_content_length: bool = True):
+        self.filename = filename
+        self.size = size
+        self.sent = 0
+        self.sha256 = hashlib.sha256()
+        self.headers = {"content-type": f"multipart/form-data; boundary={BOUNDARY}"}
+        if send_content_length:
+            self.headers["content-length"] = str(size + len(self._head()) + len(self._tail()))
+
+    def _head(self) -> bytes:
+        return (
+            f"--{BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{self.filename}"\r\n'
+            f"Content-Type: audio/mpeg\r\n\r\n"
+        ).encode()
+
+    def _tail(self) -> bytes:
+        return f"\r\n--{BOUNDARY}--\r\n".encode()
+
+    async def stream(self):
+        yield self._head()
+        block = os.urandom(CHUNK_SIZE)
+        remaining = self.size
+        while remaining:
+            chunk = block[:min(CHUNK_SIZE, remaining)]
+            remaining -= len(chunk)
+            self.sent += len(chunk)
+            self.sha256.update(chunk)
+            yield chunk
+        yield self._tail()
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process in bytes (Linux reports KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+async def test_large_upload_memory():
+    request = FakeUploadRequest("interview.mp3", 400 * MB)
+
+    rss_before = _peak_rss()
+    start = time.perf_counter()
+    upload = await receive_upload(request, max_size=500 * MB, allowed_extensions=["mp3"])
+    elapsed = time.perf_counter() - start
+    growth = _peak_rss() - rss_before
+
+    try:
+        assert upload.size == 400 * MB, upload.size
+        assert os.path.getsize(upload.path) == 400 * MB
+        assert upload.sha256 == request.sha256.hexdigest()
+        assert upload.filename == "interview.mp3" and upload.content_type == "audio/mpeg"
+        assert growth < 16 * MB, f"peak RSS grew by {growth / MB:.1f} MB"
+    finally:
+        upload.cleanup()
+    assert not os.path.exists(upload.path)
+    print(f"✅ 400 MB upload streamed to disk in {elapsed:.1f}s, peak RSS grew by {growth / MB:.1f} MB")
+
+
+async def test_aborts_over_limit():
+    # Without a Content-Length the limit is enforced while streaming
+    request = FakeUploadRequest("interview.mp3", 100 * MB, send_content_length=False)
+    temp_files = set(os.listdir(tempfile.gettempdir()))
+    try:
+        await receive_upload(request, max_size=10 * MB, allowed_extensions=["mp3"])
+    except UploadTooLargeError:
+        pass
+    else:
+        raise AssertionError("Size limit not enforced")
+    assert request.sent <= 10 * MB + CHUNK_SIZE, request.sent
+    assert set(os.listdir(tempfile.gettempdir())) <= temp_files, "temp file left behind"
+    print(f"✅ oversized upload aborted after {request.sent / MB:.1f} of 100 MB")
+
+    # With a Content-Length it is rejected before reading the body
+    request = FakeUploadRequest("interview.mp3", 100 * MB)
+    try:
+        await receive_upload(request, max_size=10 * MB)
+    except UploadTooLargeError:
+        pass
+    else:
+        raise AssertionError("Content-Length not checked")
+    assert request.sent == 0, request.sent
+    print("✅ oversized Content-Length rejected before the body was read")
+
+
+async def test_rejects_file_type():
+    request = FakeUploadRequest("payload.exe", 5 * MB, send_content_length=False)
+    try:
+        await receive_upload(request, max_size=10 * MB, allowed_extensions=[".pdf", ".docx"])
+    except UploadTooLargeError:
+        raise AssertionError("Wrong error")
+    except UploadRejectedError as e:
+        assert ".exe not allowed" in str(e), e
+    else:
+        raise AssertionError("File type not checked")
+    assert request.sent == 0, request.sent
+    print("✅ disallowed file type rejected before its content was received")
+
+
+async def main():
+    print("Testing streaming uploads")
+    print("=" * 60)
+
+    await test_large_upload_memory()
+    await test_aborts_over_limit()
+    await test_rejects_file_type()
+
+    print("\nAll streaming upload tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
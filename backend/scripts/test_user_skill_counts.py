@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Test that user_skill_counts tracks resume writes.
+
+Runs against the configured database inside a transaction that is rolled
+back at the end. Creates, edits, archives, re-activates, re-indexes and
+deletes resumes for a throwaway user and, after every step, compares the
+maintained counts with a fresh aggregate over the user's active resumes.
+
+Requires the add_user_skill_counts migration.
+"""
+
+import asyncio
+import sys
+from collections import Counter
+from pathlib import Path
+from uuid import uuid4
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import engine
+from app.models.resume import Resume
+from app.models.search_index import UserSkillCount
+from app.models.user import User
+from app.services.skill_index import skill_index
+
+
+async def expected_counts(session: AsyncSession, user_id):
+    """Count normalized skills over the user's active resumes in Python."""
+    result = await session.execute(
+        select(Resume.skills).where(Resume.user_id == user_id, Resume.status == 'active')
+    )
+    counts = Counter()
+    for skills in result.scalars().all():
+        counts.update(skill_index.document_skills(skills).keys())
+    return dict(counts)
+
+
+async def maintained_counts(session: AsyncSession, user_id):
+    result = await session.execute(
+        select(UserSkillCount.skill_norm, UserSkillCount.resume_count)
+        .where(UserSkillCount.user_id == user_id)
+    )
+    return dict(result.all())
+
+
+async def check(session: AsyncSession, user_id, step: str):
+    expected = await expected_counts(session, user_id)
+    maintained = await maintained_counts(session, user_id)
+    assert maintained == expected, f"{step}: expected {expected}, got {maintained}"
+    print(f"✅ {step}: {len(maintained)} skills")
+
+
+async def main():
+    print("Testing user_skill_counts maintenance")
+    print("=" * 60)
+    
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        session = AsyncSession(bind=conn, expire_on_commit=False)
+        try:
+            user_id = uuid4()
+            await session.execute(insert(User), [{
+                "id": user_id,
+                "email": f"skills-{user_id}@example.com",
+                "username": f"skills-{user_id}",
+            }])
+            
+            ids = [uuid4() for _ in range(3)]
+            await session.execute(insert(Resume), [
+                {"id": ids[0], "user_id": user_id, "first_name": "Ada", "last_name": "L",
+                 "skills": ["Python", "AWS", " python "], "status": "active"},
+                {"id": ids[1], "user_id": user_id, "first_name": "Grace", "last_name": "H",
+                 "skills": ["python", "COBOL"], "status": "active"},
+                {"id": ids[2], "user_id": user_id, "first_name": "Alan", "last_name": "T",
+                 "skills": ["Go"], "status": "archived"},
+            ])
+            await check(session, user_id, "insert (duplicates and inactive resumes ignored)")
+            
+            await session.execute(update(Resume).where(Resume.id == ids[1]).values(skills=["Rust", "AWS"]))
+            await check(session, user_id, "skills changed")
+            
+            await session.execute(update(Resume).where(Resume.id == ids[0]).values(status="deleted"))
+            await check(session, user_id, "soft delete")
+            
+            await session.execute(update(Resume).where(Resume.id == ids[2]).values(status="active", skills=["Go", "Rust"]))
+            await check(session, user_id, "re-activated with new skills")
+            
+            await session.execute(update(Resume).where(Resume.id == ids[2]).values(parse_status="completed"))
+            await check(session, user_id, "unrelated column updated")
+            
+            resumes = (await session.execute(select(Resume).where(Resume.user_id == user_id))).scalars().all()
+            await skill_index.index_documents(session, resumes)
+            await check(session, user_id, "re-indexed")
+            
+            await session.execute(delete(Resume).where(Resume.id == ids[1]))
+            await check(session, user_id, "hard delete")
+            
+            popular = await skill_index._top_skills(session, user_id, 1)
+            assert popular == [{"skill": "Go", "skill_norm": "go", "count": 1}], popular
+            print(f"✅ top-k read: {popular}")
+        finally:
+            await session.close()
+            await transaction.rollback()
+    
+    print("\nAll user_skill_counts tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
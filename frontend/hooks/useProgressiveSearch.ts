@@ -57,6 +57,7 @@ export interface ProgressiveSearchState {
     instant?: number;
     enhanced?: number;
     intelligent?: number;
+    analysis?: number;
     total?: number;
   };
   searchId?: string;
@@ -151,6 +152,20 @@ export function useProgressiveSearch() {
           return;
         }
 
+        if (data.event === 'analysis') {
+          // AI query analysis arrives in the background, between stages
+          setState(prev => ({
+            ...prev,
+            queryAnalysis: data.parsed_query || prev.queryAnalysis,
+            suggestions: data.suggestions || prev.suggestions,
+            timing: {
+              ...prev.timing,
+              analysis: data.timing_ms,
+            },
+          }));
+          return;
+        }
+
         if (data.event === 'error') {
           setState(prev => ({
             ...prev,
@@ -289,6 +304,20 @@ export function useProgressiveSearchWS() {
           return;
         }
 
+        if (data.event === 'analysis') {
+          // AI query analysis arrives in the background, between stages
+          setState(prev => ({
+            ...prev,
+            queryAnalysis: data.parsed_query || prev.queryAnalysis,
+            suggestions: data.suggestions || prev.suggestions,
+            timing: {
+              ...prev.timing,
+              analysis: data.timing_ms,
+            },
+          }));
+          return;
+        }
+
         if (data.event === 'error') {
           setState(prev => ({
             ...prev,